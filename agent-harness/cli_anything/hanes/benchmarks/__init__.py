@@ -0,0 +1,6 @@
+"""
+@file __init__.py
+@description Performance benchmarks for the HANES MES CLI client.
+    Each bench_*.py module runs standalone, e.g.:
+        python -m cli_anything.hanes.benchmarks.bench_pool
+"""
@@ -0,0 +1,114 @@
+"""
+@file _server.py
+@description Minimal local JSON server used by the client benchmarks.
+    Speaks HTTP/1.1 with keep-alive so connection reuse can be measured
+    without the NestJS backend. Optionally gzips responses (like the
+    compression() middleware) and throttles the link to a fixed bandwidth.
+"""
+
+import json
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Bytes per write / read while throttling.
+_THROTTLE_CHUNK = 16 * 1024
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _throttle(self, nbytes: int):
+        if self.server.bandwidth:
+            time.sleep(nbytes / self.server.bandwidth)
+
+    def _reply(self):
+        srv = self.server
+        length = int(self.headers.get("Content-Length") or 0)
+        while length:
+            chunk = self.rfile.read(min(length, _THROTTLE_CHUNK))
+            length -= len(chunk)
+            self._throttle(len(chunk))
+            with srv.lock:
+                srv.bytes_received += len(chunk)
+        if srv.latency:
+            time.sleep(srv.latency)
+        body = srv.payload
+        gzipped = srv.gzip and "gzip" in self.headers.get("Accept-Encoding", "")
+        if gzipped:
+            deflater = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            body = deflater.compress(body) + deflater.flush()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        if gzipped:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        for i in range(0, len(body), _THROTTLE_CHUNK):
+            chunk = body[i:i + _THROTTLE_CHUNK]
+            self.wfile.write(chunk)
+            self._throttle(len(chunk))
+        with srv.lock:
+            srv.bytes_sent += len(body)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _reply
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops SYNs under concurrent connects.
+    request_queue_size = 128
+
+
+class LocalServer:
+    """Threaded keep-alive server returning a fixed JSON envelope.
+
+    Args:
+        rows: Records in the default parts envelope.
+        latency: Seconds of server think time per request.
+        records: Records to serve instead of the default parts.
+        gzip: gzip responses for clients that accept it.
+        bandwidth: Link speed in bytes/second (None: unthrottled).
+
+    Usage:
+        with LocalServer(rows=20) as srv:
+            HanesBackend(base_url=srv.base_url).list_parts()
+    """
+
+    def __init__(self, rows: int = 20, latency: float = 0.0,
+                 records: list[dict] | None = None, gzip: bool = False,
+                 bandwidth: float | None = None):
+        self.httpd = _Server(("127.0.0.1", 0), _Handler)
+        self.httpd.latency = latency
+        self.httpd.gzip = gzip
+        self.httpd.bandwidth = bandwidth
+        self.httpd.lock = threading.Lock()
+        self.httpd.bytes_sent = self.httpd.bytes_received = 0
+        if records is None:
+            records = [{"itemCode": f"ITEM-{i:05d}", "itemName": f"전선 {i}",
+                        "qty": i} for i in range(rows)]
+        self.httpd.payload = json.dumps({
+            "success": True,
+            "data": records,
+            "meta": {"page": 1, "limit": len(records), "total": len(records)},
+        }).encode("utf-8")
+        self._thread = threading.Thread(target=self.httpd.serve_forever,
+                                        daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/api/v1"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
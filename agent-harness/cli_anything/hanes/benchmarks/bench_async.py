@@ -0,0 +1,80 @@
+"""
+@file bench_async.py
+@description Fan-out benchmark: sequential HanesBackend vs HanesAsyncBackend.
+    Fetches job orders, prod results and defect logs for N orders against
+    a local server with injected latency.
+
+    Usage:
+        python -m cli_anything.hanes.benchmarks.bench_async --orders 50 --latency 0.02
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from cli_anything.hanes.benchmarks._server import LocalServer
+from cli_anything.hanes.utils.hanes_async import HanesAsyncBackend
+from cli_anything.hanes.utils.hanes_backend import HanesBackend
+
+
+def _sequential(base_url: str, orders: int) -> float:
+    backend = HanesBackend(base_url=base_url)
+    t0 = time.perf_counter()
+    for i in range(orders):
+        order_no = f"JO-{i:05d}"
+        backend.get_job_order(order_no)
+        backend.list_prod_results(orderNo=order_no)
+        backend.list_defect_logs(search=order_no)
+    elapsed = time.perf_counter() - t0
+    backend.close()
+    return elapsed
+
+
+async def _fan_out(base_url: str, orders: int, concurrency: int) -> float:
+    async with HanesAsyncBackend(base_url=base_url,
+                                 concurrency=concurrency) as api:
+        t0 = time.perf_counter()
+        calls = []
+        for i in range(orders):
+            order_no = f"JO-{i:05d}"
+            calls += [api.get_job_order(order_no),
+                      api.list_prod_results(orderNo=order_no),
+                      api.list_defect_logs(search=order_no)]
+        await api.gather(*calls)
+        return time.perf_counter() - t0
+
+
+def run(orders: int = 50, latency: float = 0.02,
+        concurrency: int = 32) -> dict[str, float]:
+    """Return wall times (ms) for the sequential and fan-out variants."""
+    with LocalServer(latency=latency) as srv:
+        seq = _sequential(srv.base_url, orders)
+        fan = asyncio.run(_fan_out(srv.base_url, orders, concurrency))
+    return {"calls": orders * 3, "sequential_ms": round(seq * 1000, 1),
+            "async_ms": round(fan * 1000, 1),
+            "speedup": round(seq / fan, 2)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[2].strip())
+    parser.add_argument("--orders", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.02,
+                        help="Injected server latency per call (seconds)")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--json", action="store_true", help="Print raw JSON")
+    args = parser.parse_args()
+
+    results = run(args.orders, args.latency, args.concurrency)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{results['calls']} calls, {args.latency * 1000:.0f}ms server latency")
+    print(f"  sequential : {results['sequential_ms']:>9.1f}ms")
+    print(f"  async      : {results['async_ms']:>9.1f}ms "
+          f"(concurrency {args.concurrency})")
+    print(f"  speedup    : {results['speedup']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
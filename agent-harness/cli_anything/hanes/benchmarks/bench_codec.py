@@ -0,0 +1,118 @@
+"""
+@file bench_codec.py
+@description JSON encode/decode throughput: stdlib json vs the codec.
+    Decodes response bodies and pretty-prints them the way --json does,
+    for payloads shaped like the HANES list endpoints (parts, job orders,
+    transactions, BOM tree) or for saved responses passed with --payload.
+    Without orjson installed both columns measure the stdlib.
+
+    Usage:
+        python -m cli_anything.hanes.benchmarks.bench_codec --rows 5000
+        curl -s localhost:3003/api/v1/master/parts > parts.json
+        python -m cli_anything.hanes.benchmarks.bench_codec --payload parts.json
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+from cli_anything.hanes.utils import codec
+
+
+def _envelope(rows: list) -> bytes:
+    return json.dumps({
+        "success": True, "data": rows,
+        "meta": {"page": 1, "limit": len(rows), "total": len(rows),
+                 "totalPages": 1, "hasNext": False},
+    }, ensure_ascii=False).encode("utf-8")
+
+
+def _bom(code: str, depth: int) -> dict:
+    return {"childItemCode": code, "qtyPer": 2.5, "unit": "EA",
+            "children": [] if depth == 0 else
+            [_bom(f"{code}-{i}", depth - 1) for i in range(4)]}
+
+
+def payloads(rows: int) -> dict[str, bytes]:
+    """Synthetic response bodies modelled on the backend DTOs."""
+    return {
+        "parts": _envelope([{
+            "itemCode": f"W-{i:06d}", "itemName": f"전선 AVSS 0.5SQ 흑색 {i}",
+            "itemType": ("RAW", "SEMI", "PROD")[i % 3], "unit": "M",
+            "spec": "0.5SQ", "useYn": "Y", "safetyStock": i % 100,
+            "createdAt": "2026-01-02T03:04:05.000Z",
+        } for i in range(rows)]),
+        "job_orders": _envelope([{
+            "id": i, "orderNo": f"JO-20260102-{i:05d}", "status": "RUNNING",
+            "itemCode": f"H-{i % 200:05d}", "planQty": 1000, "goodQty": i % 1000,
+            "defectQty": i % 7, "progress": round((i % 1000) / 10, 1),
+            "lineCode": f"L{i % 8}", "startedAt": "2026-01-02T08:00:00.000Z",
+        } for i in range(rows)]),
+        "transactions": _envelope([{
+            "id": i, "transNo": f"TRX-20260101-{i:06d}",
+            "transType": ("RECEIVE", "ISSUE", "MOVE")[i % 3],
+            "itemCode": f"ITEM-{i % 800:05d}", "lotNo": f"LOT-{i // 50:05d}",
+            "qty": (i * 7) % 500 + 0.25, "remark": "",
+            "fromWarehouseId": "WH-RAW" if i % 3 else None,
+        } for i in range(rows)]),
+        "bom_tree": _envelope([_bom(f"H-{i:03d}", 3)
+                               for i in range(max(1, rows // 85))]),
+    }
+
+
+def _rate(fn, nbytes: int, min_time: float = 0.2) -> float:
+    """Throughput of fn in MB/s, repeating it for at least min_time."""
+    runs, t0 = 0, time.perf_counter()
+    while True:
+        fn()
+        runs += 1
+        elapsed = time.perf_counter() - t0
+        if elapsed >= min_time:
+            return round(nbytes * runs / elapsed / 1e6, 1)
+
+
+def run(rows: int = 5000, files: list[str] | None = None) -> dict[str, dict]:
+    """Measure decode and pretty-encode throughput per payload."""
+    bodies = ({Path(f).stem: Path(f).read_bytes() for f in files}
+              if files else payloads(rows))
+    results = {}
+    for name, body in bodies.items():
+        obj = json.loads(body)
+        text = json.dumps(obj, indent=2, ensure_ascii=False, default=str)
+        assert codec.dumps_pretty(obj) == text, f"{name}: output differs"
+        out = len(text.encode("utf-8"))
+        results[name] = {
+            "bytes": len(body),
+            "decode_json": _rate(lambda: json.loads(body.decode("utf-8")), len(body)),
+            "decode_codec": _rate(lambda: codec.loads(body), len(body)),
+            "encode_json": _rate(lambda: json.dumps(
+                obj, indent=2, ensure_ascii=False, default=str), out),
+            "encode_codec": _rate(lambda: codec.dumps_pretty(obj), out),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[2].strip())
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--payload", action="append", metavar="FILE",
+                        help="Saved response body (repeatable)")
+    parser.add_argument("--json", action="store_true", help="Print raw JSON")
+    args = parser.parse_args()
+
+    results = run(args.rows, args.payload)
+    if args.json:
+        print(json.dumps({"backend": codec.BACKEND, "results": results}, indent=2))
+        return
+    print(f"codec backend: {codec.BACKEND} (MB/s, higher is better)")
+    print(f"{'payload':<14} {'size':>10} {'decode json':>12} {'codec':>8} "
+          f"{'encode json':>12} {'codec':>8}")
+    for name, r in results.items():
+        print(f"{name:<14} {r['bytes']:>10,} {r['decode_json']:>12.1f} "
+              f"{r['decode_codec']:>8.1f} {r['encode_json']:>12.1f} "
+              f"{r['encode_codec']:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+@file bench_compression.py
+@description Bytes-on-the-wire and latency benchmark for HTTP compression.
+    Fetches a 5,000-row /inventory/transactions page and posts a large
+    bulk body over a throttled local link, with compression off (the old
+    client) and on (Accept-Encoding plus gzipped request bodies).
+
+    Usage:
+        python -m cli_anything.hanes.benchmarks.bench_compression --mbps 20
+"""
+
+import argparse
+import json
+
+from cli_anything.hanes.benchmarks._server import LocalServer
+from cli_anything.hanes.benchmarks.bench_pool import _measure, _summary
+from cli_anything.hanes.utils.hanes_backend import HanesBackend
+
+
+def _transactions(rows: int) -> list[dict]:
+    return [{
+        "id": i,
+        "transNo": f"TRX-20260101-{i:06d}",
+        "transType": ("RECEIVE", "ISSUE", "MOVE")[i % 3],
+        "transDate": f"2026-01-{i % 28 + 1:02d}T08:{i % 60:02d}:00.000Z",
+        "itemCode": f"ITEM-{i % 800:05d}",
+        "lotNo": f"LOT-{i // 50:05d}",
+        "fromWarehouseId": "WH-RAW" if i % 3 else None,
+        "toWarehouseId": "WH-PROD",
+        "qty": (i * 7) % 500 + 1,
+        "status": "DONE",
+        "remark": "",
+        "createdBy": "system",
+    } for i in range(rows)]
+
+
+def run(requests: int = 10, rows: int = 5000, mbps: float = 20.0) -> dict[str, dict]:
+    """Fetch and post through each client mode and return summaries."""
+    records = _transactions(rows)
+    bulk = {"items": records[:rows // 2]}
+    results = {}
+    with LocalServer(records=records, gzip=True,
+                     bandwidth=mbps * 1_000_000 / 8) as srv:
+        for name, compress in (("identity", False), ("gzip", True)):
+            backend = HanesBackend(base_url=srv.base_url, compress=compress)
+            backend.list_transactions()  # warm-up: connect, first import
+            srv.httpd.bytes_sent = srv.httpd.bytes_received = 0
+            get = _summary(_measure(backend.list_transactions, requests))
+            get["bytes_per_request"] = srv.httpd.bytes_sent // requests
+            post = _summary(_measure(
+                lambda: backend.post("/inventory/transactions/bulk", bulk),
+                requests))
+            post["bytes_per_request"] = srv.httpd.bytes_received // requests
+            results[name] = {"get": get, "post": post}
+            backend.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[2].strip())
+    parser.add_argument("--requests", type=int, default=10)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--mbps", type=float, default=20.0,
+                        help="Link bandwidth in megabits per second")
+    parser.add_argument("--json", action="store_true", help="Print raw JSON")
+    args = parser.parse_args()
+
+    results = run(args.requests, args.rows, args.mbps)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'mode':<9} {'call':<5} {'bytes':>10} {'mean':>10} {'p95':>10}")
+    for name, calls in results.items():
+        for call, r in calls.items():
+            print(f"{name:<9} {call:<5} {r['bytes_per_request']:>10,} "
+                  f"{r['mean_ms']:>8.1f}ms {r['p95_ms']:>8.1f}ms")
+    print()
+    for call in ("get", "post"):
+        plain, gz = results["identity"][call], results["gzip"][call]
+        print(f"{call}: {plain['bytes_per_request'] / gz['bytes_per_request']:.1f}x "
+              f"fewer bytes, {plain['mean_ms'] / gz['mean_ms']:.2f}x faster "
+              f"at {args.mbps:g} Mbit/s")
+
+
+if __name__ == "__main__":
+    main()
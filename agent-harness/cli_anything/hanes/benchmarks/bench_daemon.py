@@ -0,0 +1,74 @@
+"""
+@file bench_daemon.py
+@description Per-command wall time of cold CLI processes vs. the warm daemon.
+    Cold mode spawns `python -m cli_anything.hanes` for every command; daemon
+    mode spawns the thin client, which forwards argv to a running daemon.
+    Both hit the same local server with a throwaway session file and socket.
+
+    Usage:
+        python -m cli_anything.hanes.benchmarks.bench_daemon --commands 20
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from cli_anything.hanes.benchmarks._server import LocalServer
+from cli_anything.hanes.benchmarks.bench_pool import _summary
+from cli_anything.hanes.client import SOCKET_ENV
+
+
+def _time_command(argv: list[str], env: dict) -> float:
+    t0 = time.perf_counter()
+    subprocess.run(argv, env=env, check=True, stdout=subprocess.DEVNULL)
+    return (time.perf_counter() - t0) * 1000
+
+
+def run(commands: int = 20, rows: int = 20) -> dict[str, dict]:
+    """Run the same command cold and through the daemon; return summaries."""
+    with tempfile.TemporaryDirectory() as tmp, LocalServer(rows=rows) as srv:
+        env = dict(os.environ, **{SOCKET_ENV: str(Path(tmp) / "d.sock")})
+        args = ["--json", "--session-file", str(Path(tmp) / "session.json"),
+                "--base-url", srv.base_url, "master", "parts"]
+        cold = [sys.executable, "-m", "cli_anything.hanes", *args]
+        warm = [sys.executable, "-m", "cli_anything.hanes.client", *args]
+
+        _time_command(cold, env)  # warm the OS file cache / .pyc files
+        first = _time_command(warm, env)  # includes daemon auto-spawn
+        results = {
+            "cold": _summary([_time_command(cold, env) for _ in range(commands)]),
+            "daemon": _summary([_time_command(warm, env) for _ in range(commands)]),
+        }
+        results["daemon"]["first_call_ms"] = round(first, 1)
+        subprocess.run([sys.executable, "-m", "cli_anything.hanes", "daemon",
+                        "stop"], env=env, stdout=subprocess.DEVNULL)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[2].strip())
+    parser.add_argument("--commands", type=int, default=20)
+    parser.add_argument("--rows", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="Print raw JSON")
+    args = parser.parse_args()
+
+    results = run(args.commands, args.rows)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'mode':<10} {'mean':>9} {'p50':>9} {'p95':>9}")
+    for name, r in results.items():
+        print(f"{name:<10} {r['mean_ms']:>7.1f}ms {r['p50_ms']:>7.1f}ms "
+              f"{r['p95_ms']:>7.1f}ms")
+    speedup = results["cold"]["mean_ms"] / results["daemon"]["mean_ms"]
+    print(f"\ndaemon is {speedup:.2f}x faster per command "
+          f"(first call incl. spawn: {results['daemon']['first_call_ms']}ms)")
+
+
+if __name__ == "__main__":
+    main()
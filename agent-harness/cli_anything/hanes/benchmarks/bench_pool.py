@@ -0,0 +1,85 @@
+"""
+@file bench_pool.py
+@description Before/after latency benchmark for the keep-alive connection pool.
+    Compares one urlopen() per call (the old transport) with HanesBackend's
+    pooled HTTP/1.1 connections against a local server.
+
+    Usage:
+        python -m cli_anything.hanes.benchmarks.bench_pool --requests 500
+"""
+
+import argparse
+import json
+import math
+import statistics
+import time
+import urllib.request
+
+from cli_anything.hanes.benchmarks._server import LocalServer
+from cli_anything.hanes.utils.hanes_backend import HanesBackend
+
+
+def _urlopen_get(url: str) -> dict:
+    req = urllib.request.Request(url, headers={"Accept": "application/json"})
+    with urllib.request.urlopen(req, timeout=30) as resp:
+        return json.loads(resp.read().decode("utf-8"))
+
+
+def _measure(fn, n: int) -> list[float]:
+    samples = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return samples
+
+
+def _summary(samples: list[float]) -> dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "mean_ms": round(statistics.fmean(ordered), 3),
+        "p50_ms": round(ordered[len(ordered) // 2], 3),
+        "p95_ms": round(ordered[math.ceil(len(ordered) * 0.95) - 1], 3),
+        "total_ms": round(sum(ordered), 1),
+    }
+
+
+def run(requests: int = 500, rows: int = 20) -> dict[str, dict]:
+    """Run both transports against a local server and return summaries."""
+    with LocalServer(rows=rows) as srv:
+        url = f"{srv.base_url}/master/parts"
+        backend = HanesBackend(base_url=srv.base_url)
+        # Warm-up both paths so imports and first connects are excluded.
+        _urlopen_get(url)
+        backend.list_parts()
+        results = {
+            "urlopen": _summary(_measure(lambda: _urlopen_get(url), requests)),
+            "pooled": _summary(_measure(backend.list_parts, requests)),
+        }
+        results["pooled"]["connections"] = backend.pool.stats()["created"]
+        backend.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[2].strip())
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--rows", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="Print raw JSON")
+    args = parser.parse_args()
+
+    results = run(args.requests, args.rows)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'transport':<10} {'mean':>8} {'p50':>8} {'p95':>8} {'total':>10}")
+    for name, r in results.items():
+        print(f"{name:<10} {r['mean_ms']:>7.3f}ms {r['p50_ms']:>7.3f}ms "
+              f"{r['p95_ms']:>7.3f}ms {r['total_ms']:>9.1f}ms")
+    speedup = results["urlopen"]["mean_ms"] / results["pooled"]["mean_ms"]
+    print(f"\npooled is {speedup:.2f}x faster per request "
+          f"({results['pooled']['connections']} connection(s) opened)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+@file bench_table.py
+@description Micro-benchmark for terminal table rendering.
+    Compares the previous ReplSkin.table approach (materialise every row,
+    size columns over all of them, print() row by row) with the streaming
+    TableWriter on Korean part data, reporting time and peak memory.
+
+    Usage:
+        python -m cli_anything.hanes.benchmarks.bench_table --rows 100000
+"""
+
+import argparse
+import contextlib
+import json
+import time
+import tracemalloc
+
+from cli_anything.hanes.utils.table import TableWriter
+
+_HEADERS = ["Code", "Name", "Type", "Unit", "UseYN"]
+
+
+class _NullSink:
+    """Text sink that only counts characters."""
+
+    def __init__(self):
+        self.chars = 0
+
+    def write(self, s: str) -> int:
+        self.chars += len(s)
+        return len(s)
+
+    def flush(self):
+        pass
+
+
+def _rows(n: int):
+    for i in range(n):
+        yield [f"ITEM-{i:06d}", f"전선 하네스 조립품 {i:06d}", "FG", "EA", "Y"]
+
+
+def _legacy_table(rows: list[list[str]], max_col_width: int = 40):
+    """The pre-TableWriter algorithm: len()-based widths over every row."""
+    widths = [min(len(h), max_col_width) for h in _HEADERS]
+    for row in rows:
+        for i, cell in enumerate(row):
+            widths[i] = min(max(widths[i], len(str(cell))), max_col_width)
+
+    def pad(text, width):
+        t = str(text)[:width]
+        return t + " " * (width - len(t))
+
+    print("  " + " │ ".join(pad(h, w) for h, w in zip(_HEADERS, widths)))
+    print("  " + "───".join("─" * w for w in widths))
+    for row in rows:
+        print("  " + " │ ".join(pad(c, widths[i]) for i, c in enumerate(row)))
+
+
+def _measure(fn) -> dict[str, float]:
+    # Timed and traced in separate runs: tracemalloc slows allocation-heavy
+    # code several-fold and would swamp the comparison.
+    t0 = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - t0
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"seconds": round(elapsed, 3), "peak_mb": round(peak / 1e6, 2)}
+
+
+def run(rows: int = 100_000) -> dict[str, dict]:
+    """Render ``rows`` rows both ways into a null sink."""
+    sink = _NullSink()
+
+    def legacy():
+        with contextlib.redirect_stdout(sink):
+            _legacy_table(list(_rows(rows)))
+
+    def streaming():
+        TableWriter(_HEADERS, out=sink).write(_rows(rows))
+
+    return {"legacy": _measure(legacy), "streaming": _measure(streaming)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[2].strip())
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--json", action="store_true", help="Print raw JSON")
+    args = parser.parse_args()
+
+    results = run(args.rows)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'renderer':<10} {'time':>9} {'peak mem':>10}")
+    for name, r in results.items():
+        print(f"{name:<10} {r['seconds']:>8.3f}s {r['peak_mb']:>8.2f}MB")
+    speedup = results["legacy"]["seconds"] / results["streaming"]["seconds"]
+    print(f"\nstreaming is {speedup:.2f}x faster for {args.rows} rows "
+          "(and aligns wide Korean characters correctly)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,714 @@
+"""
+@file fake_backend.py
+@description Stand-in HANES MES backend for offline benchmarking and e2e runs.
+    Serves the endpoints HanesBackend calls (auth, master, material,
+    production, quality, inventory, equipment, shipping, dashboard) with
+    the backend's paged envelope over a seeded synthetic dataset. Records
+    are generated from their index on demand, so a million transactions
+    cost no memory; writes are kept in an in-memory overlay. Latency,
+    jitter and error rates can be injected, and the server gzips, sends
+    ETags and replays Idempotency-Key writes like the real middleware.
+
+    Usage:
+        with FakeBackend(sizes={"transactions": 1_000_000}) as srv:
+            HanesBackend(base_url=srv.base_url).list_transactions(limit=100)
+
+        # Stand in for the real backend on localhost:3003
+        python -m cli_anything.hanes.benchmarks.fake_backend --port 3003 \\
+            --transactions 1000000 --latency-ms 5 --error-rate 0.01
+"""
+
+import argparse
+import json
+import random
+import re
+import socket
+import subprocess
+import sys
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+API_PREFIX = "/api/v1"
+DEFAULT_LIMIT = 20
+# Responses smaller than this go uncompressed, as with compression().
+GZIP_THRESHOLD = 1024
+
+_EPOCH = 1767225600  # 2026-01-01T00:00:00Z
+_TS_FORMAT = "%Y-%m-%dT%H:%M:%S.000Z"
+
+
+def _mix(i: int, salt: int) -> int:
+    """Cheap deterministic hash of (index, salt) for synthetic fields."""
+    h = (i * 2654435761 + salt * 40503 + 0x9E3779B9) & 0xFFFFFFFF
+    h ^= h >> 15
+    return (h * 2246822519) & 0xFFFFFFFF
+
+
+def _ts(i: int, step_s: int) -> str:
+    return time.strftime(_TS_FORMAT, time.gmtime(_EPOCH + i * step_s))
+
+
+# ── Synthetic dataset ────────────────────────────────────────────
+
+_ITEM_TYPES = ("RAW", "SEMI", "PROD")
+_ORDER_STATUSES = ("WAITING", "RUNNING", "RUNNING", "DONE", "DONE")
+_TRANS_TYPES = ("RECEIVE", "ISSUE", "MOVE", "ADJUST")
+_DEFECT_TYPES = ("SHORT", "OPEN", "CRIMP", "STRIP", "MISWIRE")
+
+
+class FakeDataset:
+    """Seeded records of every resource, generated from their index.
+
+    Args:
+        seed: Changes every generated value; same seed, same data.
+        sizes: Records per resource, overriding DEFAULT_SIZES (keys are
+            the names in RESOURCES, e.g. ``{"transactions": 1_000_000}``).
+    """
+
+    DEFAULT_SIZES = {
+        "parts": 2_000, "processes": 40, "boms": 4_000, "routings": 6_000,
+        "com_codes": 200, "arrivals": 20_000, "lots": 50_000,
+        "mat_stocks": 20_000, "receivable": 2_000, "job_orders": 10_000,
+        "prod_results": 50_000, "reworks": 2_000, "defect_logs": 10_000,
+        "inspect_results": 20_000, "product_stocks": 20_000,
+        "transactions": 100_000, "warehouses": 12, "equips": 300,
+        "shipping_orders": 5_000,
+    }
+
+    def __init__(self, seed: int = 0, sizes: dict[str, int] | None = None):
+        unknown = set(sizes or ()) - set(self.DEFAULT_SIZES)
+        if unknown:
+            raise ValueError(f"unknown resource(s): {', '.join(sorted(unknown))}")
+        self.seed = seed
+        self.sizes = {**self.DEFAULT_SIZES, **(sizes or {})}
+        self.lock = threading.Lock()
+        # Records created through the API, per resource, after the
+        # generated ones; field changes to generated records by index.
+        self.created: dict[str, list[dict]] = {name: [] for name in self.sizes}
+        self.changes: dict[tuple[str, int], dict] = {}
+
+    def _h(self, i: int, field: int) -> int:
+        return _mix(i, self.seed * 131 + field)
+
+    def _item(self, i: int, field: int, types: str = "") -> str:
+        """Code of a part, optionally of one of the given item types."""
+        n = self.sizes["parts"]
+        p = self._h(i, field) % n
+        if types == "RAW":
+            p -= p % 3
+        elif types == "PROD":
+            p = p - p % 3 + 2 if p - p % 3 + 2 < n else 2
+        return f"W-{p:06d}"
+
+    def _warehouse(self, i: int, field: int) -> str:
+        return f"WH-{self._h(i, field) % self.sizes['warehouses']:02d}"
+
+    # One generator per resource: record number i (0-based).
+
+    def parts(self, i):
+        return {"itemCode": f"W-{i:06d}",
+                "itemName": f"전선 AVSS {0.3 + i % 5 * 0.2:.1f}SQ {i}",
+                "itemType": _ITEM_TYPES[i % 3], "unit": "M" if i % 3 == 0 else "EA",
+                "spec": f"{0.3 + i % 5 * 0.2:.1f}SQ", "safetyStock": self._h(i, 1) % 500,
+                "useYn": "N" if i % 97 == 0 else "Y", "createdAt": _ts(i, 600),
+                "updatedAt": _ts(i, 600)}
+
+    def processes(self, i):
+        kinds = ("CUT", "STRIP", "CRIMP", "ASSY", "TEST")
+        return {"processCode": f"P{i:03d}", "processName": f"{kinds[i % 5]} {i}",
+                "processType": kinds[i % 5], "useYn": "Y"}
+
+    def boms(self, i):
+        # Every PROD part (index 3k + 2) has four RAW components.
+        return {"parentItemCode": f"W-{(i // 4) * 3 + 2:06d}",
+                "childItemCode": self._item(i, 2, "RAW"),
+                "qty": (self._h(i, 3) % 40 + 1) / 4, "unit": "M",
+                "revision": "A"}
+
+    def routings(self, i):
+        return {"itemCode": f"W-{(i // 3) * 3 + 2:06d}", "seq": i % 3 + 1,
+                "processCode": f"P{self._h(i, 4) % self.sizes['processes']:03d}",
+                "equipType": ("CUTTER", "CRIMPER", "TESTER")[i % 3],
+                "cycleTime": self._h(i, 5) % 120 + 10}
+
+    def com_codes(self, i):
+        return {"groupCode": f"G{i // 10:02d}", "detailCode": f"D{i % 10:02d}",
+                "detailName": f"코드 {i}", "useYn": "Y"}
+
+    def arrivals(self, i):
+        return {"id": i + 1, "arrivalNo": f"ARR-{i:07d}",
+                "itemCode": self._item(i, 6, "RAW"),
+                "vendorCode": f"V{self._h(i, 7) % 50:03d}",
+                "arrivalQty": self._h(i, 8) % 5000 + 100,
+                "arrivalDate": _ts(i, 300), "status": ("ARRIVED", "RECEIVED")[i % 2]}
+
+    def lots(self, i):
+        return {"matUid": f"MAT-{i:08d}", "itemCode": self._item(i, 9, "RAW"),
+                "lotNo": f"LOT-{i // 20:06d}", "qty": self._h(i, 10) % 2000 + 1,
+                "status": ("NORMAL", "HOLD")[i % 31 == 0],
+                "iqcStatus": ("PASS", "PASS", "PASS", "WAIT", "FAIL")[i % 5]}
+
+    def mat_stocks(self, i):
+        return {"warehouseCode": self._warehouse(i, 11), "itemCode": self._item(i, 12, "RAW"),
+                "matUid": f"MAT-{i:08d}", "qty": self._h(i, 13) % 2000, "unit": "M"}
+
+    def receivable(self, i):
+        return {"matUid": f"MAT-{i:08d}", "itemCode": self._item(i, 14, "RAW"),
+                "qty": self._h(i, 15) % 2000 + 1, "iqcStatus": "PASS"}
+
+    def job_orders(self, i):
+        plan = (self._h(i, 16) % 20 + 1) * 100
+        status = _ORDER_STATUSES[i % 5]
+        good = 0 if status == "WAITING" else plan if status == "DONE" else \
+            self._h(i, 17) % plan
+        return {"id": i + 1, "orderNo": f"JO-{i:08d}", "itemCode": self._item(i, 18, "PROD"),
+                "lineCode": f"L{i % 8}", "planQty": plan, "goodQty": good,
+                "defectQty": good // 200, "status": status, "orderDate": _ts(i, 900)}
+
+    def prod_results(self, i):
+        return {"id": i + 1, "orderNo": f"JO-{self._h(i, 19) % self.sizes['job_orders']:08d}",
+                "goodQty": self._h(i, 20) % 200, "defectQty": self._h(i, 21) % 3,
+                "workerCode": f"E{self._h(i, 22) % 300:04d}", "createdAt": _ts(i, 120)}
+
+    def reworks(self, i):
+        return {"id": i + 1, "reworkNo": f"RW-{i:07d}", "itemCode": self._item(i, 23, "PROD"),
+                "defectQty": self._h(i, 24) % 20 + 1,
+                "status": ("OPEN", "IN_PROGRESS", "CLOSED")[i % 3], "createdAt": _ts(i, 3600)}
+
+    def defect_logs(self, i):
+        return {"id": i + 1, "itemCode": self._item(i, 25, "PROD"),
+                "defectType": _DEFECT_TYPES[self._h(i, 26) % 5],
+                "defectQty": self._h(i, 27) % 5 + 1,
+                "processCode": f"P{self._h(i, 28) % self.sizes['processes']:03d}",
+                "createdAt": _ts(i, 600)}
+
+    def inspect_results(self, i):
+        return {"id": i + 1, "orderNo": f"JO-{self._h(i, 29) % self.sizes['job_orders']:08d}",
+                "result": "FAIL" if self._h(i, 30) % 50 == 0 else "PASS",
+                "inspectorCode": f"Q{self._h(i, 31) % 40:03d}", "createdAt": _ts(i, 300)}
+
+    def product_stocks(self, i):
+        return {"warehouseCode": self._warehouse(i, 32), "itemCode": self._item(i, 33, "PROD"),
+                "prdUid": f"PRD-{i:08d}", "qty": self._h(i, 34) % 500,
+                "status": ("NORMAL", "HOLD")[i % 41 == 0]}
+
+    def transactions(self, i):
+        return {"id": i + 1, "transNo": f"TRX-{i:09d}",
+                "transType": _TRANS_TYPES[self._h(i, 35) % 4],
+                "itemCode": self._item(i, 36), "lotNo": f"LOT-{self._h(i, 37) % 100_000:06d}",
+                "qty": self._h(i, 38) % 5000 / 10, "warehouseCode": self._warehouse(i, 39),
+                "remark": "", "createdAt": _ts(i, 30)}
+
+    def warehouses(self, i):
+        return {"warehouseCode": f"WH-{i:02d}", "warehouseName": f"창고 {i}",
+                "warehouseType": ("RAW", "WIP", "FG")[i % 3], "useYn": "Y"}
+
+    def equips(self, i):
+        return {"equipCode": f"EQ-{i:04d}", "equipName": f"설비 {i}",
+                "equipType": ("CUTTER", "CRIMPER", "TESTER")[i % 3],
+                "lineCode": f"L{i % 8}", "status": ("RUN", "IDLE", "DOWN")[self._h(i, 40) % 3]}
+
+    def shipping_orders(self, i):
+        return {"id": i + 1, "shipNo": f"SHP-{i:07d}", "customerCode": f"C{i % 60:03d}",
+                "itemCode": self._item(i, 41, "PROD"), "qty": self._h(i, 42) % 1000 + 10,
+                "status": ("PLANNED", "SHIPPED")[i % 2], "shipDate": _ts(i, 1800)}
+
+    # Access
+
+    def total(self, name: str) -> int:
+        return self.sizes[name] + len(self.created[name])
+
+    def record(self, name: str, i: int) -> dict:
+        """Record i of a resource, generated or created, with changes."""
+        size = self.sizes[name]
+        if i >= size:
+            return self.created[name][i - size]
+        record = getattr(self, name)(i)
+        change = self.changes.get((name, i))
+        return {**record, **change} if change else record
+
+    def page(self, name: str, page: int, limit: int,
+             filters: dict[str, str] | None = None) -> tuple[list[dict], int]:
+        """One page of records and the total matching ``filters``.
+
+        Unfiltered pages cost O(limit); filters scan the resource.
+        Parameters that are not fields of the resource are ignored, except
+        updatedAfter on resources whose records carry updatedAt.
+        """
+        start = (page - 1) * limit
+        after = None
+        if filters and self.total(name):
+            fields = self.record(name, 0)
+            if "updatedAt" in fields:
+                after = filters.get("updatedAfter")
+            filters = {k: v for k, v in filters.items() if k in fields}
+        if not filters and after is None:
+            total = self.total(name)
+            return [self.record(name, i)
+                    for i in range(start, min(start + limit, total))], total
+        matched, rows = 0, []
+        for i in range(self.total(name)):
+            record = self.record(name, i)
+            if (all(str(record.get(k)) == v for k, v in filters.items())
+                    and (after is None or record["updatedAt"] >= after)):
+                if start <= matched < start + limit:
+                    rows.append(record)
+                matched += 1
+        return rows, matched
+
+    def find(self, name: str, field: str, value: str) -> int | None:
+        """Index of the record whose ``field`` equals value."""
+        # Generated keys end in their index (W-000012, JO-00000012).
+        digits = value.rsplit("-", 1)[-1]
+        if digits.isdigit():
+            i = int(digits) - (1 if field == "id" else 0)
+            if 0 <= i < self.sizes[name] and str(self.record(name, i).get(field)) == value:
+                return i
+        for n, record in enumerate(self.created[name]):
+            if str(record.get(field)) == value:
+                return self.sizes[name] + n
+        return None
+
+    def create(self, name: str, data: dict) -> dict:
+        with self.lock:
+            i = self.total(name)
+            now = time.strftime(_TS_FORMAT, time.gmtime())
+            record = {"id": i + 1, **data, "createdAt": now, "updatedAt": now}
+            self.created[name].append(record)
+        return record
+
+    def update(self, name: str, i: int, change: dict) -> dict:
+        change = {**change, "updatedAt": time.strftime(_TS_FORMAT, time.gmtime())}
+        with self.lock:
+            if i >= self.sizes[name]:
+                self.created[name][i - self.sizes[name]].update(change)
+            else:
+                self.changes.setdefault((name, i), {}).update(change)
+        return self.record(name, i)
+
+
+# List endpoints: API path -> dataset resource.
+RESOURCES = {
+    "/master/parts": "parts",
+    "/master/processes": "processes",
+    "/master/boms": "boms",
+    "/master/routings": "routings",
+    "/master/com-codes": "com_codes",
+    "/material/arrivals": "arrivals",
+    "/material/lots": "lots",
+    "/material/stocks": "mat_stocks",
+    "/material/receiving/receivable": "receivable",
+    "/production/job-orders": "job_orders",
+    "/production/prod-results": "prod_results",
+    "/quality/reworks": "reworks",
+    "/quality/defect-logs": "defect_logs",
+    "/quality/inspect-results": "inspect_results",
+    "/inventory/product-stocks": "product_stocks",
+    "/inventory/transactions": "transactions",
+    "/inventory/warehouses": "warehouses",
+    "/equipment/equips": "equips",
+    "/shipping/orders": "shipping_orders",
+}
+# POST endpoints that add a record to a resource.
+CREATES = {
+    "/master/parts": "parts",
+    "/material/arrivals": "arrivals",
+    "/material/receiving": "lots",
+    "/production/job-orders": "job_orders",
+    "/production/prod-results": "prod_results",
+    "/quality/reworks": "reworks",
+}
+
+
+class ApiError(Exception):
+    """An error reply in the NestJS exception-filter shape."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+# ── Routing ──────────────────────────────────────────────────────
+
+class FakeApi:
+    """Request routing over a FakeDataset, independent of HTTP."""
+
+    def __init__(self, dataset: FakeDataset, require_auth: bool = False):
+        self.data = dataset
+        self.require_auth = require_auth
+        self.tokens: dict[str, str] = {}
+
+    def handle(self, method: str, target: str, body, token: str | None):
+        """Return (status, payload) for one request."""
+        url = urlsplit(target)
+        path = unquote(url.path)
+        if not path.startswith(API_PREFIX):
+            raise ApiError(404, f"Cannot {method} {path}")
+        path = path[len(API_PREFIX):].rstrip("/")
+        query = dict(parse_qsl(url.query))
+        if path == "/auth/login" and method == "POST":
+            return 201, self._login(body)
+        if self.require_auth and token not in self.tokens:
+            raise ApiError(401, "Unauthorized")
+        if method == "GET":
+            return 200, self._get(path, query, token)
+        if method == "POST" and path in CREATES:
+            if not isinstance(body, dict):
+                raise ApiError(400, "Request body must be a JSON object")
+            return 201, {"success": True, "data": self.data.create(CREATES[path], body)}
+        if method == "POST" and path == "/inventory/transactions/bulk":
+            items = body.get("items") if isinstance(body, dict) else None
+            if not isinstance(items, list) or not all(isinstance(i, dict) for i in items):
+                raise ApiError(400, "items must be a list of objects")
+            for item in items:
+                self.data.create("transactions", item)
+            return 201, {"success": True, "data": {"count": len(items)}}
+        parts = path.split("/")
+        if (method == "PATCH" and len(parts) == 5
+                and path.startswith("/production/job-orders/")
+                and parts[4] in ("start", "complete")):
+            return 200, self._transition(parts[3], parts[4])
+        raise ApiError(404, f"Cannot {method} {API_PREFIX}{path}")
+
+    def _login(self, body) -> dict:
+        if not isinstance(body, dict) or not body.get("email") or not body.get("password"):
+            raise ApiError(400, "email and password are required")
+        token = f"fake-{_mix(len(self.tokens), 7):08x}"
+        self.tokens[token] = body["email"]
+        return {"success": True, "data": {
+            "token": token, "email": body["email"], "name": body["email"].split("@")[0],
+            "company": "HANES", "plant": "P01"}}
+
+    def _get(self, path: str, query: dict, token: str | None) -> dict:
+        if path in RESOURCES:
+            try:
+                page = max(1, int(query.pop("page", 1)))
+                limit = max(1, int(query.pop("limit", DEFAULT_LIMIT)))
+            except ValueError:
+                raise ApiError(400, "page and limit must be integers")
+            rows, total = self.data.page(RESOURCES[path], page, limit, query)
+            pages = -(-total // limit)
+            return {"success": True, "data": rows,
+                    "meta": {"page": page, "limit": limit, "total": total,
+                             "totalPages": pages, "hasNext": page < pages}}
+        if path == "/auth/me":
+            email = self.tokens.get(token, "guest@hanes.com")
+            return {"success": True, "data": {"email": email, "company": "HANES",
+                                              "plant": "P01"}}
+        if path == "/dashboard/kpi":
+            return {"success": True, "data": self._kpi()}
+        if path == "/dashboard/recent-productions":
+            name = "prod_results"
+            total = self.data.total(name)
+            return {"success": True, "data": [self.data.record(name, i)
+                                              for i in range(total - 1, max(-1, total - 11), -1)]}
+        parts = path.split("/")
+        if len(parts) == 4 and path.startswith("/master/parts/"):
+            return {"success": True, "data": self._lookup("parts", "itemCode", parts[3])}
+        if len(parts) == 4 and path.startswith("/production/job-orders/"):
+            return {"success": True, "data": self._lookup("job_orders", "orderNo", parts[3])}
+        if len(parts) == 5 and path.startswith("/master/boms/") and parts[4] == "hierarchy":
+            return {"success": True, "data": self._bom_tree(parts[3])}
+        raise ApiError(404, f"Cannot GET {API_PREFIX}{path}")
+
+    def _lookup(self, name: str, field: str, value: str) -> dict:
+        i = self.data.find(name, field, value)
+        if i is None:
+            raise ApiError(404, f"{value} not found")
+        return self.data.record(name, i)
+
+    def _bom_tree(self, code: str) -> dict:
+        part = self._lookup("parts", "itemCode", code)
+        index = int(code.rsplit("-", 1)[-1]) if code.rsplit("-", 1)[-1].isdigit() else -1
+        first = (index // 3) * 4 if index % 3 == 2 else self.data.sizes["boms"]
+        rows = [self.data.record("boms", i)
+                for i in range(first, min(first + 4, self.data.sizes["boms"]))]
+        return {"itemCode": code, "itemName": part["itemName"], "children": [
+            {"childItemCode": r["childItemCode"], "qtyPer": r["qty"],
+             "unit": r["unit"], "children": []} for r in rows]}
+
+    def _transition(self, order_id: str, action: str) -> dict:
+        i = self.data.find("job_orders", "id", order_id)
+        if i is None:
+            raise ApiError(404, f"Job order {order_id} not found")
+        order = self.data.record("job_orders", i)
+        allowed = {"start": "WAITING", "complete": "RUNNING"}[action]
+        if order["status"] != allowed:
+            raise ApiError(400, f"Cannot {action} a {order['status']} job order")
+        change = {"status": "RUNNING"} if action == "start" else \
+            {"status": "DONE", "goodQty": order["planQty"]}
+        return {"success": True, "data": self.data.update("job_orders", i, change)}
+
+    def _kpi(self) -> dict:
+        n = self.data.sizes["job_orders"]
+        # _ORDER_STATUSES cycles every five orders.
+        per_status = {s: sum((n - k + 4) // 5 for k, st in enumerate(_ORDER_STATUSES)
+                             if st == s) for s in set(_ORDER_STATUSES)}
+        return {"totalOrders": self.data.total("job_orders"),
+                "runningOrders": per_status["RUNNING"],
+                "completedOrders": per_status["DONE"],
+                "prodResults": self.data.total("prod_results"),
+                "openReworks": (self.data.sizes["reworks"] + 2) // 3,
+                "defectLogs": self.data.total("defect_logs")}
+
+
+# ── HTTP server ──────────────────────────────────────────────────
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        self.server.connections.add(self.connection)
+
+    def finish(self):
+        self.server.connections.discard(self.connection)
+        super().finish()
+
+    def _reply(self):
+        srv = self.server.fake
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        if self.headers.get("Content-Encoding") == "gzip":
+            raw = zlib.decompress(raw, 16 + zlib.MAX_WBITS)
+        status, payload, extra = srv.respond(self.command, self.path, raw, self.headers)
+
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        headers = {"Content-Type": "application/json; charset=utf-8", **extra}
+        if self.command == "GET" and status == 200:
+            etag = f'W/"{len(body):x}-{zlib.crc32(body):08x}"'
+            headers["ETag"] = etag
+            if self.headers.get("If-None-Match") == etag:
+                status, body = 304, b""
+        if (srv.gzip and len(body) >= GZIP_THRESHOLD
+                and "gzip" in (self.headers.get("Accept-Encoding") or "")):
+            deflater = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            body = deflater.compress(body) + deflater.flush()
+            headers["Content-Encoding"] = "gzip"
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if status != 304:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _reply
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class FakeBackend:
+    """Threaded keep-alive HTTP server in front of a FakeApi.
+
+    Args:
+        dataset: Data to serve (default: FakeDataset(seed, sizes)).
+        sizes: Records per resource for the default dataset.
+        seed: Seed for the default dataset and for injected faults.
+        latency: Seconds of server think time per request.
+        jitter: Extra uniformly random think time, up to this many seconds.
+        error_rate: Fraction of requests answered with ``error_status``
+            before being processed (so retrying them is always safe).
+        error_status: Status of injected errors (503, 500, 429, ...).
+        retry_after: Retry-After seconds sent with injected errors.
+        gzip: gzip responses of 1KB or more for clients that accept it.
+        require_auth: Reject requests without a token from /auth/login.
+        host, port: Listen address (port 0: any free port).
+
+    Usage:
+        with FakeBackend(latency=0.005, error_rate=0.01) as srv:
+            HanesBackend(base_url=srv.base_url).list_parts()
+            print(srv.stats)
+    """
+
+    def __init__(self, dataset: FakeDataset | None = None, *,
+                 sizes: dict[str, int] | None = None, seed: int = 0,
+                 latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, error_status: int = 503,
+                 retry_after: float | None = None, gzip: bool = True,
+                 require_auth: bool = False, host: str = "127.0.0.1",
+                 port: int = 0):
+        self.dataset = dataset or FakeDataset(seed=seed, sizes=sizes)
+        self.api = FakeApi(self.dataset, require_auth=require_auth)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self.gzip = gzip
+        self.stats = {"requests": 0, "injected_errors": 0, "replayed": 0}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._replies: dict[str, tuple[int, dict]] = {}
+        self.httpd = _Server((host, port), _Handler)
+        self.httpd.fake = self
+        self.httpd.connections = set()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}{API_PREFIX}"
+
+    def respond(self, method: str, target: str, raw: bytes,
+                headers) -> tuple[int, dict, dict]:
+        """Status, JSON payload and extra headers for one request."""
+        with self._lock:
+            self.stats["requests"] += 1
+            fail = self.error_rate and self._rng.random() < self.error_rate
+            think = self.latency + (self._rng.random() * self.jitter if self.jitter else 0)
+            self.stats["injected_errors"] += bool(fail)
+        if think:
+            time.sleep(think)
+        if fail:
+            extra = {} if self.retry_after is None else {"Retry-After": f"{self.retry_after:g}"}
+            return self.error_status, {"statusCode": self.error_status,
+                                       "message": "Injected failure"}, extra
+
+        key = headers.get("Idempotency-Key") if method != "GET" else None
+        if key:
+            with self._lock:
+                replay = self._replies.get(key)
+                self.stats["replayed"] += replay is not None
+            if replay is not None:
+                return replay[0], replay[1], {"Idempotent-Replayed": "true"}
+        auth = headers.get("Authorization") or ""
+        token = auth[7:] if auth.startswith("Bearer ") else None
+        try:
+            body = json.loads(raw) if raw else None
+            status, payload = self.api.handle(method, target, body, token)
+        except json.JSONDecodeError:
+            status, payload = 400, {"statusCode": 400, "message": "Invalid JSON body"}
+        except ApiError as e:
+            status, payload = e.status, {"statusCode": e.status, "message": e.message}
+        if key:
+            with self._lock:
+                self._replies[key] = (status, payload)
+        return status, payload, {}
+
+    def start(self) -> "FakeBackend":
+        # A short poll interval keeps stop() quick.
+        self._thread = threading.Thread(target=self.httpd.serve_forever,
+                                        args=(0.05,), daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        # Keep-alive handler threads would otherwise wait for their
+        # clients to hang up, and wake whenever those are collected.
+        for conn in list(self.httpd.connections):
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class FakeBackendProcess:
+    """The fake backend in a child process, so it does not compete with
+    the code being measured for the GIL.
+
+    Args:
+        args: Extra command-line options (see main()), e.g.
+            ["--size", "parts=20000", "--latency-ms", "2"].
+
+    Usage:
+        with FakeBackendProcess(["--transactions", "1000000"]) as srv:
+            HanesBackend(base_url=srv.base_url).list_transactions()
+    """
+
+    def __init__(self, args: list[str] | None = None):
+        self.args = list(args or [])
+        self.base_url: str | None = None
+        self.proc: subprocess.Popen | None = None
+
+    def start(self) -> "FakeBackendProcess":
+        self.proc = subprocess.Popen(
+            [sys.executable, "-m", "cli_anything.hanes.benchmarks.fake_backend",
+             "--port", "0", *self.args],
+            stdout=subprocess.PIPE, text=True)
+        line = self.proc.stdout.readline()
+        match = re.search(r"(http://\S+)", line)
+        if not match:
+            self.stop()
+            raise RuntimeError(f"fake backend did not start: {line!r}")
+        self.base_url = match.group(1)
+        return self
+
+    def stop(self):
+        if self.proc is not None and self.proc.poll() is None:
+            self.proc.terminate()
+            self.proc.wait()
+        if self.proc is not None:
+            self.proc.stdout.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[2].strip())
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3003)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="Multiply every default resource size")
+    parser.add_argument("--size", action="append", default=[], metavar="NAME=N",
+                        help="Records for one resource, e.g. lots=500000 (repeatable)")
+    parser.add_argument("--transactions", type=int, default=None,
+                        help="Shorthand for --size transactions=N")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--no-gzip", action="store_true")
+    parser.add_argument("--require-auth", action="store_true")
+    args = parser.parse_args()
+
+    sizes = {name: max(1, int(n * args.scale))
+             for name, n in FakeDataset.DEFAULT_SIZES.items()}
+    for item in args.size:
+        name, _, n = item.partition("=")
+        if name not in sizes or not n.isdigit():
+            parser.error(f"--size {item}: expected NAME=N with NAME one of "
+                         f"{', '.join(sizes)}")
+        sizes[name] = int(n)
+    if args.transactions is not None:
+        sizes["transactions"] = args.transactions
+    srv = FakeBackend(sizes=sizes, seed=args.seed, latency=args.latency_ms / 1000,
+                      jitter=args.jitter_ms / 1000, error_rate=args.error_rate,
+                      error_status=args.error_status, gzip=not args.no_gzip,
+                      require_auth=args.require_auth, host=args.host, port=args.port)
+    print(f"fake HANES backend on {srv.base_url} "
+          f"({sum(srv.dataset.sizes.values()):,} records, seed {args.seed})", flush=True)
+    try:
+        srv.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        srv.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
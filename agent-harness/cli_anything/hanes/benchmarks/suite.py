@@ -0,0 +1,333 @@
+"""
+@file suite.py
+@description Benchmark suite for CLI commands and client throughput.
+    Runs representative workloads against the stand-in backend (in its
+    own process) and reports throughput, p50/p99 latency per iteration
+    and peak RSS for each. Every scenario runs in a fresh interpreter, so
+    peak RSS is that scenario's own. Results are saved as JSON and can be
+    compared against a baseline; any metric worse than its tolerance is
+    a regression and makes the run exit 1.
+
+    Usage:
+        python -m cli_anything.hanes.benchmarks.suite --save baseline.json
+        python -m cli_anything.hanes.benchmarks.suite --baseline baseline.json
+        python -m cli_anything.hanes.benchmarks.suite --quick -k parts_all
+        HANES_BENCH_BASELINE=baseline.json python -m pytest -k TestBenchSuite
+"""
+
+import argparse
+import contextlib
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Regression thresholds: relative change allowed before a metric fails.
+# p99 of a handful of iterations is noisy, so it gets more room.
+TOLERANCES = {"throughput": 0.20, "p50_ms": 0.20, "p99_ms": 0.50,
+              "peak_rss_mb": 0.20}
+# Metrics where a higher value is better.
+_HIGHER_IS_BETTER = {"throughput"}
+
+# Dataset sizes the stand-in backend serves: (full, --quick).
+DATASET = {"parts": (20_000, 2_000), "transactions": (200_000, 10_000)}
+
+
+class _NullSink:
+    """Text sink that discards output (command stdout)."""
+
+    def write(self, s: str) -> int:
+        return len(s)
+
+    def flush(self):
+        pass
+
+
+def _peak_rss_mb() -> float | None:
+    # On Linux ru_maxrss survives exec, so a child of a large process
+    # (pytest) would report its parent's peak; VmHWM is this image's own.
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (1 << 20 if sys.platform == "darwin" else 1 << 10), 1)
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0-100)."""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+
+# ── Scenarios ────────────────────────────────────────────────────
+# Each takes (base_url, quick) and returns (per-iteration seconds,
+# units processed, unit name). They run in the child process.
+
+
+def _cli(base_url: str, tmp: str):
+    """Run CLI argv in-process like a cold one-shot invocation."""
+    from cli_anything.hanes.hanes_cli import cli
+    from cli_anything.hanes.utils.dispatch import invoke
+
+    prefix = ["--session-file", str(Path(tmp) / "session.json"),
+              "--base-url", base_url, "--no-cache"]
+
+    def run(argv: list[str], obj: dict | None = None):
+        with contextlib.redirect_stdout(_NullSink()):
+            code = invoke(cli, prefix + argv, {} if obj is None else obj)
+        if code:
+            raise RuntimeError(f"{' '.join(argv)} exited with {code}")
+    return run
+
+
+def _timed(fn, iterations: int) -> list[float]:
+    times = []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return times
+
+
+def scenario_parts_all(base_url: str, quick: bool):
+    """`--json master parts --all`: paging, streaming parse, JSON output."""
+    rows = DATASET["parts"][quick]
+    with tempfile.TemporaryDirectory() as tmp:
+        run = _cli(base_url, tmp)
+        times = _timed(lambda: run(["--json", "master", "parts", "--all",
+                                    "--limit", "500"]), 3 if quick else 5)
+    return times, rows * len(times), "rows"
+
+
+def scenario_transactions_export(base_url: str, quick: bool):
+    """`--format csv inventory transactions --all`: a ledger export."""
+    rows = DATASET["transactions"][quick]
+    with tempfile.TemporaryDirectory() as tmp:
+        run = _cli(base_url, tmp)
+        times = _timed(lambda: run(["--format", "csv", "inventory", "transactions",
+                                    "--all", "--limit", "1000"]), 2 if quick else 3)
+    return times, rows * len(times), "rows"
+
+
+def scenario_repl_dispatch(base_url: str, quick: bool):
+    """Warm-session dispatch of a small command, as the REPL does it."""
+    obj: dict = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        run = _cli(base_url, tmp)
+        run(["--json", "production", "order", "JO-00000001"], obj)
+        times = _timed(lambda: run(["--json", "production", "order",
+                                    "JO-00000001"], obj), 50 if quick else 500)
+    return times, len(times), "commands"
+
+
+def scenario_table_render(base_url: str, quick: bool):
+    """Terminal table of Korean part rows (TableWriter, no network)."""
+    from cli_anything.hanes.utils.table import TableWriter
+    rows = 10_000 if quick else 100_000
+    headers = ["Code", "Name", "Type", "Unit", "UseYN"]
+
+    def render():
+        TableWriter(headers, out=_NullSink()).write(
+            [f"W-{i:06d}", f"전선 하네스 조립품 {i:06d}", "PROD", "EA", "Y"]
+            for i in range(rows))
+    times = _timed(render, 3)
+    return times, rows * len(times), "rows"
+
+
+def scenario_bulk_create(base_url: str, quick: bool):
+    """POST /inventory/transactions/bulk with 1,000 rows per request."""
+    from cli_anything.hanes.utils.hanes_backend import HanesBackend
+    backend = HanesBackend(base_url=base_url)
+    batch = [{"transType": "RECEIVE", "itemCode": f"W-{i:06d}",
+              "lotNo": f"LOT-{i // 50:06d}", "qty": i % 500 + 0.5,
+              "warehouseCode": "WH-01", "remark": "벤치마크 입고"}
+             for i in range(1000)]
+    times = _timed(lambda: backend.post("/inventory/transactions/bulk",
+                                        {"items": batch}), 5 if quick else 30)
+    backend.close()
+    return times, len(batch) * len(times), "rows"
+
+
+def scenario_master_search(base_url: str, quick: bool):
+    """`master search` over the replica's n-gram index (after one sync)."""
+    from cli_anything.hanes.utils.hanes_backend import HanesBackend
+    from cli_anything.hanes.utils.replica import Replica
+    queries = ["W-0012", "avss 0.5sq", "전선 0.7SQ 1234", "흑색전선", "12345"]
+    with tempfile.TemporaryDirectory() as tmp:
+        replica = Replica(Path(tmp) / "replica.sqlite")
+        with HanesBackend(base_url=base_url) as backend:
+            replica.sync(backend, "parts")
+        times = _timed(lambda: [replica.search(q, ("parts",)) for q in queries],
+                       20 if quick else 200)
+        replica.close()
+    return times, len(queries) * len(times), "queries"
+
+
+SCENARIOS = {
+    "parts_all": scenario_parts_all,
+    "transactions_export": scenario_transactions_export,
+    "repl_dispatch": scenario_repl_dispatch,
+    "table_render": scenario_table_render,
+    "bulk_create": scenario_bulk_create,
+    "master_search": scenario_master_search,
+}
+
+
+def measure(name: str, base_url: str, quick: bool = False) -> dict:
+    """Run one scenario in this process and summarise it."""
+    times, units, unit = SCENARIOS[name](base_url, quick)
+    ms = [t * 1000 for t in times]
+    return {
+        "iterations": len(times),
+        "units": units,
+        "unit": unit,
+        "throughput": round(units / sum(times), 1),
+        "p50_ms": round(percentile(ms, 50), 3),
+        "p99_ms": round(percentile(ms, 99), 3),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+# ── Suite ────────────────────────────────────────────────────────
+
+
+def run_suite(names: list[str] | None = None, quick: bool = False,
+              base_url: str | None = None) -> dict:
+    """Run scenarios, each in a fresh interpreter, and return the results.
+
+    Without ``base_url`` a stand-in backend is started for the run.
+    """
+    from cli_anything.hanes.benchmarks.fake_backend import FakeBackendProcess
+
+    names = names or list(SCENARIOS)
+    unknown = set(names) - set(SCENARIOS)
+    if unknown:
+        raise ValueError(f"unknown scenario(s): {', '.join(sorted(unknown))}")
+    with contextlib.ExitStack() as stack:
+        if base_url is None:
+            sizes = [arg for name, n in DATASET.items()
+                     for arg in ("--size", f"{name}={n[quick]}")]
+            base_url = stack.enter_context(FakeBackendProcess(sizes)).base_url
+        scenarios = {}
+        for name in names:
+            argv = [sys.executable, "-m", "cli_anything.hanes.benchmarks.suite",
+                    "--child", name, "--base-url", base_url]
+            out = subprocess.run(argv + (["--quick"] if quick else []),
+                                 capture_output=True, text=True)
+            if out.returncode:
+                raise RuntimeError(f"scenario {name} failed:\n{out.stderr}")
+            scenarios[name] = json.loads(out.stdout)
+    return {"meta": _meta(quick), "scenarios": scenarios}
+
+
+def _meta(quick: bool) -> dict:
+    from cli_anything.hanes import __version__
+    from cli_anything.hanes.utils import codec
+    return {"version": __version__, "python": platform.python_version(),
+            "platform": platform.platform(), "machine": platform.machine(),
+            "codec": codec.BACKEND, "quick": quick,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z")}
+
+
+def compare(results: dict, baseline: dict,
+            tolerances: dict[str, float] | None = None) -> list[str]:
+    """Regressions of ``results`` against ``baseline``, as messages.
+
+    Scenarios or metrics missing from either side are skipped.
+    """
+    tolerances = {**TOLERANCES, **(tolerances or {})}
+    regressions = []
+    for name, current in results["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if not base:
+            continue
+        for metric, tol in tolerances.items():
+            new, old = current.get(metric), base.get(metric)
+            if not new or not old:
+                continue
+            change = (new - old) / old
+            worse = -change if metric in _HIGHER_IS_BETTER else change
+            if worse > tol:
+                regressions.append(f"{name}.{metric}: {old:g} -> {new:g} "
+                                   f"({change:+.0%}, tolerance {tol:.0%})")
+    return regressions
+
+
+def format_results(results: dict, baseline: dict | None = None) -> str:
+    lines = [f"{'scenario':<22} {'throughput':>18} {'p50':>10} {'p99':>10} "
+             f"{'peak RSS':>9}  vs baseline"]
+    for name, r in results["scenarios"].items():
+        base = (baseline or {}).get("scenarios", {}).get(name)
+        delta = f"{r['throughput'] / base['throughput'] - 1:+.1%}" \
+            if base and base.get("throughput") else ""
+        rss = f"{r['peak_rss_mb']:.1f}MB" if r["peak_rss_mb"] else "-"
+        lines.append(f"{name:<22} {r['throughput']:>10,.0f} {r['unit'] + '/s':<7} "
+                     f"{r['p50_ms']:>8.1f}ms {r['p99_ms']:>8.1f}ms {rss:>9}  {delta}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[2].strip())
+    parser.add_argument("-k", "--scenario", action="append", choices=list(SCENARIOS),
+                        help="Run only this scenario (repeatable)")
+    parser.add_argument("--quick", action="store_true",
+                        help="Small dataset and few iterations (smoke test)")
+    parser.add_argument("--base-url", default=None,
+                        help="Backend to use instead of a stand-in one")
+    parser.add_argument("--save", metavar="FILE", help="Write results as JSON")
+    parser.add_argument("--baseline", metavar="FILE",
+                        help="Compare against saved results; exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=None,
+                        help="Allowed relative change for every metric")
+    parser.add_argument("--json", action="store_true", help="Print raw JSON")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(args.child, args.base_url, args.quick)))
+        return
+
+    results = run_suite(args.scenario, args.quick, args.base_url)
+    baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8")) \
+        if args.baseline else None
+    if args.save:
+        Path(args.save).write_text(json.dumps(results, indent=2) + "\n",
+                                   encoding="utf-8")
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(format_results(results, baseline))
+    if baseline is None:
+        return
+    if baseline.get("meta", {}).get("quick") != args.quick:
+        print("warning: baseline and this run differ in --quick", file=sys.stderr)
+    tolerances = dict.fromkeys(TOLERANCES, args.tolerance) \
+        if args.tolerance is not None else None
+    regressions = compare(results, baseline, tolerances)
+    if regressions:
+        print(f"\nREGRESSION: {len(regressions)} metric(s) worse than baseline",
+              file=sys.stderr)
+        for line in regressions:
+            print(f"  {line}", file=sys.stderr)
+        sys.exit(1)
+    print("\nno regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
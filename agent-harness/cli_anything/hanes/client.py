@@ -0,0 +1,186 @@
+"""
+@file client.py
+@description Thin client for the warm cli-anything-hanes daemon.
+    Forwards argv over a Unix domain socket to a background process that
+    already has click, the session, connection pool and caches loaded,
+    then streams the command's stdout/stderr back. Starts the daemon on
+    first use. Deliberately imports only the standard library so its own
+    startup stays in the tens of milliseconds.
+
+    Usage:
+        cli-anything-hanes-client --json master parts
+"""
+
+import json
+import os
+import socket
+import sys
+import time
+
+# subprocess and pathlib are left out on purpose: together they cost more
+# import time than the rest of this module. subprocess is imported lazily
+# on the rare local-run / spawn paths.
+
+DEFAULT_SOCKET_PATH = os.path.join(os.path.expanduser("~"),
+                                   ".cli-anything-hanes", "daemon.sock")
+SOCKET_ENV = "CLI_ANYTHING_HANES_SOCKET"
+SPAWN_TIMEOUT = 10.0
+
+# Commands that need a real terminal (prompts, REPL) or manage the daemon
+# itself run in-process instead of being forwarded.
+_LOCAL_COMMANDS = {"repl", "daemon"}
+# Root options that take a value, so the value is not taken for the
+# command name. Spelled out to keep click out of this module; a test
+# checks it against the cli's options (core.batch.global_value_options).
+_GLOBAL_VALUE_OPTIONS = frozenset({
+    "--base-url", "--session-file", "--format", "--rate-limit", "--burst",
+    "--max-inflight", "--metrics-file", "--profile", "--profile-top",
+})
+# Environment a command reads: option envvars (CLI_ANYTHING_HANES_*),
+# colour switches, locale and terminal size. The caller's values are
+# sent with each request and stand in for the daemon's while it runs.
+_ENV_PREFIXES = ("CLI_ANYTHING_", "LC_")
+_ENV_NAMES = frozenset({"NO_COLOR", "LANG", "LANGUAGE", "TZ", "TERM",
+                        "COLUMNS", "LINES"})
+
+
+def socket_path() -> str:
+    """Daemon socket location (overridable via CLI_ANYTHING_HANES_SOCKET)."""
+    return os.environ.get(SOCKET_ENV) or DEFAULT_SOCKET_PATH
+
+
+def forwarded_env(environ=None) -> dict[str, str]:
+    """The variables of ``environ`` (default os.environ) a command sees."""
+    environ = os.environ if environ is None else environ
+    return {k: v for k, v in environ.items()
+            if k in _ENV_NAMES or k.startswith(_ENV_PREFIXES)}
+
+
+def _first_command(argv: list[str]) -> str | None:
+    skip = False
+    for arg in argv:
+        if skip:
+            skip = False
+        elif arg in _GLOBAL_VALUE_OPTIONS:
+            skip = True
+        elif not arg.startswith("-"):
+            return arg
+    return None
+
+
+def _needs_local(argv: list[str]) -> bool:
+    """True when argv must run in-process rather than in the daemon."""
+    if not hasattr(socket, "AF_UNIX"):
+        return True
+    command = _first_command(argv)
+    if command is None or command in _LOCAL_COMMANDS:
+        return True
+    # auth login prompts for missing credentials; let the terminal answer.
+    if command == "auth" and "login" in argv and sys.stdin.isatty():
+        return not ({"-p", "--password"} & set(argv)
+                    and {"-e", "--email"} & set(argv))
+    return False
+
+
+def _run_local(argv: list[str]) -> int:
+    import subprocess
+    return subprocess.call([sys.executable, "-m", "cli_anything.hanes", *argv])
+
+
+# ── Daemon connection ────────────────────────────────────────────
+
+def _connect(path) -> socket.socket | None:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path))
+        return sock
+    except OSError:
+        sock.close()
+        return None
+
+
+def spawn_daemon(path=None):
+    """Start a detached daemon serving ``path``; returns its Popen."""
+    import subprocess
+    path = path or socket_path()
+    env = dict(os.environ, **{SOCKET_ENV: str(path)})
+    return subprocess.Popen(
+        [sys.executable, "-m", "cli_anything.hanes", "daemon", "start",
+         "--foreground"],
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL, env=env, start_new_session=True,
+    )
+
+
+def connect(path=None, spawn: bool = True) -> socket.socket | None:
+    """Connect to the daemon, starting one if none is listening."""
+    path = path or socket_path()
+    sock = _connect(path)
+    if sock is not None or not spawn:
+        return sock
+    proc = spawn_daemon(path)
+    deadline = time.monotonic() + SPAWN_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(0.02)
+        sock = _connect(path)
+        if sock is not None:
+            return sock
+        if proc.poll() is not None:
+            break
+    return None
+
+
+def _read_stdin() -> str:
+    if sys.stdin is None or sys.stdin.isatty():
+        return ""
+    return sys.stdin.read()
+
+
+def forward(sock: socket.socket, argv: list[str], stdin=_read_stdin,
+            stdout=None, stderr=None) -> int:
+    """Send one command to the daemon and relay its output frames.
+
+    Protocol: one JSON request line ({"argv", "cwd", "tty", "env"}), then
+    JSON frames back, one per line: {"out": text}, {"err": text} and a
+    final {"exit": code}. If the command
+    reads stdin the daemon sends {"stdin": true} and the client answers
+    with one {"data": text} line, so stdin is only consumed when needed.
+    """
+    stdout = stdout or sys.stdout
+    stderr = stderr or sys.stderr
+    request = {"argv": argv, "cwd": os.getcwd(), "tty": stdout.isatty(),
+               "env": forwarded_env()}
+    sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+    with sock, sock.makefile("rb") as frames:
+        for line in frames:
+            frame = json.loads(line)
+            if "out" in frame:
+                stdout.write(frame["out"])
+                stdout.flush()
+            elif "err" in frame:
+                stderr.write(frame["err"])
+                stderr.flush()
+            elif "stdin" in frame:
+                data = stdin() if callable(stdin) else stdin
+                sock.sendall(json.dumps({"data": data}).encode("utf-8") + b"\n")
+            elif "exit" in frame:
+                return frame["exit"]
+    stderr.write("Error: daemon closed the connection\n")
+    return 1
+
+
+# ── Entry point ──────────────────────────────────────────────────
+
+def main(argv: list[str] | None = None):
+    """Console-script entry point: forward to the daemon or run cold."""
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if _needs_local(argv):
+        sys.exit(_run_local(argv))
+    sock = connect()
+    if sock is None:
+        sys.exit(_run_local(argv))
+    sys.exit(forward(sock, argv))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""
+@file batch.py
+@description Batch mode: run many CLI commands in one process.
+    Reads commands from a file or stdin, runs read-only ones concurrently
+    on a worker pool sharing one session / connection pool / cache, keeps
+    everything else strictly ordered, and prints one JSON result per
+    command followed by a timing summary.
+
+    Usage:
+        cli-anything-hanes batch commands.txt
+        printf 'master parts\\ninventory warehouses\\n' | cli-anything-hanes batch -
+"""
+
+import io
+import json
+import math
+import shlex
+import sys
+import time
+from collections import deque
+from functools import cache
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import click
+
+from cli_anything.hanes.utils.dispatch import ThreadStreams, invoke
+from cli_anything.hanes.utils.http_pool import DEFAULT_POOL_SIZE
+
+
+# Command paths that only read, listed one by one so a write added to a
+# group later is not taken for a read. Anything else (auth login,
+# production start, cache clear, ...) is a barrier: it waits for every
+# command before it and blocks every command after it.
+READ_ONLY_COMMANDS = frozenset({
+    "master parts", "master part", "master search", "master processes",
+    "master boms", "master bom-tree", "master routings", "master com-codes",
+    "material arrivals", "material lots", "material stocks",
+    "material receivable",
+    "quality reworks", "quality defects", "quality inspections",
+    "inventory product-stocks", "inventory transactions",
+    "inventory warehouses",
+    "production orders", "production order", "production results",
+    "dashboard kpi", "auth me", "auth status", "cache stats", "health",
+    "queue status", "sync status",
+})
+_UNSUPPORTED = {"batch", "repl", "daemon", "loadtest"}
+
+
+@cache
+def global_value_options() -> frozenset[str]:
+    """Root options that take a value (--format json, --profile x.prof)."""
+    from cli_anything.hanes.hanes_cli import cli
+    return frozenset(opt for p in cli.params
+                     if isinstance(p, click.Option) and not p.is_flag
+                     for opt in p.opts + p.secondary_opts)
+
+
+class BatchCommand:
+    """One parsed input line."""
+
+    __slots__ = ("id", "args", "error")
+
+    def __init__(self, id, args: list[str], error: str | None = None):
+        self.id = id
+        self.args = args
+        self.error = error
+
+    @property
+    def path(self) -> list[str]:
+        """Group/subcommand names, skipping global options."""
+        names, skip = [], False
+        for arg in self.args:
+            if skip:
+                skip = False
+            elif arg in global_value_options():
+                skip = True
+            elif arg.startswith("-"):
+                continue
+            else:
+                names.append(arg)
+                if len(names) == 2:
+                    break
+        return names
+
+    @property
+    def read_only(self) -> bool:
+        return " ".join(self.path) in READ_ONLY_COMMANDS
+
+
+def parse_line(line: str, lineno: int) -> BatchCommand | None:
+    """Parse a shell-syntax line, a JSON argv array or {"id", "args"|"cmd"}."""
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    try:
+        if line.startswith("["):
+            return BatchCommand(lineno, [str(a) for a in json.loads(line)])
+        if line.startswith("{"):
+            spec = json.loads(line)
+            args = spec.get("args")
+            if args is None:
+                args = shlex.split(spec.get("cmd", ""))
+            return BatchCommand(spec.get("id", lineno), [str(a) for a in args])
+        return BatchCommand(lineno, shlex.split(line))
+    except (ValueError, AttributeError) as e:
+        return BatchCommand(lineno, [], error=f"Parse error: {e}")
+
+
+def _decode_output(text: str):
+    text = text.strip()
+    if not text:
+        return None
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+class BatchRunner:
+    """Schedules BatchCommands and collects their results in input order.
+
+    Args:
+        command: Root click command each argv is dispatched to.
+        sessions: Shared ctx.obj["sessions"] so all commands reuse one
+            session, connection pool and response cache.
+        prefix: Global options prepended to every argv (e.g. --json).
+        workers: Concurrent read commands.
+    """
+
+    def __init__(self, command: click.Command, sessions: dict,
+                 prefix: list[str], workers: int = DEFAULT_POOL_SIZE,
+                 fail_fast: bool = False):
+        self.command = command
+        self.sessions = sessions
+        self.prefix = prefix
+        self.workers = workers
+        self.fail_fast = fail_fast
+        self.failed = 0
+        self.skipped = 0
+        self.elapsed: list[float] = []
+
+    def _execute(self, cmd: BatchCommand, out: ThreadStreams,
+                 err: ThreadStreams) -> dict:
+        result = {"id": cmd.id, "args": cmd.args}
+        t0 = time.perf_counter()
+        if cmd.error or (cmd.path and cmd.path[0] in _UNSUPPORTED):
+            code = 2
+            stdout = ""
+            stderr = cmd.error or f"'{cmd.path[0]}' cannot run inside batch"
+        else:
+            with out.capture() as o, err.capture() as e:
+                code = invoke(self.command, self.prefix + cmd.args,
+                              {"sessions": self.sessions}, tracebacks=False)
+            stdout, stderr = o.getvalue(), e.getvalue()
+        elapsed = (time.perf_counter() - t0) * 1000
+        result.update(exit_code=code, ok=code == 0,
+                      output=_decode_output(stdout),
+                      stderr=stderr.strip() or None,
+                      elapsed_ms=round(elapsed, 3))
+        return result
+
+    def run(self, commands: list[BatchCommand], emit) -> dict:
+        """Run commands, call emit(result) in input order, return summary."""
+        out = ThreadStreams(sys.stdout)
+        err = ThreadStreams(sys.stderr)
+        saved = sys.stdin, sys.stdout, sys.stderr
+        # Commands must not prompt on (or consume) the batch's own input.
+        sys.stdin, sys.stdout, sys.stderr = io.StringIO(), out, err
+        pending: deque[Future] = deque()
+
+        def drain(block: bool):
+            while pending and (block or pending[0].done()):
+                result = pending.popleft().result()
+                self.elapsed.append(result["elapsed_ms"])
+                if not result["ok"]:
+                    self.failed += 1
+                emit(result)
+
+        t0 = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                for i, cmd in enumerate(commands):
+                    barrier = not cmd.read_only
+                    if barrier:
+                        drain(block=True)
+                    if self.fail_fast and self.failed:
+                        self.skipped = len(commands) - i
+                        break
+                    pending.append(pool.submit(self._execute, cmd, out, err))
+                    drain(block=barrier)
+                drain(block=True)
+        finally:
+            sys.stdin, sys.stdout, sys.stderr = saved
+        wall = (time.perf_counter() - t0) * 1000
+        return self.summary(len(commands), wall)
+
+    def summary(self, total: int, wall_ms: float) -> dict:
+        ordered = sorted(self.elapsed)
+        busy = sum(ordered)
+        return {
+            "commands": total,
+            "succeeded": len(ordered) - self.failed,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "workers": self.workers,
+            "wall_ms": round(wall_ms, 1),
+            "command_ms": round(busy, 1),
+            "mean_ms": round(busy / len(ordered), 3) if ordered else 0.0,
+            "p95_ms": (round(ordered[math.ceil(len(ordered) * 0.95) - 1], 3)
+                       if ordered else 0.0),
+            "parallelism": round(busy / wall_ms, 2) if wall_ms else 0.0,
+        }
+
+
+@click.command("batch")
+@click.argument("script", type=click.File("r", encoding="utf-8"), default="-")
+@click.option("--workers", "-w", type=click.IntRange(1, 64),
+              default=DEFAULT_POOL_SIZE, show_default=True,
+              help="Read commands run concurrently (HTTP concurrency is "
+                   "also capped by the connection pool size)")
+@click.option("--fail-fast", is_flag=True,
+              help="Stop scheduling commands after the first failure")
+@click.pass_context
+def batch_command(ctx, script, workers, fail_fast):
+    """Run commands from SCRIPT (or stdin) and print JSON results.
+
+    Each line is a command in shell syntax, a JSON array of arguments or
+    an object {"id": ..., "args": [...]} / {"id": ..., "cmd": "..."}.
+    Blank lines and # comments are skipped. Read-only commands run
+    concurrently; any other command waits for those before it and holds
+    back those after it. Output is one JSON object per command, in input
+    order, then a {"summary": ...} line.
+    """
+    commands = [c for n, line in enumerate(script, 1)
+                if (c := parse_line(line, n)) is not None]
+
+    root = ctx.find_root()
+    prefix = ["--json"]
+    if root.params.get("session_file"):
+        prefix += ["--session-file", root.params["session_file"]]
+    if root.params.get("no_cache"):
+        prefix.append("--no-cache")
+    # Keep the shared session's rate limiter (and its metrics) in place.
+    for name, opt in (("rate_limit", "--rate-limit"), ("burst", "--burst"),
+                      ("max_inflight", "--max-inflight")):
+        if root.params.get(name) is not None:
+            prefix += [opt, str(root.params[name])]
+    if root.params.get("shared_limits"):
+        prefix.append("--shared-limits")
+    # Each command's waterfall lands in its own "stderr" field.
+    if root.params.get("trace"):
+        prefix.append("--trace")
+    if root.params.get("metrics_file"):
+        prefix += ["--metrics-file", root.params["metrics_file"]]
+
+    runner = BatchRunner(root.command, ctx.obj["sessions"], prefix,
+                         workers=workers, fail_fast=fail_fast)
+    stdout = sys.stdout
+
+    def emit(result: dict):
+        stdout.write(json.dumps(result, ensure_ascii=False, default=str) + "\n")
+        stdout.flush()
+
+    summary = runner.run(commands, emit)
+    emit({"summary": summary})
+    if summary["failed"]:
+        ctx.exit(1)
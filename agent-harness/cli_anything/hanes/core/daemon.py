@@ -0,0 +1,292 @@
+"""
+@file daemon.py
+@description Warm background daemon and its `daemon` command group.
+    Holds one process with click, sessions, connection pools and caches
+    already loaded, and runs commands forwarded by the thin client
+    (cli_anything/hanes/client.py) over a Unix domain socket. Commands run
+    one at a time; the daemon exits after an idle timeout.
+"""
+
+import io
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+import click
+
+from cli_anything.hanes.client import connect, forwarded_env, socket_path
+from cli_anything.hanes.utils.dispatch import invoke
+
+
+DEFAULT_IDLE_TIMEOUT = 600.0
+
+
+class _FrameWriter(io.RawIOBase):
+    """Binary sink that forwards each write to the client as a JSON frame."""
+
+    def __init__(self, conn: socket.socket, stream: str, tty: bool = False):
+        self.conn = conn
+        self.stream = stream
+        self.tty = tty
+
+    def writable(self) -> bool:
+        return True
+
+    def isatty(self) -> bool:
+        return self.tty
+
+    def write(self, b) -> int:
+        if not b:
+            return 0
+        text = bytes(b).decode("utf-8", errors="replace")
+        frame = json.dumps({self.stream: text}, ensure_ascii=False)
+        self.conn.sendall(frame.encode("utf-8") + b"\n")
+        return len(b)
+
+
+class _RemoteStdin(io.StringIO):
+    """stdin that fetches the client's input on first read."""
+
+    def __init__(self, conn: socket.socket, reader):
+        super().__init__()
+        self._conn = conn
+        self._reader = reader
+        self._loaded = False
+
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        self._conn.sendall(b'{"stdin": true}\n')
+        reply = json.loads(self._reader.readline() or b"{}")
+        self.write(reply.get("data") or "")
+        self.seek(0)
+
+    def read(self, size=-1):
+        self._load()
+        return super().read(size)
+
+    def readline(self, size=-1):
+        self._load()
+        return super().readline(size)
+
+    def readlines(self, hint=-1):
+        self._load()
+        return super().readlines(hint)
+
+    def __next__(self):
+        self._load()
+        return super().__next__()
+
+
+def _text_stream(conn: socket.socket, stream: str, tty: bool) -> io.TextIOWrapper:
+    return io.TextIOWrapper(_FrameWriter(conn, stream, tty), encoding="utf-8",
+                            line_buffering=True, write_through=True)
+
+
+def _set_env(env: dict[str, str]):
+    """Make the forwarded variables of os.environ exactly ``env``."""
+    for key in forwarded_env().keys() - env.keys():
+        del os.environ[key]
+    os.environ.update(env)
+    if hasattr(time, "tzset"):
+        time.tzset()
+
+
+class DaemonServer:
+    """Accept loop serving forwarded commands against a shared ctx.obj.
+
+    Args:
+        command: Root click command to dispatch argv to.
+        path: Unix socket path to listen on.
+        idle_timeout: Seconds without a connection before shutting down.
+    """
+
+    def __init__(self, command: click.Command, path: Path | None = None,
+                 idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+        self.command = command
+        self.path = Path(path or socket_path())
+        self.idle_timeout = idle_timeout
+        self.obj: dict = {}
+        self.served = 0
+        self._lock = threading.Lock()
+        self._stop = False
+        self._sock: socket.socket | None = None
+
+    # ── Lifecycle ────────────────────────────────────────────────────
+
+    def bind(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.exists():
+            # A socket file nobody answers on is left over from a crash.
+            live = connect(self.path, spawn=False)
+            if live is not None:
+                live.close()
+                raise click.ClickException(f"Daemon already running on {self.path}")
+            self.path.unlink()
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.bind(str(self.path))
+        os.chmod(self.path, 0o600)
+        sock.listen(16)
+        sock.settimeout(self.idle_timeout)
+        self._sock = sock
+
+    def close(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+        for session in self.obj.get("sessions", {}).values():
+            session.pool.close()
+
+    def serve_forever(self):
+        """Serve until stopped or idle for ``idle_timeout`` seconds."""
+        if self._sock is None:
+            self.bind()
+        try:
+            while not self._stop:
+                try:
+                    conn, _ = self._sock.accept()
+                except socket.timeout:
+                    break
+                with conn:
+                    conn.settimeout(None)
+                    try:
+                        self.handle(conn)
+                    except OSError:
+                        pass  # client went away mid-command
+        finally:
+            self.close()
+
+    # ── Requests ─────────────────────────────────────────────────────
+
+    def handle(self, conn: socket.socket):
+        with conn.makefile("rb") as reader:
+            line = reader.readline()
+            if not line:
+                return
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("request is not a JSON object")
+            except ValueError as e:
+                # A bad request fails on its own; the daemon keeps serving.
+                frame = {"err": f"Error: malformed daemon request: {e}\n"}
+                conn.sendall(json.dumps(frame).encode("utf-8") + b'\n{"exit": 2}\n')
+                return
+            self._dispatch(conn, request, reader)
+
+    def _dispatch(self, conn: socket.socket, request: dict, reader):
+        if request.get("control") == "stop":
+            self._stop = True
+            conn.sendall(b'{"exit": 0}\n')
+            return
+        if request.get("control") == "status":
+            status = {"pid": os.getpid(), "served": self.served,
+                      "sessions": len(self.obj.get("sessions", {}))}
+            conn.sendall(json.dumps({"out": json.dumps(status) + "\n"}).encode()
+                         + b"\n{\"exit\": 0}\n")
+            return
+        code = self.run(conn, request, reader)
+        conn.sendall(json.dumps({"exit": code}).encode("utf-8") + b"\n")
+
+    def run(self, conn: socket.socket, request: dict, reader) -> int:
+        """Execute one forwarded argv with stdio redirected to ``conn``,
+        in the client's directory and environment."""
+        tty = bool(request.get("tty"))
+        out = _text_stream(conn, "out", tty)
+        err = _text_stream(conn, "err", False)
+        env = request.get("env")
+        saved = sys.stdin, sys.stdout, sys.stderr, os.getcwd()
+        with self._lock:
+            saved_env = forwarded_env()
+            sys.stdin = _RemoteStdin(conn, reader)
+            sys.stdout, sys.stderr = out, err
+            try:
+                os.chdir(request.get("cwd") or saved[3])
+                if env is not None:
+                    _set_env(env)
+                return invoke(self.command, request.get("argv") or [], self.obj)
+            finally:
+                sys.stdin, sys.stdout, sys.stderr = saved[:3]
+                os.chdir(saved[3])
+                if env is not None:
+                    _set_env(saved_env)
+                self.served += 1
+
+
+def _control(message: str) -> dict | None:
+    sock = connect(spawn=False)
+    if sock is None:
+        return None
+    with sock, sock.makefile("rb") as f:
+        sock.sendall(json.dumps({"control": message}).encode() + b"\n")
+        out = ""
+        for line in f:
+            frame = json.loads(line)
+            out += frame.get("out", "")
+        return json.loads(out) if out else {}
+
+
+# ── Commands ─────────────────────────────────────────────────────
+
+@click.group("daemon")
+def daemon_group():
+    """Warm background process for fast one-shot commands."""
+    pass
+
+
+@daemon_group.command("start")
+@click.option("--foreground", is_flag=True, help="Serve in this process")
+@click.option("--idle-timeout", type=float, default=DEFAULT_IDLE_TIMEOUT,
+              show_default=True, help="Exit after this many idle seconds")
+@click.pass_context
+def daemon_start(ctx, foreground, idle_timeout):
+    """Start the daemon (the client also starts it on first use)."""
+    if not hasattr(socket, "AF_UNIX"):
+        raise click.ClickException("Daemon mode needs Unix domain sockets")
+    if not foreground:
+        sock = connect()
+        if sock is None:
+            raise click.ClickException("Daemon failed to start")
+        sock.close()
+        click.echo(json.dumps({"socket": str(socket_path())})
+                   if ctx.obj.get("json_mode") else f"Daemon on {socket_path()}")
+        return
+    server = DaemonServer(ctx.find_root().command, idle_timeout=idle_timeout)
+    server.bind()
+    server.serve_forever()
+
+
+@daemon_group.command("stop")
+@click.pass_context
+def daemon_stop(ctx):
+    """Stop a running daemon."""
+    stopped = _control("stop") is not None
+    if ctx.obj.get("json_mode"):
+        click.echo(json.dumps({"stopped": stopped}))
+    else:
+        click.echo("Daemon stopped" if stopped else "Daemon not running")
+
+
+@daemon_group.command("status")
+@click.pass_context
+def daemon_status(ctx):
+    """Show whether a daemon is running."""
+    status = _control("status")
+    data = {"running": status is not None, "socket": str(socket_path()),
+            **(status or {})}
+    if ctx.obj.get("json_mode"):
+        click.echo(json.dumps(data, indent=2))
+    else:
+        from cli_anything.hanes.utils.repl_skin import ReplSkin
+        ReplSkin("hanes").status_block(
+            {k: str(v) for k, v in data.items()}, title="Daemon"
+        )
@@ -0,0 +1,490 @@
+"""
+@file importer.py
+@description `import` command: bulk-create records from a CSV or XLSX file.
+    Rows are streamed, validated locally and POSTed by a bounded pool of
+    workers, each with an idempotency key derived from the file and row,
+    so retries and resumed runs never create a row twice. Progress goes
+    to a checkpoint file after every few rows; rerunning the same command
+    after a crash or Ctrl-C picks up where it stopped. Rejected rows are
+    written, with the reason, to an error CSV that can be fixed and
+    imported again.
+
+    Usage:
+        cli-anything-hanes import parts parts.xlsx
+        cli-anything-hanes import arrivals arrivals.csv --workers 16
+        cli-anything-hanes import prod-results results.csv --dry-run
+"""
+
+import csv
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import click
+
+from cli_anything.hanes.core.session import Session
+from cli_anything.hanes.utils.hanes_backend import HanesAPIError, HanesBackend
+from cli_anything.hanes.utils.http_pool import ConnectionPool
+from cli_anything.hanes.utils.tabular import TabularReader
+
+DEFAULT_WORKERS = 8
+# Rows read ahead of the workers; bounds memory and the checkpoint size.
+WINDOW_PER_WORKER = 4
+# The checkpoint is rewritten after this many rows or seconds, whichever
+# comes first, and always when the run ends.
+CHECKPOINT_EVERY_ROWS = 200
+CHECKPOINT_EVERY_S = 1.0
+PROGRESS_EVERY_S = 2.0
+# Replies that say something about the backend rather than the row; the
+# run stops instead of rejecting every remaining row the same way.
+_FATAL_STATUSES = {401, 403, 408, 429}
+
+
+# ── Resources ────────────────────────────────────────────────────
+
+class ImportSpec:
+    """How rows of one resource are checked and where they are sent.
+
+    Args:
+        path: API path rows are POSTed to.
+        required: Columns every row must have; a tuple entry means any
+            one of those columns.
+        numbers: Column -> (int or float, minimum) for numeric columns.
+        unique: Column that must not repeat within the file.
+    """
+
+    __slots__ = ("path", "required", "numbers", "unique")
+
+    def __init__(self, path: str, required: tuple = (),
+                 numbers: dict | None = None, unique: str | None = None):
+        self.path = path
+        self.required = required
+        self.numbers = numbers or {}
+        self.unique = unique
+
+    def validate(self, row: dict) -> dict:
+        """Build the request body for a row; ValueError if it is invalid.
+
+        Columns starting with "_" are dropped, so an error file can be
+        fixed and imported again as it is.
+        """
+        data = {k: v for k, v in row.items() if not k.startswith("_")}
+        missing = [" or ".join(f) if isinstance(f, tuple) else f
+                   for f in self.required
+                   if not any(c in data for c in (f if isinstance(f, tuple) else (f,)))]
+        if missing:
+            raise ValueError(f"missing {', '.join(missing)}")
+        for column, (kind, minimum) in self.numbers.items():
+            if column not in data:
+                continue
+            try:
+                value = kind(data[column].replace(",", ""))
+            except ValueError:
+                raise ValueError(f"{column}: not a{'n integer' if kind is int else ' number'}: "
+                                 f"{data[column]!r}")
+            if value < minimum:
+                raise ValueError(f"{column}: must be at least {minimum}")
+            data[column] = value
+        return data
+
+
+IMPORTS = {
+    "parts": ImportSpec(
+        "/master/parts", ("itemCode", "itemName"),
+        {"safetyStock": (int, 0)}, unique="itemCode"),
+    "arrivals": ImportSpec(
+        "/material/arrivals", ("itemCode", "arrivalQty"),
+        {"arrivalQty": (float, 0.001)}, unique="arrivalNo"),
+    "job-orders": ImportSpec(
+        "/production/job-orders", ("itemCode", "planQty"),
+        {"planQty": (int, 1)}, unique="orderNo"),
+    "prod-results": ImportSpec(
+        "/production/prod-results", (("jobOrderId", "orderNo"), "goodQty"),
+        {"jobOrderId": (int, 1), "goodQty": (int, 0), "defectQty": (int, 0)}),
+    "reworks": ImportSpec(
+        "/quality/reworks", ("itemCode", "defectQty"),
+        {"defectQty": (int, 1)}, unique="reworkNo"),
+}
+
+
+def file_fingerprint(path: str | Path) -> str:
+    """sha256 of the file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# ── Checkpoint ───────────────────────────────────────────────────
+
+class Checkpoint:
+    """Which rows of a file are finished (created or rejected).
+
+    Rows are counted in file order, blank rows excluded. Everything up
+    to ``watermark`` is finished; ``done`` holds finished rows above it,
+    which stays small because rows are sent in order. ``generation``
+    counts --restart runs; it is part of the idempotency keys, so a
+    restarted import is not deduplicated against the earlier one.
+    """
+
+    def __init__(self, path: str | Path, resource: str, fingerprint: str,
+                 generation: int = 0):
+        self.path = Path(path)
+        self.resource = resource
+        self.fingerprint = fingerprint
+        self.generation = generation
+        self.watermark = 0
+        self.done: set[int] = set()
+        self.created = 0
+        self.rejected = 0
+        self.complete = False
+
+    @classmethod
+    def load(cls, path: str | Path, resource: str, fingerprint: str) -> "Checkpoint":
+        """The saved checkpoint, or a fresh one if there is none.
+
+        Raises ValueError if the checkpoint belongs to another file
+        version or resource.
+        """
+        cp = cls(path, resource, fingerprint)
+        try:
+            state = json.loads(cp.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return cp
+        except (OSError, ValueError) as e:
+            raise ValueError(f"unreadable checkpoint {cp.path}: {e}")
+        if state.get("resource") != resource or state.get("fingerprint") != fingerprint:
+            raise ValueError(f"checkpoint {cp.path} is for a different file or "
+                             "resource (the file changed?); use --restart")
+        cp.generation = state.get("generation", 0)
+        cp.watermark = state["watermark"]
+        cp.done = set(state["done"])
+        cp.created = state["created"]
+        cp.rejected = state["rejected"]
+        cp.complete = state["complete"]
+        return cp
+
+    @classmethod
+    def restart(cls, path: str | Path, resource: str, fingerprint: str) -> "Checkpoint":
+        """A fresh checkpoint one generation after the saved one (if any)."""
+        try:
+            state = json.loads(Path(path).read_text(encoding="utf-8"))
+            generation = int(state.get("generation", 0)) + 1
+        except (OSError, ValueError, TypeError, AttributeError):
+            generation = 1
+        return cls(path, resource, fingerprint, generation)
+
+    @property
+    def resumed(self) -> bool:
+        return self.watermark > 0 or bool(self.done)
+
+    def is_done(self, ordinal: int) -> bool:
+        return ordinal <= self.watermark or ordinal in self.done
+
+    def mark(self, ordinal: int):
+        self.done.add(ordinal)
+        while self.watermark + 1 in self.done:
+            self.watermark += 1
+            self.done.discard(self.watermark)
+
+    def save(self):
+        """Write atomically, so a crash leaves the previous checkpoint."""
+        state = {"resource": self.resource, "fingerprint": self.fingerprint,
+                 "generation": self.generation, "watermark": self.watermark, "done": sorted(self.done),
+                 "created": self.created, "rejected": self.rejected,
+                 "complete": self.complete}
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(json.dumps(state), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+# ── Importer ─────────────────────────────────────────────────────
+
+class ImportAborted(Exception):
+    """The backend failed in a way that would fail every row."""
+
+
+class Importer:
+    """Validates and creates rows with up to ``workers`` requests in flight.
+
+    Args:
+        backend: Client the rows are POSTed through.
+        spec: The resource's ImportSpec.
+        checkpoint: Finished rows to skip; updated as rows finish.
+        errors: csv.writer for rejected rows (None: not written).
+        workers: Concurrent requests.
+        dry_run: Validate only; nothing is sent or checkpointed.
+        progress: Called with the running counts every few seconds.
+    """
+
+    def __init__(self, backend: HanesBackend, spec: ImportSpec,
+                 checkpoint: Checkpoint, errors=None,
+                 workers: int = DEFAULT_WORKERS, dry_run: bool = False,
+                 progress=None):
+        self.backend = backend
+        self.spec = spec
+        self.checkpoint = checkpoint
+        self.errors = errors
+        self.workers = workers
+        self.dry_run = dry_run
+        self.progress = progress
+        self.counts = {"rows": 0, "skipped": 0, "created": 0, "rejected": 0}
+        self._lock = threading.Lock()
+        self._abort: BaseException | None = None
+        self._unsaved = 0
+        self._saved_at = time.monotonic()
+        self._reported_at = time.monotonic()
+
+    def _key(self, ordinal: int) -> str:
+        key = f"import-{self.checkpoint.fingerprint[:24]}"
+        if self.checkpoint.generation:
+            key += f"-g{self.checkpoint.generation}"
+        return f"{key}-{ordinal}"
+
+    def run(self, rows) -> dict:
+        """Import (row number, row) pairs; returns the counts.
+
+        Raises ImportAborted after the rows in flight have finished and
+        the checkpoint is saved.
+        """
+        t0 = time.perf_counter()
+        window = threading.BoundedSemaphore(self.workers * WINDOW_PER_WORKER)
+        seen: dict[str, int] = {}
+        finished = False
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers,
+                                    thread_name_prefix="hanes-import") as pool:
+                for ordinal, (row_no, row) in enumerate(rows, 1):
+                    if self._abort is not None:
+                        break
+                    self.counts["rows"] += 1
+                    duplicate = None
+                    if self.spec.unique and row.get(self.spec.unique):
+                        value = row[self.spec.unique]
+                        first = seen.setdefault(value, row_no)
+                        if first != row_no:
+                            duplicate = (f"duplicate {self.spec.unique} {value!r} "
+                                         f"(first on row {first})")
+                    if self.checkpoint.is_done(ordinal):
+                        self.counts["skipped"] += 1
+                        continue
+                    try:
+                        if duplicate:
+                            raise ValueError(duplicate)
+                        data = self.spec.validate(row)
+                    except ValueError as e:
+                        self._finish(ordinal, row_no, row, str(e))
+                        continue
+                    if self.dry_run:
+                        self._finish(ordinal, row_no, row, None)
+                        continue
+                    window.acquire()
+                    future = pool.submit(self.backend.post, self.spec.path, data,
+                                         idempotency_key=self._key(ordinal))
+                    future.add_done_callback(
+                        lambda f, o=ordinal, n=row_no, r=row: self._done(f, o, n, r, window))
+            finished = self._abort is None
+        finally:
+            if not self.dry_run:
+                self.checkpoint.complete = finished
+                self.checkpoint.save()
+        if self._abort is not None:
+            raise ImportAborted(str(self._abort)) from self._abort
+        elapsed = time.perf_counter() - t0
+        done = self.counts["created"] + self.counts["rejected"]
+        return {**self.counts, "seconds": round(elapsed, 3),
+                "rows_per_s": round(done / elapsed, 1) if elapsed > 0 else 0.0}
+
+    def _done(self, future, ordinal, row_no, row, window):
+        window.release()
+        exc = future.exception()
+        if exc is None:
+            self._finish(ordinal, row_no, row, None)
+        elif isinstance(exc, HanesAPIError) and exc.status < 500 \
+                and exc.status not in _FATAL_STATUSES:
+            self._finish(ordinal, row_no, row, f"[{exc.status}] {exc.message}")
+        else:
+            # Not marked: the row is sent again (same key) on resume.
+            with self._lock:
+                if self._abort is None:
+                    self._abort = exc
+
+    def _finish(self, ordinal: int, row_no: int, row: dict, error: str | None):
+        with self._lock:
+            if error is None:
+                self.counts["created"] += 1
+            else:
+                self.counts["rejected"] += 1
+                if self.errors is not None:
+                    self.errors.writerow({**row, "_row": row_no, "_error": error})
+            if self.dry_run:
+                return
+            cp = self.checkpoint
+            cp.mark(ordinal)
+            if error is None:
+                cp.created += 1
+            else:
+                cp.rejected += 1
+            self._unsaved += 1
+            now = time.monotonic()
+            if (self._unsaved >= CHECKPOINT_EVERY_ROWS
+                    or now - self._saved_at >= CHECKPOINT_EVERY_S):
+                cp.save()
+                self._unsaved, self._saved_at = 0, now
+            if self.progress and now - self._reported_at >= PROGRESS_EVERY_S:
+                self._reported_at = now
+                self.progress(dict(self.counts))
+
+
+class ErrorFile:
+    """Rejected rows as CSV: _row, _error, then the file's own columns.
+
+    Appends when resuming; the header is written only to a new file.
+    """
+
+    def __init__(self, path: str | Path, columns: list[str], append: bool):
+        self.path = Path(path)
+        new = not (append and self.path.exists() and self.path.stat().st_size)
+        self._f = open(self.path, "a" if not new else "w", newline="",
+                       encoding="utf-8-sig" if new else "utf-8")
+        self.writer = csv.DictWriter(
+            self._f, ["_row", "_error"] + [c for c in columns if c and not c.startswith("_")],
+            extrasaction="ignore")
+        if new:
+            self.writer.writeheader()
+        self.written = 0
+
+    def writerow(self, row: dict):
+        self.writer.writerow(row)
+        self.written += 1
+
+    def close(self):
+        self._f.close()
+
+
+# ── Command ──────────────────────────────────────────────────────
+
+@click.command("import")
+@click.argument("resource", type=click.Choice(sorted(IMPORTS)))
+@click.argument("file", type=click.Path(exists=True, dir_okay=False))
+@click.option("--workers", "-w", type=click.IntRange(1, 64),
+              default=DEFAULT_WORKERS, show_default=True,
+              help="Rows created concurrently")
+@click.option("--sheet", default=None, help="XLSX sheet name (default: the first)")
+@click.option("--encoding", default="utf-8-sig", show_default=True,
+              help="CSV text encoding (e.g. cp949 for Korean Excel exports)")
+@click.option("--checkpoint", "checkpoint_path", type=click.Path(dir_okay=False),
+              default=None, help="Checkpoint file (default: FILE.RESOURCE.checkpoint.json)")
+@click.option("--errors", "errors_path", type=click.Path(dir_okay=False),
+              default=None, help="Rejected rows CSV (default: FILE.errors.csv)")
+@click.option("--restart", is_flag=True, default=False,
+              help="Ignore an existing checkpoint and send every row again "
+                   "as new records, from the first row")
+@click.option("--dry-run", is_flag=True, default=False,
+              help="Validate the file without sending anything")
+@click.pass_context
+def import_command(ctx, resource, file, workers, sheet, encoding,
+                   checkpoint_path, errors_path, restart, dry_run):
+    """Create RESOURCE records from the rows of a CSV or XLSX FILE.
+
+    The first row holds the API field names (itemCode, itemName, ...).
+    Rows are checked locally, then created by --workers concurrent
+    requests. A checkpoint records finished rows, so rerunning the same
+    command after an interruption resumes; rejected rows go to an error
+    CSV. A backend failure (connection, 5xx, auth) stops the run with the
+    checkpoint saved. Exits 1 if any row was rejected or the run stopped.
+    """
+    session: Session = ctx.obj["session"]
+    json_mode = ctx.obj.get("json_mode")
+    spec = IMPORTS[resource]
+    path = Path(file)
+    checkpoint_path = Path(checkpoint_path or f"{path}.{resource}.checkpoint.json")
+    errors_path = Path(errors_path or f"{path}.errors.csv")
+
+    fingerprint = file_fingerprint(path)
+    if dry_run:
+        checkpoint = Checkpoint(checkpoint_path, resource, fingerprint)
+    elif restart:
+        checkpoint = Checkpoint.restart(checkpoint_path, resource, fingerprint)
+    else:
+        try:
+            checkpoint = Checkpoint.load(checkpoint_path, resource, fingerprint)
+        except ValueError as e:
+            raise click.UsageError(str(e))
+    if checkpoint.complete:
+        click.echo(f"import: {path} was already imported ({checkpoint.created} "
+                   f"created, {checkpoint.rejected} rejected); use --restart "
+                   "to import it again", err=True)
+        return
+
+    backend = HanesBackend(
+        base_url=session.base_url, token=session.token, company=session.company,
+        plant=session.plant,
+        pool=ConnectionPool(session.base_url.rstrip("/"), maxsize=workers),
+        retry=session.retry, breaker=session.breaker, limiter=session.limiter,
+        metrics=session.metrics)
+
+    def progress(counts: dict):
+        click.echo(f"import: {counts['rows']} rows, {counts['created']} "
+                   f"{'valid' if dry_run else 'created'}, {counts['rejected']} rejected",
+                   err=True)
+
+    summary = {"resource": resource, "file": str(path)}
+    aborted = None
+    try:
+        with TabularReader(path, encoding=encoding, sheet=sheet) as reader:
+            errors = ErrorFile(errors_path, reader.headers,
+                               append=checkpoint.resumed)
+            importer = Importer(backend, spec, checkpoint, errors, workers=workers,
+                                dry_run=dry_run, progress=progress)
+            try:
+                summary.update(importer.run(reader))
+            except ImportAborted as e:
+                aborted = str(e)
+                summary.update(importer.counts)
+            finally:
+                errors.close()
+    except (OSError, ValueError, UnicodeDecodeError) as e:
+        raise click.UsageError(f"cannot read {path}: {e}")
+    finally:
+        backend.close()
+        if not dry_run:
+            # This backend bypasses the response cache; lists of the
+            # resource must not keep serving pre-import pages.
+            session.cache.invalidate(spec.path)
+    if not errors.written and not checkpoint.rejected:
+        errors_path.unlink(missing_ok=True)
+
+    summary.update({
+        "dry_run": dry_run, "complete": aborted is None,
+        "checkpoint": None if dry_run else str(checkpoint_path),
+        "errors_file": str(errors_path) if errors_path.exists() else None,
+    })
+    if aborted:
+        summary["aborted"] = aborted
+
+    if json_mode:
+        from cli_anything.hanes.utils.codec import dumps_pretty
+        click.echo(dumps_pretty(summary))
+    else:
+        from cli_anything.hanes.utils.repl_skin import ReplSkin
+        skin = ReplSkin("hanes")
+        block = {"resource": resource, "rows": str(summary["rows"]),
+                 "valid" if dry_run else "created": str(summary["created"]),
+                 "rejected": str(summary["rejected"])}
+        if summary["skipped"]:
+            block["skipped"] = f"{summary['skipped']} (finished in an earlier run)"
+        if "rows_per_s" in summary:
+            block["rate"] = f"{summary['rows_per_s']:.1f} rows/s"
+        if summary["errors_file"]:
+            block["errors"] = summary["errors_file"]
+        skin.status_block(block, title="Import (dry run)" if dry_run else "Import")
+        if aborted:
+            skin.error(f"stopped: {aborted}; rerun the same command to resume")
+    if aborted or summary["rejected"]:
+        ctx.exit(1)
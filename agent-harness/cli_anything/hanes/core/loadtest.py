@@ -0,0 +1,399 @@
+"""
+@file loadtest.py
+@description `loadtest` command: simulated shop-floor traffic.
+    Virtual line operators list job orders, start them, post production
+    results, complete them and look up material stock through the normal
+    HanesBackend methods. Arrivals are open-loop (Poisson at --rate), so a
+    slow backend builds a backlog instead of quietly lowering the load,
+    and latency is measured from each request's scheduled arrival. Reports
+    throughput, latency percentiles and error rates per interval as NDJSON
+    plus a summary per action.
+
+    Usage:
+        cli-anything-hanes loadtest --rate 50 --operators 32 --duration 60
+        cli-anything-hanes --json loadtest --mix result=10,stocks=1 > run.ndjson
+"""
+
+import json
+import random
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import click
+
+from cli_anything.hanes.core.session import Session
+from cli_anything.hanes.utils.hanes_backend import HanesAPIError, HanesBackend
+from cli_anything.hanes.utils.http_pool import ConnectionPool
+from cli_anything.hanes.utils.metrics import Histogram
+from cli_anything.hanes.utils.resilience import CircuitBreaker, RetryPolicy
+
+# Operator actions and their default share of the traffic.
+DEFAULT_MIX = {"list_orders": 3, "start": 1, "result": 6, "complete": 1,
+               "stocks": 2}
+ACTIONS = tuple(DEFAULT_MIX)
+# Arrivals waiting for a free operator beyond this many per operator are
+# dropped (and counted) rather than queued without bound.
+MAX_BACKLOG_PER_OPERATOR = 50
+
+
+def parse_mix(text: str | None) -> dict[str, float]:
+    """Parse "result=6,start=1" into action weights (unlisted: 0)."""
+    if not text:
+        return dict(DEFAULT_MIX)
+    mix = dict.fromkeys(ACTIONS, 0.0)
+    for item in text.split(","):
+        name, _, weight = item.strip().partition("=")
+        if name not in mix:
+            raise ValueError(f"unknown action {name!r} (use {', '.join(ACTIONS)})")
+        try:
+            mix[name] = float(weight or 1)
+        except ValueError:
+            raise ValueError(f"bad weight for {name}: {weight!r}")
+        if mix[name] < 0:
+            raise ValueError(f"negative weight for {name}")
+    if not any(mix.values()):
+        raise ValueError("the mix has no positive weights")
+    return mix
+
+
+def error_kind(exc: BaseException) -> str:
+    if isinstance(exc, HanesAPIError):
+        return f"http_{exc.status}"
+    if isinstance(exc, ConnectionError):
+        return "connection"
+    return type(exc).__name__
+
+
+class OrderBoard:
+    """Job orders shared by the operators: waiting to start, and running."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._waiting: deque = deque()
+        self._running: list[dict] = []
+        self._claimed: set = set()
+
+    def offer(self, orders: list[dict]):
+        """Add WAITING orders from a listing, skipping ones already taken."""
+        with self._lock:
+            for order in orders:
+                if isinstance(order, dict) and order.get("id") is not None \
+                        and order["id"] not in self._claimed:
+                    self._claimed.add(order["id"])
+                    self._waiting.append(order)
+
+    def take_waiting(self) -> dict | None:
+        with self._lock:
+            return self._waiting.popleft() if self._waiting else None
+
+    def started(self, order: dict):
+        with self._lock:
+            self._running.append(order)
+
+    def pick_running(self, roll: int) -> dict | None:
+        with self._lock:
+            return self._running[roll % len(self._running)] if self._running else None
+
+    def take_running(self, roll: int) -> dict | None:
+        with self._lock:
+            if not self._running:
+                return None
+            return self._running.pop(roll % len(self._running))
+
+
+class _Window:
+    """Counters for one reporting interval (or the whole run)."""
+
+    def __init__(self):
+        self.arrivals = 0
+        self.dropped = 0
+        self.latency = {a: Histogram() for a in ACTIONS}
+        self.errors = {a: 0 for a in ACTIONS}
+        self.error_kinds: dict[str, int] = {}
+        self.queue = Histogram()
+
+    def add(self, action: str, latency_ms: float, queue_ms: float,
+            error: str | None):
+        self.latency[action].add(latency_ms)
+        self.queue.add(queue_ms)
+        if error:
+            self.errors[action] += 1
+            self.error_kinds[error] = self.error_kinds.get(error, 0) + 1
+
+    def summary(self, seconds: float) -> dict:
+        total = Histogram()
+        for hist in self.latency.values():
+            total.merge(hist)
+        errors = sum(self.errors.values())
+        done = total.count
+        lat = total.summary()
+        return {
+            "arrivals": self.arrivals,
+            "completed": done,
+            "throughput": round(done / seconds, 2) if seconds else 0.0,
+            "errors": errors,
+            "error_rate": round(errors / done, 4) if done else 0.0,
+            "dropped": self.dropped,
+            **{k: lat[k] for k in ("mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms")},
+            "queue_p99_ms": round(self.queue.percentile(99), 3),
+            "errors_by_kind": dict(sorted(self.error_kinds.items())),
+            "actions": {
+                a: {"count": h.count, "errors": self.errors[a],
+                    "error_rate": round(self.errors[a] / h.count, 4) if h.count else 0.0,
+                    "throughput": round(h.count / seconds, 2) if seconds else 0.0,
+                    **{k: v for k, v in h.summary().items() if k != "count"}}
+                for a, h in self.latency.items() if h.count},
+        }
+
+
+class LoadTest:
+    """Open-loop load generator over a HanesBackend.
+
+    Args:
+        backend: Client to drive; its pool should allow ``operators``
+            connections.
+        rate: Mean arrivals per second (Poisson).
+        duration: Seconds to generate arrivals for; in-flight requests
+            are then allowed to finish.
+        operators: Virtual operators, i.e. requests in flight at most.
+        mix: Action weights (see DEFAULT_MIX).
+        interval: Seconds per reported window.
+        emit: Called with each window's record.
+        seed: Seed for arrivals, action choice and payloads.
+    """
+
+    def __init__(self, backend: HanesBackend, rate: float, duration: float,
+                 operators: int = 16, mix: dict[str, float] | None = None,
+                 interval: float = 1.0, emit=None, seed: int | None = None):
+        self.backend = backend
+        self.rate = rate
+        self.duration = duration
+        self.operators = operators
+        self.mix = mix or dict(DEFAULT_MIX)
+        self.interval = interval
+        self.emit = emit or (lambda record: None)
+        self.rng = random.Random(seed)
+        self.board = OrderBoard()
+        self._lock = threading.Lock()
+        self._window = _Window()
+        self._total = _Window()
+        self._pending = 0
+        self._inflight = 0
+        self._t0 = self._last_flush = 0.0
+
+    # ── Actions ──
+
+    def _list_orders(self, roll: int) -> str:
+        result = self.backend.list_job_orders(status="WAITING", limit=50)
+        data = result.get("data", result) if isinstance(result, dict) else result
+        self.board.offer(data if isinstance(data, list) else [])
+        return "list_orders"
+
+    def _start(self, roll: int) -> str:
+        order = self.board.take_waiting()
+        if order is None:
+            return self._list_orders(roll)
+        self.backend.start_job_order(order["id"])
+        self.board.started(order)
+        return "start"
+
+    def _result(self, roll: int) -> str:
+        order = self.board.pick_running(roll)
+        if order is None:
+            return self._start(roll)
+        self.backend.create_prod_result({
+            "jobOrderId": order["id"], "orderNo": order.get("orderNo"),
+            "goodQty": roll % 50 + 1, "defectQty": int(roll % 20 == 0),
+            "workerCode": f"LT-{roll % self.operators:03d}",
+        })
+        return "result"
+
+    def _complete(self, roll: int) -> str:
+        order = self.board.take_running(roll)
+        if order is None:
+            return self._start(roll)
+        self.backend.complete_job_order(order["id"])
+        return "complete"
+
+    def _stocks(self, roll: int) -> str:
+        self.backend.list_mat_stocks(limit=50)
+        return "stocks"
+
+    def _execute(self, action: str, arrival: float, roll: int):
+        started = time.perf_counter()
+        with self._lock:
+            self._pending -= 1
+            self._inflight += 1
+        error = None
+        try:
+            action = getattr(self, f"_{action}")(roll)
+        except Exception as e:
+            error = error_kind(e)
+        done = time.perf_counter()
+        with self._lock:
+            self._inflight -= 1
+            for window in (self._window, self._total):
+                window.add(action, (done - arrival) * 1000,
+                           (started - arrival) * 1000, error)
+
+    # ── Reporting ──
+
+    def _flush(self, now: float, seconds: float) -> dict:
+        with self._lock:
+            window, self._window = self._window, _Window()
+            state = {"inflight": self._inflight, "backlog": self._pending}
+        record = {"t": round(now - self._t0, 3), "window_s": round(seconds, 3),
+                  **window.summary(seconds), **state}
+        self.emit(record)
+        return record
+
+    def _report(self, stop: threading.Event):
+        last = self._t0
+        while not stop.wait(max(0.0, last + self.interval - time.perf_counter())):
+            now = time.perf_counter()
+            self._flush(now, now - last)
+            last = now
+        self._last_flush = last
+
+    def run(self) -> dict:
+        """Generate load for ``duration`` seconds and return the summary."""
+        actions = [a for a in ACTIONS if self.mix.get(a)]
+        weights = [self.mix[a] for a in actions]
+        max_backlog = self.operators * MAX_BACKLOG_PER_OPERATOR
+        stop = threading.Event()
+        self._t0 = time.perf_counter()
+        reporter = threading.Thread(target=self._report, args=(stop,),
+                                    name="loadtest-report", daemon=True)
+        reporter.start()
+        with ThreadPoolExecutor(self.operators, thread_name_prefix="operator") as pool:
+            arrival = self._t0
+            while True:
+                arrival += self.rng.expovariate(self.rate)
+                if arrival - self._t0 >= self.duration:
+                    break
+                delay = arrival - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                action = self.rng.choices(actions, weights)[0]
+                roll = self.rng.getrandbits(32)
+                with self._lock:
+                    self._window.arrivals += 1
+                    self._total.arrivals += 1
+                    dropped = self._pending >= max_backlog
+                    if dropped:
+                        self._window.dropped += 1
+                        self._total.dropped += 1
+                    else:
+                        self._pending += 1
+                if not dropped:
+                    pool.submit(self._execute, action, arrival, roll)
+        stop.set()
+        reporter.join()
+        end = time.perf_counter()
+        if end - self._last_flush > 0.001:
+            self._flush(end, end - self._last_flush)
+        with self._lock:
+            summary = self._total.summary(end - self._t0)
+        return {"duration_s": round(end - self._t0, 3), "rate": self.rate,
+                "operators": self.operators, **summary}
+
+
+# ── Command ──────────────────────────────────────────────────────
+
+@click.command("loadtest")
+@click.option("--rate", "-r", type=click.FloatRange(min=0, min_open=True),
+              default=10.0, show_default=True,
+              help="Mean operator actions started per second (open loop)")
+@click.option("--operators", "-o", type=click.IntRange(1, 1024), default=16,
+              show_default=True, help="Virtual operators (max requests in flight)")
+@click.option("--duration", "-d", type=click.FloatRange(min=0, min_open=True),
+              default=30.0, show_default=True, help="Seconds of load")
+@click.option("--mix", default=None,
+              help="Action weights, e.g. list_orders=3,start=1,result=6,"
+                   "complete=1,stocks=2 (the default)")
+@click.option("--interval", type=click.FloatRange(min=0.1), default=1.0,
+              show_default=True, help="Seconds per reported interval")
+@click.option("--output", "output_path", type=click.Path(dir_okay=False),
+              default=None, help="Also write the interval records to this NDJSON file")
+@click.option("--seed", type=int, default=None, help="Seed for a repeatable run")
+@click.pass_context
+def loadtest_command(ctx, rate, operators, duration, mix, interval, output_path, seed):
+    """Simulate line operators against the backend and report latency.
+
+    Each arrival is one operator action: list WAITING job orders, start
+    one, post a production result on a running one, complete one, or
+    list material stock. Latency counts from the scheduled arrival, so
+    time spent waiting for a free operator is included. Requests are not
+    retried and the response cache is not used.
+
+    With --json, stdout is NDJSON: one record per interval, then a
+    {"summary": ...} line. Otherwise progress goes to stderr and a
+    summary table to stdout.
+    """
+    try:
+        weights = parse_mix(mix)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--mix")
+    session: Session = ctx.obj["session"]
+    json_mode = ctx.obj.get("json_mode")
+    backend = HanesBackend(
+        base_url=session.base_url, token=session.token, company=session.company,
+        plant=session.plant,
+        pool=ConnectionPool(session.base_url.rstrip("/"), maxsize=operators),
+        retry=RetryPolicy(max_attempts=1),
+        # Never short-circuit: failures are what is being measured.
+        breaker=CircuitBreaker(failure_threshold=sys.maxsize),
+        limiter=session.limiter)
+
+    out_file = open(output_path, "a", encoding="utf-8") if output_path else None
+
+    def emit(record: dict):
+        line = json.dumps(record, ensure_ascii=False)
+        if out_file is not None:
+            out_file.write(line + "\n")
+            out_file.flush()
+        if json_mode:
+            click.echo(line)
+        else:
+            click.echo(f"  t={record['t']:>7.1f}s  {record['throughput']:>8.1f} req/s  "
+                       f"p50 {record['p50_ms']:>8.1f}ms  p99 {record['p99_ms']:>8.1f}ms  "
+                       f"errors {record['error_rate']:>6.1%}  "
+                       f"inflight {record['inflight']:>3}  backlog {record['backlog']}",
+                       err=True)
+
+    test = LoadTest(backend, rate=rate, duration=duration, operators=operators,
+                    mix=weights, interval=interval, emit=emit, seed=seed)
+    try:
+        summary = test.run()
+    finally:
+        backend.close()
+        if out_file is not None:
+            out_file.close()
+
+    if json_mode:
+        click.echo(json.dumps({"summary": summary}, ensure_ascii=False))
+        return
+    from cli_anything.hanes.utils.repl_skin import ReplSkin
+    skin = ReplSkin("hanes")
+    skin.status_block({
+        "duration": f"{summary['duration_s']:.1f}s",
+        "offered": f"{rate:g} req/s, {operators} operators",
+        "throughput": f"{summary['throughput']:.1f} req/s",
+        "requests": str(summary["completed"]),
+        "errors": f"{summary['errors']} ({summary['error_rate']:.1%})",
+        "dropped": str(summary["dropped"]),
+        "latency": f"p50 {summary['p50_ms']:.1f}ms  p95 {summary['p95_ms']:.1f}ms  "
+                   f"p99 {summary['p99_ms']:.1f}ms",
+    }, title="Load test")
+    skin.table(["Action", "Count", "Req/s", "Errors", "p50 ms", "p95 ms",
+                "p99 ms", "Max ms"],
+               [[name, str(a["count"]), f"{a['throughput']:.1f}",
+                 f"{a['errors']} ({a['error_rate']:.1%})", f"{a['p50_ms']:.1f}",
+                 f"{a['p95_ms']:.1f}", f"{a['p99_ms']:.1f}", f"{a['max_ms']:.1f}"]
+                for name, a in summary["actions"].items()])
+    if summary["errors_by_kind"]:
+        skin.warning("errors: " + ", ".join(
+            f"{kind} x{n}" for kind, n in summary["errors_by_kind"].items()))
@@ -4,9 +4,9 @@
 """
 
 import click
-import json
 
 from cli_anything.hanes.core.session import Session
+from cli_anything.hanes.utils.output import page_size, render
 
 
 @click.group("master")
@@ -15,26 +15,6 @@ def master_group():
     pass
 
 
-def _output(ctx: click.Context, data, headers=None, rows_fn=None):
-    """Output helper: JSON mode or table."""
-    if ctx.obj.get("json_mode"):
-        click.echo(json.dumps(data, indent=2, ensure_ascii=False, default=str))
-        return
-    if headers and rows_fn and isinstance(data, dict):
-        items = data.get("data", data)
-        if isinstance(items, list):
-            from cli_anything.hanes.utils.repl_skin import ReplSkin
-            skin = ReplSkin("hanes")
-            rows = [rows_fn(item) for item in items]
-            skin.table(headers, rows)
-            total = data.get("total", len(items))
-            skin.info(f"Total: {total}")
-        else:
-            click.echo(json.dumps(data, indent=2, ensure_ascii=False, default=str))
-    else:
-        click.echo(json.dumps(data, indent=2, ensure_ascii=False, default=str))
-
-
 # ── Parts ────────────────────────────────────────────────────────
 
 @master_group.command("parts")
@@ -42,22 +22,36 @@ def _output(ctx: click.Context, data, headers=None, rows_fn=None):
 @click.option("--type", "item_type", default=None, help="Item type filter")
 @click.option("--page", default=1, type=int, help="Page number")
 @click.option("--limit", default=20, type=int, help="Items per page")
+@click.option("--all", "fetch_all", is_flag=True,
+              help="Stream every page (--limit sets the page size)")
+@click.option("--local", is_flag=True,
+              help="Answer from the local replica (see `sync`)")
 @click.pass_context
-def list_parts(ctx, search, item_type, page, limit):
+def list_parts(ctx, search, item_type, page, limit, fetch_all, local):
     """List parts (items) from master data."""
     session: Session = ctx.obj["session"]
-    result = session.backend.list_parts(
-        search=search, itemType=item_type, page=page, limit=limit
-    )
-    _output(ctx, result,
-            headers=["Code", "Name", "Type", "Unit", "UseYN"],
-            rows_fn=lambda r: [
-                r.get("itemCode", ""),
-                r.get("itemName", ""),
-                r.get("itemType", ""),
-                r.get("unit", ""),
-                r.get("useYn", ""),
-            ])
+    if local:
+        from cli_anything.hanes.core.sync import local_list
+        result = local_list(ctx, "parts", search, {"itemType": item_type},
+                            page, limit, fetch_all)
+    elif fetch_all:
+        result = session.backend.iter_parts(
+            search=search, itemType=item_type, page_size=page_size(ctx, limit),
+            stream=True,
+        )
+    else:
+        result = session.backend.list_parts(
+            search=search, itemType=item_type, page=page, limit=limit
+        )
+    render(ctx, result,
+           headers=["Code", "Name", "Type", "Unit", "UseYN"],
+           rows_fn=lambda r: [
+               r.get("itemCode", ""),
+               r.get("itemName", ""),
+               r.get("itemType", ""),
+               r.get("unit", ""),
+               r.get("useYn", ""),
+           ])
 
 
 @master_group.command("part")
@@ -67,7 +61,45 @@ def get_part(ctx, item_code):
     """Get details for a specific part."""
     session: Session = ctx.obj["session"]
     result = session.backend.get_part(item_code)
-    _output(ctx, result)
+    render(ctx, result)
+
+
+# ── Search ───────────────────────────────────────────────────────
+
+@master_group.command("search")
+@click.argument("query")
+@click.option("--resource", "-r", "resources", multiple=True,
+              type=click.Choice(["parts", "boms"]),
+              help="Resource to search (repeatable; default: both)")
+@click.option("--limit", default=20, type=click.IntRange(1, 1000),
+              help="Results to return")
+@click.pass_context
+def search_master(ctx, query, resources, limit):
+    """Search parts and BOM lines in the local replica, best match first.
+
+    Matches item code, name, part no., customer part no. and spec (BOM
+    lines: parent/child code, ECO no., group, remark) by prefix for codes
+    and words and by two-character n-grams for Korean, so "흑색전선" also
+    finds "흑색 전선". Needs `sync -r parts` / `sync -r boms` first.
+    """
+    from cli_anything.hanes.core.sync import local_search
+    result = local_search(ctx, query, resources or ("parts", "boms"), limit)
+    render(ctx, result,
+           headers=["Resource", "Code", "Name", "Spec", "Score"],
+           rows_fn=lambda r: [
+               r["resource"],
+               r.get("itemCode") or f"{r.get('parentItemCode', '')} > "
+                                    f"{r.get('childItemCode', '')}",
+               r.get("itemName") or r.get("ecoNo") or "",
+               r.get("spec") or r.get("revision") or "",
+               f"{r['score']:.2f}",
+           ])
+    if not ctx.obj.get("json_mode"):
+        meta = result["meta"]
+        click.echo(f"search: {meta['total']} match(es) in {meta['took_ms']}ms"
+                   + ("" if meta["exhaustive"] else ", best candidates only")
+                   + (", no record holds every word" if meta["partial"] and meta["total"]
+                      else ""), err=True)
 
 
 # ── Processes ────────────────────────────────────────────────────
@@ -76,19 +108,32 @@ def get_part(ctx, item_code):
 @click.option("--search", "-s", default=None, help="Search keyword")
 @click.option("--page", default=1, type=int)
 @click.option("--limit", default=20, type=int)
+@click.option("--all", "fetch_all", is_flag=True,
+              help="Stream every page (--limit sets the page size)")
+@click.option("--local", is_flag=True,
+              help="Answer from the local replica (see `sync`)")
 @click.pass_context
-def list_processes(ctx, search, page, limit):
+def list_processes(ctx, search, page, limit, fetch_all, local):
     """List manufacturing processes."""
     session: Session = ctx.obj["session"]
-    result = session.backend.list_processes(search=search, page=page, limit=limit)
-    _output(ctx, result,
-            headers=["Code", "Name", "Type", "UseYN"],
-            rows_fn=lambda r: [
-                r.get("processCode", ""),
-                r.get("processName", ""),
-                r.get("processType", ""),
-                r.get("useYn", ""),
-            ])
+    if local:
+        from cli_anything.hanes.core.sync import local_list
+        result = local_list(ctx, "processes", search, None, page, limit, fetch_all)
+    elif fetch_all:
+        result = session.backend.iter_processes(
+            search=search, page_size=page_size(ctx, limit),
+            stream=True,
+        )
+    else:
+        result = session.backend.list_processes(search=search, page=page, limit=limit)
+    render(ctx, result,
+           headers=["Code", "Name", "Type", "UseYN"],
+           rows_fn=lambda r: [
+               r.get("processCode", ""),
+               r.get("processName", ""),
+               r.get("processType", ""),
+               r.get("useYn", ""),
+           ])
 
 
 # ── BOM ──────────────────────────────────────────────────────────
@@ -97,20 +142,33 @@ def list_processes(ctx, search, page, limit):
 @click.option("--search", "-s", default=None)
 @click.option("--page", default=1, type=int)
 @click.option("--limit", default=20, type=int)
+@click.option("--all", "fetch_all", is_flag=True,
+              help="Stream every page (--limit sets the page size)")
+@click.option("--local", is_flag=True,
+              help="Answer from the local replica (see `sync`)")
 @click.pass_context
-def list_boms(ctx, search, page, limit):
+def list_boms(ctx, search, page, limit, fetch_all, local):
     """List BOM (Bill of Materials) records."""
     session: Session = ctx.obj["session"]
-    result = session.backend.list_boms(search=search, page=page, limit=limit)
-    _output(ctx, result,
-            headers=["Parent", "Child", "Qty", "Unit", "Rev"],
-            rows_fn=lambda r: [
-                r.get("parentItemCode", ""),
-                r.get("childItemCode", ""),
-                str(r.get("qty", "")),
-                r.get("unit", ""),
-                r.get("revision", ""),
-            ])
+    if local:
+        from cli_anything.hanes.core.sync import local_list
+        result = local_list(ctx, "boms", search, None, page, limit, fetch_all)
+    elif fetch_all:
+        result = session.backend.iter_boms(
+            search=search, page_size=page_size(ctx, limit),
+            stream=True,
+        )
+    else:
+        result = session.backend.list_boms(search=search, page=page, limit=limit)
+    render(ctx, result,
+           headers=["Parent", "Child", "Qty", "Unit", "Rev"],
+           rows_fn=lambda r: [
+               r.get("parentItemCode", ""),
+               r.get("childItemCode", ""),
+               str(r.get("qty", "")),
+               r.get("unit", ""),
+               r.get("revision", ""),
+           ])
 
 
 @master_group.command("bom-tree")
@@ -121,7 +179,7 @@ def bom_tree(ctx, parent_code, depth):
     """Show BOM hierarchy tree for a parent item."""
     session: Session = ctx.obj["session"]
     result = session.backend.get_bom_hierarchy(parent_code, depth)
-    _output(ctx, result)
+    render(ctx, result)
 
 
 # ── Routing ──────────────────────────────────────────────────────
@@ -130,20 +188,33 @@ def bom_tree(ctx, parent_code, depth):
 @click.option("--search", "-s", default=None)
 @click.option("--page", default=1, type=int)
 @click.option("--limit", default=20, type=int)
+@click.option("--all", "fetch_all", is_flag=True,
+              help="Stream every page (--limit sets the page size)")
+@click.option("--local", is_flag=True,
+              help="Answer from the local replica (see `sync`)")
 @click.pass_context
-def list_routings(ctx, search, page, limit):
+def list_routings(ctx, search, page, limit, fetch_all, local):
     """List routing (process maps)."""
     session: Session = ctx.obj["session"]
-    result = session.backend.list_routings(search=search, page=page, limit=limit)
-    _output(ctx, result,
-            headers=["ItemCode", "Seq", "Process", "EquipType", "CycleTime"],
-            rows_fn=lambda r: [
-                r.get("itemCode", ""),
-                str(r.get("seq", "")),
-                r.get("processCode", ""),
-                r.get("equipType", ""),
-                str(r.get("cycleTime", "")),
-            ])
+    if local:
+        from cli_anything.hanes.core.sync import local_list
+        result = local_list(ctx, "routings", search, None, page, limit, fetch_all)
+    elif fetch_all:
+        result = session.backend.iter_routings(
+            search=search, page_size=page_size(ctx, limit),
+            stream=True,
+        )
+    else:
+        result = session.backend.list_routings(search=search, page=page, limit=limit)
+    render(ctx, result,
+           headers=["ItemCode", "Seq", "Process", "EquipType", "CycleTime"],
+           rows_fn=lambda r: [
+               r.get("itemCode", ""),
+               str(r.get("seq", "")),
+               r.get("processCode", ""),
+               r.get("equipType", ""),
+               str(r.get("cycleTime", "")),
+           ])
 
 
 # ── Common Codes ─────────────────────────────────────────────────
@@ -151,16 +222,28 @@ def list_routings(ctx, search, page, limit):
 @master_group.command("com-codes")
 @click.option("--group", "group_code", default=None, help="Group code filter")
 @click.option("--search", "-s", default=None)
+@click.option("--all", "fetch_all", is_flag=True, help="Stream every page")
+@click.option("--local", is_flag=True,
+              help="Answer from the local replica (see `sync`)")
 @click.pass_context
-def list_com_codes(ctx, group_code, search):
+def list_com_codes(ctx, group_code, search, fetch_all, local):
     """List common codes (system code table)."""
     session: Session = ctx.obj["session"]
-    result = session.backend.list_com_codes(groupCode=group_code, search=search)
-    _output(ctx, result,
-            headers=["Group", "Detail", "Name", "UseYN"],
-            rows_fn=lambda r: [
-                r.get("groupCode", ""),
-                r.get("detailCode", ""),
-                r.get("detailName", ""),
-                r.get("useYn", ""),
-            ])
+    if local:
+        from cli_anything.hanes.core.sync import local_list
+        result = local_list(ctx, "com-codes", search, {"groupCode": group_code},
+                            fetch_all=fetch_all, limit=1000)
+    elif fetch_all:
+        result = session.backend.iter_com_codes(
+            groupCode=group_code, search=search, stream=True
+        )
+    else:
+        result = session.backend.list_com_codes(groupCode=group_code, search=search)
+    render(ctx, result,
+           headers=["Group", "Detail", "Name", "UseYN"],
+           rows_fn=lambda r: [
+               r.get("groupCode", ""),
+               r.get("detailCode", ""),
+               r.get("detailName", ""),
+               r.get("useYn", ""),
+           ])
@@ -0,0 +1,122 @@
+"""
+@file queue.py
+@description Offline write queue commands (status, flush, discard).
+    Production results and receiving posted while the backend is down are
+    journaled in ~/.cli-anything-hanes/write-queue.ndjson (see
+    utils/write_queue.py); `queue flush` replays them once it is back.
+
+    Usage:
+        cli-anything-hanes queue status
+        cli-anything-hanes queue flush --wait 600
+"""
+
+import click
+
+from cli_anything.hanes.core.session import Session
+from cli_anything.hanes.utils.codec import dumps_pretty
+from cli_anything.hanes.utils.write_queue import (
+    DEFAULT_BATCH_SIZE, DEFAULT_MAX_ATTEMPTS, DEFAULT_WORKERS, Replayer,
+)
+
+
+def _echo(ctx, data: dict, title: str):
+    if ctx.obj.get("json_mode"):
+        click.echo(dumps_pretty(data))
+        return
+    from cli_anything.hanes.utils.repl_skin import ReplSkin
+    ReplSkin("hanes").status_block(
+        {k: str(v) for k, v in data.items() if not isinstance(v, list)}, title=title)
+
+
+@click.group("queue")
+def queue_group():
+    """Writes queued while the backend was unreachable."""
+    pass
+
+
+@queue_group.command("status")
+@click.option("--list", "show", is_flag=True, default=False,
+              help="List the queued writes")
+@click.pass_context
+def queue_status(ctx, show):
+    """Show how many writes are pending or were refused."""
+    session: Session = ctx.obj["session"]
+    queue = session.write_queue
+    data = queue.stats()
+    if show:
+        pending, failed = queue.entries()
+        data["entries"] = pending + failed
+    _echo(ctx, data, "Write Queue")
+    if show and not ctx.obj.get("json_mode") and data["entries"]:
+        from cli_anything.hanes.utils.repl_skin import ReplSkin
+        ReplSkin("hanes").table(
+            ["Id", "Queued", "Path", "State"],
+            [[e["id"], e["ts"], e["path"], e.get("error", "pending")]
+             for e in data["entries"]])
+
+
+@queue_group.command("flush")
+@click.option("--wait", type=click.FloatRange(min=0), default=0.0,
+              show_default=True,
+              help="Seconds to keep retrying while the backend is down")
+@click.option("--batch-size", type=click.IntRange(1, 1000),
+              default=DEFAULT_BATCH_SIZE, show_default=True,
+              help="Writes recorded per journal append")
+@click.option("--workers", "-w", type=click.IntRange(1, 64),
+              default=DEFAULT_WORKERS, show_default=True,
+              help="Paths replayed concurrently (writes to one path go in order)")
+@click.option("--max-attempts", type=click.IntRange(min=1),
+              default=DEFAULT_MAX_ATTEMPTS, show_default=True,
+              help="Transient failures before a write is marked failed")
+@click.option("--retry-failed", is_flag=True, default=False,
+              help="Also resend writes the backend refused before")
+@click.pass_context
+def queue_flush(ctx, wait, batch_size, workers, max_attempts, retry_failed):
+    """Send queued writes to the backend, oldest first.
+
+    Waits for ping() to succeed, then sends in batches with the writes'
+    original idempotency keys, in journal order per path. Writes the
+    backend refuses, or that still fail after --max-attempts, are kept
+    as failed; see `queue status --list`. Exits 1 if anything is left.
+    """
+    session: Session = ctx.obj["session"]
+    queue = session.write_queue
+    if retry_failed:
+        queue.retry([e["id"] for e in queue.entries()[1]])
+    replayer = Replayer(queue, session.backend, batch_size=batch_size,
+                        workers=workers, max_attempts=max_attempts)
+
+    def progress(counts: dict):
+        if not ctx.obj.get("json_mode"):
+            click.echo(f"queue: {counts['sent']} sent, {counts['failed']} failed, "
+                       f"{counts['remaining']} left", err=True)
+
+    result = replayer.flush(wait=wait, progress=progress)
+    result["failed_total"] = len(queue.entries()[1])
+    _echo(ctx, result, "Queue Flush")
+    if result["busy"]:
+        click.echo("queue: another process is already flushing", err=True)
+    if result["remaining"] or result["failed"]:
+        ctx.exit(1)
+
+
+@queue_group.command("discard")
+@click.argument("ids", nargs=-1)
+@click.option("--failed", "all_failed", is_flag=True, default=False,
+              help="Discard every write the backend refused")
+@click.pass_context
+def queue_discard(ctx, ids, all_failed):
+    """Remove queued writes by id without sending them."""
+    session: Session = ctx.obj["session"]
+    queue = session.write_queue
+    pending, failed = queue.entries()
+    known = {e["id"] for e in pending + failed}
+    unknown = [i for i in ids if i not in known]
+    if unknown:
+        raise click.BadParameter(f"not queued: {', '.join(unknown)}", param_hint="IDS")
+    targets = list(ids) + ([e["id"] for e in failed] if all_failed else [])
+    if not targets:
+        raise click.UsageError("give ids to discard, or --failed")
+    queue.drop(targets)
+    queue.compact()
+    _echo(ctx, {"discarded": len(set(targets)), **queue.stats()}, "Write Queue")
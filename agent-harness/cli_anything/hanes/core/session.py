@@ -10,7 +10,15 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from cli_anything.hanes.utils.cache import ResponseCache
+from cli_anything.hanes.utils.disk_cache import DiskCache
 from cli_anything.hanes.utils.hanes_backend import HanesBackend, DEFAULT_BASE_URL
+from cli_anything.hanes.utils.http_pool import ConnectionPool
+from cli_anything.hanes.utils.metrics import RequestMetrics
+from cli_anything.hanes.utils.ratelimit import RateLimiter
+from cli_anything.hanes.utils.resilience import CircuitBreaker, RetryPolicy
+from cli_anything.hanes.utils.singleflight import SingleFlight
+from cli_anything.hanes.utils.write_queue import DEFAULT_QUEUE_FILE, WriteQueue
 
 
 DEFAULT_SESSION_DIR = Path.home() / ".cli-anything-hanes"
@@ -29,11 +37,57 @@ class Session:
         self.user_email: str | None = None
         self.last_login: str | None = None
         self._backend: HanesBackend | None = None
+        self._pool: ConnectionPool | None = None
+        self._pool_url: str | None = None
+        # Retry counters and breaker state outlive backend rebuilds, so a
+        # REPL / daemon / batch session fails fast across commands while
+        # the backend is down. The breaker is per base URL, like the pool.
+        self.retry = RetryPolicy()
+        self.breaker = CircuitBreaker()
+        # Coalesces identical concurrent GETs from batch workers / threads.
+        self.singleflight = SingleFlight()
+        # Optional client-side rate / concurrency limit (configure_limits).
+        self.limiter: RateLimiter | None = None
+        self._limiter_config: tuple | None = None
+        # Per-endpoint latency histograms for the life of the session;
+        # --metrics-file adds an NDJSON sink (configure_metrics).
+        self.metrics = RequestMetrics()
+        # Reference-data cache shared by every backend this session builds
+        # and, through the disk tier, by later CLI invocations; set to None
+        # to disable caching.
+        self.cache: ResponseCache | None = ResponseCache(
+            disk=DiskCache(self.session_file.parent / "cache")
+        )
+        # Offline journal for production results / receiving that could
+        # not be sent; `queue flush` replays it.
+        self.write_queue = WriteQueue(self.session_file.parent / DEFAULT_QUEUE_FILE)
+        self._replica = None
+        # Per-invocation switch (--no-cache) that leaves self.cache intact
+        # for long-lived sessions held by the REPL or daemon.
+        self.cache_enabled = True
+        self._mtime: float | None = None
 
         self._load()
 
+    def _file_mtime(self) -> float | None:
+        try:
+            return self.session_file.stat().st_mtime
+        except OSError:
+            return None
+
+    def reload_if_changed(self):
+        """Re-read the session file if another process rewrote it."""
+        if self._file_mtime() == self._mtime:
+            return
+        self.base_url = DEFAULT_BASE_URL
+        self.token = self.company = self.plant = None
+        self.user_email = self.last_login = None
+        self._backend = None
+        self._load()
+
     def _load(self):
         """Load session from disk if it exists."""
+        self._mtime = self._file_mtime()
         if self.session_file.exists():
             try:
                 with open(self.session_file, "r", encoding="utf-8") as f:
@@ -60,6 +114,7 @@ class Session:
         }
         with open(self.session_file, "w", encoding="utf-8") as f:
             json.dump(data, f, indent=2, ensure_ascii=False)
+        self._mtime = self._file_mtime()
 
     def clear(self):
         """Clear session data (logout)."""
@@ -71,26 +126,87 @@ class Session:
         self._backend = None
         if self.session_file.exists():
             self.session_file.unlink()
+        self._mtime = None
 
     @property
     def is_authenticated(self) -> bool:
         return self.token is not None
 
+    @property
+    def pool(self) -> ConnectionPool:
+        """Keep-alive connection pool, kept across backend rebuilds."""
+        base_url = self.base_url.rstrip("/")
+        if self._pool is None or self._pool_url != base_url:
+            if self._pool is not None:
+                self._pool.close()
+            self._pool = ConnectionPool(base_url)
+            self._pool_url = base_url
+            self.breaker = CircuitBreaker()
+        return self._pool
+
     @property
     def backend(self) -> HanesBackend:
         """Get or create the API backend client."""
-        if self._backend is None:
+        cache = self.cache if self.cache_enabled else None
+        if (self._backend is None or self._backend.cache is not cache
+                or self._backend.limiter is not self.limiter
+                or self._backend.base_url != self.base_url.rstrip("/")):
             self._backend = HanesBackend(
                 base_url=self.base_url,
                 token=self.token,
                 company=self.company,
                 plant=self.plant,
+                pool=self.pool,
+                cache=cache,
+                retry=self.retry,
+                breaker=self.breaker,
+                singleflight=self.singleflight,
+                limiter=self.limiter,
+                metrics=self.metrics,
+                write_queue=self.write_queue,
             )
         return self._backend
 
+    @property
+    def replica(self):
+        """Local SQLite mirror of master data, filled by `sync`."""
+        if self._replica is None:
+            from cli_anything.hanes.utils.replica import DEFAULT_REPLICA_FILE, Replica
+            self._replica = Replica(self.session_file.parent / DEFAULT_REPLICA_FILE)
+        return self._replica
+
+    def configure_limits(self, rate: float | None = None,
+                         burst: float | None = None,
+                         max_inflight: int | None = None,
+                         shared: bool = False):
+        """Limit requests per second and in flight; no arguments removes
+        the limit. With ``shared`` the limits are coordinated through lock
+        files next to the session file, across every process using the
+        same backend URL. An unchanged configuration keeps the existing
+        limiter and its metrics."""
+        config = (rate, burst, max_inflight, shared, self.base_url.rstrip("/"))
+        if config == self._limiter_config:
+            return
+        self._limiter_config = config
+        if not rate and not max_inflight:
+            self.limiter = None
+        elif shared:
+            self.limiter = RateLimiter.for_backend(
+                self.base_url, self.session_file.parent, rate=rate,
+                burst=burst, max_inflight=max_inflight)
+        else:
+            self.limiter = RateLimiter(rate=rate, burst=burst,
+                                       max_inflight=max_inflight)
+
+    def configure_metrics(self, path: str | Path | None = None):
+        """Append one NDJSON record per request to ``path`` (None: off)."""
+        self.metrics.set_path(path)
+
     def login(self, email: str, password: str) -> dict:
         """Authenticate and store the session."""
-        client = HanesBackend(base_url=self.base_url)
+        client = HanesBackend(base_url=self.base_url, pool=self.pool,
+                              retry=self.retry, breaker=self.breaker,
+                              limiter=self.limiter, metrics=self.metrics)
         result = client.login(email, password)
 
         data = result.get("data", result)
@@ -0,0 +1,163 @@
+"""
+@file sync.py
+@description `sync` command: mirror master data into the local replica.
+    Parts, processes, BOMs, routings, common codes and warehouses are
+    copied into ~/.cli-anything-hanes/replica.sqlite (utils/replica.py);
+    list commands with --local then answer from it without a round trip.
+
+    Usage:
+        cli-anything-hanes sync                  # every resource
+        cli-anything-hanes sync -r parts --full
+        cli-anything-hanes sync status --remote
+        cli-anything-hanes master parts --local -s AVSS
+        cli-anything-hanes master search "AVS 0.5sq 흑색"
+"""
+
+import time
+
+import click
+
+from cli_anything.hanes.core.session import Session
+from cli_anything.hanes.utils.codec import dumps_pretty
+from cli_anything.hanes.utils.hanes_backend import page_items
+from cli_anything.hanes.utils.replica import RESOURCES, ReplicaMissing
+
+
+def local_list(ctx, name: str, search: str | None = None,
+               filters: dict | None = None, page: int = 1, limit: int = 20,
+               fetch_all: bool = False):
+    """A list command's result from the replica (for --local)."""
+    session: Session = ctx.obj["session"]
+    try:
+        if fetch_all:
+            # Fail before render() starts streaming.
+            session.replica.query(name, limit=1)
+            return session.replica.iter_records(name, search, filters)
+        return session.replica.query(name, search, filters, page, limit)
+    except ReplicaMissing as e:
+        raise click.UsageError(str(e))
+
+
+def local_search(ctx, query: str, names: tuple, limit: int = 20) -> dict:
+    """Ranked matches from the replica's search index (`master search`)."""
+    session: Session = ctx.obj["session"]
+    try:
+        return session.replica.search(query, names, limit)
+    except ReplicaMissing as e:
+        raise click.UsageError(str(e))
+
+
+def _age(seconds: float | None) -> str:
+    if seconds is None:
+        return "never"
+    for unit, size in (("d", 86400), ("h", 3600), ("m", 60)):
+        if seconds >= size:
+            return f"{seconds / size:.1f}{unit}"
+    return f"{seconds:.0f}s"
+
+
+@click.group("sync", invoke_without_command=True)
+@click.option("--resource", "-r", "resources", multiple=True,
+              type=click.Choice(list(RESOURCES)),
+              help="Resource to sync (repeatable; default: all)")
+@click.option("--full", is_flag=True, default=False,
+              help="Diff the full listings instead of pulling changes")
+@click.pass_context
+def sync_group(ctx, resources, full):
+    """Mirror master data into the local SQLite replica.
+
+    Pulls only records changed since the last updatedAt watermark when
+    the backend supports it; otherwise diffs the full listing by key and
+    content hash, which also removes deleted records. A full diff runs at
+    least once a day either way.
+    """
+    if ctx.invoked_subcommand is not None:
+        return
+    session: Session = ctx.obj["session"]
+    json_mode = ctx.obj.get("json_mode")
+    # Reference endpoints are cached; the replica must see the backend.
+    cache_enabled, session.cache_enabled = session.cache_enabled, False
+    results = []
+    try:
+        for name in resources or RESOURCES:
+            result = session.replica.sync(session.backend, name, full=full)
+            results.append(result)
+            if not json_mode:
+                click.echo(f"sync: {name} {result['mode']}: {result['fetched']} fetched, "
+                           f"+{result['inserted']} ~{result['updated']} "
+                           f"-{result['deleted']} in {result['duration_ms']:.0f}ms",
+                           err=True)
+    finally:
+        session.cache_enabled = cache_enabled
+    if json_mode:
+        click.echo(dumps_pretty({"data": results}))
+        return
+    from cli_anything.hanes.utils.repl_skin import ReplSkin
+    ReplSkin("hanes").table(
+        ["Resource", "Mode", "Rows", "Inserted", "Updated", "Deleted", "ms"],
+        [[r["resource"], r["mode"], str(r["rows"]), str(r["inserted"]),
+          str(r["updated"]), str(r["deleted"]), f"{r['duration_ms']:.0f}"]
+         for r in results])
+
+
+@sync_group.command("status")
+@click.option("--remote", is_flag=True, default=False,
+              help="Also ask the backend how many records it has / changed")
+@click.pass_context
+def sync_status(ctx, remote):
+    """Show how old each part of the replica is.
+
+    With --remote, also compare record counts with the backend and, for
+    incrementally synced resources, count records updated at or after
+    the watermark.
+    """
+    session: Session = ctx.obj["session"]
+    replica = session.replica
+    now = time.time()
+    rows = []
+    for name, res in RESOURCES.items():
+        state = replica.state(name) if replica.path.exists() else None
+        row = {"resource": name, "rows": None, "mode": None, "watermark": None,
+               "synced_at": None, "age_s": None}
+        if state is not None:
+            row.update(rows=state["rows"], mode=state["mode"],
+                       watermark=state["watermark"], synced_at=state["synced_at"],
+                       age_s=round(now - state["synced_at"], 1))
+        if remote:
+            cache_enabled, session.cache_enabled = session.cache_enabled, False
+            try:
+                backend = session.backend
+                row["remote_total"] = _remote_total(backend.get(res.path, params={"limit": 1}))
+                row["changed"] = None
+                if row["watermark"]:
+                    row["changed"] = _remote_total(backend.get(res.path, params={
+                        "limit": 1, "updatedAfter": row["watermark"]}))
+            finally:
+                session.cache_enabled = cache_enabled
+        rows.append(row)
+    if ctx.obj.get("json_mode"):
+        click.echo(dumps_pretty({"path": str(replica.path), "data": rows}))
+        return
+    from cli_anything.hanes.utils.repl_skin import ReplSkin
+    headers = ["Resource", "Rows", "Mode", "Synced", "Watermark"]
+    if remote:
+        headers += ["Remote", "Changed"]
+    table = []
+    for r in rows:
+        line = [r["resource"], "-" if r["rows"] is None else str(r["rows"]),
+                r["mode"] or "-", f"{_age(r['age_s'])} ago" if r["age_s"] is not None
+                else "never", r["watermark"] or "-"]
+        if remote:
+            line += ["?" if r["remote_total"] is None else str(r["remote_total"]),
+                     "-" if r["changed"] is None else str(r["changed"])]
+        table.append(line)
+    ReplSkin("hanes").table(headers, table)
+
+
+def _remote_total(result) -> int | None:
+    """Record count from a list response's meta, if it reports one."""
+    meta = result.get("meta") if isinstance(result, dict) else None
+    if isinstance(meta, dict) and "total" in meta:
+        return int(meta["total"])
+    items, has_next = page_items(result, 1, 1)
+    return None if has_next else len(items)
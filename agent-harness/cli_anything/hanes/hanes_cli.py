@@ -13,27 +13,76 @@
 import json
 import shlex
 import sys
+from pathlib import Path
 
 import click
 
 from cli_anything.hanes import __version__
-from cli_anything.hanes.core.session import Session
-from cli_anything.hanes.core.master import master_group
-from cli_anything.hanes.core.material import material_group
-from cli_anything.hanes.core.production import production_group
-from cli_anything.hanes.core.quality import quality_group
-from cli_anything.hanes.core.inventory import inventory_group
-
-
-@click.group(invoke_without_command=True)
+from cli_anything.hanes.core.session import Session, DEFAULT_SESSION_FILE
+from cli_anything.hanes.utils.codec import dumps_pretty
+from cli_anything.hanes.utils.lazy_group import LazyGroup
+from cli_anything.hanes.utils.output import FORMATS
+
+
+# Subcommand groups are imported only when dispatched (see LazyGroup).
+_LAZY_SUBCOMMANDS = {
+    "master": "cli_anything.hanes.core.master:master_group",
+    "material": "cli_anything.hanes.core.material:material_group",
+    "production": "cli_anything.hanes.core.production:production_group",
+    "quality": "cli_anything.hanes.core.quality:quality_group",
+    "inventory": "cli_anything.hanes.core.inventory:inventory_group",
+    "daemon": "cli_anything.hanes.core.daemon:daemon_group",
+    "batch": "cli_anything.hanes.core.batch:batch_command",
+    "loadtest": "cli_anything.hanes.core.loadtest:loadtest_command",
+    "import": "cli_anything.hanes.core.importer:import_command",
+    "queue": "cli_anything.hanes.core.queue:queue_group",
+    "sync": "cli_anything.hanes.core.sync:sync_group",
+}
+
+
+@click.group(cls=LazyGroup, lazy_subcommands=_LAZY_SUBCOMMANDS,
+             invoke_without_command=True)
 @click.option("--json", "json_mode", is_flag=True, default=False,
               help="Output in JSON format for agent consumption")
+@click.option("--format", "output_format", type=click.Choice(FORMATS),
+              default=None,
+              help="Output format for results (default: table; json with --json)")
 @click.option("--base-url", default=None,
               help="API base URL (default: http://localhost:3003/api/v1)")
 @click.option("--session-file", default=None, help="Path to session file")
+@click.option("--no-cache", is_flag=True, default=False,
+              help="Bypass the reference-data response cache")
+@click.option("--rate-limit", type=click.FloatRange(min=0, min_open=True),
+              default=None, envvar="CLI_ANYTHING_HANES_RATE_LIMIT",
+              help="Max API requests per second")
+@click.option("--burst", type=click.FloatRange(min=1), default=None,
+              envvar="CLI_ANYTHING_HANES_BURST",
+              help="Requests allowed at once before --rate-limit applies")
+@click.option("--max-inflight", type=click.IntRange(min=1), default=None,
+              envvar="CLI_ANYTHING_HANES_MAX_INFLIGHT",
+              help="Max concurrent API requests")
+@click.option("--shared-limits", is_flag=True, default=False,
+              envvar="CLI_ANYTHING_HANES_SHARED_LIMITS",
+              help="Apply the limits across all processes on this machine")
+@click.option("--trace", is_flag=True, default=False,
+              envvar="CLI_ANYTHING_HANES_TRACE",
+              help="Print a request timing waterfall to stderr after each command")
+@click.option("--metrics-file", type=click.Path(dir_okay=False), default=None,
+              envvar="CLI_ANYTHING_HANES_METRICS_FILE",
+              help="Append one NDJSON timing record per API request")
+@click.option("--profile", "profile_path", type=click.Path(dir_okay=False),
+              default=None,
+              help="Profile the command: write pstats to this file and "
+                   "collapsed stacks next to it (.folded)")
+@click.option("--profile-top", type=click.IntRange(min=1), default=20,
+              show_default=True, help="Functions listed in the --profile report")
+@click.option("--profile-imports", is_flag=True, default=False,
+              help="Report module import cost for this command")
 @click.version_option(version=__version__, prog_name="cli-anything-hanes")
 @click.pass_context
-def cli(ctx, json_mode, base_url, session_file):
+def cli(ctx, json_mode, output_format, base_url, session_file, no_cache,
+        rate_limit, burst, max_inflight, shared_limits, trace, metrics_file,
+        profile_path, profile_top, profile_imports):
     """HANES MES CLI — Command-line interface to the HANES Manufacturing Execution System.
 
     Wraps the HANES MES REST API so AI agents and power users can operate
@@ -41,18 +90,65 @@ def cli(ctx, json_mode, base_url, session_file):
     """
     ctx.ensure_object(dict)
 
-    session = Session(session_file=session_file)
+    if profile_imports:
+        # main() handles the flag before anything is imported; here it can
+        # only come from the REPL / daemon, where the imports are done.
+        raise click.UsageError("--profile-imports must be given on the "
+                               "command line, before the subcommand")
+    if profile_path:
+        _start_profile(ctx, profile_path, profile_top)
+
+    # Long-lived callers (REPL, daemon, batch) pass the same obj back in,
+    # so sessions and their connection pools / caches stay warm.
+    sessions = ctx.obj.setdefault("sessions", {})
+    key = str(Path(session_file).resolve() if session_file else DEFAULT_SESSION_FILE)
+    session = sessions.get(key)
+    if session is None:
+        session = sessions[key] = Session(session_file=session_file)
+    else:
+        session.reload_if_changed()
     if base_url:
         session.base_url = base_url
         session.save()
-
+    session.cache_enabled = not no_cache
+    session.configure_limits(rate=rate_limit, burst=burst,
+                             max_inflight=max_inflight, shared=shared_limits)
+    session.configure_metrics(metrics_file)
+
+    # --trace given when starting the REPL applies to every command in it.
+    if ctx.invoked_subcommand in (None, "repl"):
+        ctx.obj["trace"] = trace
+    elif trace or ctx.obj.get("trace"):
+        records = session.metrics.begin()
+        ctx.call_on_close(lambda: _print_trace(session, records))
+
+    output_format = output_format or ("json" if json_mode else "table")
     ctx.obj["session"] = session
-    ctx.obj["json_mode"] = json_mode
+    ctx.obj["format"] = output_format
+    # Machine-readable formats imply JSON for commands without a record view.
+    ctx.obj["json_mode"] = output_format != "table"
 
     if ctx.invoked_subcommand is None:
         ctx.invoke(repl)
 
 
+def _start_profile(ctx: click.Context, path: str, top: int):
+    from cli_anything.hanes.utils.profiling import CommandProfiler
+
+    profiler = CommandProfiler(path, top=top)
+    if not profiler.start():
+        click.echo("Warning: a profiler is already running; "
+                   "--profile ignored", err=True)
+        return
+    ctx.call_on_close(lambda: click.echo(profiler.stop(), err=True))
+
+
+def _print_trace(session: Session, records: list):
+    session.metrics.end()
+    if records:
+        click.echo(session.metrics.waterfall(records), err=True)
+
+
 # ── Auth commands ────────────────────────────────────────────────
 
 @cli.group("auth")
@@ -72,7 +168,7 @@ def auth_login(ctx, email, password):
     try:
         result = session.login(email, password)
         if ctx.obj.get("json_mode"):
-            click.echo(json.dumps(result, indent=2, ensure_ascii=False, default=str))
+            click.echo(dumps_pretty(result))
         else:
             from cli_anything.hanes.utils.repl_skin import ReplSkin
             skin = ReplSkin("hanes")
@@ -103,7 +199,7 @@ def auth_me(ctx):
     try:
         result = session.backend.me()
         if ctx.obj.get("json_mode"):
-            click.echo(json.dumps(result, indent=2, ensure_ascii=False, default=str))
+            click.echo(dumps_pretty(result))
         else:
             from cli_anything.hanes.utils.repl_skin import ReplSkin
             skin = ReplSkin("hanes")
@@ -140,7 +236,7 @@ def auth_status(ctx):
     session: Session = ctx.obj["session"]
     data = session.to_dict()
     if ctx.obj.get("json_mode"):
-        click.echo(json.dumps(data, indent=2, ensure_ascii=False, default=str))
+        click.echo(dumps_pretty(data))
     else:
         from cli_anything.hanes.utils.repl_skin import ReplSkin
         skin = ReplSkin("hanes")
@@ -188,7 +284,7 @@ def dashboard_kpi(ctx):
     session: Session = ctx.obj["session"]
     result = session.backend.get_dashboard_kpi()
     if ctx.obj.get("json_mode"):
-        click.echo(json.dumps(result, indent=2, ensure_ascii=False, default=str))
+        click.echo(dumps_pretty(result))
     else:
         from cli_anything.hanes.utils.repl_skin import ReplSkin
         skin = ReplSkin("hanes")
@@ -198,16 +294,79 @@ def dashboard_kpi(ctx):
                 {k: str(v) for k, v in data.items()}, title="Dashboard KPI"
             )
         else:
-            click.echo(json.dumps(result, indent=2, ensure_ascii=False, default=str))
+            click.echo(dumps_pretty(result))
+
+
+# ── Health ───────────────────────────────────────────────────────
+
+@cli.command("health")
+@click.pass_context
+def health(ctx):
+    """Ping the backend; show retry / breaker counters and latencies."""
+    session: Session = ctx.obj["session"]
+    backend = session.backend
+    data = {"base_url": backend.base_url, "reachable": backend.ping(),
+            **backend.resilience_stats(),
+            "endpoints": session.metrics.endpoints()}
+    if ctx.obj.get("json_mode"):
+        click.echo(json.dumps(data, indent=2))
+    else:
+        from cli_anything.hanes.utils.repl_skin import ReplSkin
+        skin = ReplSkin("hanes")
+        skin.status_block({
+            "API URL": data["base_url"],
+            "Reachable": "Yes" if data["reachable"] else "No",
+            "Circuit": data["breaker"]["state"],
+        }, title="Backend Health")
+        skin.status_block({k: str(v) for k, v in data["retry"].items()},
+                          title="Retries")
+        skin.status_block({k: str(v) for k, v in data["breaker"].items()
+                           if k != "state"}, title="Circuit Breaker")
+        if "limiter" in data:
+            skin.status_block({k: str(v) for k, v in data["limiter"].items()},
+                              title="Rate Limiter")
+        if data["endpoints"]:
+            skin.table(["Endpoint", "Count", "p50 ms", "p95 ms", "p99 ms", "Max ms"],
+                       [[name, s["count"], s["p50_ms"], s["p95_ms"], s["p99_ms"],
+                         s["max_ms"]] for name, s in data["endpoints"].items()])
+
+
+# ── Cache ────────────────────────────────────────────────────────
+
+@cli.group("cache")
+def cache_group():
+    """Reference-data response cache."""
+    pass
+
 
+@cache_group.command("stats")
+@click.pass_context
+def cache_stats(ctx):
+    """Show cache hit/miss counters."""
+    session: Session = ctx.obj["session"]
+    enabled = session.cache is not None and session.cache_enabled
+    stats = session.cache.stats() if enabled else {"enabled": False}
+    if ctx.obj.get("json_mode"):
+        click.echo(json.dumps(stats, indent=2))
+    else:
+        from cli_anything.hanes.utils.repl_skin import ReplSkin
+        ReplSkin("hanes").status_block(
+            {k: str(v) for k, v in stats.items()}, title="Response Cache"
+        )
 
-# ── Register subcommand groups ───────────────────────────────────
 
-cli.add_command(master_group)
-cli.add_command(material_group)
-cli.add_command(production_group)
-cli.add_command(quality_group)
-cli.add_command(inventory_group)
+@cache_group.command("clear")
+@click.pass_context
+def cache_clear(ctx):
+    """Drop all cached responses."""
+    session: Session = ctx.obj["session"]
+    if session.cache is not None:
+        session.cache.clear()
+    if ctx.obj.get("json_mode"):
+        click.echo(json.dumps({"message": "Cache cleared"}))
+    else:
+        from cli_anything.hanes.utils.repl_skin import ReplSkin
+        ReplSkin("hanes").success("Cache cleared")
 
 
 # ── REPL ─────────────────────────────────────────────────────────
@@ -238,6 +397,7 @@ def repl(ctx):
         "master processes": "List processes",
         "master boms": "List BOMs",
         "master routings": "List routings",
+        "master search <query>": "Search parts/BOM in the local replica",
         "material arrivals": "List arrivals",
         "material lots": "List material lots",
         "material stocks": "List material stocks",
@@ -248,6 +408,14 @@ def repl(ctx):
         "inventory product-stocks": "List product stocks",
         "inventory warehouses": "List warehouses",
         "dashboard kpi": "Show KPI summary",
+        "health": "Ping backend, show retry/breaker counters",
+        "cache stats": "Show response cache counters",
+        "queue status": "Show writes queued while offline",
+        "queue flush": "Replay queued writes to the backend",
+        "sync": "Mirror master data into the local replica",
+        "sync status": "Show how far behind the replica is",
+        "loadtest": "Simulate line operators, report latency",
+        "import": "Bulk-create records from a CSV/XLSX file",
         "help": "Show this help",
         "quit / exit": "Exit the REPL",
     }
@@ -295,6 +463,9 @@ def repl(ctx):
 
 def main():
     """CLI entry point for console_scripts."""
+    if "--profile-imports" in sys.argv[1:]:
+        from cli_anything.hanes.utils.profiling import profile_imports
+        sys.exit(profile_imports(sys.argv[1:]))
     cli(obj={})
 
 
@@ -4,10 +4,18 @@
     Tests use synthetic data — no external dependencies required.
 """
 
+import asyncio
 import json
+import multiprocessing
 import os
+import sys
 import tempfile
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
 from unittest.mock import patch, MagicMock
 
 import pytest
@@ -16,6 +24,128 @@ from cli_anything.hanes.core.session import Session
 from cli_anything.hanes.utils.hanes_backend import (
     HanesBackend, HanesAPIError, DEFAULT_BASE_URL,
 )
+from cli_anything.hanes.utils.cache import ResponseCache
+from cli_anything.hanes.utils.disk_cache import DiskCache
+from cli_anything.hanes.utils.hanes_async import HanesAsyncBackend
+from cli_anything.hanes.utils.http_pool import ConnectionPool
+
+
+# ── Local stub server ────────────────────────────────────────────
+
+
+def _paged(query: dict, total: int) -> dict:
+    """Backend-style paged envelope over `total` synthetic parts."""
+    page = int(query.get("page", ["1"])[0])
+    limit = int(query["limit"][0])
+    start = (page - 1) * limit
+    rows = [{"itemCode": f"P{n:04d}", "itemName": f"품목 {n}"}
+            for n in range(start, min(start + limit, total))]
+    pages = -(-total // limit)
+    return {"success": True, "data": rows,
+            "meta": {"page": page, "limit": limit, "total": total,
+                     "totalPages": pages, "hasNext": page < pages}}
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Keep-alive JSON handler; records the client port of every request."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self):
+        srv = self.server
+        srv.ports.append(self.client_address[1])
+        srv.paths.append(self.path)
+        query = parse_qs(urlsplit(self.path).query)
+        length = int(self.headers.get("Content-Length") or 0)
+        body_in = self.rfile.read(length) if length else b""
+        srv.request_encodings.append(self.headers.get("Content-Encoding"))
+        srv.accept_encodings.append(self.headers.get("Accept-Encoding"))
+        if self.headers.get("Content-Encoding") == "gzip":
+            body_in = zlib.decompress(body_in, 16 + zlib.MAX_WBITS)
+        with srv.lock:
+            srv.inflight += 1
+            srv.max_inflight = max(srv.max_inflight, srv.inflight)
+        try:
+            if "/slow" in self.path or srv.slow_all:
+                time.sleep(srv.latency)
+        finally:
+            with srv.lock:
+                srv.inflight -= 1
+        srv.idempotency_keys.append(self.headers.get("Idempotency-Key"))
+        with srv.lock:
+            unavailable = srv.fail_next > 0
+            srv.fail_next -= unavailable
+        if unavailable:
+            status, payload = srv.fail_status, {"message": "Unavailable"}
+        elif self.path.startswith("/api/v1/missing"):
+            status, payload = 404, {"message": "Not found"}
+        elif "limit" in query:
+            status, payload = 200, _paged(query, srv.total)
+        else:
+            status, payload = 200, {"method": self.command, "path": self.path,
+                                    "body": body_in.decode("utf-8") or None}
+        body = json.dumps(payload).encode("utf-8")
+        etag = f'W/"{hash(body) & 0xffffffff:x}"'
+        if status == 200 and self.headers.get("If-None-Match") == etag:
+            status, body = 304, b""
+        coding = srv.response_encoding
+        if coding and coding in (self.headers.get("Accept-Encoding") or ""):
+            body = zlib.compress(body) if coding == "deflate" else \
+                zlib.compress(body, wbits=16 + zlib.MAX_WBITS)
+        else:
+            coding = None
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        if coding and status != 304:
+            self.send_header("Content-Encoding", coding)
+        self.send_header("ETag", etag)
+        if unavailable and srv.retry_after is not None:
+            self.send_header("Retry-After", srv.retry_after)
+        if status != 304:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        # Drop the socket without announcing it, like an idle-timeout close.
+        if srv.drop_after_reply:
+            self.close_connection = True
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _reply
+
+
+class _StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 64
+
+
+@pytest.fixture
+def stub_server():
+    httpd = _StubServer(("127.0.0.1", 0), _StubHandler)
+    httpd.ports = []
+    httpd.paths = []
+    httpd.total = 0
+    httpd.drop_after_reply = False
+    httpd.lock = threading.Lock()
+    httpd.inflight = httpd.max_inflight = 0
+    httpd.latency = 0.1
+    httpd.slow_all = False
+    httpd.fail_next = 0
+    httpd.fail_status = 503
+    httpd.retry_after = None
+    httpd.idempotency_keys = []
+    httpd.request_encodings = []
+    httpd.accept_encodings = []
+    httpd.response_encoding = None
+    t = threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True)
+    t.start()
+    host, port = httpd.server_address[:2]
+    httpd.base_url = f"http://{host}:{port}/api/v1"
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
 
 
 # ── Session Tests ────────────────────────────────────────────────
@@ -187,6 +317,2465 @@ class TestHanesBackend:
         assert b.ping() is False
 
 
+# ── Connection Pool Tests ────────────────────────────────────────
+
+
+class TestConnectionPool:
+    """Keep-alive pooling in HanesBackend._request."""
+
+    def test_reuses_connection_across_methods(self, stub_server):
+        """get/post/put/patch/delete share one keep-alive socket."""
+        b = HanesBackend(base_url=stub_server.base_url)
+        assert b.get("/master/parts", {"page": 1})["method"] == "GET"
+        assert b.post("/master/parts", {"itemCode": "A"})["body"] == '{"itemCode": "A"}'
+        b.put("/master/parts/A", {"x": 1})
+        b.patch("/production/job-orders/1/start")
+        b.delete("/master/parts/A")
+        assert len(set(stub_server.ports)) == 1
+        assert b.pool.stats()["created"] == 1
+        assert b.pool.stats()["reused"] == 4
+
+    def test_reconnects_on_stale_socket(self, stub_server):
+        """A socket closed by the server is replaced transparently."""
+        stub_server.drop_after_reply = True
+        b = HanesBackend(base_url=stub_server.base_url)
+        for _ in range(3):
+            assert b.get("/master/parts")["method"] == "GET"
+        assert len(set(stub_server.ports)) == 3
+
+    def test_stale_socket_resends_only_safe_requests(self, stub_server):
+        """A keyless write is not sent twice: the reset may have come after
+        the server read it."""
+        stub_server.drop_after_reply = True
+        pool = ConnectionPool(stub_server.base_url)
+        url = stub_server.base_url + "/production/prod-results"
+        pool.request("GET", url)
+        with pytest.raises(OSError):
+            pool.request("POST", url, b"{}", {"Content-Type": "application/json"})
+        pool.request("GET", url)
+        resp = pool.request("POST", url, b"{}", {"Idempotency-Key": "k-1"})
+        assert resp.status == 200 and pool.stats()["created"] == 3
+        assert stub_server.idempotency_keys.count("k-1") == 1
+        pool.close()
+
+    def test_shared_between_threads(self, stub_server):
+        """Concurrent callers never open more than pool_size sockets."""
+        b = HanesBackend(base_url=stub_server.base_url, pool_size=2)
+        errors = []
+
+        def worker():
+            # Distinct URLs, so single-flight does not coalesce them.
+            try:
+                for i in range(10):
+                    b.get("/master/parts", {"t": threading.get_ident(), "i": i})
+            except Exception as e:  # pragma: no cover - reported below
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert not errors
+        assert len(stub_server.ports) == 80
+        assert len(set(stub_server.ports)) <= 2
+
+    def test_http_error_maps_to_api_error(self, stub_server):
+        """4xx responses raise HanesAPIError with the server message."""
+        b = HanesBackend(base_url=stub_server.base_url)
+        with pytest.raises(HanesAPIError) as exc:
+            b.get("/missing")
+        assert exc.value.status == 404
+        assert exc.value.message == "Not found"
+        assert b.get("/master/parts")["method"] == "GET"
+
+    def test_unreachable_raises_connection_error(self):
+        """Refused connections surface as ConnectionError."""
+        b = HanesBackend(base_url="http://127.0.0.1:19999/api/v1")
+        with pytest.raises(ConnectionError):
+            b.get("/master/parts")
+
+    def test_session_keeps_pool_across_context_change(self, tmp_path):
+        """set_context rebuilds the client but keeps its pool."""
+        s = Session(session_file=str(tmp_path / "session.json"))
+        pool = s.backend.pool
+        s.set_context(company="HQ")
+        assert s.backend.pool is pool
+        assert s.backend.company == "HQ"
+
+
+# ── Retry / Circuit Breaker Tests ────────────────────────────────
+
+
+class TestResilience:
+    """RetryPolicy and CircuitBreaker in HanesBackend._send."""
+
+    DOWN_URL = "http://127.0.0.1:19999/api/v1"
+
+    def _backend(self, base_url, attempts=4, threshold=100, reset=5.0):
+        from cli_anything.hanes.utils.resilience import (
+            CircuitBreaker, RetryPolicy,
+        )
+        return HanesBackend(
+            base_url=base_url,
+            retry=RetryPolicy(max_attempts=attempts, base_delay=0),
+            breaker=CircuitBreaker(failure_threshold=threshold,
+                                   reset_timeout=reset))
+
+    def test_get_retries_through_503(self, stub_server):
+        stub_server.fail_next = 2
+        b = self._backend(stub_server.base_url)
+        assert b.get("/master/parts")["method"] == "GET"
+        assert len(stub_server.paths) == 3
+        stats = b.resilience_stats()
+        assert stats["retry"]["retries"] == 2
+        assert stats["retry"]["recovered"] == 1
+        assert stats["breaker"]["state"] == "closed"
+
+    def test_gives_up_after_max_attempts(self, stub_server):
+        stub_server.fail_next = 10
+        b = self._backend(stub_server.base_url, attempts=3)
+        with pytest.raises(HanesAPIError) as exc:
+            b.get("/master/parts")
+        assert exc.value.status == 503
+        assert len(stub_server.paths) == 3
+        assert b.retry.stats()["exhausted"] == 1
+
+    def test_write_without_key_is_not_retried(self, stub_server):
+        stub_server.fail_next = 1
+        b = self._backend(stub_server.base_url)
+        with pytest.raises(HanesAPIError):
+            b.post("/production/prod-results", {"qty": 1})
+        assert len(stub_server.paths) == 1
+        assert b.retry.stats()["retries"] == 0
+
+    def test_write_with_idempotency_key_is_retried(self, stub_server):
+        stub_server.fail_next = 1
+        b = self._backend(stub_server.base_url)
+        b.post("/production/prod-results", {"qty": 1}, idempotency_key="k-1")
+        assert stub_server.idempotency_keys == ["k-1", "k-1"]
+
+    def test_refused_connection_retries_then_raises(self):
+        b = self._backend(self.DOWN_URL, attempts=3)
+        with pytest.raises(ConnectionError):
+            b.post("/master/parts", {"itemCode": "A"})
+        stats = b.retry.stats()
+        assert stats["retries"] == 2
+        assert stats["exhausted"] == 1
+
+    def test_breaker_fails_fast_while_open(self):
+        from cli_anything.hanes.utils.resilience import CircuitOpenError
+        b = self._backend(self.DOWN_URL, attempts=1, threshold=2)
+        for _ in range(2):
+            with pytest.raises(ConnectionError):
+                b.get("/master/parts")
+        assert b.breaker.state == "open"
+        t0 = time.perf_counter()
+        with pytest.raises(CircuitOpenError):
+            b.get("/master/parts")
+        assert time.perf_counter() - t0 < 0.05
+        assert b.breaker.stats()["short_circuited"] == 1
+
+    def test_breaker_probe_closes_when_backend_returns(self, stub_server):
+        stub_server.fail_next = 2
+        b = self._backend(stub_server.base_url, attempts=1, threshold=2,
+                          reset=0.05)
+        for _ in range(2):
+            with pytest.raises(HanesAPIError):
+                b.get("/master/parts")
+        assert b.breaker.state == "open"
+        time.sleep(0.06)
+        assert b.get("/master/parts")["method"] == "GET"
+        stats = b.breaker.stats()
+        assert stats["state"] == "closed"
+        assert stats["probes"] == 1
+
+    def test_failed_probe_reopens(self):
+        from cli_anything.hanes.utils.resilience import (
+            CircuitBreaker, CircuitOpenError,
+        )
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+        assert breaker.acquire("x") is True
+        with pytest.raises(CircuitOpenError):
+            breaker.probed(False, "x")
+        assert breaker.state == "open"
+        with pytest.raises(CircuitOpenError):
+            breaker.acquire("x")
+
+    def test_async_backend_retries(self, stub_server):
+        from cli_anything.hanes.utils.resilience import RetryPolicy
+        stub_server.fail_next = 1
+
+        async def main():
+            async with HanesAsyncBackend(
+                    base_url=stub_server.base_url,
+                    retry=RetryPolicy(base_delay=0)) as api:
+                return await api.get("/master/parts"), api.retry.stats()
+
+        result, stats = asyncio.run(main())
+        assert result["method"] == "GET"
+        assert stats["recovered"] == 1
+
+    def test_health_command(self, stub_server, tmp_path):
+        from click.testing import CliRunner
+        from cli_anything.hanes.hanes_cli import cli
+        result = CliRunner().invoke(cli, [
+            "--json", "--session-file", str(tmp_path / "s.json"),
+            "--base-url", stub_server.base_url, "health"])
+        assert result.exit_code == 0, result.output
+        data = json.loads(result.output)
+        assert data["reachable"] is True
+        assert data["breaker"]["state"] == "closed"
+        assert set(data["retry"]) == {"requests", "retries", "recovered",
+                                      "exhausted", "throttled"}
+
+
+# ── Single-flight Tests ──────────────────────────────────────────
+
+
+class TestSingleFlight:
+    """Coalescing of identical concurrent GETs."""
+
+    def _burst(self, fn, n=8):
+        barrier = threading.Barrier(n)
+        results, errors = [None] * n, []
+
+        def worker(i):
+            barrier.wait()
+            try:
+                results[i] = fn(i)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return results, errors
+
+    def test_identical_gets_share_one_request(self, stub_server):
+        stub_server.slow_all = True
+        b = HanesBackend(base_url=stub_server.base_url, pool_size=8)
+        results, errors = self._burst(
+            lambda i: b.get("/master/parts", {"page": 1}))
+        assert not errors
+        assert len(stub_server.paths) == 1
+        assert all(r == results[0] for r in results)
+        # Each caller gets its own decoded copy.
+        assert len({id(r) for r in results}) == len(results)
+        assert b.singleflight.stats()["shared"] == 7
+
+    def test_different_params_and_tenants_not_shared(self, stub_server):
+        stub_server.slow_all = True
+        a = HanesBackend(base_url=stub_server.base_url, company="HQ")
+        c = HanesBackend(base_url=stub_server.base_url, company="P2",
+                         pool=a.pool, singleflight=a.singleflight)
+        self._burst(lambda i: (a if i % 2 else c).get(
+            "/master/parts", {"page": i // 4}), n=8)
+        assert len(stub_server.paths) == 4
+
+    def test_error_fans_out(self, stub_server):
+        from cli_anything.hanes.utils.resilience import RetryPolicy
+        stub_server.slow_all = True
+        stub_server.fail_next = 1
+        b = HanesBackend(base_url=stub_server.base_url,
+                         retry=RetryPolicy(max_attempts=1), pool_size=8)
+        _, errors = self._burst(lambda i: b.get("/master/parts"), n=4)
+        assert len(errors) == 4
+        assert all(isinstance(e, HanesAPIError) and e.status == 503
+                   for e in errors)
+        assert len(stub_server.paths) == 1
+
+    def test_writes_never_coalesced(self, stub_server):
+        stub_server.slow_all = True
+        b = HanesBackend(base_url=stub_server.base_url, pool_size=4)
+        self._burst(lambda i: b.post("/master/parts", {"itemCode": "A"}), n=4)
+        assert len(stub_server.paths) == 4
+
+    def test_async_identical_gets_share_one_request(self, stub_server):
+        async def main():
+            async with HanesAsyncBackend(base_url=stub_server.base_url) as api:
+                results = await api.gather(*[api.get("/slow") for _ in range(5)])
+                return results, api.singleflight.stats()
+
+        results, stats = asyncio.run(main())
+        assert len(stub_server.paths) == 1
+        assert len({id(r) for r in results}) == 5
+        assert stats == {"calls": 1, "shared": 4, "inflight": 0}
+
+
+# ── Rate Limiter Tests ───────────────────────────────────────────
+
+
+class TestRateLimit:
+    """Token bucket, in-flight cap and 429 Retry-After handling."""
+
+    def test_token_bucket_spaces_reservations(self):
+        from cli_anything.hanes.utils.ratelimit import TokenBucket
+        bucket = TokenBucket(rate=100, burst=1)
+        waits = [bucket.reserve() for _ in range(20)]
+        assert waits[0] == 0
+        assert waits[-1] == pytest.approx(0.19, abs=0.02)
+
+    def test_rate_limit_applies_to_backend(self, stub_server):
+        from cli_anything.hanes.utils.ratelimit import RateLimiter
+        limiter = RateLimiter(rate=50, burst=1)
+        b = HanesBackend(base_url=stub_server.base_url, limiter=limiter)
+        t0 = time.perf_counter()
+        for i in range(10):
+            b.get("/master/parts", {"i": i})
+        assert time.perf_counter() - t0 >= 0.17
+        stats = limiter.stats()
+        assert stats["acquired"] == 10
+        assert stats["queued"] >= 8
+        assert stats["wait_max_ms"] >= 15
+        assert stats["inflight"] == 0
+
+    def test_max_inflight_caps_concurrency(self, stub_server):
+        from cli_anything.hanes.utils.ratelimit import RateLimiter
+        stub_server.latency = 0.05
+        stub_server.slow_all = True
+        b = HanesBackend(base_url=stub_server.base_url, pool_size=8,
+                         limiter=RateLimiter(max_inflight=2))
+        threads = [threading.Thread(target=b.get, args=("/master/parts", {"i": i}))
+                   for i in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(stub_server.paths) == 6
+        assert stub_server.max_inflight == 2
+
+    def test_shared_slots_coordinate_limiters(self, tmp_path):
+        """Two limiters on one directory act like two processes."""
+        from cli_anything.hanes.utils.ratelimit import RateLimiter
+        a = RateLimiter(max_inflight=1, shared_dir=tmp_path)
+        b = RateLimiter(max_inflight=1, shared_dir=tmp_path)
+        entered = threading.Event()
+
+        def other():
+            with b.permit():
+                entered.set()
+
+        with a.permit():
+            t = threading.Thread(target=other)
+            t.start()
+            assert not entered.wait(0.1)
+        assert entered.wait(1)
+        t.join()
+        assert b.stats()["wait_max_ms"] >= 90
+
+    def test_busy_bucket_lock_gives_back_the_slot(self, stub_server, tmp_path):
+        from cli_anything.hanes.utils.filelock import FileLock
+        from cli_anything.hanes.utils.ratelimit import RateLimiter, RateLimitError
+        limiter = RateLimiter(rate=100, max_inflight=1, shared_dir=tmp_path)
+        limiter.bucket.lock_timeout = 0.05
+        b = HanesBackend(base_url=stub_server.base_url, limiter=limiter)
+        with FileLock(tmp_path / "bucket.lock"):
+            with pytest.raises(RateLimitError):
+                b.get("/master/parts")
+        # Not a backend failure, and the only slot is free again.
+        assert b.resilience_stats()["breaker"]["failures"] == 0
+        assert not stub_server.paths
+        assert b.get("/master/parts")["method"] == "GET"
+
+    def test_interrupted_wait_gives_back_the_slot(self):
+        from cli_anything.hanes.utils import ratelimit
+        limiter = ratelimit.RateLimiter(rate=1, burst=1, max_inflight=1)
+        with limiter.permit():
+            pass
+        with patch.object(ratelimit.time, "sleep", side_effect=KeyboardInterrupt):
+            with pytest.raises(KeyboardInterrupt):
+                with limiter.permit():
+                    pass
+        assert limiter.slots._semaphore.acquire(blocking=False)
+
+    def test_shared_bucket_across_instances(self, tmp_path):
+        from cli_anything.hanes.utils.ratelimit import SharedTokenBucket
+        a = SharedTokenBucket(tmp_path, rate=10, burst=1)
+        b = SharedTokenBucket(tmp_path, rate=10, burst=1)
+        assert a.reserve() == 0
+        assert b.reserve() == pytest.approx(0.1, abs=0.02)
+        a.pause(1.0)
+        assert b.reserve() >= 0.9
+
+    def test_429_retry_after_is_honoured(self, stub_server):
+        from cli_anything.hanes.utils.ratelimit import RateLimiter
+        from cli_anything.hanes.utils.resilience import RetryPolicy
+        stub_server.fail_next = 1
+        stub_server.fail_status = 429
+        stub_server.retry_after = "0.2"
+        limiter = RateLimiter(max_inflight=4)
+        b = HanesBackend(base_url=stub_server.base_url, limiter=limiter,
+                         retry=RetryPolicy(base_delay=0))
+        t0 = time.perf_counter()
+        # Not idempotent, but a 429 was never processed: safe to resend.
+        assert b.post("/production/prod-results", {"qty": 1})["method"] == "POST"
+        assert time.perf_counter() - t0 >= 0.2
+        assert len(stub_server.paths) == 2
+        stats = b.resilience_stats()
+        assert stats["retry"]["throttled"] == 1
+        assert stats["breaker"]["failures"] == 0
+        assert stats["limiter"]["paused"] == 1
+
+    def test_long_retry_after_is_not_slept(self, stub_server):
+        from cli_anything.hanes.utils.resilience import RetryPolicy
+        stub_server.fail_next = 1
+        stub_server.fail_status = 429
+        stub_server.retry_after = "120"
+        b = HanesBackend(base_url=stub_server.base_url,
+                         retry=RetryPolicy(max_retry_after=1))
+        with pytest.raises(HanesAPIError) as exc:
+            b.get("/master/parts")
+        assert exc.value.status == 429
+        assert len(stub_server.paths) == 1
+
+    def test_parse_retry_after(self):
+        from email.utils import formatdate
+        from cli_anything.hanes.utils.resilience import parse_retry_after
+        assert parse_retry_after("3") == 3.0
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("soon") is None
+        later = parse_retry_after(formatdate(time.time() + 60, usegmt=True))
+        assert 55 < later <= 60
+
+    def test_cli_options_configure_limiter(self, stub_server, tmp_path):
+        from click.testing import CliRunner
+        from cli_anything.hanes.hanes_cli import cli
+        args = ["--json", "--session-file", str(tmp_path / "s.json"),
+                "--base-url", stub_server.base_url, "--rate-limit", "5",
+                "--max-inflight", "2", "--shared-limits"]
+        result = CliRunner().invoke(cli, args + ["master", "parts"])
+        assert result.exit_code == 0, result.output
+        shared = list((tmp_path / "ratelimit").iterdir())
+        assert len(shared) == 1
+        assert (shared[0] / "bucket.json").exists()
+        result = CliRunner().invoke(cli, args + ["health"])
+        limiter = json.loads(result.output)["limiter"]
+        assert (limiter["rate"], limiter["max_inflight"]) == (5.0, 2)
+        assert limiter["shared"] is True
+
+
+# ── Compression Tests ────────────────────────────────────────────
+
+
+class TestCompression:
+    """Unit tests for gzip/deflate response decoding and request bodies."""
+
+    def test_accept_encoding_and_gzip_response(self, stub_server):
+        stub_server.response_encoding = "gzip"
+        api = HanesBackend(base_url=stub_server.base_url)
+        assert api.get("/master/parts")["method"] == "GET"
+        assert "gzip" in stub_server.accept_encodings[-1]
+
+    def test_deflate_response(self, stub_server):
+        stub_server.response_encoding = "deflate"
+        api = HanesBackend(base_url=stub_server.base_url)
+        assert api.get("/master/parts")["method"] == "GET"
+
+    def test_compress_off_sends_plain(self, stub_server):
+        stub_server.response_encoding = "gzip"
+        api = HanesBackend(base_url=stub_server.base_url, compress=False)
+        big = {"rows": ["x" * 100] * 500}
+        assert json.loads(api.post("/master/parts", big)["body"]) == big
+        assert stub_server.accept_encodings[-1] == "identity"
+        assert stub_server.request_encodings[-1] is None
+
+    def test_large_body_is_gzipped(self, stub_server):
+        api = HanesBackend(base_url=stub_server.base_url, compress_min_size=1024)
+        small, big = {"itemCode": "A"}, {"rows": ["전선"] * 2000}
+        assert api.post("/master/parts", small)["body"] == '{"itemCode": "A"}'
+        assert json.loads(api.post("/master/parts", big)["body"]) == big
+        assert stub_server.request_encodings == [None, "gzip"]
+
+    def test_stream_decoder_chunks(self):
+        from cli_anything.hanes.utils.compression import StreamDecoder, decoder_for
+        data = json.dumps([{"n": i} for i in range(2000)]).encode()
+        for encoding, blob in (("gzip", zlib.compress(data, wbits=31)),
+                               ("deflate", zlib.compress(data)),
+                               ("deflate", zlib.compress(data, wbits=-15))):
+            dec = StreamDecoder(encoding)
+            out = b"".join(dec.feed(blob[i:i + 7]) for i in range(0, len(blob), 7))
+            assert out + dec.flush() == data
+        assert decoder_for("identity") is None
+        with pytest.raises(ValueError):
+            decoder_for("br")
+
+    def test_async_decodes_gzip(self, stub_server):
+        stub_server.response_encoding = "gzip"
+        stub_server.total = 300
+
+        async def main():
+            async with HanesAsyncBackend(base_url=stub_server.base_url) as api:
+                page = await api.get("/master/parts", {"limit": 300})
+                echo = await api.post("/master/parts", {"rows": ["y"] * 9000})
+                return page, echo
+
+        page, echo = asyncio.run(main())
+        assert len(page["data"]) == 300
+        assert json.loads(echo["body"])["rows"] == ["y"] * 9000
+        assert stub_server.request_encodings[-1] == "gzip"
+
+
+# ── Request Metrics Tests ────────────────────────────────────────
+
+
+class TestMetrics:
+    """Per-request timings, endpoint histograms, --trace, --metrics-file."""
+
+    def test_histogram_percentiles(self):
+        from cli_anything.hanes.utils.metrics import Histogram
+        hist = Histogram()
+        for ms in range(1, 1001):
+            hist.add(float(ms))
+        summary = hist.summary()
+        assert summary["count"] == 1000 and summary["max_ms"] == 1000
+        for key, exact in (("p50_ms", 500), ("p95_ms", 950), ("p99_ms", 990)):
+            assert exact <= summary[key] <= exact * 1.05
+
+    def test_endpoint_collapses_ids(self):
+        from cli_anything.hanes.utils.metrics import endpoint_of
+        assert endpoint_of("PATCH", "/production/job-orders/12/start") == \
+            "PATCH /production/job-orders/{id}/start"
+        assert endpoint_of("GET", "/master/parts?page=2") == "GET /master/parts"
+
+    def test_backend_records_phases(self, stub_server):
+        from cli_anything.hanes.utils.metrics import RequestMetrics
+        metrics = RequestMetrics()
+        b = HanesBackend(base_url=stub_server.base_url, metrics=metrics)
+        records = metrics.begin()
+        b.get("/master/parts")
+        b.get("/master/parts/P-0001")
+        with pytest.raises(HanesAPIError):
+            b.get("/missing")
+        assert metrics.end() is records and len(records) == 3
+        first, second, missing = (r for _, r in records)
+        assert first["connect_ms"] > 0 and first["ttfb_ms"] > 0
+        assert second["connect_ms"] == 0 and second["dns_ms"] == 0
+        assert first["status"] == 200 and first["bytes"] > 0
+        assert missing["status"] == 404
+        assert first["total_ms"] >= first["ttfb_ms"] + first["download_ms"]
+        endpoints = metrics.endpoints()
+        assert endpoints["GET /master/parts/{id}"]["count"] == 1
+        assert set(endpoints["GET /master/parts"]) >= {"p50_ms", "p95_ms", "p99_ms"}
+
+    def test_retries_cache_and_prefetch_traced(self, stub_server):
+        from cli_anything.hanes.utils.metrics import RequestMetrics
+        from cli_anything.hanes.utils.resilience import RetryPolicy
+        metrics = RequestMetrics()
+        b = HanesBackend(base_url=stub_server.base_url, metrics=metrics,
+                         cache=ResponseCache(), retry=RetryPolicy(base_delay=0))
+        stub_server.fail_next = 1
+        stub_server.total = 20
+        records = metrics.begin()
+        b.get("/inventory/warehouses")
+        b.get("/inventory/warehouses")
+        list(b.iter_parts(page_size=10))
+        metrics.end()
+        sources = [(r["source"], r["attempts"]) for _, r in records]
+        assert sources[:2] == [("network", 2), ("cache", 0)]
+        assert len(records) == 4  # both pages, including the prefetched one
+        assert "|" in metrics.waterfall(records)
+
+    def test_cli_trace_and_metrics_file(self, stub_server, tmp_path):
+        from click.testing import CliRunner
+        from cli_anything.hanes.hanes_cli import cli
+        stub_server.total = 15
+        sf, mf = str(tmp_path / "session.json"), tmp_path / "m" / "req.ndjson"
+        args = ["--json", "--session-file", sf, "--base-url", stub_server.base_url,
+                "--trace", "--metrics-file", str(mf)]
+        result = CliRunner().invoke(cli, args + ["master", "parts", "--all",
+                                                 "--limit", "10"])
+        assert result.exit_code == 0, result.output
+        assert json.loads(result.stdout)["total"] == 15
+        assert "trace: 2 request(s)" in result.stderr
+        assert "GET /master/parts (stream)" in result.stderr
+        lines = [json.loads(line) for line in mf.read_text().splitlines()]
+        assert [r["path"] for r in lines] == ["/master/parts"] * 2
+        assert {"dns_ms", "connect_ms", "ttfb_ms", "download_ms", "decode_ms",
+                "status", "bytes"} <= set(lines[0])
+        health = CliRunner().invoke(cli, args[:5] + ["health"])
+        assert "endpoints" in json.loads(health.stdout)
+
+
+# ── Async Backend Tests ──────────────────────────────────────────
+
+
+class TestHanesAsyncBackend:
+    """Unit tests for the asyncio client."""
+
+    def test_same_method_surface(self):
+        """Every public HanesBackend method exists on the async client."""
+        sync_api = {n for n in dir(HanesBackend) if not n.startswith("_")}
+        async_api = {n for n in dir(HanesAsyncBackend) if not n.startswith("_")}
+        assert sync_api - {"close"} <= async_api
+
+    def test_fan_out_runs_concurrently(self, stub_server):
+        """N slow calls take about one latency, not N of them."""
+        async def main():
+            async with HanesAsyncBackend(base_url=stub_server.base_url) as api:
+                t0 = time.perf_counter()
+                results = await api.gather(
+                    *[api.get("/slow", {"i": i}) for i in range(5)]
+                )
+                return results, time.perf_counter() - t0
+
+        results, elapsed = asyncio.run(main())
+        assert [r["method"] for r in results] == ["GET"] * 5
+        assert elapsed < 0.4
+
+    def test_concurrency_bound(self, stub_server):
+        """No more than `concurrency` requests are in flight at once."""
+        async def main():
+            async with HanesAsyncBackend(base_url=stub_server.base_url,
+                                         concurrency=2) as api:
+                await api.gather(*[api.get("/slow", {"i": i}) for i in range(6)])
+                return api.pool.stats()
+
+        stub_server.latency = 0.05
+        stats = asyncio.run(main())
+        assert stub_server.max_inflight == 2
+        assert stats["created"] == 2
+
+    def test_timeout_raises_connection_error(self, stub_server):
+        """A call exceeding the timeout fails and frees its slot."""
+        async def main():
+            async with HanesAsyncBackend(base_url=stub_server.base_url,
+                                         timeout=0.05, concurrency=1) as api:
+                with pytest.raises(ConnectionError, match="no response within 0.05s"):
+                    await api.get("/slow")
+                return await api.get("/master/parts")
+
+        assert asyncio.run(main())["method"] == "GET"
+        # Timeouts are not retried, even for a GET.
+        assert stub_server.paths.count("/api/v1/slow") == 1
+
+    def test_cancellation_frees_slot(self, stub_server):
+        """Cancelled calls close their socket and release the semaphore."""
+        async def main():
+            async with HanesAsyncBackend(base_url=stub_server.base_url,
+                                         concurrency=1) as api:
+                task = asyncio.create_task(api.get("/slow"))
+                await asyncio.sleep(0.02)
+                task.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await task
+                return await api.post("/master/parts", {"itemCode": "A"})
+
+        assert asyncio.run(main())["body"] == '{"itemCode": "A"}'
+
+    def test_http_error_maps_to_api_error(self, stub_server):
+        async def main():
+            async with HanesAsyncBackend(base_url=stub_server.base_url) as api:
+                await api.get("/missing")
+
+        with pytest.raises(HanesAPIError) as exc:
+            asyncio.run(main())
+        assert exc.value.status == 404
+
+
+# ── Auto-pagination Tests ────────────────────────────────────────
+
+
+class TestPagination:
+    """iter_all / iter_* generators and the --all flag."""
+
+    def test_iter_all_walks_every_page(self, stub_server):
+        stub_server.total = 25
+        b = HanesBackend(base_url=stub_server.base_url)
+        codes = [r["itemCode"] for r in b.iter_parts(search="x", page_size=10)]
+        assert codes == [f"P{n:04d}" for n in range(25)]
+        pages = [p for p in stub_server.paths if "limit=10" in p]
+        assert len(pages) == 3
+        assert all("search=x" in p for p in pages)
+
+    def test_iter_all_empty(self, stub_server):
+        b = HanesBackend(base_url=stub_server.base_url)
+        assert list(b.iter_all("/master/parts", page_size=10)) == []
+
+    def test_iter_all_prefetches_next_page(self, stub_server):
+        """Page 2 is requested while page 1 is still being consumed."""
+        stub_server.total = 20
+        b = HanesBackend(base_url=stub_server.base_url)
+        it = b.iter_parts(page_size=10)
+        next(it)
+        deadline = time.monotonic() + 2
+        while time.monotonic() < deadline:
+            if any("page=2" in p for p in stub_server.paths):
+                break
+            time.sleep(0.01)
+        assert any("page=2" in p for p in stub_server.paths)
+        it.close()
+
+    def test_iter_all_without_prefetch(self, stub_server):
+        stub_server.total = 15
+        b = HanesBackend(base_url=stub_server.base_url)
+        it = b.iter_parts(page_size=10, prefetch=False)
+        next(it)
+        assert not any("page=2" in p for p in stub_server.paths)
+        assert len(list(it)) == 14
+
+    def test_page_items_fallbacks(self):
+        from cli_anything.hanes.utils.hanes_backend import page_items
+        assert page_items({"data": [1, 2]}, 1, 2) == ([1, 2], True)
+        assert page_items({"data": [1]}, 1, 2) == ([1], False)
+        assert page_items({"data": [1, 2], "total": 4}, 2, 2) == ([1, 2], False)
+        assert page_items([1, 2, 3], 1, 3) == ([1, 2, 3], True)
+        assert page_items({"data": {"x": 1}}, 1, 2) == ([], False)
+
+    def test_async_iter_all(self, stub_server):
+        stub_server.total = 25
+
+        async def main():
+            async with HanesAsyncBackend(base_url=stub_server.base_url) as api:
+                return [r async for r in api.iter_parts(page_size=10)]
+
+        assert len(asyncio.run(main())) == 25
+
+    def test_cli_all_streams_valid_json(self, stub_server, tmp_path):
+        from click.testing import CliRunner
+        from cli_anything.hanes.hanes_cli import cli
+        stub_server.total = 7
+        sf = str(tmp_path / "session.json")
+        result = CliRunner().invoke(cli, [
+            "--json", "--session-file", sf, "--base-url", stub_server.base_url,
+            "master", "parts", "--all", "--limit", "3",
+        ])
+        assert result.exit_code == 0, result.output
+        data = json.loads(result.output)
+        assert data["total"] == 7
+        assert [r["itemCode"] for r in data["data"]][-1] == "P0006"
+        expected = json.dumps(data, indent=2, ensure_ascii=False) + "\n"
+        assert result.output == expected
+
+    def test_cli_all_table(self, stub_server, tmp_path):
+        from click.testing import CliRunner
+        from cli_anything.hanes.hanes_cli import cli
+        stub_server.total = 5
+        sf = str(tmp_path / "session.json")
+        result = CliRunner().invoke(cli, [
+            "--session-file", sf, "--base-url", stub_server.base_url,
+            "master", "parts", "--all",
+        ])
+        assert result.exit_code == 0, result.output
+        assert "P0004" in result.output
+        assert "Total: 5" in result.output
+        assert any("limit=100" in p for p in stub_server.paths)
+
+    def test_every_list_command_has_all_flag(self):
+        from cli_anything.hanes.core.master import master_group
+        from cli_anything.hanes.core.material import material_group
+        from cli_anything.hanes.core.production import production_group
+        from cli_anything.hanes.core.quality import quality_group
+        from cli_anything.hanes.core.inventory import inventory_group
+        single = {"part", "bom-tree", "order", "start", "complete", "search"}
+        for group in (master_group, material_group, production_group,
+                      quality_group, inventory_group):
+            for name, cmd in group.commands.items():
+                if name in single:
+                    continue
+                opts = {o for p in cmd.params for o in getattr(p, "opts", [])}
+                assert "--all" in opts, f"{group.name} {name}"
+
+
+# ── Streaming JSON Tests ─────────────────────────────────────────
+
+
+class TestStreaming:
+    """Incremental parsing of list responses (iter_all(stream=True))."""
+
+    def test_parser_any_chunking(self):
+        from cli_anything.hanes.utils.jsonstream import ItemParser
+        doc = {"success": True,
+               "data": [{"n": i, "s": "전선 \"]}", "l": [1.5, None]}
+                        for i in range(200)] + [12345, -7, True],
+               "meta": {"page": 1, "hasNext": False}}
+        raw = json.dumps(doc, indent=2, ensure_ascii=False).encode("utf-8")
+        for size in (1, 5, 4096):
+            parser, items = ItemParser(), []
+            for i in range(0, len(raw), size):
+                items += parser.feed(raw[i:i + size])
+            items += parser.close()
+            assert items == doc["data"]
+            assert parser.envelope == {"success": True, "meta": doc["meta"]}
+
+    def test_parser_bare_array_and_errors(self):
+        from cli_anything.hanes.utils.jsonstream import ItemParser
+        parser = ItemParser()
+        assert parser.feed(b'[1, 2') == [1]
+        assert parser.feed(b']') == [2] and parser.close() == []
+        parser = ItemParser()
+        parser.feed(b'{"data": [{"a": 1},')
+        with pytest.raises(ValueError):
+            parser.close()
+        with pytest.raises(ValueError):
+            ItemParser().feed(b'"text"')
+
+    def test_iter_all_stream_walks_every_page(self, stub_server):
+        stub_server.total = 25
+        b = HanesBackend(base_url=stub_server.base_url)
+        codes = [r["itemCode"] for r in b.iter_parts(page_size=10, stream=True)]
+        assert codes == [f"P{n:04d}" for n in range(25)]
+        assert len([p for p in stub_server.paths if "limit=10" in p]) == 3
+        assert b.pool.stats() == {"created": 1, "reused": 2, "idle": 1}
+
+    def test_stream_gzip_and_errors(self, stub_server):
+        from cli_anything.hanes.utils.hanes_backend import HanesAPIError
+        stub_server.total = 30
+        stub_server.response_encoding = "gzip"
+        b = HanesBackend(base_url=stub_server.base_url)
+        assert len(list(b.iter_parts(page_size=7, stream=True))) == 30
+        with pytest.raises(HanesAPIError) as exc:
+            list(b.iter_all("/missing", stream=True))
+        assert exc.value.status == 404
+
+    def test_abandoned_stream_frees_slot(self, stub_server):
+        """Stopping early drops the half-read socket but frees the slot."""
+        stub_server.total = 5000
+        b = HanesBackend(base_url=stub_server.base_url, pool_size=1)
+        it = b.iter_parts(page_size=5000, stream=True)
+        next(it)
+        it.close()
+        assert b.pool.stats()["idle"] == 0
+        assert b.get("/master/parts")["method"] == "GET"
+
+    def test_stream_memory_bounded_by_record(self):
+        """Peak memory of a streamed page is far below the decoded page."""
+        import tracemalloc
+        from cli_anything.hanes.utils.jsonstream import ItemParser
+        raw = json.dumps({"data": [{"itemCode": f"P{i:06d}", "qty": i}
+                                   for i in range(50000)]}).encode()
+
+        def peak(fn):
+            tracemalloc.start()
+            fn()
+            size = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            return size
+
+        def streamed():
+            parser = ItemParser()
+            for i in range(0, len(raw), 65536):
+                for _ in parser.feed(raw[i:i + 65536]):
+                    pass
+            parser.close()
+
+        assert peak(streamed) * 10 < peak(lambda: json.loads(raw.decode()))
+
+    def test_cli_all_uses_stream(self, stub_server, tmp_path):
+        from click.testing import CliRunner
+        from cli_anything.hanes.hanes_cli import cli
+        stub_server.total = 5
+        sf = str(tmp_path / "session.json")
+        with patch.object(HanesBackend, "_stream_page",
+                          autospec=True,
+                          side_effect=HanesBackend._stream_page) as spy:
+            result = CliRunner().invoke(cli, [
+                "--session-file", sf, "--base-url", stub_server.base_url,
+                "--format", "ndjson", "master", "parts", "--all",
+            ])
+        assert result.exit_code == 0, result.output
+        assert len(result.output.splitlines()) == 5
+        assert spy.call_count == 1
+
+
+# ── JSON Codec Tests ─────────────────────────────────────────────
+
+
+def _codec_payload() -> dict:
+    """Values where orjson's and json's formatting could diverge."""
+    from datetime import datetime
+    from decimal import Decimal
+    return {
+        "data": [{"itemCode": f"P{i:04d}", "itemName": "전선 \u2028\x7f\x1f",
+                  "qty": i * 1.5, "rate": i / 7, "big": 1e16 * i,
+                  "ok": i % 2 == 0, "tags": [], "meta": {}, "none": None}
+                 for i in range(40)],
+        "at": datetime(2026, 1, 2, 3, 4, 5),
+        "amount": Decimal("12.50"),
+        "huge": 2 ** 70,
+        "nested": {"a": [[{}], [1, [2, [3.0]]]]},
+    }
+
+
+class TestCodec:
+    """codec.loads / codec.dumps_pretty match the stdlib byte for byte."""
+
+    def test_dumps_pretty_matches_stdlib(self):
+        from cli_anything.hanes.utils.codec import dumps_pretty
+        payload = _codec_payload()
+        expected = json.dumps(payload, indent=2, ensure_ascii=False, default=str)
+        assert dumps_pretty(payload) == expected
+        del payload["huge"]
+        expected = json.dumps(payload, indent=2, ensure_ascii=False, default=str)
+        assert dumps_pretty(payload) == expected
+        assert dumps_pretty({1: "int key"}) == '{\n  "1": "int key"\n}'
+
+    def test_loads_matches_stdlib(self):
+        from cli_anything.hanes.utils.codec import loads
+        raw = json.dumps(_codec_payload(), ensure_ascii=False, default=str)
+        assert loads(raw.encode("utf-8")) == json.loads(raw)
+        assert loads(raw) == json.loads(raw)
+        assert loads(b'{"n": 18446744073709551616}') == {"n": 2 ** 64}
+        with pytest.raises(ValueError):
+            loads(b'{"n": ')
+
+    def test_orjson_fallbacks(self):
+        """Floats that orjson formats differently go through stdlib."""
+        pytest.importorskip("orjson")
+        from cli_anything.hanes.utils import codec
+        for value in (1e-05, 1.5e-07, [0.00012, 3e-9], 1e16, 1.5e20, {"n": 1e22}):
+            expected = json.dumps(value, indent=2)
+            assert codec.dumps_pretty(value) == expected
+        assert codec.BACKEND == "orjson"
+
+    def test_cli_json_output_identical(self, stub_server, tmp_path):
+        from click.testing import CliRunner
+        from cli_anything.hanes.hanes_cli import cli
+        stub_server.total = 12
+        sf = str(tmp_path / "session.json")
+        result = CliRunner().invoke(cli, [
+            "--json", "--session-file", sf, "--base-url", stub_server.base_url,
+            "master", "parts", "--limit", "12",
+        ])
+        assert result.exit_code == 0, result.output
+        expected = json.dumps(json.loads(result.output), indent=2,
+                              ensure_ascii=False) + "\n"
+        assert result.output == expected
+
+
+# ── Output Format Tests ──────────────────────────────────────────
+
+
+class TestOutputFormats:
+    """--format table|json|ndjson|csv|tsv through the shared renderer."""
+
+    def _run(self, stub_server, tmp_path, *args):
+        from click.testing import CliRunner
+        from cli_anything.hanes.hanes_cli import cli
+        sf = str(tmp_path / "session.json")
+        result = CliRunner().invoke(cli, [
+            "--session-file", sf, "--base-url", stub_server.base_url, *args])
+        assert result.exit_code == 0, result.output
+        return result.output
+
+    def test_ndjson_all_pages(self, stub_server, tmp_path):
+        stub_server.total = 250
+        out = self._run(stub_server, tmp_path, "--format", "ndjson",
+                        "master", "parts", "--all")
+        rows = [json.loads(line) for line in out.splitlines()]
+        assert len(rows) == 250
+        assert rows[-1]["itemCode"] == "P0249"
+
+    def test_ndjson_single_page_drops_envelope(self, stub_server, tmp_path):
+        stub_server.total = 3
+        out = self._run(stub_server, tmp_path, "--format", "ndjson",
+                        "master", "parts")
+        assert [json.loads(l)["itemCode"] for l in out.splitlines()] == [
+            "P0000", "P0001", "P0002"]
+
+    def test_csv_and_tsv(self, stub_server, tmp_path):
+        import csv
+        import io
+        stub_server.total = 4
+        out = self._run(stub_server, tmp_path, "--format", "csv",
+                        "master", "parts", "--all")
+        rows = list(csv.reader(io.StringIO(out)))
+        assert rows[0] == ["itemCode", "itemName"]
+        assert rows[1] == ["P0000", "품목 0"]
+        assert len(rows) == 5
+        tsv = self._run(stub_server, tmp_path, "--format", "tsv",
+                        "master", "parts")
+        assert tsv.splitlines()[0] == "itemCode\titemName"
+
+    def test_csv_nested_values_and_missing_keys(self, monkeypatch):
+        from cli_anything.hanes.utils import output
+        written = []
+        monkeypatch.setattr(output.click, "echo",
+                            lambda s, nl=True: written.append(s))
+        output.stream_delimited([{"a": 1, "b": {"x": [1, 2]}}, {"a": None}])
+        assert "".join(written) == 'a,b\n1,"{""x"": [1, 2]}"\n,\n'
+
+    def test_json_flag_is_format_json(self, stub_server, tmp_path):
+        stub_server.total = 2
+        a = self._run(stub_server, tmp_path, "--json", "master", "parts")
+        b = self._run(stub_server, tmp_path, "--format", "json",
+                      "master", "parts")
+        assert a == b
+        assert json.loads(a)["data"][0]["itemCode"] == "P0000"
+
+    def test_streams_before_iterator_is_exhausted(self, monkeypatch):
+        from cli_anything.hanes.utils import output
+        written = []
+        monkeypatch.setattr(output.click, "echo",
+                            lambda s, nl=True: written.append(s))
+
+        def records():
+            for i in range(5000):
+                yield {"itemCode": f"P{i:05d}", "pad": "x" * 50}
+            assert written, "nothing written before the last record"
+
+        assert output.stream_ndjson(records()) == 5000
+
+    def test_constant_memory(self, monkeypatch):
+        import tracemalloc
+        from cli_anything.hanes.utils import output
+        sizes = []
+        monkeypatch.setattr(output.click, "echo",
+                            lambda s, nl=True: sizes.append(len(s)))
+        records = ({"itemCode": f"P{i:06d}", "pad": "x" * 200}
+                   for i in range(20000))
+        tracemalloc.start()
+        output.stream_delimited(records)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        assert sum(sizes) > 4_000_000
+        assert peak < 500_000
+
+
+# ── Table Renderer Tests ─────────────────────────────────────────
+
+
+class TestTable:
+    """Streaming TableWriter and terminal cell widths."""
+
+    def test_display_width(self):
+        from cli_anything.hanes.utils.table import display_width
+        assert display_width("ABC") == 3
+        assert display_width("하네스") == 6
+        assert display_width("P-01 전선") == 9
+        assert display_width("\033[1m굵게\033[0m") == 4
+        assert display_width("Ｆｕｌｌ") == 8
+        assert display_width("café") == 4
+
+    def test_display_width_matches_unicodedata(self):
+        import unicodedata
+        from cli_anything.hanes.utils.table import display_width
+        for cp in list(range(0x20, 0x3400)) + list(range(0xAC00, 0xAD00)):
+            ch = chr(cp)
+            # Cn: unassigned in this interpreter's Unicode version, which
+            # may be older than the table's.
+            if unicodedata.category(ch) in ("Cs", "Cn", "Mn", "Me", "Cf", "Cc"):
+                continue
+            expected = 2 if unicodedata.east_asian_width(ch) in "WF" else 1
+            assert display_width(ch) == expected, hex(cp)
+
+    def test_fit_pads_and_truncates_to_exact_width(self):
+        from cli_anything.hanes.utils.table import display_width, fit
+        assert fit("EA", 4) == "EA  "
+        assert fit("하네스", 8) == "하네스  "
+        for width in range(0, 12):
+            out = fit("전선 하네스 조립품 12", width)
+            assert display_width(out) == width
+        assert fit("전선 하네스", 6) == "전선 …"
+        assert fit("전선 하네스", 5) == "전선…"
+
+    def test_rows_align_with_wide_characters(self):
+        import io
+        from cli_anything.hanes.utils.table import TableWriter, display_width
+        out = io.StringIO()
+        rows = [["P-1", "전선"], ["P-22", "Harness"], ["P-333", "하네스 조립"]]
+        assert TableWriter(["Code", "Name"], out=out).write(rows) == 3
+        lines = out.getvalue().splitlines()
+        assert len(lines) == 5
+        assert len({display_width(line) for line in lines}) == 1
+        assert lines[0].index("│") == lines[2].index("│")
+
+    def test_widths_from_sample_then_truncate(self):
+        import io
+        from cli_anything.hanes.utils.table import TableWriter
+        out = io.StringIO()
+        rows = [["a"]] * 3 + [["abcdefgh"]]
+        TableWriter(["Col"], sample_rows=3, out=out).write(rows)
+        assert out.getvalue().splitlines()[-1] == "  ab…"
+
+    def test_streams_rows_without_materialising(self):
+        from cli_anything.hanes.utils import table
+        writes = []
+
+        class Sink:
+            def write(self, s):
+                writes.append(s)
+
+            def flush(self):
+                pass
+
+        def rows():
+            for i in range(table._LINES_PER_WRITE * 4):
+                yield [f"P{i:05d}", "하네스"]
+            assert len(writes) > 2, "rows were buffered until the end"
+
+        writer = table.TableWriter(["Code", "Name"], sample_rows=10, out=Sink())
+        assert writer.write(rows()) == table._LINES_PER_WRITE * 4
+
+    def test_repl_skin_table(self, capsys):
+        from cli_anything.hanes.utils.repl_skin import ReplSkin
+        skin = ReplSkin("hanes", version="1.0.0")
+        skin._color = False
+        skin.table(["Code", "Name"], [["P-1", "전선 하네스"], ["P-22", "X"]])
+        lines = capsys.readouterr().out.splitlines()
+        assert lines[0] == "  Code │ Name       "
+        assert lines[2] == "  P-1  │ 전선 하네스"
+
+
+# ── Response Cache Tests ─────────────────────────────────────────
+
+
+class TestResponseCache:
+    """TTL / LRU / conditional-request cache for reference endpoints."""
+
+    def _backend(self, srv, **cache_kw):
+        return HanesBackend(base_url=srv.base_url, company="HQ",
+                            cache=ResponseCache(**cache_kw))
+
+    def test_fresh_hit_skips_network(self, stub_server):
+        b = self._backend(stub_server)
+        first = b.list_com_codes(groupCode="UNIT")
+        first["mutated"] = True
+        second = b.list_com_codes(groupCode="UNIT")
+        assert len(stub_server.paths) == 1
+        assert "mutated" not in second
+        assert b.cache.stats()["hits"] == 1
+        assert b.cache.stats()["misses"] == 1
+
+    def test_stale_entry_revalidates_with_304(self, stub_server):
+        b = self._backend(stub_server, ttls={"/master/parts": 0})
+        first = b.list_parts(search="wire")
+        second = b.list_parts(search="wire")
+        assert first == second
+        assert len(stub_server.paths) == 2
+        assert b.cache.stats()["revalidated"] == 1
+
+    def test_write_invalidates_resource(self, stub_server):
+        b = self._backend(stub_server)
+        b.list_parts()
+        b.list_warehouses()
+        b.create_part({"itemCode": "NEW"})
+        b.list_parts()
+        b.list_warehouses()
+        gets = [p for p in stub_server.paths if "parts" in p]
+        assert len(gets) == 3  # GET, POST, GET again
+        assert b.cache.stats()["invalidations"] == 1
+
+    def test_lru_eviction(self, stub_server):
+        b = self._backend(stub_server, max_entries=2)
+        for search in ("a", "b", "c"):
+            b.list_parts(search=search)
+        b.list_parts(search="c")
+        b.list_parts(search="a")
+        assert b.cache.stats()["evictions"] == 2
+        assert len(stub_server.paths) == 4
+
+    def test_uncached_endpoints_pass_through(self, stub_server):
+        b = self._backend(stub_server)
+        b.list_job_orders()
+        b.list_job_orders()
+        assert len(stub_server.paths) == 2
+        assert b.cache.stats()["entries"] == 0
+
+    def test_key_separates_tenants(self):
+        k1 = ResponseCache.key("u", "/master/parts", {"a": 1, "b": None}, "HQ", "P1")
+        k2 = ResponseCache.key("u", "/master/parts", {"a": 1}, "HQ", "P2")
+        assert k1 != k2
+        assert k1 == ResponseCache.key("u", "/master/parts", {"a": "1"}, "HQ", "P1")
+
+    def test_resource_matching_is_segment_aware(self):
+        c = ResponseCache()
+        assert c.resource_for("/master/parts/ABC") == "/master/parts"
+        assert c.resource_for("/master/parts-extra") is None
+
+    def test_cli_cache_stats(self, tmp_path):
+        from click.testing import CliRunner
+        from cli_anything.hanes.hanes_cli import cli
+        sf = str(tmp_path / "session.json")
+        result = CliRunner().invoke(cli, ["--json", "--session-file", sf,
+                                          "cache", "stats"])
+        assert result.exit_code == 0
+        assert json.loads(result.output)["hits"] == 0
+
+
+# ── Disk Cache Tests ─────────────────────────────────────────────
+
+
+def _disk_cache_worker(directory: str, worker: int, errors):
+    """Hammer one shared cache directory from a separate process."""
+    cache = DiskCache(directory, max_bytes=20_000)
+    body = json.dumps({"worker": worker, "pad": "x" * 500}).encode()
+    for i in range(50):
+        key = f"k{i % 10}"
+        cache.put(key, "/master/parts", body, time.time() + 60)
+        entry = cache.get(key, "/master/parts")
+        if entry is not None and not entry.body.startswith(b'{"worker"'):
+            errors.put(f"corrupt read in worker {worker}")
+
+
+class TestDiskCache:
+    """Persistent cache shared across CLI invocations."""
+
+    def test_second_client_skips_network(self, stub_server, tmp_path):
+        def client():
+            return HanesBackend(
+                base_url=stub_server.base_url,
+                cache=ResponseCache(disk=DiskCache(tmp_path / "cache")),
+            )
+
+        first = client().list_warehouses(search="WH")
+        second_backend = client()
+        second = second_backend.list_warehouses(search="WH")
+        assert first == second
+        assert len(stub_server.paths) == 1
+        assert second_backend.cache.stats()["disk_hits"] == 1
+
+    def test_atomic_write_leaves_no_temp_files(self, tmp_path):
+        cache = DiskCache(tmp_path)
+        cache.put("k", "/master/parts", b'{"a": 1}', time.time() + 60)
+        names = [p.name for p in tmp_path.iterdir()]
+        assert not any(n.endswith(".tmp") for n in names)
+        assert cache.get("k", "/master/parts").body == b'{"a": 1}'
+
+    def test_lru_eviction_by_size(self, tmp_path):
+        cache = DiskCache(tmp_path, max_bytes=2000)
+        body = b"x" * 400
+        for key in ("a", "b", "c"):
+            cache.put(key, "/master/parts", body, time.time() + 60)
+            time.sleep(0.01)
+        os.utime(cache._path("a", "/master/parts"))  # touch: a is now newest
+        cache.put("d", "/master/parts", body, time.time() + 60)
+        assert cache.get("b", "/master/parts") is None
+        assert cache.get("a", "/master/parts") is not None
+        assert cache.stats()["disk_bytes"] <= 2000
+
+    def test_filling_the_cache_rescans_rarely(self, tmp_path):
+        cache = DiskCache(tmp_path, max_bytes=100_000)
+        with patch.object(cache, "_sizes", wraps=cache._sizes) as scans:
+            for n in range(1000):
+                cache.put(f"k{n}", "/master/parts", b"x" * 200, time.time() + 60)
+        # One scan per put would be 1000 (each over every file so far).
+        assert scans.call_count < 40
+        assert cache.stats()["disk_bytes"] <= 100_000
+        assert cache.get("k999", "/master/parts") is not None
+
+    def test_write_invalidates_disk(self, stub_server, tmp_path):
+        b = HanesBackend(base_url=stub_server.base_url,
+                         cache=ResponseCache(disk=DiskCache(tmp_path)))
+        b.list_parts()
+        b.create_part({"itemCode": "X"})
+        assert DiskCache(tmp_path).stats()["disk_entries"] == 0
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="uses fork")
+    def test_concurrent_processes(self, tmp_path):
+        ctx = multiprocessing.get_context("fork")
+        errors = ctx.Queue()
+        procs = [ctx.Process(target=_disk_cache_worker,
+                             args=(str(tmp_path), w, errors)) for w in range(4)]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join(30)
+        assert all(p.exitcode == 0 for p in procs)
+        assert errors.empty()
+        assert DiskCache(tmp_path).stats()["disk_bytes"] <= 20_000
+
+    def test_cli_invocations_share_cache(self, stub_server, tmp_path):
+        from click.testing import CliRunner
+        from cli_anything.hanes.hanes_cli import cli
+        sf = str(tmp_path / "session.json")
+        args = ["--json", "--session-file", sf, "--base-url",
+                stub_server.base_url, "inventory", "warehouses"]
+        first = CliRunner().invoke(cli, args)
+        second = CliRunner().invoke(cli, args)
+        assert first.exit_code == second.exit_code == 0
+        assert first.output == second.output
+        assert len(stub_server.paths) == 1
+        CliRunner().invoke(cli, ["--no-cache"] + args)
+        assert len(stub_server.paths) == 2
+
+
+# ── Daemon Tests ─────────────────────────────────────────────────
+
+
+@pytest.fixture
+def daemon(tmp_path, monkeypatch):
+    """DaemonServer on a temp socket, served from a background thread."""
+    from cli_anything.hanes.client import SOCKET_ENV
+    from cli_anything.hanes.core.daemon import DaemonServer
+    from cli_anything.hanes.hanes_cli import cli
+    path = tmp_path / "d.sock"
+    monkeypatch.setenv(SOCKET_ENV, str(path))
+    server = DaemonServer(cli, path=path, idle_timeout=5)
+    server.bind()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server._stop = True
+    from cli_anything.hanes.client import connect
+    sock = connect(path, spawn=False)
+    if sock is not None:
+        sock.close()
+    thread.join(5)
+
+
+@pytest.mark.skipif(not hasattr(__import__("socket"), "AF_UNIX"),
+                    reason="needs Unix domain sockets")
+class TestDaemon:
+    """Warm daemon and thin client."""
+
+    def _run(self, daemon, argv):
+        import io
+        from types import SimpleNamespace
+        from cli_anything.hanes.client import connect, forward
+        out, err = io.StringIO(), io.StringIO()
+        code = forward(connect(daemon.path, spawn=False), argv, stdin="",
+                       stdout=out, stderr=err)
+        return code, SimpleNamespace(out=out.getvalue(), err=err.getvalue())
+
+    def test_forwards_output_and_reuses_session(self, daemon, stub_server,
+                                                tmp_path):
+        sf = str(tmp_path / "session.json")
+        args = ["--json", "--session-file", sf, "--base-url",
+                stub_server.base_url, "inventory", "warehouses"]
+        code, first = self._run(daemon, args)
+        assert code == 0
+        assert json.loads(first.out)
+        code, second = self._run(daemon, args)
+        assert second.out == first.out
+        assert daemon.served == 2
+        assert len(daemon.obj["sessions"]) == 1
+        # Second call was served from the warm in-memory cache and pool.
+        assert len(stub_server.paths) == 1
+
+    def test_stdin_fetched_on_demand(self, daemon):
+        import io
+        import click
+        from cli_anything.hanes.client import connect, forward
+
+        @click.command()
+        def echo_stdin():
+            click.echo(sys.stdin.read().upper())
+
+        daemon.command = echo_stdin
+        out = io.StringIO()
+        code = forward(connect(daemon.path, spawn=False), [], stdin="abc",
+                       stdout=out, stderr=io.StringIO())
+        assert code == 0
+        assert out.getvalue() == "ABC\n"
+
+    def test_exit_code_and_stderr(self, daemon):
+        code, out = self._run(daemon, ["no-such-command"])
+        assert code == 2
+        assert "No such command" in out.err
+
+    def test_malformed_request_does_not_stop_daemon(self, daemon):
+        from cli_anything.hanes.client import connect
+        for raw in (b'{"argv": ["auth", \n', b"[1, 2]\n", b"\xff\xfe\n"):
+            with connect(daemon.path, spawn=False) as sock, \
+                    sock.makefile("rb") as f:
+                sock.sendall(raw)
+                frames = [json.loads(line) for line in f]
+            assert "malformed daemon request" in frames[0]["err"]
+            assert frames[-1] == {"exit": 2}
+        code, out = self._run(daemon, ["--json", "--help"])
+        assert code == 0 and "Usage" in out.out
+
+    def test_command_sees_the_callers_environment(self, daemon, monkeypatch):
+        import click
+        from cli_anything.hanes.client import connect
+
+        @click.command()
+        @click.option("--trace", is_flag=True, envvar="CLI_ANYTHING_HANES_TRACE")
+        def show(trace):
+            click.echo(json.dumps([trace, os.environ.get("LANG")]))
+
+        daemon.command = show
+        monkeypatch.setenv("LANG", "C.UTF-8")
+        monkeypatch.delenv("CLI_ANYTHING_HANES_TRACE", raising=False)
+        request = {"argv": [], "env": {"CLI_ANYTHING_HANES_TRACE": "1",
+                                       "LANG": "ko_KR.UTF-8"}}
+        with connect(daemon.path, spawn=False) as sock, sock.makefile("rb") as f:
+            sock.sendall(json.dumps(request).encode() + b"\n")
+            frames = [json.loads(line) for line in f]
+        assert json.loads(frames[0]["out"]) == [True, "ko_KR.UTF-8"]
+        # The daemon's own environment is back for the next command.
+        assert "CLI_ANYTHING_HANES_TRACE" not in os.environ
+        assert os.environ["LANG"] == "C.UTF-8"
+
+    def test_picks_up_session_file_changes(self, daemon, tmp_path):
+        sf = tmp_path / "session.json"
+        args = ["--json", "--session-file", str(sf), "auth", "status"]
+        self._run(daemon, args)
+        time.sleep(0.01)
+        Session(session_file=str(sf)).set_context(company="C9")
+        code, out = self._run(daemon, args)
+        assert json.loads(out.out)["company"] == "C9"
+
+    def test_idle_shutdown_removes_socket(self, tmp_path):
+        from cli_anything.hanes.core.daemon import DaemonServer
+        from cli_anything.hanes.hanes_cli import cli
+        server = DaemonServer(cli, path=tmp_path / "idle.sock", idle_timeout=0.1)
+        server.bind()
+        assert server.path.exists()
+        server.serve_forever()
+        assert not server.path.exists()
+
+    def test_replaces_stale_socket_file(self, tmp_path):
+        import socket
+        from cli_anything.hanes.core.daemon import DaemonServer
+        from cli_anything.hanes.hanes_cli import cli
+        path = tmp_path / "stale.sock"
+        dead = socket.socket(socket.AF_UNIX)
+        dead.bind(str(path))
+        dead.close()
+        server = DaemonServer(cli, path=path, idle_timeout=0.1)
+        server.bind()
+        server.close()
+
+    def test_client_runs_repl_and_daemon_commands_locally(self):
+        from cli_anything.hanes.client import _needs_local
+        assert _needs_local([])
+        assert _needs_local(["--json", "daemon", "stop"])
+        assert not _needs_local(["--session-file", "x", "master", "parts"])
+        assert _needs_local(["--format", "json", "repl"])
+        assert _needs_local(["--profile", "x.prof", "--profile-top", "5", "daemon", "stop"])
+        assert not _needs_local(["--rate-limit", "5", "--burst", "2", "master", "parts"])
+
+    def test_client_knows_every_global_value_option(self):
+        from cli_anything.hanes.client import _GLOBAL_VALUE_OPTIONS
+        from cli_anything.hanes.core.batch import global_value_options
+        assert _GLOBAL_VALUE_OPTIONS == global_value_options()
+
+    def test_client_autospawns_daemon(self, tmp_path, monkeypatch):
+        from cli_anything.hanes.client import SOCKET_ENV, connect
+        from cli_anything.hanes.core.daemon import _control
+        path = tmp_path / "spawn.sock"
+        monkeypatch.setenv(SOCKET_ENV, str(path))
+        sock = connect(path)
+        assert sock is not None
+        sock.close()
+        assert _control("status")["pid"] != os.getpid()
+        assert _control("stop") == {}
+        deadline = time.monotonic() + 5
+        while path.exists() and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert not path.exists()
+
+
+# ── Batch Mode Tests ─────────────────────────────────────────────
+
+
+class TestBatch:
+    """cli-anything-hanes batch: many commands, one process."""
+
+    def _batch(self, stub_server, tmp_path, script, *opts):
+        from click.testing import CliRunner
+        from cli_anything.hanes.hanes_cli import cli
+        sf = str(tmp_path / "session.json")
+        result = CliRunner().invoke(
+            cli, ["--session-file", sf, "--base-url", stub_server.base_url,
+                  "batch", *opts, "-"], input=script)
+        lines = [json.loads(line) for line in result.output.splitlines()]
+        return result, lines[:-1], lines[-1]["summary"]
+
+    def test_parse_line_formats(self):
+        from cli_anything.hanes.core.batch import parse_line
+        assert parse_line("  # comment", 1) is None
+        assert parse_line("master parts --search 'a b'", 2).args == [
+            "master", "parts", "--search", "a b"]
+        assert parse_line('["master", "part", "X"]', 3).args == [
+            "master", "part", "X"]
+        cmd = parse_line('{"id": "q1", "cmd": "inventory warehouses"}', 4)
+        assert (cmd.id, cmd.args) == ("q1", ["inventory", "warehouses"])
+        assert parse_line('bad "quote', 5).error
+
+    def test_read_only_classification(self):
+        from cli_anything.hanes.core.batch import parse_line
+        assert parse_line("--json master parts", 1).read_only
+        assert parse_line("production orders", 1).read_only
+        assert not parse_line("production start 1", 1).read_only
+        assert not parse_line("--session-file x auth login", 1).read_only
+        assert not parse_line("unknown thing", 1).read_only
+        assert parse_line("--format csv --metrics-file m.json master parts", 1).read_only
+        assert not parse_line("--profile auth.prof auth login", 1).read_only
+        assert not parse_line("material receiving-create M-1", 1).read_only
+        assert not parse_line("master", 1).read_only
+
+    def test_only_listed_commands_run_concurrently(self):
+        import click
+        from cli_anything.hanes.core.batch import READ_ONLY_COMMANDS, BatchCommand
+        from cli_anything.hanes.hanes_cli import cli
+        ctx = click.Context(cli)
+        paths = []
+        for name in cli.list_commands(ctx):
+            cmd = cli.get_command(ctx, name)
+            if isinstance(cmd, click.Group):
+                paths += [[name, sub] for sub in cmd.list_commands(ctx)]
+            else:
+                paths.append([name])
+        listed = {" ".join(p) for p in paths} & READ_ONLY_COMMANDS
+        # No stale entries, and every command not listed is a barrier.
+        assert listed == READ_ONLY_COMMANDS
+        for path in paths:
+            assert BatchCommand(1, path).read_only == (" ".join(path) in listed)
+
+    def test_reads_run_concurrently(self, stub_server, tmp_path):
+        stub_server.slow_all = True
+        script = "".join(f"production orders --status S{i}\n" for i in range(4))
+        t0 = time.perf_counter()
+        result, rows, summary = self._batch(stub_server, tmp_path, script,
+                                            "--workers", "4")
+        elapsed = time.perf_counter() - t0
+        assert result.exit_code == 0
+        assert [r["id"] for r in rows] == [1, 2, 3, 4]
+        assert all(r["ok"] and r["output"]["success"] for r in rows)
+        assert stub_server.max_inflight >= 2
+        assert elapsed < 4 * stub_server.latency
+        assert summary["succeeded"] == 4
+
+    def test_summary_p95_is_nearest_rank(self):
+        from cli_anything.hanes.core.batch import BatchRunner
+        runner = BatchRunner(None, {}, [])
+        runner.elapsed = [10.0, 20.0, 30.0]
+        assert runner.summary(3, 60.0)["p95_ms"] == 30.0
+        runner.elapsed = [float(n) for n in range(1, 101)]
+        assert runner.summary(100, 5050.0)["p95_ms"] == 95.0
+
+    def test_concurrent_first_use_of_lazy_group(self, stub_server, tmp_path, monkeypatch):
+        import importlib
+        from cli_anything.hanes import hanes_cli
+        from cli_anything.hanes.utils import lazy_group
+        # Unload `master` and make its import slow, so every worker looks
+        # it up before the first one has registered it.
+        commands = dict(hanes_cli.cli.commands)
+        commands.pop("master", None)
+        monkeypatch.setattr(hanes_cli.cli, "commands", commands)
+        monkeypatch.setattr(hanes_cli.cli, "lazy_subcommands",
+                            {**hanes_cli.cli.lazy_subcommands,
+                             "master": hanes_cli._LAZY_SUBCOMMANDS["master"]})
+
+        import_module = importlib.import_module
+
+        def slow_import(name):
+            time.sleep(0.05)
+            return import_module(name)
+        monkeypatch.setattr(lazy_group.importlib, "import_module", slow_import)
+        script = "master parts\nmaster processes\nmaster boms\nmaster routings\n"
+        result, rows, summary = self._batch(stub_server, tmp_path, script,
+                                            "--workers", "4")
+        assert [r["stderr"] for r in rows if not r["ok"]] == []
+        assert result.exit_code == 0 and summary["succeeded"] == 4
+
+    def test_writes_are_barriers(self, stub_server, tmp_path):
+        stub_server.slow_all = True
+        script = ("production orders\n"
+                  "production start 7\n"
+                  "production orders --status RUNNING\n")
+        result, rows, _ = self._batch(stub_server, tmp_path, script)
+        assert result.exit_code == 0
+        assert ["start" in p for p in stub_server.paths] == [False, True, False]
+        assert rows[1]["output"]["method"] == "PATCH"
+
+    def test_failures_reported_per_command(self, stub_server, tmp_path):
+        script = "nosuch\nrepl\nauth status\n"
+        result, rows, summary = self._batch(stub_server, tmp_path, script)
+        assert result.exit_code == 1
+        assert rows[0]["exit_code"] == 2 and "No such command" in rows[0]["stderr"]
+        assert "cannot run inside batch" in rows[1]["stderr"]
+        assert rows[2]["ok"] and rows[2]["output"]["authenticated"] is False
+        assert (summary["failed"], summary["succeeded"]) == (2, 1)
+
+    def test_fail_fast_skips_rest(self, stub_server, tmp_path):
+        script = "nosuch\nauth login -e a -p b\nauth status\n"
+        result, rows, summary = self._batch(stub_server, tmp_path, script,
+                                            "--fail-fast")
+        assert len(rows) == 1
+        assert summary["skipped"] == 2
+
+
+# ── Fake Backend Tests ───────────────────────────────────────────
+
+
+class TestFakeBackend:
+    """benchmarks/fake_backend.py: the stand-in server for offline runs."""
+
+    def test_paged_envelope_over_large_dataset(self):
+        from cli_anything.hanes.benchmarks.fake_backend import FakeBackend
+        with FakeBackend(sizes={"transactions": 1_000_000}) as srv:
+            b = HanesBackend(base_url=srv.base_url)
+            result = b.list_transactions(page=4000, limit=250)
+            assert result["meta"] == {"page": 4000, "limit": 250, "total": 1_000_000,
+                                      "totalPages": 4000, "hasNext": False}
+            assert result["data"][-1]["transNo"] == "TRX-000999999"
+            assert sum(1 for _ in b.iter_warehouses(page_size=5)) == 12
+            running = b.list_job_orders(status="RUNNING", limit=1)["meta"]["total"]
+            assert running == 4000
+
+    def test_seeded_data_is_reproducible(self):
+        from cli_anything.hanes.benchmarks.fake_backend import FakeDataset
+        a, b, c = FakeDataset(seed=1), FakeDataset(seed=1), FakeDataset(seed=2)
+        assert a.page("lots", 3, 50) == b.page("lots", 3, 50)
+        assert a.page("lots", 3, 50) != c.page("lots", 3, 50)
+        with pytest.raises(ValueError):
+            FakeDataset(sizes={"nope": 1})
+
+    def test_lookups_writes_and_errors(self):
+        from cli_anything.hanes.benchmarks.fake_backend import FakeBackend
+        with FakeBackend(require_auth=True) as srv:
+            b = HanesBackend(base_url=srv.base_url)
+            with pytest.raises(HanesAPIError) as exc:
+                b.list_parts()
+            assert exc.value.status == 401
+            b.login("admin@hanes.com", "admin123")
+            assert b.get_part("W-000042")["data"]["itemCode"] == "W-000042"
+            assert len(b.get_bom_hierarchy("W-000002")["data"]["children"]) == 4
+            with pytest.raises(HanesAPIError) as exc:
+                b.get_part("NOPE")
+            assert exc.value.status == 404
+            assert b.start_job_order(1)["data"]["status"] == "RUNNING"
+            assert b.complete_job_order(1)["data"]["status"] == "DONE"
+            with pytest.raises(HanesAPIError) as exc:
+                b.start_job_order(1)
+            assert exc.value.status == 400
+            created = b.create_part({"itemCode": "NEW-1", "itemName": "신규"})
+            assert created["data"]["id"] == 2001
+            assert b.get_part("NEW-1")["data"]["itemName"] == "신규"
+
+    def test_idempotent_replay(self):
+        from cli_anything.hanes.benchmarks.fake_backend import FakeBackend
+        with FakeBackend() as srv:
+            b = HanesBackend(base_url=srv.base_url)
+            first = b.post("/master/parts", {"itemCode": "NEW-1"}, idempotency_key="k1")
+            again = b.post("/master/parts", {"itemCode": "NEW-1"}, idempotency_key="k1")
+            assert first == again
+            assert srv.dataset.total("parts") == 2001
+            assert srv.stats["replayed"] == 1
+
+    def test_injected_faults_gzip_and_etags(self):
+        from cli_anything.hanes.benchmarks.fake_backend import FakeBackend
+        from cli_anything.hanes.utils.resilience import RetryPolicy
+        with FakeBackend(error_rate=0.3, seed=3) as srv:
+            b = HanesBackend(base_url=srv.base_url,
+                             retry=RetryPolicy(max_attempts=8, base_delay=0))
+            for page in range(1, 21):
+                assert b.list_parts(page=page, limit=100)["data"]
+            assert srv.stats["injected_errors"] > 0
+        with FakeBackend() as srv:
+            pool = ConnectionPool(srv.base_url)
+            resp = pool.request("GET", "/api/v1/master/parts?limit=200",
+                                headers={"Accept-Encoding": "gzip"})
+            assert resp.headers.get("Content-Encoding") == "gzip"
+            etag = resp.headers["ETag"]
+            resp = pool.request("GET", "/api/v1/master/parts?limit=200",
+                                headers={"If-None-Match": etag})
+            assert resp.status == 304
+            pool.close()
+
+
+# ── Load Test Tests ──────────────────────────────────────────────
+
+
+class TestLoadTest:
+    """`loadtest`: open-loop operator traffic against the fake backend."""
+
+    def test_parse_mix(self):
+        from cli_anything.hanes.core.loadtest import DEFAULT_MIX, parse_mix
+        assert parse_mix(None) == DEFAULT_MIX
+        mix = parse_mix("result=10, stocks")
+        assert mix["result"] == 10 and mix["stocks"] == 1 and mix["start"] == 0
+        for bad in ("nope=1", "result=x", "result=-1", "result=0"):
+            with pytest.raises(ValueError):
+                parse_mix(bad)
+
+    def test_operator_workflow(self):
+        from cli_anything.hanes.benchmarks.fake_backend import FakeBackend
+        from cli_anything.hanes.core.loadtest import LoadTest
+        records = []
+        with FakeBackend() as srv:
+            backend = HanesBackend(base_url=srv.base_url, pool_size=4)
+            summary = LoadTest(backend, rate=400, duration=0.5, operators=4,
+                               interval=0.2, emit=records.append, seed=7).run()
+            created = srv.dataset.total("prod_results") - srv.dataset.sizes["prod_results"]
+        assert summary["errors"] == 0 and summary["dropped"] == 0
+        assert summary["completed"] == summary["arrivals"] > 100
+        assert set(summary["actions"]) == {"list_orders", "start", "result",
+                                           "complete", "stocks"}
+        assert created == summary["actions"]["result"]["count"]
+        assert len(records) >= 2
+        assert sum(r["completed"] for r in records) == summary["completed"]
+        assert summary["p50_ms"] <= summary["p99_ms"] <= summary["max_ms"]
+
+    def test_overload_drops_and_errors_are_counted(self):
+        from cli_anything.hanes.benchmarks.fake_backend import FakeBackend
+        from cli_anything.hanes.core import loadtest
+        from cli_anything.hanes.utils.resilience import RetryPolicy
+        with FakeBackend(latency=0.02, error_rate=0.5, seed=1) as srv, \
+                patch.object(loadtest, "MAX_BACKLOG_PER_OPERATOR", 3):
+            backend = HanesBackend(base_url=srv.base_url,
+                                   retry=RetryPolicy(max_attempts=1))
+            summary = loadtest.LoadTest(backend, rate=1000, duration=0.3,
+                                        operators=2, mix={"stocks": 1},
+                                        seed=3).run()
+        assert summary["dropped"] > 0
+        assert summary["completed"] + summary["dropped"] == summary["arrivals"]
+        assert summary["errors_by_kind"]["http_503"] == summary["errors"] > 0
+        assert summary["queue_p99_ms"] > 0
+
+    def test_cli_json_output(self, tmp_path):
+        from click.testing import CliRunner
+        from cli_anything.hanes.benchmarks.fake_backend import FakeBackend
+        from cli_anything.hanes.hanes_cli import cli
+        out = tmp_path / "run.ndjson"
+        with FakeBackend() as srv:
+            result = CliRunner().invoke(cli, [
+                "--json", "--session-file", str(tmp_path / "s.json"),
+                "--base-url", srv.base_url, "loadtest", "--rate", "100",
+                "--duration", "0.4", "--interval", "0.2", "--seed", "1",
+                "--output", str(out)])
+        assert result.exit_code == 0, result.output
+        lines = [json.loads(line) for line in result.stdout.splitlines()]
+        assert "summary" in lines[-1] and all("t" in r for r in lines[:-1])
+        assert len(out.read_text().splitlines()) == len(lines) - 1
+        bad = CliRunner().invoke(cli, ["--session-file", str(tmp_path / "s.json"),
+                                       "loadtest", "--mix", "bogus=1"])
+        assert bad.exit_code == 2
+
+
+# ── Bulk Import Tests ────────────────────────────────────────────
+
+
+def _write_xlsx(path, rows):
+    """Minimal workbook: shared and inline strings, numbers, a gap column."""
+    import zipfile
+    ns = 'xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"'
+    rel = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+    strings, cells = [], []
+    for r, row in enumerate(rows, 1):
+        xml = []
+        for c, value in enumerate(row):
+            ref = f"{chr(65 + c * 2)}{r}"  # A, C, E...: empty cells between
+            if isinstance(value, (int, float)):
+                xml.append(f'<c r="{ref}"><v>{float(value)}</v></c>')
+            elif c == 0:
+                xml.append(f'<c r="{ref}" t="inlineStr"><is><t>{value}</t></is></c>')
+            else:
+                strings.append(value)
+                xml.append(f'<c r="{ref}" t="s"><v>{len(strings) - 1}</v></c>')
+        cells.append(f'<row r="{r + 1}">{"".join(xml)}</row>')
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("xl/workbook.xml",
+                    f'<workbook {ns} xmlns:r="{rel}"><sheets>'
+                    f'<sheet name="Parts" sheetId="1" r:id="rId1"/></sheets></workbook>')
+        zf.writestr("xl/_rels/workbook.xml.rels",
+                    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+                    '<Relationship Id="rId1" Target="worksheets/sheet1.xml"/></Relationships>')
+        zf.writestr("xl/sharedStrings.xml", f'<sst {ns}>' + "".join(
+            f"<si><r><t>{v[:2]}</t></r><r><t>{v[2:]}</t></r></si>" for v in strings) + "</sst>")
+        zf.writestr("xl/worksheets/sheet1.xml",
+                    f'<worksheet {ns}><sheetData>{"".join(cells)}</sheetData></worksheet>')
+
+
+class _StubBackend:
+    """Records posts; raises ConnectionError on the rows in fail_on."""
+
+    def __init__(self, fail_on=()):
+        self.fail_on = set(fail_on)
+        self.posts = []
+        self.lock = threading.Lock()
+
+    def post(self, path, data, idempotency_key=None):
+        if data.get("itemCode") in self.fail_on:
+            raise ConnectionError("backend down")
+        with self.lock:
+            self.posts.append((data["itemCode"], idempotency_key))
+        return {"success": True, "data": data}
+
+
+class TestImport:
+    """`import`: streaming readers, validation, checkpoints, error file."""
+
+    def test_csv_and_xlsx_readers(self, tmp_path):
+        from cli_anything.hanes.utils.tabular import TabularReader, column_index
+        assert [column_index(r) for r in ("A1", "Z9", "AA2", "AB7")] == [0, 25, 26, 27]
+        csv_path = tmp_path / "p.csv"
+        csv_path.write_text("\ufeffitemCode,itemName,safetyStock\n"
+                            'W-1,"two\nlines",5\n\n,,\nW-2, 전선 ,\n', encoding="utf-8")
+        with TabularReader(csv_path) as reader:
+            assert reader.headers == ["itemCode", "itemName", "safetyStock"]
+            rows = list(reader)
+        assert rows == [(2, {"itemCode": "W-1", "itemName": "two\nlines", "safetyStock": "5"}),
+                        (6, {"itemCode": "W-2", "itemName": "전선"})]
+        xlsx_path = tmp_path / "p.xlsx"
+        _write_xlsx(xlsx_path, [["itemCode", "itemName", "safetyStock"],
+                                ["W-1", "AVSS 0.5", 12], ["W-2", "케이블", 2.5],
+                                ["W-3", "AVSS 0.85", 0.1 * 3 * 40]])
+        with TabularReader(xlsx_path) as reader:
+            assert reader.headers[0] == "itemCode" and reader.headers[2] == "itemName"
+            rows = list(reader)
+        assert rows == [(3, {"itemCode": "W-1", "itemName": "AVSS 0.5", "safetyStock": "12"}),
+                        (4, {"itemCode": "W-2", "itemName": "케이블", "safetyStock": "2.5"}),
+                        (5, {"itemCode": "W-3", "itemName": "AVSS 0.85", "safetyStock": "12"})]
+        with pytest.raises(ValueError, match="no sheet named"):
+            TabularReader(xlsx_path, sheet="Nope").__enter__()
+
+    def test_validation_and_checkpoint(self, tmp_path):
+        from cli_anything.hanes.core.importer import IMPORTS, Checkpoint
+        parts, results = IMPORTS["parts"], IMPORTS["prod-results"]
+        assert parts.validate({"itemCode": "W", "itemName": "n", "safetyStock": "1,200",
+                               "_error": "x"}) == {"itemCode": "W", "itemName": "n",
+                                                   "safetyStock": 1200}
+        for row, message in (({"itemCode": "W"}, "missing itemName"),
+                             ({"itemCode": "W", "itemName": "n", "safetyStock": "x"},
+                              "not an integer"),
+                             ({"goodQty": "1"}, "missing jobOrderId or orderNo"),
+                             ({"orderNo": "JO-1", "goodQty": "-1"}, "at least 0")):
+            spec = parts if "itemCode" in row else results
+            with pytest.raises(ValueError, match=message):
+                spec.validate(row)
+
+        cp = Checkpoint(tmp_path / "cp.json", "parts", "abc")
+        for ordinal in (2, 1, 4):
+            cp.mark(ordinal)
+        assert cp.watermark == 2 and cp.done == {4}
+        cp.save()
+        loaded = Checkpoint.load(tmp_path / "cp.json", "parts", "abc")
+        assert [loaded.is_done(i) for i in (1, 2, 3, 4)] == [True, True, False, True]
+        with pytest.raises(ValueError, match="--restart"):
+            Checkpoint.load(tmp_path / "cp.json", "parts", "changed")
+
+    def test_abort_then_resume_sends_each_row_once(self, tmp_path):
+        from cli_anything.hanes.core import importer
+        rows = [(n + 2, {"itemCode": f"W-{n}", "itemName": "x"}) for n in range(40)]
+        cp = importer.Checkpoint(tmp_path / "cp.json", "parts", "f" * 64)
+        first = _StubBackend(fail_on={"W-25"})
+        run = importer.Importer(first, importer.IMPORTS["parts"], cp, workers=4)
+        with pytest.raises(importer.ImportAborted, match="backend down"):
+            run.run(rows)
+        assert not cp.complete and 25 <= cp.watermark < 40
+        second = _StubBackend()
+        cp = importer.Checkpoint.load(tmp_path / "cp.json", "parts", "f" * 64)
+        counts = importer.Importer(second, importer.IMPORTS["parts"], cp,
+                                   workers=4).run(rows)
+        assert cp.complete and counts["skipped"] == len(first.posts)
+        # Rows that finished before the stop are skipped; the rest are
+        # sent once, W-25 with the key it had in the first run.
+        sent = sorted(code for code, _ in first.posts + second.posts)
+        assert sent == sorted(f"W-{n}" for n in range(40))
+        assert dict(second.posts)["W-25"] == run._key(26)
+        assert counts["created"] + counts["skipped"] == 40
+
+    def test_cli_import_against_fake_backend(self, tmp_path):
+        from click.testing import CliRunner
+        from cli_anything.hanes.benchmarks.fake_backend import FakeBackend
+        from cli_anything.hanes.hanes_cli import cli
+        data = tmp_path / "parts.csv"
+        lines = ["itemCode,itemName,safetyStock"]
+        lines += [f"N-{i},Part {i},{i}" for i in range(30)]
+        lines += ["N-bad,,1", "N-3,Again,1", "N-x,Bad stock,many"]
+        data.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        with FakeBackend() as srv:
+            args = ["--json", "--session-file", str(tmp_path / "s.json"),
+                    "--base-url", srv.base_url, "import", "parts", str(data)]
+            listing = args[:5] + ["master", "parts", "--limit", "1"]
+            before = CliRunner().invoke(cli, listing)  # cached
+            dry = CliRunner().invoke(cli, args + ["--dry-run"])
+            assert srv.dataset.total("parts") == srv.dataset.sizes["parts"]
+            result = CliRunner().invoke(cli, args + ["--workers", "4"])
+            created = list(srv.dataset.created["parts"])
+            after = CliRunner().invoke(cli, listing)
+            again = CliRunner().invoke(cli, args)
+            restarted = CliRunner().invoke(cli, args + ["--restart"])
+            recreated = len(srv.dataset.created["parts"]) - len(created)
+        total = srv.dataset.sizes["parts"]
+        assert json.loads(before.stdout)["meta"]["total"] == total
+        assert json.loads(after.stdout)["meta"]["total"] == total + 30
+        assert json.loads(dry.stdout)["created"] == 30 and dry.exit_code == 1
+        assert result.exit_code == 1, result.output
+        summary = json.loads(result.stdout)
+        assert summary["created"] == 30 and summary["rejected"] == 3
+        assert summary["complete"] and summary["rows"] == 33
+        assert sorted(p["itemCode"] for p in created) == sorted(f"N-{i}" for i in range(30))
+        assert all(isinstance(p["safetyStock"], int) for p in created)
+        errors = Path(summary["errors_file"]).read_text(encoding="utf-8-sig").splitlines()
+        assert errors[0] == "_row,_error,itemCode,itemName,safetyStock"
+        assert [e.split(",")[0] for e in errors[1:]] == ["32", "33", "34"]
+        assert "duplicate itemCode 'N-3' (first on row 5)" in errors[2]
+        assert again.exit_code == 0 and "already imported" in again.stderr
+        # --restart uses new idempotency keys: the rows are created again.
+        assert json.loads(restarted.stdout)["created"] == 30 and recreated == 30
+        assert json.loads(Path(f"{data}.parts.checkpoint.json").read_text())["generation"] == 1
+
+
+# ── Write Queue Tests ────────────────────────────────────────────
+
+
+def _closed_url() -> str:
+    import socket
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}/api/v1"
+
+
+class TestWriteQueue:
+    """Offline journal for writes, replay and the `queue` commands."""
+
+    def test_journal_replays_state_and_compacts(self, tmp_path):
+        from cli_anything.hanes.utils.write_queue import WriteQueue
+        queue = WriteQueue(tmp_path / "q.ndjson")
+        ids = [queue.append("POST", "/production/prod-results", {"n": n})["id"]
+               for n in range(4)]
+        queue.mark(done=[ids[0]], failed={ids[1]: "[400] bad"})
+        queue.drop([ids[3]])
+        with open(queue.path, "a", encoding="utf-8") as f:
+            f.write('{"op": "done", "ids": [')  # torn last line
+        pending, failed = queue.entries()
+        assert [e["data"]["n"] for e in pending] == [2]
+        assert failed[0]["id"] == ids[1] and failed[0]["error"] == "[400] bad"
+        queue.compact()
+        assert len(queue.path.read_text().splitlines()) == 3
+        queue.retry([ids[1]])
+        assert [e["id"] for e in queue.entries()[0]] == [ids[1], ids[2]]
+        queue.mark(done=[ids[1], ids[2]])
+        queue.compact()
+        assert not queue.path.exists() and queue.stats()["pending"] == 0
+
+    def test_offline_write_is_queued_with_its_key(self, tmp_path):
+        from cli_anything.hanes.utils.resilience import RetryPolicy
+        from cli_anything.hanes.utils.write_queue import WriteQueue
+        queue = WriteQueue(tmp_path / "q.ndjson")
+        backend = HanesBackend(base_url=_closed_url(), write_queue=queue,
+                               retry=RetryPolicy(max_attempts=1))
+        result = backend.create_prod_result({"orderNo": "JO-1", "goodQty": 5})
+        assert result["queued"] and result["data"]["queueId"].startswith("wq-")
+        # Not applied yet, so not reported as a success.
+        assert result["success"] is False and result["status"] == "queued"
+        entry = queue.entries()[0][0]
+        assert entry["id"] == result["data"]["queueId"]
+        assert entry["path"] == "/production/prod-results"
+        assert entry["data"] == {"orderNo": "JO-1", "goodQty": 5}
+        # Other writes are not queued.
+        with pytest.raises(ConnectionError):
+            backend.create_part({"itemCode": "W"})
+        with pytest.raises(ConnectionError):
+            HanesBackend(base_url=_closed_url(), retry=RetryPolicy(max_attempts=1)
+                         ).create_receiving({"matUid": "M"})
+
+    def test_only_transient_errors_are_queued(self, tmp_path):
+        from cli_anything.hanes.benchmarks.fake_backend import FakeBackend
+        from cli_anything.hanes.utils.resilience import RetryPolicy
+        from cli_anything.hanes.utils.write_queue import WriteQueue
+        queue = WriteQueue(tmp_path / "q.ndjson")
+        for status, queued in ((503, True), (429, True), (500, False)):
+            with FakeBackend(error_rate=1.0, error_status=status) as srv:
+                backend = HanesBackend(base_url=srv.base_url, write_queue=queue,
+                                       retry=RetryPolicy(max_attempts=1))
+                if queued:
+                    assert backend.create_receiving({"matUid": "M"})["queued"]
+                else:
+                    with pytest.raises(HanesAPIError) as e:
+                        backend.create_receiving({"matUid": "M"})
+                    assert e.value.status == 500
+        assert len(queue.entries()[0]) == 2
+
+    def test_queued_write_exits_tempfail(self):
+        import click
+        from click.testing import CliRunner
+        from cli_anything.hanes.utils.output import render
+
+        @click.command()
+        @click.pass_context
+        def post(ctx):
+            ctx.obj = {"json_mode": True}
+            render(ctx, {"success": False, "queued": True, "status": "queued",
+                         "data": {"queueId": "wq-1"}})
+
+        result = CliRunner().invoke(post)
+        assert result.exit_code == 75
+        assert json.loads(result.stdout)["data"]["queueId"] == "wq-1"
+
+    def test_replay_keeps_order_and_refused(self, tmp_path):
+        from cli_anything.hanes.benchmarks.fake_backend import FakeBackend
+        from cli_anything.hanes.utils.write_queue import Replayer, WriteQueue
+        queue = WriteQueue(tmp_path / "q.ndjson")
+        for n in range(120):
+            queue.append("POST", "/production/prod-results", {"orderNo": f"JO-{n}"})
+        bad = queue.append("POST", "/production/nope", {"n": 1})["id"]
+        with FakeBackend() as srv, HanesBackend(base_url=srv.base_url) as backend:
+            # Reached the backend before the connection dropped.
+            first = queue.entries()[0][0]
+            backend.post(first["path"], first["data"], idempotency_key=first["id"])
+            counts = Replayer(queue, backend, batch_size=50).flush()
+            created = srv.dataset.created["prod_results"]
+        assert counts["sent"] == 120 and counts["failed"] == 1
+        assert counts["batches"] == 3 and counts["remaining"] == 0
+        # JO-0 was replayed by key, not created twice; one path goes in
+        # journal order.
+        assert [int(r["orderNo"][3:]) for r in created] == list(range(120))
+        pending, failed = queue.entries()
+        assert not pending and failed[0]["id"] == bad and "404" in failed[0]["error"]
+
+    def test_replay_gives_up_after_max_attempts(self, tmp_path):
+        from cli_anything.hanes.utils.write_queue import Replayer, WriteQueue
+
+        class Flaky:
+            sent = []
+
+            def ping(self):
+                return True
+
+            def post(self, path, data, idempotency_key=None):
+                if data["n"] == 0:
+                    raise HanesAPIError(503, "Service Unavailable")
+                self.sent.append(data["n"])
+
+        queue = WriteQueue(tmp_path / "q.ndjson")
+        stuck = queue.append("POST", "/material/receiving", {"n": 0})["id"]
+        for n in range(1, 4):
+            queue.append("POST", "/material/receiving", {"n": n})
+        counts = Replayer(queue, Flaky(), max_attempts=3, backoff=0.0).flush(wait=5)
+        # The stuck write holds back its path until it is given up on.
+        assert Flaky.sent == [1, 2, 3]
+        assert counts["sent"] == 3 and counts["failed"] == 1
+        pending, failed = queue.entries()
+        assert not pending and failed[0]["id"] == stuck
+        assert failed[0]["error"].startswith("gave up after 3 attempts")
+        assert failed[0]["attempts"] == 2
+        queue.retry([stuck])
+        assert "attempts" not in queue.entries()[0][0]
+
+    def test_flush_offline_then_online(self, tmp_path):
+        from click.testing import CliRunner
+        from cli_anything.hanes.benchmarks.fake_backend import FakeBackend
+        from cli_anything.hanes.hanes_cli import cli
+        session_file = tmp_path / "s.json"
+        base = ["--json", "--session-file", str(session_file)]
+        session = Session(str(session_file))
+        for n in range(3):
+            session.write_queue.append("POST", "/material/receiving", {"matUid": f"M-{n}"})
+        offline = CliRunner().invoke(cli, base + ["--base-url", _closed_url(),
+                                                  "queue", "flush"])
+        assert offline.exit_code == 1
+        result = json.loads(offline.stdout)
+        assert result["stopped"] == "backend unreachable" and result["remaining"] == 3
+        with FakeBackend() as srv:
+            online = CliRunner().invoke(cli, base + ["--base-url", srv.base_url,
+                                                     "queue", "flush"])
+            assert srv.dataset.total("lots") == srv.dataset.sizes["lots"] + 3
+        assert online.exit_code == 0, online.output
+        assert json.loads(online.stdout)["sent"] == 3
+        status = CliRunner().invoke(cli, base + ["queue", "status"])
+        assert json.loads(status.stdout)["pending"] == 0
+
+
+# ── Replica Tests ────────────────────────────────────────────────
+
+
+class _ListBackend:
+    """iter_all() over a fixed list that ignores updatedAfter."""
+
+    def __init__(self, records):
+        self.records = records
+        self.calls = []
+
+    def iter_all(self, path, page_size=100, stream=False, **params):
+        self.calls.append(params)
+        return iter(list(self.records))
+
+
+class TestReplica:
+    """`sync`: SQLite mirror with watermark pulls, full diffs and --local."""
+
+    def test_lookback(self):
+        from cli_anything.hanes.utils.replica import lookback
+        assert lookback("2026-01-01T00:00:30.000Z", 60) == "2025-12-31T23:59:30.000Z"
+        assert lookback("2026-01-01T09:00:00+09:00", 0) == "2026-01-01T00:00:00.000Z"
+        assert lookback("yesterday") == "yesterday"
+
+    def test_watermark_then_full_diff_fallback(self, tmp_path):
+        from cli_anything.hanes.benchmarks.fake_backend import FakeBackend
+        from cli_anything.hanes.utils.replica import Replica
+        replica = Replica(tmp_path / "r.sqlite")
+        with FakeBackend(sizes={"parts": 300, "processes": 20}) as srv, \
+                HanesBackend(base_url=srv.base_url) as backend:
+            first = replica.sync(backend, "parts")
+            srv.dataset.update("parts", 7, {"itemName": "renamed"})
+            second = replica.sync(backend, "parts")
+            procs = [replica.sync(backend, "processes") for _ in range(2)]
+        assert first["mode"] == "full" and first["inserted"] == first["rows"] == 300
+        assert first["watermark"] == "2026-01-03T01:50:00.000Z"
+        assert second["mode"] == "incremental" and second["updated"] == 1
+        assert second["fetched"] < 5 and second["watermark"] > first["watermark"]
+        assert replica.query("parts", search="RENAMED")["data"][0]["itemCode"] == "W-000007"
+        # No updatedAt on processes: every sync is a full diff.
+        assert [p["mode"] for p in procs] == ["full", "full"]
+        assert procs[1]["unchanged"] == 20 and procs[1]["watermark"] is None
+
+        # A backend that ignores updatedAfter: full diff, deletions seen,
+        # and no more incremental attempts.
+        records = [{"itemCode": f"W-{i:06d}", "itemName": "x",
+                    "updatedAt": "2026-01-01T00:00:00.000Z"} for i in range(5)]
+        stub = _ListBackend(records)
+        replica.sync(stub, "parts")
+        assert replica.state("parts")["mode"] == "full"
+        assert replica.query("parts")["meta"]["total"] == 5
+        del stub.records[1:3]
+        result = replica.sync(stub, "parts", full=True)
+        assert result["deleted"] == 2 and result["rows"] == 3
+        assert "updatedAfter" in stub.calls[0] and "updatedAfter" not in stub.calls[-1]
+
+    def test_watermark_compares_instants(self, tmp_path):
+        from cli_anything.hanes.utils.replica import Replica, parse_timestamp
+
+        class SinceBackend(_ListBackend):
+            def iter_all(self, path, page_size=100, stream=False, **params):
+                self.calls.append(params)
+                since = parse_timestamp(params.get("updatedAfter", "0001-01-01"))
+                return iter([r for r in self.records
+                             if parse_timestamp(r["updatedAt"]) > since])
+
+        # 10:00Z in -05:00 sorts before 06:00Z as a string.
+        stub = SinceBackend([
+            {"itemCode": "A", "updatedAt": "2026-01-01T05:00:00-05:00"},
+            {"itemCode": "B", "updatedAt": "2026-01-01T06:00:00.123Z"},
+        ])
+        replica = Replica(tmp_path / "r.sqlite")
+        assert replica.sync(stub, "parts")["watermark"] == "2026-01-01T05:00:00-05:00"
+        stub.records.append({"itemCode": "C", "updatedAt": "2026-01-01T19:30:00+09:00"})
+        result = replica.sync(stub, "parts")
+        assert stub.calls[-1]["updatedAfter"] == "2026-01-01T09:59:00.000Z"
+        assert result["mode"] == "incremental" and result["fetched"] == 2
+        assert result["inserted"] == 1 and result["watermark"] == "2026-01-01T19:30:00+09:00"
+
+    def test_query_filters_and_duplicate_keys(self, tmp_path):
+        from cli_anything.hanes.utils.replica import Replica, ReplicaMissing
+        replica = Replica(tmp_path / "r.sqlite")
+        with pytest.raises(ReplicaMissing, match="sync -r boms"):
+            replica.query("boms")
+        boms = [{"parentItemCode": "A", "childItemCode": f"C{i % 3}", "revision": "A",
+                 "qty": i} for i in range(6)]
+        result = replica.sync(_ListBackend(boms), "boms")
+        assert result["rows"] == 6 and replica.sync(_ListBackend(boms), "boms")["updated"] == 0
+        page = replica.query("boms", filters={"childItemCode": "C1"}, limit=1)
+        assert [r["qty"] for r in page["data"]] == [1]
+        assert page["meta"] == {"page": 1, "limit": 1, "total": 2, "totalPages": 2,
+                                "hasNext": True}
+        assert [r["qty"] for r in replica.iter_records("boms", search="c2")] == [2, 5]
+        assert replica.query("boms", search="%")["meta"]["total"] == 0
+        with pytest.raises(ValueError):
+            replica.query("boms", filters={"qty": "1"})
+
+    def test_cli_sync_and_local(self, tmp_path):
+        from click.testing import CliRunner
+        from cli_anything.hanes.benchmarks.fake_backend import FakeBackend
+        from cli_anything.hanes.hanes_cli import cli
+        base = ["--json", "--session-file", str(tmp_path / "s.json")]
+        missing = CliRunner().invoke(cli, base + ["master", "parts", "--local"])
+        assert missing.exit_code == 2 and "sync -r parts" in missing.stderr
+        with FakeBackend(sizes={"parts": 200}) as srv:
+            url = ["--base-url", srv.base_url]
+            synced = CliRunner().invoke(cli, base + url + ["sync", "-r", "parts",
+                                                           "-r", "warehouses"])
+            status = CliRunner().invoke(cli, base + url + ["sync", "status", "--remote"])
+        assert synced.exit_code == 0, synced.output
+        assert [r["rows"] for r in json.loads(synced.stdout)["data"]] == [200, 12]
+        rows = {r["resource"]: r for r in json.loads(status.stdout)["data"]}
+        assert rows["parts"]["remote_total"] == 200 and rows["parts"]["changed"] == 1
+        assert rows["boms"]["rows"] is None and rows["warehouses"]["age_s"] < 60
+        local = CliRunner().invoke(cli, base + ["master", "parts", "--local",
+                                                "--type", "RAW", "--limit", "5"])
+        result = json.loads(local.stdout)
+        assert result["meta"]["total"] == 67 and len(result["data"]) == 5
+        assert all(r["itemType"] == "RAW" for r in result["data"])
+        every = CliRunner().invoke(cli, base + ["inventory", "warehouses", "--local", "--all"])
+        assert json.loads(every.stdout)["total"] == 12
+
+
+# ── Search Index Tests ───────────────────────────────────────────
+
+
+class TestSearchIndex:
+    """`master search`: n-gram index kept in step with the replica."""
+
+    def test_tokens(self):
+        from cli_anything.hanes.utils.search_index import query_tokens, tokens
+        doc = tokens("ＡＶＳ 0.5sq 흑색 전선")
+        assert {"avs", "av", "0.5sq", "0.5", "0", "5", "sq", "흑색", "전선", "흑", "전"} <= set(doc)
+        assert doc["색전"] < doc["흑색"] and doc["av"] < doc["avs"]
+        assert tokens("흑색전선", query=True) == {"흑색": 10, "색전": 10, "전선": 10}
+        assert query_tokens("avss-0.5 W") == [("avss-0.5", ["avss", "0", "5"]), ("w", [])]
+
+    @staticmethod
+    def _index(replica, name):
+        db = replica.db
+        return (sorted(db.execute(f"SELECT * FROM {name}_tokens")),
+                sorted(db.execute(f"SELECT * FROM {name}_terms")))
+
+    def test_incremental_updates_match_rebuild(self, tmp_path):
+        from cli_anything.hanes.utils.replica import RESOURCES, Replica
+        replica = Replica(tmp_path / "r.sqlite")
+        parts = [{"itemCode": f"W-{i:06d}", "itemName": f"전선 AVSS {i}", "spec": "0.5SQ",
+                  "updatedAt": "2026-01-01T00:00:00.000Z"} for i in range(50)]
+        backend = _ListBackend(parts)
+        replica.sync(backend, "parts")
+        parts[3] = {**parts[3], "itemName": "흑색 전선", "custPartNo": "91234-AB100"}
+        del parts[10:20]
+        parts.append({"itemCode": "W-900000", "itemName": "튜브 5MM",
+                      "updatedAt": "2026-01-01T00:00:00.000Z"})
+        result = replica.sync(backend, "parts", full=True)
+        assert (result["updated"], result["deleted"], result["inserted"]) == (1, 10, 1)
+        patched = self._index(replica, "parts")
+        replica._reindex(RESOURCES["parts"])
+        assert patched == self._index(replica, "parts")
+        assert dict(patched[1])["전선"] == 40
+
+    def test_search_ranks_and_falls_back(self, tmp_path):
+        from cli_anything.hanes.utils.replica import Replica, ReplicaMissing
+        replica = Replica(tmp_path / "r.sqlite")
+        with pytest.raises(ReplicaMissing, match="sync -r parts"):
+            replica.search("W-0001")
+        parts = [{"itemCode": "W-000100", "itemName": "전선 AVSS 0.5SQ", "spec": "0.5SQ"},
+                 {"itemCode": "W-000101", "itemName": "AVS 0.5sq 흑색 전선"},
+                 {"itemCode": "T-000001", "itemName": "튜브", "itemNo": "W-0001-X"}]
+        boms = [{"parentItemCode": "W-000900", "childItemCode": "W-000101", "revision": "A"}]
+        replica.sync(_ListBackend(parts), "parts")
+        assert replica.search("W-000101")["meta"]["resources"] == ["parts"]
+        replica.sync(_ListBackend(boms), "boms")
+
+        hits = replica.search("W-000101")
+        assert [(h["resource"], h.get("itemCode")) for h in hits["data"]] == [
+            ("parts", "W-000101"), ("boms", None)]
+        assert hits["data"][0]["score"] > hits["data"][1]["score"]
+        assert hits["meta"]["exhaustive"] and not hits["meta"]["partial"]
+        # Code field outweighs part no.; prefixes match.
+        assert [h["itemCode"] for h in replica.search("w-0001", ("parts",))["data"]] == [
+            "W-000100", "W-000101", "T-000001"]
+        for query in ("흑색전선", "전선 흑", "ＡＶＳ 0.5SQ 흑색"):
+            assert [h["itemCode"] for h in replica.search(query)["data"]] == ["W-000101"]
+        partial = replica.search("흑색 튜브", ("parts",))
+        assert partial["meta"]["partial"] and partial["meta"]["total"] == 2
+        assert replica.search("없는품목")["data"] == []
+
+    def test_cli_search(self, tmp_path):
+        from click.testing import CliRunner
+        from cli_anything.hanes.benchmarks.fake_backend import FakeBackend
+        from cli_anything.hanes.hanes_cli import cli
+        base = ["--json", "--session-file", str(tmp_path / "s.json")]
+        missing = CliRunner().invoke(cli, base + ["master", "search", "W-0001"])
+        assert missing.exit_code == 2 and "sync -r parts" in missing.stderr
+        with FakeBackend(sizes={"parts": 300, "boms": 400}) as srv:
+            srv.dataset.update("parts", 42, {"custPartNo": "91234-AB100"})
+            synced = CliRunner().invoke(cli, base + ["--base-url", srv.base_url, "sync",
+                                                     "-r", "parts", "-r", "boms"])
+            assert synced.exit_code == 0, synced.output
+        result = CliRunner().invoke(cli, base + ["master", "search", "91234", "-r", "parts"])
+        found = json.loads(result.stdout)
+        assert [d["itemCode"] for d in found["data"]] == ["W-000042"]
+        assert found["meta"]["resources"] == ["parts"]
+        table = CliRunner().invoke(cli, ["--session-file", str(tmp_path / "s.json"),
+                                         "master", "search", "avss", "--limit", "2"])
+        assert table.exit_code == 0 and "W-000000" in table.stdout
+        assert "best candidates only" not in table.stderr and "300 match" in table.stderr
+
+
+# ── Benchmark Suite Tests ────────────────────────────────────────
+
+
+class TestBenchSuite:
+    """benchmarks/suite.py: scenarios, result shape, baseline comparison."""
+
+    def test_compare_flags_regressions(self):
+        from cli_anything.hanes.benchmarks.suite import compare, percentile
+        assert percentile([5, 1, 4, 2, 3], 50) == 3
+        assert percentile(list(range(1, 101)), 99) == 99
+        base = {"scenarios": {"a": {"throughput": 1000, "p50_ms": 10,
+                                    "p99_ms": 20, "peak_rss_mb": 30}}}
+        same = {"scenarios": {"a": {"throughput": 950, "p50_ms": 11,
+                                    "p99_ms": 25, "peak_rss_mb": 31},
+                              "new": {"throughput": 1}}}
+        assert compare(same, base) == []
+        worse = {"scenarios": {"a": {"throughput": 700, "p50_ms": 10,
+                                     "p99_ms": 40, "peak_rss_mb": None}}}
+        found = compare(worse, base)
+        assert [line.split(":")[0] for line in found] == ["a.throughput", "a.p99_ms"]
+        assert compare(worse, base, {"throughput": 0.5, "p99_ms": 2}) == []
+
+    def test_quick_run(self):
+        from cli_anything.hanes.benchmarks.suite import run_suite
+        results = run_suite(["repl_dispatch", "table_render"], quick=True)
+        assert results["meta"]["quick"] is True
+        dispatch = results["scenarios"]["repl_dispatch"]
+        assert dispatch["unit"] == "commands" and dispatch["iterations"] == 50
+        for r in results["scenarios"].values():
+            assert r["throughput"] > 0 and 0 < r["p50_ms"] <= r["p99_ms"]
+            if sys.platform != "win32":
+                assert r["peak_rss_mb"] > 0
+
+    @pytest.mark.skipif(not os.environ.get("HANES_BENCH_BASELINE"),
+                        reason="set HANES_BENCH_BASELINE=baseline.json to run")
+    def test_against_baseline(self):
+        from cli_anything.hanes.benchmarks.suite import compare, run_suite
+        baseline = json.loads(Path(os.environ["HANES_BENCH_BASELINE"]).read_text())
+        results = run_suite(quick=baseline["meta"]["quick"])
+        regressions = compare(results, baseline)
+        assert not regressions, "\n".join(regressions)
+
+
+# ── Profiling Tests ──────────────────────────────────────────────
+
+
+class TestProfiling:
+    """--profile (pstats + collapsed stacks) and --profile-imports."""
+
+    def test_profile_writes_pstats_and_report(self, stub_server, tmp_path):
+        import pstats
+        from click.testing import CliRunner
+        from cli_anything.hanes.hanes_cli import cli
+        stub_server.total = 30
+        out = tmp_path / "out.prof"
+        result = CliRunner().invoke(cli, [
+            "--json", "--session-file", str(tmp_path / "s.json"),
+            "--base-url", stub_server.base_url, "--profile", str(out),
+            "--profile-top", "5", "master", "parts", "--all", "--limit", "10"])
+        assert result.exit_code == 0, result.output
+        assert json.loads(result.stdout)["total"] == 30
+        assert f"profile: wrote {out}" in result.stderr
+        assert "Ordered by: cumulative time" in result.stderr
+        functions = {name for _, _, name in pstats.Stats(str(out)).stats}
+        assert "list_parts" in functions
+        assert (tmp_path / "out.folded").exists()
+
+    def test_sampler_collapses_stacks(self, tmp_path):
+        from cli_anything.hanes.utils.profiling import StackSampler
+
+        def busy_worker():
+            deadline = time.perf_counter() + 0.1
+            while time.perf_counter() < deadline:
+                pass
+
+        sampler = StackSampler(interval=0.001)
+        sampler.start()
+        worker = threading.Thread(target=busy_worker, name="worker")
+        worker.start()
+        worker.join()
+        sampler.stop()
+        path = tmp_path / "x.folded"
+        sampler.write(path)
+        lines = path.read_text().splitlines()
+        assert any(line.startswith("worker;") and "busy_worker (" in line
+                   for line in lines)
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+    def test_profilers_do_not_nest(self, tmp_path):
+        from cli_anything.hanes.utils.profiling import CommandProfiler
+        outer = CommandProfiler(tmp_path / "a.prof")
+        assert outer.start()
+        assert not CommandProfiler(tmp_path / "b.prof").start()
+        outer.stop()
+        inner = CommandProfiler(tmp_path / "b.prof")
+        assert inner.start()
+        inner.stop()
+
+    def test_importtime_report(self):
+        from cli_anything.hanes.utils.profiling import import_report, parse_importtime
+        modules, other = parse_importtime([
+            "import time: self [us] | cumulative | imported package",
+            "import time:       120 |        120 |   _json",
+            "import time:       400 |        520 | json",
+            "Error: boom",
+        ])
+        assert other == ["Error: boom"]
+        assert [(m["module"], m["depth"]) for m in modules] == [("_json", 1), ("json", 0)]
+        report = import_report(modules, top=1)
+        assert report.splitlines()[0] == "imports: 2 modules, 0.5 ms"
+        assert report.splitlines()[-1].endswith("json") and "_json" not in report
+
+    def test_profile_imports_runs_command(self, capfd):
+        from cli_anything.hanes.utils.profiling import profile_imports
+        assert profile_imports(["--profile-imports", "--version"]) == 0
+        out, err = capfd.readouterr()
+        assert "cli-anything-hanes" in out
+        assert "imports:" in err and "cli_anything.hanes.hanes_cli" in err
+
+    def test_profile_imports_rejected_in_process(self, tmp_path):
+        from click.testing import CliRunner
+        from cli_anything.hanes.hanes_cli import cli
+        result = CliRunner().invoke(cli, ["--session-file", str(tmp_path / "s.json"),
+                                          "--profile-imports", "cache", "stats"])
+        assert result.exit_code == 2
+
+
+# ── Startup Tests ────────────────────────────────────────────────
+
+# Cumulative `import cli_anything.hanes.hanes_cli` time. Roughly 3x what
+# it takes today, so only a real regression (e.g. an eager import of the
+# command modules, asyncio or prompt_toolkit) trips it.
+IMPORT_BUDGET_MS = 350
+_DEFERRED_MODULES = (
+    "cli_anything.hanes.core.master", "cli_anything.hanes.core.material",
+    "cli_anything.hanes.core.production", "cli_anything.hanes.core.quality",
+    "cli_anything.hanes.core.inventory", "cli_anything.hanes.core.daemon",
+    "cli_anything.hanes.utils.repl_skin", "prompt_toolkit", "asyncio",
+    "cli_anything.hanes.utils.profiling",
+)
+
+
+def _importtime(code: str) -> dict[str, int]:
+    """Run code under -X importtime; return {module: cumulative µs}."""
+    import subprocess
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          capture_output=True, text=True, check=True)
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestStartup:
+    """Cold-start import cost of the CLI entry point."""
+
+    def test_entry_point_defers_command_modules(self):
+        times = _importtime("import cli_anything.hanes.hanes_cli")
+        loaded = [m for m in _DEFERRED_MODULES if m in times]
+        assert loaded == []
+
+    def test_import_time_budget(self):
+        times = _importtime("import cli_anything.hanes.hanes_cli")
+        assert times["cli_anything.hanes.hanes_cli"] / 1000 < IMPORT_BUDGET_MS
+
+    def test_dispatch_imports_only_the_invoked_group(self, tmp_path):
+        # importlib.import_module() bypasses -X importtime, so check
+        # sys.modules in the child instead.
+        import subprocess
+        sf = str(tmp_path / "session.json")
+        code = (
+            "import sys\n"
+            "from cli_anything.hanes.hanes_cli import cli\n"
+            f"cli.main(['--session-file', {sf!r}, 'master', '--help'],"
+            " standalone_mode=False)\n"
+            "print([m for m in sys.modules if m.startswith('cli_anything.hanes.core.')])"
+        )
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True,
+                             text=True, check=True).stdout.splitlines()[-1]
+        assert "cli_anything.hanes.core.master" in out
+        assert "cli_anything.hanes.core.production" not in out
+
+    def test_lazy_group_lists_and_resolves(self):
+        from cli_anything.hanes.hanes_cli import cli
+        import click
+        ctx = click.Context(cli)
+        names = cli.list_commands(ctx)
+        for name in ("master", "material", "production", "quality",
+                     "inventory", "daemon", "auth", "cache"):
+            assert name in names
+        assert cli.get_command(ctx, "master").name == "master"
+        assert cli.get_command(ctx, "nope") is None
+
+
 # ── CLI Command Registration Tests ──────────────────────────────
 
 class TestCLICommands:
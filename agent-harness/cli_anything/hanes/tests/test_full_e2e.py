@@ -9,6 +9,9 @@
 
     For subprocess tests (installed CLI):
         CLI_ANYTHING_FORCE_INSTALLED=1 python -m pytest cli_anything/hanes/tests/test_full_e2e.py -v -s
+
+    Without the backend, against the stand-in server (benchmarks/fake_backend.py):
+        HANES_E2E_FAKE=1 python -m pytest cli_anything/hanes/tests/test_full_e2e.py -v -s
 """
 
 import json
@@ -23,6 +26,11 @@ from cli_anything.hanes.utils.hanes_backend import HanesBackend, HanesAPIError
 
 # ── Fixtures ─────────────────────────────────────────────────────
 
+if os.environ.get("HANES_E2E_FAKE"):
+    from cli_anything.hanes.benchmarks.fake_backend import FakeBackend
+    _FAKE_BACKEND = FakeBackend(host="localhost", port=3003).start()
+
+
 def _backend_available() -> bool:
     """Check if the HANES backend is running."""
     try:
@@ -0,0 +1,195 @@
+"""
+@file cache.py
+@description Response cache for slow-changing reference endpoints.
+    Entries live for a per-endpoint TTL, are evicted LRU past a size cap,
+    and are revalidated with ETag / Last-Modified once stale so an
+    unchanged resource costs a 304 instead of a full payload. Writes to a
+    resource drop its cached entries. An optional DiskCache tier keeps
+    entries across CLI invocations.
+"""
+
+import threading
+import time
+import urllib.parse
+from collections import OrderedDict
+
+from cli_anything.hanes.utils.disk_cache import DiskCache
+
+
+# Seconds a cached GET stays fresh, keyed by resource path.
+DEFAULT_TTLS: dict[str, float] = {
+    "/master/parts": 300,
+    "/master/processes": 600,
+    "/master/routings": 300,
+    "/master/com-codes": 900,
+    "/inventory/warehouses": 900,
+}
+DEFAULT_MAX_ENTRIES = 256
+
+
+class CacheEntry:
+    """Cached response body plus its validators."""
+
+    __slots__ = ("resource", "body", "expires", "etag", "last_modified")
+
+    def __init__(self, resource: str, body: bytes, expires: float,
+                 etag: str | None = None, last_modified: str | None = None):
+        self.resource = resource
+        self.body = body
+        self.expires = expires
+        self.etag = etag
+        self.last_modified = last_modified
+
+    @property
+    def fresh(self) -> bool:
+        return time.monotonic() < self.expires
+
+    def validators(self) -> dict[str, str]:
+        """Conditional-request headers for revalidating this entry."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """Thread-safe TTL + LRU cache of GET response bodies.
+
+    Bodies are stored as raw bytes and decoded on every hit, so callers
+    can mutate what they get back without corrupting the cache. With
+    ``disk`` set, memory misses fall through to (and writes go to) disk.
+    """
+
+    def __init__(self, ttls: dict[str, float] | None = None,
+                 max_entries: int = DEFAULT_MAX_ENTRIES,
+                 disk: DiskCache | None = None):
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.max_entries = max_entries
+        self.disk = disk
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters = {"hits": 0, "misses": 0, "disk_hits": 0,
+                         "revalidated": 0, "evictions": 0, "invalidations": 0}
+
+    # ── Keys and policy ──────────────────────────────────────────────
+
+    def resource_for(self, path: str) -> str | None:
+        """Return the configured resource a path belongs to, if any."""
+        path = path.split("?", 1)[0].rstrip("/")
+        best = None
+        for resource in self.ttls:
+            if path == resource or path.startswith(resource + "/"):
+                if best is None or len(resource) > len(best):
+                    best = resource
+        return best
+
+    @staticmethod
+    def key(base_url: str, path: str, params: dict | None = None,
+            company: str | None = None, plant: str | None = None) -> str:
+        """Cache key: origin, tenant, path and sorted non-None params."""
+        query = ""
+        if params:
+            filtered = sorted((k, str(v)) for k, v in params.items()
+                              if v is not None)
+            query = urllib.parse.urlencode(filtered)
+        return f"{base_url}|{company or ''}|{plant or ''}|{path}?{query}"
+
+    # ── Operations ───────────────────────────────────────────────────
+
+    def _load_disk(self, key: str, resource: str) -> CacheEntry | None:
+        found = self.disk.get(key, resource)
+        if found is None:
+            return None
+        # Disk entries carry wall-clock expiry; memory uses monotonic time.
+        expires = time.monotonic() + (found.expires_at - time.time())
+        entry = CacheEntry(resource, found.body, expires,
+                           found.etag, found.last_modified)
+        with self._lock:
+            self._insert(key, entry)
+            if entry.fresh:
+                self.counters["disk_hits"] += 1
+        return entry
+
+    def _insert(self, key: str, entry: CacheEntry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.counters["evictions"] += 1
+
+    def get(self, key: str, resource: str | None = None) -> CacheEntry | None:
+        """Return the entry for key (fresh or stale) and count hit/miss.
+
+        ``resource`` is needed to look the key up in the disk tier.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is None and self.disk is not None and resource:
+            entry = self._load_disk(key, resource)
+        with self._lock:
+            if entry is not None and entry.fresh:
+                self.counters["hits"] += 1
+            else:
+                self.counters["misses"] += 1
+        return entry
+
+    def put(self, key: str, resource: str, body: bytes,
+            etag: str | None = None, last_modified: str | None = None):
+        ttl = self.ttls.get(resource, 0)
+        entry = CacheEntry(resource, body, time.monotonic() + ttl,
+                           etag, last_modified)
+        with self._lock:
+            self._insert(key, entry)
+        if self.disk is not None:
+            self.disk.put(key, resource, body, time.time() + ttl,
+                          etag, last_modified)
+
+    def revalidated(self, key: str) -> CacheEntry | None:
+        """Mark a stale entry fresh again after a 304 Not Modified."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            ttl = self.ttls.get(entry.resource, 0)
+            entry.expires = time.monotonic() + ttl
+            self.counters["revalidated"] += 1
+        if self.disk is not None:
+            self.disk.put(key, entry.resource, entry.body, time.time() + ttl,
+                          entry.etag, entry.last_modified)
+        return entry
+
+    def invalidate(self, path: str) -> int:
+        """Drop every entry of the resource a write to ``path`` touches."""
+        resource = self.resource_for(path)
+        if resource is None:
+            return 0
+        with self._lock:
+            stale = [k for k, e in self._entries.items()
+                     if e.resource == resource]
+            for k in stale:
+                del self._entries[k]
+            self.counters["invalidations"] += len(stale)
+        if self.disk is not None:
+            self.disk.invalidate(resource)
+        return len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats(self) -> dict[str, int | float]:
+        """Hit/miss counters, current size and hit ratio."""
+        with self._lock:
+            stats = dict(self.counters)
+            stats["entries"] = len(self._entries)
+        if self.disk is not None:
+            stats.update(self.disk.stats())
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        return stats
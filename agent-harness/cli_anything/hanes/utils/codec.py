@@ -0,0 +1,61 @@
+"""
+@file codec.py
+@description JSON codec for API responses and CLI output.
+    Uses orjson when it is installed (pip install cli-anything-hanes[fast])
+    and the stdlib json module otherwise. Output is byte-identical to
+    json.dumps(obj, indent=2, ensure_ascii=False, default=str) either way:
+    documents orjson would format differently are re-encoded with stdlib.
+    (The one exception is NaN/Infinity, which are not JSON and which the
+    backend never sends: orjson writes them as null.)
+"""
+
+import json
+import re
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+if orjson is not None:
+    # Hand datetimes and dataclasses to default=str like json.dumps does
+    # instead of orjson's native (ISO / dict) formatting.
+    _PRETTY = (orjson.OPT_INDENT_2 | orjson.OPT_PASSTHROUGH_DATETIME
+               | orjson.OPT_PASSTHROUGH_DATACLASS)
+
+# orjson writes floats below 1e-4 as 0.00001 / 1.5e-7 where repr() gives
+# 1e-05 / 1.5e-07, and floats from 1e16 up as 1e16 where repr() gives
+# 1e+16. Output containing any of these shapes (usually inside a string,
+# which is harmless) is re-encoded with stdlib to be safe.
+_FLOAT_MISMATCH = re.compile(rb"0\.0000|e-\d(?!\d)|e\d")
+
+
+def loads(data: bytes | str):
+    """Parse a JSON document (UTF-8 bytes or str)."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # NaN/Infinity, integers beyond 64 bits, lone surrogates:
+            # accepted by json, rejected by orjson.
+            pass
+    if isinstance(data, (bytes, bytearray)):
+        data = data.decode("utf-8")
+    return json.loads(data)
+
+
+def dumps_pretty(obj) -> str:
+    """json.dumps(obj, indent=2, ensure_ascii=False, default=str)."""
+    if orjson is not None:
+        try:
+            out = orjson.dumps(obj, default=str, option=_PRETTY)
+        except TypeError:
+            # Non-str keys, integers beyond 64 bits, lone surrogates.
+            pass
+        else:
+            if not _FLOAT_MISMATCH.search(out):
+                return out.decode("utf-8")
+    return json.dumps(obj, indent=2, ensure_ascii=False, default=str)
@@ -0,0 +1,195 @@
+"""
+@file disk_cache.py
+@description On-disk response cache shared across CLI invocations.
+    Lives under ~/.cli-anything-hanes/cache so separate one-shot
+    cli-anything-hanes processes reuse reference lookups. One file per
+    entry, written atomically; total size is kept under a byte budget by
+    evicting least-recently-used files while holding a lock file. The
+    directory is only rescanned for its size now and then, so filling
+    the cache costs O(1) stat calls per write, not O(entries).
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+from cli_anything.hanes.utils.filelock import FileLock
+
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+_SUFFIX = ".entry"
+# Writes between size scans: a quarter of the files last counted, at
+# least this many. Other processes' writes show up at the next scan.
+_MIN_RESCAN_PUTS = 64
+# Eviction frees down to this share of max_bytes, so a full cache is not
+# scanned and trimmed again on every write.
+_EVICT_TO = 0.9
+
+
+class DiskEntry:
+    """Cached body and metadata read back from disk."""
+
+    __slots__ = ("key", "resource", "body", "expires_at", "etag", "last_modified")
+
+    def __init__(self, key: str, resource: str, body: bytes, expires_at: float,
+                 etag: str | None = None, last_modified: str | None = None):
+        self.key = key
+        self.resource = resource
+        self.body = body
+        self.expires_at = expires_at
+        self.etag = etag
+        self.last_modified = last_modified
+
+
+class DiskCache:
+    """File-per-entry cache safe for concurrent processes.
+
+    Readers never see partial files: entries are written to a temp file in
+    the same directory and moved into place with os.replace(). Reads touch
+    the file's mtime, which eviction uses as the LRU clock.
+
+    The size checked against ``max_bytes`` is the last scan's total plus
+    what this instance wrote since (overwrites counted in full, so it
+    errs high and evicts early rather than late).
+    """
+
+    def __init__(self, directory: str | Path,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock_path = self.directory / ".lock"
+        self._size: int | None = None
+        self._rescan_in = 0
+
+    # ── Paths ────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _slug(resource: str) -> str:
+        return resource.strip("/").replace("/", "_") or "root"
+
+    def _path(self, key: str, resource: str) -> Path:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:40]
+        return self.directory / f"{self._slug(resource)}--{digest}{_SUFFIX}"
+
+    def _files(self) -> list[os.DirEntry]:
+        try:
+            return [e for e in os.scandir(self.directory)
+                    if e.name.endswith(_SUFFIX)]
+        except FileNotFoundError:
+            return []
+
+    # ── Operations ───────────────────────────────────────────────────
+
+    def get(self, key: str, resource: str) -> DiskEntry | None:
+        path = self._path(key, resource)
+        try:
+            with open(path, "rb") as f:
+                meta = json.loads(f.readline())
+                body = f.read()
+            os.utime(path)
+        except (FileNotFoundError, ValueError, OSError):
+            return None
+        if meta.get("key") != key:
+            return None
+        return DiskEntry(key, resource, body, meta.get("expires_at", 0),
+                         meta.get("etag"), meta.get("last_modified"))
+
+    def put(self, key: str, resource: str, body: bytes, expires_at: float,
+            etag: str | None = None, last_modified: str | None = None):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        meta = {"key": key, "expires_at": expires_at, "etag": etag,
+                "last_modified": last_modified, "stored_at": time.time()}
+        header = json.dumps(meta, ensure_ascii=False).encode("utf-8") + b"\n"
+        import tempfile  # only writers pay for it
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(header)
+                f.write(body)
+            os.replace(tmp, self._path(key, resource))
+        except BaseException as e:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            # Windows refuses to replace a file another process has open;
+            # the cache is best-effort, so skip this write.
+            if isinstance(e, PermissionError):
+                return
+            raise
+        self._rescan_in -= 1
+        if self._size is None or self._rescan_in <= 0:
+            self._scan()
+        else:
+            self._size += len(header) + len(body)
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def invalidate(self, resource: str) -> int:
+        """Delete every entry belonging to ``resource``."""
+        prefix = self._slug(resource) + "--"
+        removed = freed = 0
+        for entry in self._files():
+            if entry.name.startswith(prefix):
+                try:
+                    size = entry.stat().st_size
+                    os.unlink(entry.path)
+                    removed += 1
+                    freed += size
+                except FileNotFoundError:
+                    pass
+        if self._size is not None:
+            self._size = max(0, self._size - freed)
+        return removed
+
+    def clear(self):
+        for entry in self._files():
+            try:
+                os.unlink(entry.path)
+            except FileNotFoundError:
+                pass
+        self._counted(0, 0)
+
+    def _sizes(self) -> list[tuple[str, os.stat_result]]:
+        sizes = []
+        for e in self._files():
+            try:
+                sizes.append((e.path, e.stat()))
+            except FileNotFoundError:
+                pass
+        return sizes
+
+    def _counted(self, files: int, total: int):
+        self._size = total
+        self._rescan_in = max(_MIN_RESCAN_PUTS, files // 4)
+
+    def _scan(self):
+        sizes = self._sizes()
+        self._counted(len(sizes), sum(st.st_size for _, st in sizes))
+
+    def _evict(self):
+        """Drop least-recently-used files until under the byte budget."""
+        target = self.max_bytes * _EVICT_TO
+        with FileLock(self._lock_path):
+            ordered = sorted(self._sizes(), key=lambda kv: kv[1].st_mtime)
+            total = sum(st.st_size for _, st in ordered)
+            if total <= self.max_bytes:
+                target = total
+            kept = len(ordered)
+            for path, st in ordered:
+                if total <= target:
+                    break
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+                total -= st.st_size
+                kept -= 1
+        self._counted(kept, total)
+
+    def stats(self) -> dict[str, int]:
+        sizes = self._sizes()
+        return {"disk_entries": len(sizes),
+                "disk_bytes": sum(st.st_size for _, st in sizes)}
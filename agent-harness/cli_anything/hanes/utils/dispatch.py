@@ -0,0 +1,90 @@
+"""
+@file dispatch.py
+@description Helpers for running CLI argv in-process.
+    Shared by the daemon and batch mode: invoke() maps click's exit paths
+    to an exit code the way standalone mode would, and ThreadStreams lets
+    several worker threads capture their own stdout/stderr at once.
+"""
+
+import io
+import sys
+import threading
+import traceback
+
+import click
+
+
+def invoke(command: click.Command, argv: list[str], obj: dict,
+           tracebacks: bool = True) -> int:
+    """Run argv against command in this process and return its exit code.
+
+    Unhandled exceptions print a traceback to stderr like a cold run, or
+    just "Error: ..." with ``tracebacks=False``.
+    """
+    try:
+        rv = command.main(args=argv, prog_name="cli-anything-hanes",
+                          standalone_mode=False, obj=obj)
+        return rv if isinstance(rv, int) else 0
+    except click.exceptions.Exit as e:
+        return e.exit_code
+    except click.ClickException as e:
+        e.show()
+        return e.exit_code
+    except click.Abort:
+        click.echo("Aborted!", err=True)
+        return 1
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except Exception as e:
+        if tracebacks:
+            traceback.print_exc()
+        else:
+            click.echo(f"Error: {e}", err=True)
+        return 1
+
+
+class ThreadStreams(io.TextIOBase):
+    """Text stream that routes writes to a per-thread buffer.
+
+    Installed as sys.stdout (or sys.stderr); threads inside capture() write
+    to their own StringIO, every other thread writes to ``fallback``.
+    """
+
+    encoding = "utf-8"
+    errors = "strict"
+
+    def __init__(self, fallback):
+        super().__init__()
+        self.fallback = fallback
+        self._local = threading.local()
+
+    def writable(self) -> bool:
+        return True
+
+    def isatty(self) -> bool:
+        return False
+
+    def write(self, s: str) -> int:
+        buf = getattr(self._local, "buf", None)
+        return (buf if buf is not None else self.fallback).write(s)
+
+    def flush(self):
+        if getattr(self._local, "buf", None) is None:
+            self.fallback.flush()
+
+    def capture(self) -> "_Capture":
+        """Context manager collecting this thread's writes; see .getvalue()."""
+        return _Capture(self._local)
+
+
+class _Capture:
+    def __init__(self, local: threading.local):
+        self._local = local
+        self.buf = io.StringIO()
+
+    def __enter__(self):
+        self._local.buf = self.buf
+        return self.buf
+
+    def __exit__(self, *exc):
+        self._local.buf = None
@@ -0,0 +1,641 @@
+"""
+@file hanes_async.py
+@description asyncio HTTP client for HANES MES Backend API.
+    Same method surface as HanesBackend, but every call is a coroutine so
+    fan-out workloads (e.g. 50 job orders plus their results and defects)
+    run concurrently over shared keep-alive connections.
+
+    Usage:
+        async with HanesAsyncBackend(token=tok, company="HQ") as api:
+            orders, results = await asyncio.gather(
+                api.list_job_orders(limit=50),
+                api.list_prod_results(limit=50),
+            )
+"""
+
+import asyncio
+import http.client
+import io
+import time
+import urllib.parse
+from typing import Any, AsyncIterator, Awaitable, Callable, Hashable
+
+from cli_anything.hanes.utils import codec
+from cli_anything.hanes.utils.compression import (
+    DEFAULT_MIN_SIZE, READ_CHUNK, decoder_for,
+)
+from cli_anything.hanes.utils.hanes_backend import (
+    DEFAULT_BASE_URL, DEFAULT_PAGE_SIZE, HanesBackend, api_error, build_url,
+    connection_error, page_items,
+)
+from cli_anything.hanes.utils.http_pool import DEFAULT_MAX_IDLE, PoolResponse, may_resend
+from cli_anything.hanes.utils.resilience import (
+    CircuitBreaker, IDEMPOTENCY_HEADER, THROTTLED, RetryPolicy,
+    parse_retry_after,
+)
+
+
+DEFAULT_CONCURRENCY = 10
+
+_NO_BODY_STATUSES = {204, 304}
+
+
+class AsyncSingleFlight:
+    """asyncio counterpart of singleflight.SingleFlight (one event loop).
+
+    The shared call runs as its own task, so cancelling one waiter does
+    not cancel the request for the others.
+    """
+
+    def __init__(self):
+        self._tasks: dict[Hashable, asyncio.Future] = {}
+        self.counters = {"calls": 0, "shared": 0}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = task
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+            self.counters["calls"] += 1
+        else:
+            self.counters["shared"] += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict[str, int]:
+        return dict(self.counters, inflight=len(self._tasks))
+
+
+class _AsyncConnection:
+    """One keep-alive stream pair to the backend."""
+
+    __slots__ = ("reader", "writer", "last_used")
+
+    def __init__(self, reader: asyncio.StreamReader,
+                 writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.last_used = time.monotonic()
+
+    def close(self):
+        self.writer.close()
+
+
+class AsyncConnectionPool:
+    """asyncio counterpart of ConnectionPool for a single origin.
+
+    ``maxsize`` bounds concurrent requests (callers wait on a semaphore);
+    idle connections are reused LIFO. Must be used from one event loop.
+    """
+
+    def __init__(self, base_url: str, maxsize: int = DEFAULT_CONCURRENCY,
+                 timeout: float = 30, max_idle: float = DEFAULT_MAX_IDLE):
+        parts = urllib.parse.urlsplit(base_url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported URL scheme: {base_url}")
+        self.ssl = parts.scheme == "https"
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or (443 if self.ssl else 80)
+        self.maxsize = max(1, maxsize)
+        self.timeout = timeout
+        self.max_idle = max_idle
+
+        self._idle: list[_AsyncConnection] = []
+        self._slots: asyncio.Semaphore | None = None
+        self.created = 0
+        self.reused = 0
+
+    # ── Connection management ────────────────────────────────────────
+
+    async def _new_conn(self) -> _AsyncConnection:
+        reader, writer = await asyncio.open_connection(
+            self.host, self.port, ssl=self.ssl or None
+        )
+        self.created += 1
+        return _AsyncConnection(reader, writer)
+
+    async def _acquire(self) -> tuple[_AsyncConnection, bool]:
+        now = time.monotonic()
+        while self._idle:
+            conn = self._idle.pop()
+            if now - conn.last_used > self.max_idle or conn.reader.at_eof():
+                conn.close()
+                continue
+            self.reused += 1
+            return conn, True
+        return await self._new_conn(), False
+
+    def _release(self, conn: _AsyncConnection):
+        conn.last_used = time.monotonic()
+        self._idle.append(conn)
+
+    async def aclose(self):
+        """Close all idle connections."""
+        idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+        for conn in idle:
+            try:
+                await conn.writer.wait_closed()
+            except OSError:
+                pass
+
+    # ── Requests ─────────────────────────────────────────────────────
+
+    def _encode(self, method: str, url: str, body: bytes | None,
+                headers: dict[str, str]) -> bytes:
+        parts = urllib.parse.urlsplit(url)
+        target = parts.path or "/"
+        if parts.query:
+            target += "?" + parts.query
+        host = self.host if self.port in (80, 443) else f"{self.host}:{self.port}"
+        lines = [f"{method} {target} HTTP/1.1", f"Host: {host}"]
+        lines += [f"{k}: {v}" for k, v in headers.items()]
+        if body is not None or method in ("POST", "PUT", "PATCH"):
+            lines.append(f"Content-Length: {len(body or b'')}")
+        head = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+        return head + (body or b"")
+
+    async def _read_body(self, reader: asyncio.StreamReader,
+                         headers: http.client.HTTPMessage) -> bytes:
+        """Read the framed body, inflating gzip/deflate chunk by chunk."""
+        decoder = decoder_for(headers.get("Content-Encoding"))
+        parts = []
+
+        def take(chunk: bytes):
+            parts.append(decoder.feed(chunk) if decoder else chunk)
+
+        length = headers.get("Content-Length")
+        if headers.get("Transfer-Encoding", "").lower() == "chunked":
+            while True:
+                size_line = await reader.readuntil(b"\r\n")
+                size = int(size_line.split(b";", 1)[0], 16)
+                if size == 0:
+                    # Skip trailers up to the terminating blank line.
+                    while await reader.readuntil(b"\r\n") != b"\r\n":
+                        pass
+                    break
+                take(await reader.readexactly(size))
+                await reader.readexactly(2)
+        elif length is not None:
+            remaining = int(length)
+            while remaining:
+                take(await reader.readexactly(min(remaining, READ_CHUNK)))
+                remaining -= min(remaining, READ_CHUNK)
+        else:
+            while chunk := await reader.read(READ_CHUNK):
+                take(chunk)
+        if decoder:
+            parts.append(decoder.flush())
+        return b"".join(parts)
+
+    async def _read_head(self, reader: asyncio.StreamReader
+                         ) -> tuple[str, int, str, http.client.HTTPMessage]:
+        status_line = await reader.readuntil(b"\r\n")
+        version, status, *reason = (
+            status_line.decode("latin-1").rstrip("\r\n").split(" ", 2)
+        )
+        lines = []
+        while True:
+            line = await reader.readuntil(b"\r\n")
+            if line == b"\r\n":
+                break
+            lines.append(line)
+        headers = http.client.parse_headers(io.BytesIO(b"".join(lines) + b"\r\n"))
+        return version, int(status), reason[0] if reason else "", headers
+
+    async def _send(self, conn: _AsyncConnection, method: str, url: str,
+                    body: bytes | None,
+                    headers: dict[str, str]) -> PoolResponse:
+        try:
+            conn.writer.write(self._encode(method, url, body, headers))
+            await conn.writer.drain()
+            version, status, reason, resp_headers = await self._read_head(conn.reader)
+            no_body = method == "HEAD" or status in _NO_BODY_STATUSES or status < 200
+            data = b"" if no_body else await self._read_body(conn.reader, resp_headers)
+        except BaseException:
+            # Cancelled or failed mid-exchange: the stream state is unknown.
+            conn.close()
+            raise
+        framed = no_body or resp_headers.get("Content-Length") is not None \
+            or resp_headers.get("Transfer-Encoding", "").lower() == "chunked"
+        conn_header = resp_headers.get("Connection", "").lower()
+        if version == "HTTP/1.0":
+            keep_alive = conn_header == "keep-alive"
+        else:
+            keep_alive = conn_header != "close"
+        if framed and keep_alive:
+            self._release(conn)
+        else:
+            conn.close()
+        return PoolResponse(status, reason, resp_headers, data)
+
+    async def request(self, method: str, url: str, body: bytes | None = None,
+                      headers: dict[str, str] | None = None) -> PoolResponse:
+        """Send a request over a pooled connection and read the response.
+
+        The whole exchange is bounded by ``timeout``. A reused socket that
+        the server already closed is replaced and the request resent once,
+        if it may_resend().
+
+        Raises:
+            OSError: On socket-level failures (refused, reset).
+            TimeoutError: When the exchange exceeds ``timeout``.
+        """
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.maxsize)
+        headers = headers or {}
+        async with self._slots:
+            try:
+                return await asyncio.wait_for(
+                    self._request(method, url, body, headers), self.timeout
+                )
+            except asyncio.TimeoutError as e:
+                # Before Python 3.11 this is not the builtin TimeoutError
+                # that RetryPolicy (shared with the sync client) checks for.
+                raise TimeoutError(f"no response within {self.timeout}s") from e
+
+    async def _request(self, method, url, body, headers) -> PoolResponse:
+        conn, reused = await self._acquire()
+        try:
+            return await self._send(conn, method, url, body, headers)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            if not reused or not may_resend(method, headers):
+                raise
+        return await self._send(await self._new_conn(), method, url, body, headers)
+
+    def stats(self) -> dict[str, int]:
+        """Connection counters (created, reused, idle)."""
+        return {"created": self.created, "reused": self.reused,
+                "idle": len(self._idle)}
+
+
+class HanesAsyncBackend:
+    """asyncio HTTP client for HANES MES Backend API.
+
+    Concurrency is capped by ``concurrency``; extra calls wait for a free
+    slot. Cancelling a call closes its connection rather than returning a
+    half-read socket to the pool. Create and use it inside one event loop.
+    Retries and the circuit breaker behave as in HanesBackend; both
+    objects are thread-safe and may be shared with a sync client.
+    Concurrent identical GETs share one request, as in HanesBackend.
+    """
+
+    def __init__(self, base_url: str = DEFAULT_BASE_URL,
+                 token: str | None = None,
+                 company: str | None = None,
+                 plant: str | None = None,
+                 timeout: float = 30,
+                 concurrency: int = DEFAULT_CONCURRENCY,
+                 pool: AsyncConnectionPool | None = None,
+                 retry: RetryPolicy | None = None,
+                 breaker: CircuitBreaker | None = None,
+                 compress: bool = True,
+                 compress_min_size: int = DEFAULT_MIN_SIZE):
+        self.base_url = base_url.rstrip("/")
+        self.token = token
+        self.company = company
+        self.plant = plant
+        self.timeout = timeout
+        self.pool = pool or AsyncConnectionPool(
+            self.base_url, maxsize=concurrency, timeout=timeout
+        )
+        self.retry = retry or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self.singleflight = AsyncSingleFlight()
+        self.compress = compress
+        self.compress_min_size = compress_min_size
+
+    _headers = HanesBackend._headers
+    _body = HanesBackend._body
+    resilience_stats = HanesBackend.resilience_stats
+
+    async def aclose(self):
+        """Close idle pooled connections."""
+        await self.pool.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def _request(self, method: str, path: str,
+                       data: dict | None = None,
+                       params: dict | None = None,
+                       idempotency_key: str | None = None) -> dict:
+        """Make an HTTP request to the API (see HanesBackend._request).
+
+        Raises:
+            HanesAPIError: If the API returns an error.
+            ConnectionError: If the backend is unreachable or times out.
+        """
+        url = build_url(self.base_url, path, params)
+        headers = self._headers()
+        if idempotency_key:
+            headers[IDEMPOTENCY_HEADER] = idempotency_key
+        body = self._body(data, headers)
+
+        resp = await self._send(method, url, body, headers)
+        if resp.status >= 400:
+            raise api_error(resp.status, resp.body)
+        return codec.loads(resp.body) if resp.body else {}
+
+    async def _send(self, method: str, url: str, body: bytes | None,
+                    headers: dict[str, str]) -> PoolResponse:
+        if method == "GET":
+            key = (url, tuple(sorted(headers.items())))
+            return await self.singleflight.do(
+                key, lambda: self._send_with_retry(method, url, body, headers))
+        return await self._send_with_retry(method, url, body, headers)
+
+    async def _send_with_retry(self, method: str, url: str,
+                               body: bytes | None,
+                               headers: dict[str, str]) -> PoolResponse:
+        retry, breaker = self.retry, self.breaker
+        retry.count("requests")
+        attempt = 0
+        while True:
+            if breaker.acquire(self.base_url):
+                breaker.probed(await self.ping(), self.base_url)
+            retry_after = None
+            try:
+                resp = await self.pool.request(method, url, body=body,
+                                               headers=headers)
+            except (OSError, asyncio.TimeoutError, TimeoutError,
+                    asyncio.IncompleteReadError, http.client.HTTPException) as e:
+                breaker.record_failure()
+                if not retry.should_retry(attempt, method, headers, e):
+                    raise connection_error(self.base_url, e) from e
+            else:
+                if not retry.retryable_status(resp.status):
+                    breaker.record_success()
+                    retry.succeeded(attempt)
+                    return resp
+                retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+                if resp.status == THROTTLED:
+                    retry.count("throttled")
+                else:
+                    breaker.record_failure()
+                if not retry.should_retry(attempt, method, headers,
+                                          status=resp.status,
+                                          retry_after=retry_after):
+                    return resp
+            await asyncio.sleep(retry.backoff(attempt, retry_after))
+            attempt += 1
+
+    async def get(self, path: str, params: dict | None = None) -> dict:
+        return await self._request("GET", path, params=params)
+
+    async def post(self, path: str, data: dict | None = None,
+                   idempotency_key: str | None = None) -> dict:
+        return await self._request("POST", path, data=data,
+                                   idempotency_key=idempotency_key)
+
+    async def put(self, path: str, data: dict | None = None,
+                  idempotency_key: str | None = None) -> dict:
+        return await self._request("PUT", path, data=data,
+                                   idempotency_key=idempotency_key)
+
+    async def patch(self, path: str, data: dict | None = None,
+                    idempotency_key: str | None = None) -> dict:
+        return await self._request("PATCH", path, data=data,
+                                   idempotency_key=idempotency_key)
+
+    async def delete(self, path: str, idempotency_key: str | None = None) -> dict:
+        return await self._request("DELETE", path,
+                                   idempotency_key=idempotency_key)
+
+    async def iter_all(self, path: str, page_size: int = DEFAULT_PAGE_SIZE,
+                       prefetch: bool = True, **params) -> AsyncIterator[dict]:
+        """Yield every record of a paginated list endpoint (async for)."""
+        params.pop("page", None)
+        params["limit"] = page_size
+
+        def fetch(page: int):
+            return self.get(path, params={**params, "page": page})
+
+        page = 1
+        result = await fetch(page)
+        ahead = None
+        try:
+            while True:
+                items, has_next = page_items(result, page, page_size)
+                if has_next and prefetch:
+                    ahead = asyncio.ensure_future(fetch(page + 1))
+                for item in items:
+                    yield item
+                if not has_next:
+                    return
+                page += 1
+                result = await ahead if ahead else await fetch(page)
+                ahead = None
+        finally:
+            if ahead is not None:
+                ahead.cancel()
+
+    async def gather(self, *calls, return_exceptions: bool = False) -> list[Any]:
+        """Run several calls concurrently, e.g. ``api.gather(a(), b())``."""
+        return await asyncio.gather(*calls, return_exceptions=return_exceptions)
+
+    # ── Convenience: health check ────────────────────────────────────
+
+    async def ping(self) -> bool:
+        """Check if the backend is reachable (see HanesBackend.ping)."""
+        try:
+            resp = await asyncio.wait_for(
+                self.pool.request("GET", self.base_url), 5
+            )
+            return resp.status not in self.retry.statuses
+        except Exception:
+            return False
+
+    # ── Auth ─────────────────────────────────────────────────────────
+
+    async def login(self, email: str, password: str) -> dict:
+        result = await self.post("/auth/login",
+                                 {"email": email, "password": password})
+        if "token" in result or "data" in result:
+            token_data = result.get("data", result)
+            if isinstance(token_data, dict):
+                self.token = token_data.get("token", email)
+            else:
+                self.token = email
+        return result
+
+    async def me(self) -> dict:
+        return await self.get("/auth/me")
+
+    # ── Master ───────────────────────────────────────────────────────
+
+    async def list_parts(self, **params) -> dict:
+        return await self.get("/master/parts", params=params)
+
+    def iter_parts(self, **params) -> AsyncIterator[dict]:
+        return self.iter_all("/master/parts", **params)
+
+    async def get_part(self, item_code: str) -> dict:
+        return await self.get(f"/master/parts/{urllib.parse.quote(item_code)}")
+
+    async def create_part(self, data: dict) -> dict:
+        return await self.post("/master/parts", data)
+
+    async def list_processes(self, **params) -> dict:
+        return await self.get("/master/processes", params=params)
+
+    def iter_processes(self, **params) -> AsyncIterator[dict]:
+        return self.iter_all("/master/processes", **params)
+
+    async def list_boms(self, **params) -> dict:
+        return await self.get("/master/boms", params=params)
+
+    def iter_boms(self, **params) -> AsyncIterator[dict]:
+        return self.iter_all("/master/boms", **params)
+
+    async def get_bom_hierarchy(self, parent_code: str, depth: int = 10) -> dict:
+        return await self.get(
+            f"/master/boms/{urllib.parse.quote(parent_code)}/hierarchy",
+            params={"depth": depth},
+        )
+
+    async def list_routings(self, **params) -> dict:
+        return await self.get("/master/routings", params=params)
+
+    def iter_routings(self, **params) -> AsyncIterator[dict]:
+        return self.iter_all("/master/routings", **params)
+
+    async def list_com_codes(self, **params) -> dict:
+        return await self.get("/master/com-codes", params=params)
+
+    def iter_com_codes(self, **params) -> AsyncIterator[dict]:
+        return self.iter_all("/master/com-codes", **params)
+
+    # ── Material ─────────────────────────────────────────────────────
+
+    async def list_arrivals(self, **params) -> dict:
+        return await self.get("/material/arrivals", params=params)
+
+    def iter_arrivals(self, **params) -> AsyncIterator[dict]:
+        return self.iter_all("/material/arrivals", **params)
+
+    async def create_arrival(self, data: dict) -> dict:
+        return await self.post("/material/arrivals", data)
+
+    async def list_mat_lots(self, **params) -> dict:
+        return await self.get("/material/lots", params=params)
+
+    def iter_mat_lots(self, **params) -> AsyncIterator[dict]:
+        return self.iter_all("/material/lots", **params)
+
+    async def list_mat_stocks(self, **params) -> dict:
+        return await self.get("/material/stocks", params=params)
+
+    def iter_mat_stocks(self, **params) -> AsyncIterator[dict]:
+        return self.iter_all("/material/stocks", **params)
+
+    async def list_receivable(self, **params) -> dict:
+        return await self.get("/material/receiving/receivable", params=params)
+
+    def iter_receivable(self, **params) -> AsyncIterator[dict]:
+        return self.iter_all("/material/receiving/receivable", **params)
+
+    async def create_receiving(self, data: dict) -> dict:
+        return await self.post("/material/receiving", data)
+
+    # ── Production ───────────────────────────────────────────────────
+
+    async def list_job_orders(self, **params) -> dict:
+        return await self.get("/production/job-orders", params=params)
+
+    def iter_job_orders(self, **params) -> AsyncIterator[dict]:
+        return self.iter_all("/production/job-orders", **params)
+
+    async def get_job_order(self, order_no: str) -> dict:
+        return await self.get(
+            f"/production/job-orders/{urllib.parse.quote(order_no)}"
+        )
+
+    async def create_job_order(self, data: dict) -> dict:
+        return await self.post("/production/job-orders", data)
+
+    async def start_job_order(self, order_id: int) -> dict:
+        return await self.patch(f"/production/job-orders/{order_id}/start")
+
+    async def complete_job_order(self, order_id: int) -> dict:
+        return await self.patch(f"/production/job-orders/{order_id}/complete")
+
+    async def list_prod_results(self, **params) -> dict:
+        return await self.get("/production/prod-results", params=params)
+
+    def iter_prod_results(self, **params) -> AsyncIterator[dict]:
+        return self.iter_all("/production/prod-results", **params)
+
+    async def create_prod_result(self, data: dict) -> dict:
+        return await self.post("/production/prod-results", data)
+
+    # ── Quality ──────────────────────────────────────────────────────
+
+    async def list_reworks(self, **params) -> dict:
+        return await self.get("/quality/reworks", params=params)
+
+    def iter_reworks(self, **params) -> AsyncIterator[dict]:
+        return self.iter_all("/quality/reworks", **params)
+
+    async def create_rework(self, data: dict) -> dict:
+        return await self.post("/quality/reworks", data)
+
+    async def list_defect_logs(self, **params) -> dict:
+        return await self.get("/quality/defect-logs", params=params)
+
+    def iter_defect_logs(self, **params) -> AsyncIterator[dict]:
+        return self.iter_all("/quality/defect-logs", **params)
+
+    async def list_inspect_results(self, **params) -> dict:
+        return await self.get("/quality/inspect-results", params=params)
+
+    def iter_inspect_results(self, **params) -> AsyncIterator[dict]:
+        return self.iter_all("/quality/inspect-results", **params)
+
+    # ── Inventory ────────────────────────────────────────────────────
+
+    async def list_product_stocks(self, **params) -> dict:
+        return await self.get("/inventory/product-stocks", params=params)
+
+    def iter_product_stocks(self, **params) -> AsyncIterator[dict]:
+        return self.iter_all("/inventory/product-stocks", **params)
+
+    async def list_transactions(self, **params) -> dict:
+        return await self.get("/inventory/transactions", params=params)
+
+    def iter_transactions(self, **params) -> AsyncIterator[dict]:
+        return self.iter_all("/inventory/transactions", **params)
+
+    async def list_warehouses(self, **params) -> dict:
+        return await self.get("/inventory/warehouses", params=params)
+
+    def iter_warehouses(self, **params) -> AsyncIterator[dict]:
+        return self.iter_all("/inventory/warehouses", **params)
+
+    # ── Equipment ────────────────────────────────────────────────────
+
+    async def list_equips(self, **params) -> dict:
+        return await self.get("/equipment/equips", params=params)
+
+    def iter_equips(self, **params) -> AsyncIterator[dict]:
+        return self.iter_all("/equipment/equips", **params)
+
+    # ── Shipping ─────────────────────────────────────────────────────
+
+    async def list_ship_orders(self, **params) -> dict:
+        return await self.get("/shipping/orders", params=params)
+
+    def iter_ship_orders(self, **params) -> AsyncIterator[dict]:
+        return self.iter_all("/shipping/orders", **params)
+
+    # ── Dashboard ────────────────────────────────────────────────────
+
+    async def get_dashboard_kpi(self) -> dict:
+        return await self.get("/dashboard/kpi")
+
+    async def get_recent_productions(self) -> dict:
+        return await self.get("/dashboard/recent-productions")
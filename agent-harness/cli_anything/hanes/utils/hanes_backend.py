@@ -5,14 +5,33 @@
     This is the 'real software backend' — the CLI is useless without it.
 """
 
+import contextvars
+import http.client
 import json
-import urllib.request
-import urllib.error
+import time
 import urllib.parse
-from typing import Any
+from typing import Any, Iterator
+
+from cli_anything.hanes.utils import codec
+from cli_anything.hanes.utils.cache import ResponseCache
+from cli_anything.hanes.utils.compression import (
+    ACCEPT_ENCODING, DEFAULT_MIN_SIZE, gzip_body,
+)
+from cli_anything.hanes.utils.http_pool import (
+    ConnectionPool, DEFAULT_POOL_SIZE, PoolResponse, StreamResponse,
+)
+from cli_anything.hanes.utils.jsonstream import RecordStream
+from cli_anything.hanes.utils.metrics import RequestMetrics
+from cli_anything.hanes.utils.ratelimit import RateLimiter
+from cli_anything.hanes.utils.resilience import (
+    CircuitBreaker, IDEMPOTENCY_HEADER, THROTTLED, RetryPolicy,
+    parse_retry_after,
+)
+from cli_anything.hanes.utils.singleflight import SingleFlight
 
 
 DEFAULT_BASE_URL = "http://localhost:3003/api/v1"
+DEFAULT_PAGE_SIZE = 100
 
 
 class HanesAPIError(Exception):
@@ -25,26 +44,152 @@ class HanesAPIError(Exception):
         super().__init__(f"[{status}] {message}")
 
 
+def build_url(base_url: str, path: str, params: dict | None = None) -> str:
+    """Join base URL and path, appending non-None query parameters."""
+    url = f"{base_url}{path}"
+    if params:
+        filtered = {k: v for k, v in params.items() if v is not None}
+        if filtered:
+            url += "?" + urllib.parse.urlencode(filtered)
+    return url
+
+
+def api_error(status: int, body: bytes) -> HanesAPIError:
+    """Build a HanesAPIError from an error response body."""
+    raw = body.decode("utf-8", errors="replace")
+    try:
+        err_data = json.loads(raw)
+        msg = err_data.get("message", raw)
+    except json.JSONDecodeError:
+        msg = raw
+        err_data = None
+    return HanesAPIError(status, msg, err_data)
+
+
+def connection_error(base_url: str, exc: BaseException) -> ConnectionError:
+    """Build the ConnectionError raised when the backend is unreachable."""
+    return ConnectionError(
+        f"Cannot connect to HANES MES backend at {base_url}\n"
+        f"Start the server with: cd apps/backend && pnpm dev\n"
+        f"Error: {exc}"
+    )
+
+
+def page_items(result: Any, page: int, limit: int) -> tuple[list, bool]:
+    """Split a list response into (records, has_next_page).
+
+    Understands the backend's paged envelope
+    ``{data: [...], meta: {page, limit, total, totalPages, hasNext}}`` and
+    falls back to "a full page means there may be more".
+    """
+    data = result.get("data", result) if isinstance(result, dict) else result
+    if not isinstance(data, list) or not data:
+        return [], False
+    return data, has_next_page(result, len(data), page, limit)
+
+
+def has_next_page(result: Any, count: int, page: int, limit: int) -> bool:
+    """Whether a page of ``count`` records has a successor (see page_items)."""
+    if not count:
+        return False
+    meta = result.get("meta") if isinstance(result, dict) else None
+    if not isinstance(meta, dict):
+        meta = result if isinstance(result, dict) else {}
+    if "hasNext" in meta:
+        return bool(meta["hasNext"])
+    if "totalPages" in meta:
+        return page < int(meta["totalPages"])
+    if "total" in meta:
+        return page * limit < int(meta["total"])
+    return count >= limit
+
+
 class HanesBackend:
     """HTTP client for HANES MES Backend API.
 
-    Uses only stdlib (urllib) to avoid extra dependencies.
+    Uses only stdlib (http.client/urllib) to avoid extra dependencies.
+    Requests go through a keep-alive ConnectionPool; pass ``pool`` to
+    share one pool between several clients. With a ResponseCache, GETs of
+    reference endpoints are served from cache and writes invalidate them.
+
+    Failed requests are retried per ``retry`` (reads always, writes only
+    with an idempotency key) and a shared ``breaker`` fails fast while the
+    backend is down. Pass ``RetryPolicy(max_attempts=1)`` to disable.
+
+    Identical GETs issued concurrently (same URL and headers, so same
+    token and tenant) share one in-flight request through ``singleflight``;
+    each caller decodes its own copy of the response.
+
+    An optional ``limiter`` caps request rate and requests in flight; a
+    429 response pauses it for the Retry-After the server sent.
+
+    With ``compress`` responses are requested gzip/deflate-coded and
+    inflated while being read, and JSON bodies of ``compress_min_size``
+    bytes or more are sent gzipped.
+
+    ``iter_all(stream=True)`` parses each page's records straight off the
+    socket instead of reading and decoding the whole page first.
+
+    With ``metrics`` every call is recorded (phase timings, status, size)
+    for per-endpoint histograms, --trace and --metrics-file.
+
+    With a ``write_queue`` (utils/write_queue.py), create_prod_result and
+    create_receiving carry an idempotency key, and when the backend is
+    unreachable or briefly unavailable (408/429/502/503/504) the write is
+    journaled for later replay and ``{"success": False, "queued": True,
+    "status": "queued", ...}`` is returned instead of the error: the
+    write has not been applied yet.
     """
 
     def __init__(self, base_url: str = DEFAULT_BASE_URL,
                  token: str | None = None,
                  company: str | None = None,
                  plant: str | None = None,
-                 timeout: int = 30):
+                 timeout: int = 30,
+                 pool: ConnectionPool | None = None,
+                 pool_size: int = DEFAULT_POOL_SIZE,
+                 cache: ResponseCache | None = None,
+                 retry: RetryPolicy | None = None,
+                 breaker: CircuitBreaker | None = None,
+                 singleflight: SingleFlight | None = None,
+                 limiter: RateLimiter | None = None,
+                 compress: bool = True,
+                 compress_min_size: int = DEFAULT_MIN_SIZE,
+                 metrics: RequestMetrics | None = None,
+                 write_queue=None):
         self.base_url = base_url.rstrip("/")
         self.token = token
         self.company = company
         self.plant = plant
         self.timeout = timeout
+        self.pool = pool or ConnectionPool(
+            self.base_url, maxsize=pool_size, timeout=timeout
+        )
+        self.cache = cache
+        self.retry = retry or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self.singleflight = singleflight or SingleFlight()
+        self.limiter = limiter
+        self.compress = compress
+        self.compress_min_size = compress_min_size
+        self.metrics = metrics
+        self.write_queue = write_queue
+
+    def close(self):
+        """Close idle pooled connections."""
+        self.pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
 
     def _headers(self) -> dict[str, str]:
         """Build request headers with auth and tenant info."""
         headers = {"Content-Type": "application/json", "Accept": "application/json"}
+        if self.compress:
+            headers["Accept-Encoding"] = ACCEPT_ENCODING
         if self.token:
             headers["Authorization"] = f"Bearer {self.token}"
         if self.company:
@@ -53,9 +198,20 @@ class HanesBackend:
             headers["X-Plant"] = self.plant
         return headers
 
+    def _body(self, data: dict | None, headers: dict[str, str]) -> bytes | None:
+        """JSON-encode a request body, gzipping it when large enough."""
+        if not data:
+            return None
+        body = json.dumps(data).encode("utf-8")
+        if self.compress and len(body) >= self.compress_min_size:
+            body = gzip_body(body)
+            headers["Content-Encoding"] = "gzip"
+        return body
+
     def _request(self, method: str, path: str,
                  data: dict | None = None,
-                 params: dict | None = None) -> dict:
+                 params: dict | None = None,
+                 idempotency_key: str | None = None) -> dict:
         """Make an HTTP request to the API.
 
         Args:
@@ -63,6 +219,8 @@ class HanesBackend:
             path: API path (e.g., '/auth/login').
             data: JSON body for POST/PUT/PATCH.
             params: Query parameters for GET.
+            idempotency_key: Sent as Idempotency-Key; makes a write
+                safe to retry.
 
         Returns:
             Parsed JSON response as dict.
@@ -71,64 +229,287 @@ class HanesBackend:
             HanesAPIError: If the API returns an error.
             ConnectionError: If the backend is unreachable.
         """
-        url = f"{self.base_url}{path}"
-
-        if params:
-            filtered = {k: v for k, v in params.items() if v is not None}
-            if filtered:
-                url += "?" + urllib.parse.urlencode(filtered)
-
-        body = json.dumps(data).encode("utf-8") if data else None
-        req = urllib.request.Request(
-            url, data=body, headers=self._headers(), method=method
-        )
-
+        started = time.perf_counter()
+        url = build_url(self.base_url, path, params)
+        headers = self._headers()
+        if idempotency_key:
+            headers[IDEMPOTENCY_HEADER] = idempotency_key
+        body = self._body(data, headers)
+
+        resource = self.cache.resource_for(path) if self.cache else None
+        if method == "GET" and resource is not None:
+            return self._cached_get(url, path, params, resource, headers,
+                                    started)
         try:
-            with urllib.request.urlopen(req, timeout=self.timeout) as resp:
-                raw = resp.read().decode("utf-8")
-                return json.loads(raw) if raw else {}
-        except urllib.error.HTTPError as e:
-            raw = e.read().decode("utf-8", errors="replace")
+            return self._decode(self._send(method, url, body, headers),
+                                method, path, started)
+        finally:
+            if resource is not None and method != "GET":
+                self.cache.invalidate(path)
+
+    def _send(self, method: str, url: str, body: bytes | None,
+              headers: dict[str, str]) -> PoolResponse:
+        """Send a request; concurrent identical GETs are coalesced."""
+        if method == "GET":
+            key = (url, tuple(sorted(headers.items())))
+            leader = []
+
+            def call() -> PoolResponse:
+                leader.append(True)
+                return self._send_with_retry(method, url, body, headers)
+
+            resp = self.singleflight.do(key, call)
+            if not leader and self.metrics is not None:
+                # Another caller's request: don't count its timings twice.
+                return PoolResponse(resp.status, resp.reason, resp.headers,
+                                    resp.body, {"shared": True})
+            return resp
+        return self._send_with_retry(method, url, body, headers)
+
+    def _send_with_retry(self, method: str, url: str, body: bytes | None,
+                         headers: dict[str, str], stream: bool = False
+                         ) -> PoolResponse | StreamResponse:
+        """Send through the pool, retrying and tripping the breaker.
+
+        With ``stream`` the response comes back unread (pool.stream()).
+        """
+        send = self.pool.stream if stream else self.pool.request
+        retry, breaker = self.retry, self.breaker
+        retry.count("requests")
+        attempt = 0
+        queue_ms = 0.0
+        while True:
+            if breaker.acquire(self.base_url):
+                breaker.probed(self.ping(), self.base_url)
+            retry_after = None
             try:
-                err_data = json.loads(raw)
-                msg = err_data.get("message", raw)
-            except json.JSONDecodeError:
-                msg = raw
-                err_data = None
-            raise HanesAPIError(e.code, msg, err_data) from e
-        except urllib.error.URLError as e:
-            raise ConnectionError(
-                f"Cannot connect to HANES MES backend at {self.base_url}\n"
-                f"Start the server with: cd apps/backend && pnpm dev\n"
-                f"Error: {e.reason}"
-            ) from e
+                if self.limiter is None:
+                    resp = send(method, url, body=body, headers=headers)
+                else:
+                    queued = time.perf_counter()
+                    with self.limiter.permit():
+                        queue_ms += (time.perf_counter() - queued) * 1000
+                        resp = send(method, url, body=body, headers=headers)
+            except (OSError, http.client.HTTPException) as e:
+                breaker.record_failure()
+                if not retry.should_retry(attempt, method, headers, e):
+                    raise connection_error(self.base_url, e) from e
+            else:
+                if resp.timing is not None:
+                    resp.timing.update(attempts=attempt + 1, queue=queue_ms)
+                if not retry.retryable_status(resp.status):
+                    breaker.record_success()
+                    retry.succeeded(attempt)
+                    return resp
+                retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+                if resp.status == THROTTLED:
+                    # The backend is up, just busy: not a breaker failure.
+                    retry.count("throttled")
+                    if self.limiter is not None and retry_after:
+                        self.limiter.pause(retry_after)
+                else:
+                    breaker.record_failure()
+                if not retry.should_retry(attempt, method, headers,
+                                          status=resp.status,
+                                          retry_after=retry_after):
+                    return resp
+                if stream:
+                    resp.close()
+            time.sleep(retry.backoff(attempt, retry_after))
+            attempt += 1
+
+    def _decode(self, resp: PoolResponse, method: str, path: str,
+                started: float, source: str = "network") -> dict:
+        """Parse a response (raising HanesAPIError) and record its metrics."""
+        if self.metrics is None:
+            if resp.status >= 400:
+                raise api_error(resp.status, resp.body)
+            return codec.loads(resp.body) if resp.body else {}
+        t0 = time.perf_counter()
+        try:
+            if resp.status >= 400:
+                raise api_error(resp.status, resp.body)
+            return codec.loads(resp.body) if resp.body else {}
+        finally:
+            timing = resp.timing
+            if timing and timing.get("shared"):
+                source, timing = "shared", None
+            self.metrics.record(method, path, resp.status, len(resp.body),
+                                timing, (time.perf_counter() - t0) * 1000,
+                                started, source)
+
+    def _cached_get(self, url: str, path: str, params: dict | None,
+                    resource: str, headers: dict[str, str],
+                    started: float) -> dict:
+        """GET through the response cache, revalidating stale entries."""
+        key = self.cache.key(self.base_url, path, params,
+                             self.company, self.plant)
+        entry = self.cache.get(key, resource)
+        if entry is not None and entry.fresh:
+            return self._decode(PoolResponse(200, "OK", None, entry.body),
+                                "GET", path, started, "cache")
+        if entry is not None:
+            headers = {**headers, **entry.validators()}
+
+        resp = self._send("GET", url, None, headers)
+        if resp.status == 304 and entry is not None:
+            entry = self.cache.revalidated(key) or entry
+            return self._decode(PoolResponse(200, "OK", resp.headers, entry.body,
+                                             resp.timing),
+                                "GET", path, started, "revalidated")
+        result = self._decode(resp, "GET", path, started)
+        self.cache.put(key, resource, resp.body,
+                       etag=resp.headers.get("ETag"),
+                       last_modified=resp.headers.get("Last-Modified"))
+        return result
 
     def get(self, path: str, params: dict | None = None) -> dict:
         return self._request("GET", path, params=params)
 
-    def post(self, path: str, data: dict | None = None) -> dict:
-        return self._request("POST", path, data=data)
-
-    def put(self, path: str, data: dict | None = None) -> dict:
-        return self._request("PUT", path, data=data)
-
-    def patch(self, path: str, data: dict | None = None) -> dict:
-        return self._request("PATCH", path, data=data)
-
-    def delete(self, path: str) -> dict:
-        return self._request("DELETE", path)
+    def post(self, path: str, data: dict | None = None,
+             idempotency_key: str | None = None) -> dict:
+        return self._request("POST", path, data=data,
+                             idempotency_key=idempotency_key)
+
+    def put(self, path: str, data: dict | None = None,
+            idempotency_key: str | None = None) -> dict:
+        return self._request("PUT", path, data=data,
+                             idempotency_key=idempotency_key)
+
+    def _queued_post(self, path: str, data: dict) -> dict:
+        """POST that is journaled instead of lost if the backend is down."""
+        if self.write_queue is None:
+            return self.post(path, data)
+        from cli_anything.hanes.utils.write_queue import is_transient, new_key
+        key = new_key()
+        try:
+            return self.post(path, data, idempotency_key=key)
+        except (ConnectionError, HanesAPIError) as e:
+            if not is_transient(e):
+                raise
+            entry = self.write_queue.append("POST", path, data, key)
+            return {"success": False, "queued": True, "status": "queued",
+                    "data": {"queueId": entry["id"], "queuedAt": entry["ts"]},
+                    "message": str(e).splitlines()[0]}
+
+    def patch(self, path: str, data: dict | None = None,
+              idempotency_key: str | None = None) -> dict:
+        return self._request("PATCH", path, data=data,
+                             idempotency_key=idempotency_key)
+
+    def delete(self, path: str, idempotency_key: str | None = None) -> dict:
+        return self._request("DELETE", path, idempotency_key=idempotency_key)
+
+    def _stream_page(self, path: str, params: dict | None = None) -> RecordStream:
+        """GET a list page and parse its records as they arrive.
+
+        Bypasses the response cache and single-flight: the body is read
+        from the socket exactly once, by the returned stream.
+        """
+        started = time.perf_counter()
+        url = build_url(self.base_url, path, params)
+        resp = self._send_with_retry("GET", url, None, self._headers(),
+                                     stream=True)
+
+        def close():
+            resp.close()
+            if self.metrics is not None:
+                # Parsing is interleaved with the download and counted there.
+                self.metrics.record("GET", path, resp.status, resp.nbytes,
+                                    resp.timing, 0.0, started, "stream")
+
+        if resp.status >= 400:
+            try:
+                raise api_error(resp.status, resp.read_all())
+            finally:
+                close()
+        return RecordStream(resp.read, close)
+
+    def iter_all(self, path: str, page_size: int = DEFAULT_PAGE_SIZE,
+                 prefetch: bool = True, stream: bool = False,
+                 **params) -> Iterator[dict]:
+        """Yield every record of a paginated list endpoint, page by page.
+
+        At most two pages are held in memory. With ``prefetch`` the next
+        page is fetched on a background thread while the current one is
+        being consumed.
+
+        With ``stream`` records are parsed off the socket one at a time,
+        so memory is bounded by the largest record rather than the page.
+        Pages are then fetched one after another: the envelope's ``meta``
+        follows the records, so whether there is a next page is only
+        known once the current one has been read.
+        """
+        params.pop("page", None)
+        params["limit"] = page_size
+        if stream:
+            yield from self._iter_streamed(path, page_size, params)
+            return
+
+        def fetch(page: int) -> dict:
+            return self.get(path, params={**params, "page": page})
+
+        executor = None
+        if prefetch:
+            from concurrent.futures import ThreadPoolExecutor
+            executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            page = 1
+            result = fetch(page)
+            while True:
+                items, has_next = page_items(result, page, page_size)
+                # Run in this context so --trace sees prefetched pages.
+                ahead = (executor.submit(contextvars.copy_context().run,
+                                         fetch, page + 1)
+                         if has_next and executor else None)
+                yield from items
+                if not has_next:
+                    return
+                page += 1
+                result = ahead.result() if ahead else fetch(page)
+        finally:
+            if executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def _iter_streamed(self, path: str, page_size: int,
+                       params: dict) -> Iterator[dict]:
+        page = 1
+        while True:
+            count = 0
+            with self._stream_page(path, {**params, "page": page}) as records:
+                for record in records:
+                    count += 1
+                    yield record
+            if not has_next_page(records.envelope, count, page, page_size):
+                return
+            page += 1
 
     # ── Convenience: health check ────────────────────────────────────
 
     def ping(self) -> bool:
-        """Check if the backend is reachable."""
+        """Check if the backend is reachable.
+
+        Any HTTP answer counts (the API root is usually a 404) except the
+        gateway errors a restarting backend returns.
+        """
+        import urllib.error
+        import urllib.request
         try:
             req = urllib.request.Request(self.base_url, method="GET")
             with urllib.request.urlopen(req, timeout=5):
                 return True
+        except urllib.error.HTTPError as e:
+            return e.code not in self.retry.statuses
         except Exception:
             return False
 
+    def resilience_stats(self) -> dict:
+        """Retry counters, circuit breaker state and rate limiter waits."""
+        stats = {"retry": self.retry.stats(), "breaker": self.breaker.stats()}
+        if getattr(self, "limiter", None) is not None:
+            stats["limiter"] = self.limiter.stats()
+        return stats
+
     # ── Auth ─────────────────────────────────────────────────────────
 
     def login(self, email: str, password: str) -> dict:
@@ -149,6 +530,9 @@ class HanesBackend:
     def list_parts(self, **params) -> dict:
         return self.get("/master/parts", params=params)
 
+    def iter_parts(self, **params) -> Iterator[dict]:
+        return self.iter_all("/master/parts", **params)
+
     def get_part(self, item_code: str) -> dict:
         return self.get(f"/master/parts/{urllib.parse.quote(item_code)}")
 
@@ -158,9 +542,15 @@ class HanesBackend:
     def list_processes(self, **params) -> dict:
         return self.get("/master/processes", params=params)
 
+    def iter_processes(self, **params) -> Iterator[dict]:
+        return self.iter_all("/master/processes", **params)
+
     def list_boms(self, **params) -> dict:
         return self.get("/master/boms", params=params)
 
+    def iter_boms(self, **params) -> Iterator[dict]:
+        return self.iter_all("/master/boms", **params)
+
     def get_bom_hierarchy(self, parent_code: str, depth: int = 10) -> dict:
         return self.get(f"/master/boms/{urllib.parse.quote(parent_code)}/hierarchy",
                         params={"depth": depth})
@@ -168,34 +558,55 @@ class HanesBackend:
     def list_routings(self, **params) -> dict:
         return self.get("/master/routings", params=params)
 
+    def iter_routings(self, **params) -> Iterator[dict]:
+        return self.iter_all("/master/routings", **params)
+
     def list_com_codes(self, **params) -> dict:
         return self.get("/master/com-codes", params=params)
 
+    def iter_com_codes(self, **params) -> Iterator[dict]:
+        return self.iter_all("/master/com-codes", **params)
+
     # ── Material ─────────────────────────────────────────────────────
 
     def list_arrivals(self, **params) -> dict:
         return self.get("/material/arrivals", params=params)
 
+    def iter_arrivals(self, **params) -> Iterator[dict]:
+        return self.iter_all("/material/arrivals", **params)
+
     def create_arrival(self, data: dict) -> dict:
         return self.post("/material/arrivals", data)
 
     def list_mat_lots(self, **params) -> dict:
         return self.get("/material/lots", params=params)
 
+    def iter_mat_lots(self, **params) -> Iterator[dict]:
+        return self.iter_all("/material/lots", **params)
+
     def list_mat_stocks(self, **params) -> dict:
         return self.get("/material/stocks", params=params)
 
+    def iter_mat_stocks(self, **params) -> Iterator[dict]:
+        return self.iter_all("/material/stocks", **params)
+
     def list_receivable(self, **params) -> dict:
         return self.get("/material/receiving/receivable", params=params)
 
+    def iter_receivable(self, **params) -> Iterator[dict]:
+        return self.iter_all("/material/receiving/receivable", **params)
+
     def create_receiving(self, data: dict) -> dict:
-        return self.post("/material/receiving", data)
+        return self._queued_post("/material/receiving", data)
 
     # ── Production ───────────────────────────────────────────────────
 
     def list_job_orders(self, **params) -> dict:
         return self.get("/production/job-orders", params=params)
 
+    def iter_job_orders(self, **params) -> Iterator[dict]:
+        return self.iter_all("/production/job-orders", **params)
+
     def get_job_order(self, order_no: str) -> dict:
         return self.get(f"/production/job-orders/{urllib.parse.quote(order_no)}")
 
@@ -211,44 +622,71 @@ class HanesBackend:
     def list_prod_results(self, **params) -> dict:
         return self.get("/production/prod-results", params=params)
 
+    def iter_prod_results(self, **params) -> Iterator[dict]:
+        return self.iter_all("/production/prod-results", **params)
+
     def create_prod_result(self, data: dict) -> dict:
-        return self.post("/production/prod-results", data)
+        return self._queued_post("/production/prod-results", data)
 
     # ── Quality ──────────────────────────────────────────────────────
 
     def list_reworks(self, **params) -> dict:
         return self.get("/quality/reworks", params=params)
 
+    def iter_reworks(self, **params) -> Iterator[dict]:
+        return self.iter_all("/quality/reworks", **params)
+
     def create_rework(self, data: dict) -> dict:
         return self.post("/quality/reworks", data)
 
     def list_defect_logs(self, **params) -> dict:
         return self.get("/quality/defect-logs", params=params)
 
+    def iter_defect_logs(self, **params) -> Iterator[dict]:
+        return self.iter_all("/quality/defect-logs", **params)
+
     def list_inspect_results(self, **params) -> dict:
         return self.get("/quality/inspect-results", params=params)
 
+    def iter_inspect_results(self, **params) -> Iterator[dict]:
+        return self.iter_all("/quality/inspect-results", **params)
+
     # ── Inventory ────────────────────────────────────────────────────
 
     def list_product_stocks(self, **params) -> dict:
         return self.get("/inventory/product-stocks", params=params)
 
+    def iter_product_stocks(self, **params) -> Iterator[dict]:
+        return self.iter_all("/inventory/product-stocks", **params)
+
     def list_transactions(self, **params) -> dict:
         return self.get("/inventory/transactions", params=params)
 
+    def iter_transactions(self, **params) -> Iterator[dict]:
+        return self.iter_all("/inventory/transactions", **params)
+
     def list_warehouses(self, **params) -> dict:
         return self.get("/inventory/warehouses", params=params)
 
+    def iter_warehouses(self, **params) -> Iterator[dict]:
+        return self.iter_all("/inventory/warehouses", **params)
+
     # ── Equipment ────────────────────────────────────────────────────
 
     def list_equips(self, **params) -> dict:
         return self.get("/equipment/equips", params=params)
 
+    def iter_equips(self, **params) -> Iterator[dict]:
+        return self.iter_all("/equipment/equips", **params)
+
     # ── Shipping ─────────────────────────────────────────────────────
 
     def list_ship_orders(self, **params) -> dict:
         return self.get("/shipping/orders", params=params)
 
+    def iter_ship_orders(self, **params) -> Iterator[dict]:
+        return self.iter_all("/shipping/orders", **params)
+
     # ── Dashboard ────────────────────────────────────────────────────
 
     def get_dashboard_kpi(self) -> dict:
@@ -0,0 +1,330 @@
+"""
+@file http_pool.py
+@description Persistent HTTP/1.1 connection pool for the HANES API client.
+    Keeps keep-alive sockets to the NestJS server open between calls so
+    chained requests skip the TCP handshake. Thread-safe: one pool can be
+    shared by several HanesBackend instances and worker threads.
+    stream() hands back a response whose body is still on the socket, for
+    callers that parse it incrementally. Each response carries its DNS /
+    connect / TTFB / download timings in ms.
+"""
+
+import functools
+import http.client
+import socket
+import threading
+import time
+import urllib.parse
+
+from cli_anything.hanes.utils.compression import (
+    READ_CHUNK, decoder_for, read_decoded,
+)
+from cli_anything.hanes.utils.resilience import IDEMPOTENCY_HEADER, IDEMPOTENT_METHODS
+
+DEFAULT_POOL_SIZE = 4
+
+# Node's http server closes idle keep-alive sockets after 5s by default;
+# drop ours a little earlier instead of finding out on the next write.
+DEFAULT_MAX_IDLE = 4.0
+
+# Errors that mean a reused socket was already closed by the server.
+_STALE_ERRORS = (http.client.BadStatusLine, ConnectionError)
+
+
+def may_resend(method: str, headers: dict[str, str]) -> bool:
+    """Whether a request that failed on a reused socket can be sent again.
+
+    The same errors come from a reset after the server read the request,
+    so a write is only resent when repeating it is harmless (the rule
+    RetryPolicy.allows applies to retries).
+    """
+    return method.upper() in IDEMPOTENT_METHODS or IDEMPOTENCY_HEADER in headers
+
+
+def _connect_any(addresses: list, address, timeout, source_address=None):
+    """socket.create_connection() over already-resolved addresses."""
+    err = None
+    for family, socktype, proto, _, sockaddr in addresses:
+        sock = socket.socket(family, socktype, proto)
+        try:
+            if isinstance(timeout, (int, float)):
+                sock.settimeout(timeout)
+            if source_address:
+                sock.bind(source_address)
+            sock.connect(sockaddr)
+            return sock
+        except OSError as e:
+            err = e
+            sock.close()
+    raise err or OSError(f"No addresses for {address[0]}")
+
+
+class PoolResponse:
+    """A fully-read HTTP response returned by ConnectionPool.request().
+
+    ``timing`` maps phase names (dns, connect, ttfb, download) to ms;
+    dns/connect only appear when the request opened a new connection.
+    """
+
+    __slots__ = ("status", "reason", "headers", "body", "timing")
+
+    def __init__(self, status: int, reason: str,
+                 headers: http.client.HTTPMessage, body: bytes,
+                 timing: dict | None = None):
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+        self.timing = timing
+
+
+class StreamResponse:
+    """An HTTP response whose body is read incrementally by the caller.
+
+    Holds its connection and pool slot until ``close()``. A body read to
+    the end returns the connection to the pool; one abandoned half-way
+    closes it.
+    """
+
+    def __init__(self, pool: "ConnectionPool", conn: http.client.HTTPConnection,
+                 resp: http.client.HTTPResponse, timing: dict):
+        self.status = resp.status
+        self.reason = resp.reason
+        self.headers = resp.headers
+        self.timing = timing
+        self.nbytes = 0
+        self._pool = pool
+        self._conn = conn
+        self._resp = resp
+        self._decoder = decoder_for(resp.getheader("Content-Encoding"))
+        self._failed = False
+        self._closed = False
+
+    def read(self, amt: int = READ_CHUNK) -> bytes:
+        """Up to about ``amt`` decoded bytes; b"" only at end of body."""
+        t0 = time.perf_counter()
+        try:
+            while True:
+                raw = self._resp.read(amt)
+                if not raw:
+                    if self._decoder is None:
+                        return b""
+                    tail, self._decoder = self._decoder.flush(), None
+                    self.nbytes += len(tail)
+                    return tail
+                data = self._decoder.feed(raw) if self._decoder else raw
+                if data:
+                    self.nbytes += len(data)
+                    return data
+        except BaseException:
+            self._failed = True
+            raise
+        finally:
+            self.timing["download"] += (time.perf_counter() - t0) * 1000
+
+    def read_all(self) -> bytes:
+        return b"".join(iter(self.read, b""))
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        if (self._resp.isclosed() and not self._resp.will_close
+                and not self._failed):
+            self._pool._release(self._conn)
+        else:
+            self._conn.close()
+        self._pool._slots.release()
+
+
+class ConnectionPool:
+    """Pool of keep-alive HTTP/1.1 connections to a single origin.
+
+    At most ``maxsize`` connections are in use at once; further callers
+    block until one is released. Idle connections are reused LIFO so the
+    warmest socket is picked first.
+    """
+
+    def __init__(self, base_url: str, maxsize: int = DEFAULT_POOL_SIZE,
+                 timeout: float = 30, max_idle: float = DEFAULT_MAX_IDLE):
+        parts = urllib.parse.urlsplit(base_url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported URL scheme: {base_url}")
+        self.scheme = parts.scheme
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.maxsize = max(1, maxsize)
+        self.timeout = timeout
+        self.max_idle = max_idle
+
+        self._idle: list[tuple[http.client.HTTPConnection, float]] = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.maxsize)
+        self.created = 0
+        self.reused = 0
+
+    # ── Connection management ────────────────────────────────────────
+
+    def _new_conn(self) -> http.client.HTTPConnection:
+        cls = (http.client.HTTPSConnection if self.scheme == "https"
+               else http.client.HTTPConnection)
+        with self._lock:
+            self.created += 1
+        conn = cls(self.host, self.port, timeout=self.timeout)
+        # Resolve separately so DNS and TCP/TLS setup are timed apart.
+        t0 = time.perf_counter()
+        addresses = socket.getaddrinfo(self.host, self.port, 0,
+                                       socket.SOCK_STREAM)
+        t1 = time.perf_counter()
+        conn._create_connection = functools.partial(_connect_any, addresses)
+        conn.connect()
+        # Small request/response pairs suffer from Nagle + delayed ACK.
+        conn.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        # Charged to the first request sent over this connection.
+        conn.setup_ms = {"dns": (t1 - t0) * 1000,
+                         "connect": (time.perf_counter() - t1) * 1000}
+        return conn
+
+    @staticmethod
+    def _timing(conn: http.client.HTTPConnection, t0: float, t1: float) -> dict:
+        timing = {"ttfb": (t1 - t0) * 1000, "download": 0.0}
+        setup = getattr(conn, "setup_ms", None)
+        if setup:
+            timing.update(setup)
+            conn.setup_ms = None
+        return timing
+
+    def _acquire(self) -> tuple[http.client.HTTPConnection, bool]:
+        """Return (connection, reused) — an idle socket or a new one."""
+        now = time.monotonic()
+        expired = []
+        conn = None
+        with self._lock:
+            while self._idle:
+                candidate, last_used = self._idle.pop()
+                if now - last_used > self.max_idle:
+                    expired.append(candidate)
+                    continue
+                conn = candidate
+                self.reused += 1
+                break
+        for c in expired:
+            c.close()
+        if conn is not None:
+            return conn, True
+        return self._new_conn(), False
+
+    def _release(self, conn: http.client.HTTPConnection):
+        with self._lock:
+            self._idle.append((conn, time.monotonic()))
+
+    def close(self):
+        """Close all idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            conn.close()
+
+    # ── Requests ─────────────────────────────────────────────────────
+
+    def _target(self, url: str) -> str:
+        parts = urllib.parse.urlsplit(url)
+        target = parts.path or "/"
+        if parts.query:
+            target += "?" + parts.query
+        return target
+
+    def _send(self, conn: http.client.HTTPConnection, method: str,
+              target: str, body: bytes | None,
+              headers: dict[str, str]) -> PoolResponse:
+        t0 = time.perf_counter()
+        try:
+            conn.request(method, target, body=body, headers=headers)
+            resp = conn.getresponse()
+            t1 = time.perf_counter()
+            data = read_decoded(resp.read,
+                                decoder_for(resp.getheader("Content-Encoding")))
+        except BaseException:
+            conn.close()
+            raise
+        timing = self._timing(conn, t0, t1)
+        timing["download"] = (time.perf_counter() - t1) * 1000
+        if resp.will_close:
+            conn.close()
+        else:
+            self._release(conn)
+        return PoolResponse(resp.status, resp.reason, resp.headers, data, timing)
+
+    def request(self, method: str, url: str, body: bytes | None = None,
+                headers: dict[str, str] | None = None) -> PoolResponse:
+        """Send a request over a pooled connection and read the response.
+
+        A reused socket that turns out to be closed by the server is
+        replaced with a fresh connection and the request is sent once more,
+        if it may_resend().
+
+        Raises:
+            OSError: On socket-level failures (refused, timeout, reset).
+            http.client.HTTPException: On malformed responses.
+        """
+        target = self._target(url)
+        headers = headers or {}
+        with self._slots:
+            conn, reused = self._acquire()
+            try:
+                return self._send(conn, method, target, body, headers)
+            except _STALE_ERRORS:
+                if not reused or not may_resend(method, headers):
+                    raise
+            return self._send(self._new_conn(), method, target, body, headers)
+
+    def _open(self, conn: http.client.HTTPConnection, method: str,
+              target: str, body: bytes | None,
+              headers: dict[str, str]) -> StreamResponse:
+        t0 = time.perf_counter()
+        try:
+            conn.request(method, target, body=body, headers=headers)
+            resp = conn.getresponse()
+            return StreamResponse(self, conn, resp,
+                                  self._timing(conn, t0, time.perf_counter()))
+        except BaseException:
+            conn.close()
+            raise
+
+    def stream(self, method: str, url: str, body: bytes | None = None,
+               headers: dict[str, str] | None = None) -> StreamResponse:
+        """Send a request and return once the response headers are in.
+
+        The caller reads the body with ``read()`` and must ``close()`` the
+        response, which holds a pool slot until then.
+
+        Raises:
+            OSError: On socket-level failures (refused, timeout, reset).
+            http.client.HTTPException: On malformed responses.
+        """
+        target = self._target(url)
+        headers = headers or {}
+        self._slots.acquire()
+        try:
+            conn, reused = self._acquire()
+            try:
+                return self._open(conn, method, target, body, headers)
+            except _STALE_ERRORS:
+                if not reused or not may_resend(method, headers):
+                    raise
+            return self._open(self._new_conn(), method, target, body, headers)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def stats(self) -> dict[str, int]:
+        """Connection counters (created, reused, idle)."""
+        with self._lock:
+            return {"created": self.created, "reused": self.reused,
+                    "idle": len(self._idle)}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,202 @@
+"""
+@file jsonstream.py
+@description Incremental JSON parsing of large list responses.
+    Parses the top-level ``data`` array of a response envelope one record
+    at a time as bytes arrive, so memory is bounded by the size of a
+    record rather than of the page. The other top-level fields (``meta``,
+    ``success``, ...) are collected into ``envelope``.
+"""
+
+import codecs
+import json
+from typing import Callable, Iterator
+
+from cli_anything.hanes.utils.compression import READ_CHUNK
+
+
+_WHITESPACE = " \t\n\r"
+_NUMBER_START = "-0123456789"
+
+# Parser states.
+_START, _KEY, _COLON, _VALUE, _ITEM, _ITEM_SEP, _FIELD_SEP, _DONE = range(8)
+
+
+class ItemParser:
+    """Push parser yielding the elements of one top-level array.
+
+    Feed it bytes with ``feed()``; it returns the records completed so
+    far. A bare top-level array is streamed as well. Call ``close()`` at
+    end of input: it returns any last record and raises ValueError on
+    truncated JSON.
+
+    Usage:
+        parser = ItemParser("data")
+        for chunk in chunks:
+            for record in parser.feed(chunk):
+                ...
+        parser.close()
+        meta = parser.envelope.get("meta")
+    """
+
+    def __init__(self, key: str = "data"):
+        self.key = key
+        self.envelope: dict = {}
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._state = _START
+        self._field: str | None = None
+        self._bare = False
+
+    def feed(self, chunk: bytes) -> list:
+        self._buf = self._buf[self._pos:] + self._text.decode(chunk)
+        self._pos = 0
+        return self._parse(final=False)
+
+    def close(self) -> list:
+        self._buf = self._buf[self._pos:] + self._text.decode(b"", final=True)
+        self._pos = 0
+        items = self._parse(final=True)
+        if self._state != _DONE:
+            raise ValueError("Truncated JSON response")
+        return items
+
+    def _value(self, final: bool):
+        """Decode the value at the cursor; None (cursor kept) if incomplete."""
+        buf, pos = self._buf, self._pos
+        try:
+            value, end = self._json.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return None
+        # "12" at the end of the buffer may be the start of "1234".
+        if end == len(buf) and not final and buf[pos] in _NUMBER_START:
+            return None
+        self._pos = end
+        return (value,)
+
+    def _parse(self, final: bool) -> list:
+        items = []
+        buf = self._buf
+        while True:
+            while self._pos < len(buf) and buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos >= len(buf):
+                return items
+            c = buf[self._pos]
+            state = self._state
+            if state == _START:
+                if c == "[":
+                    self._bare = True
+                    self._state = _ITEM
+                elif c == "{":
+                    self._state = _KEY
+                else:
+                    raise ValueError("Expected a JSON object or array")
+                self._pos += 1
+                continue
+            if state == _KEY:
+                if c == "}":
+                    self._pos += 1
+                    self._state = _DONE
+                    continue
+                if c != '"':
+                    raise ValueError(f"Expected a field name at offset {self._pos}")
+                decoded = self._value(final)
+                if decoded is None:
+                    return items
+                self._field = decoded[0]
+                self._state = _COLON
+            elif state == _COLON:
+                self._expect(c, ":")
+                self._state = _VALUE
+            elif state == _VALUE:
+                if c == "[" and self._field == self.key:
+                    self._pos += 1
+                    self._state = _ITEM
+                    continue
+                decoded = self._value(final)
+                if decoded is None:
+                    return items
+                self.envelope[self._field] = decoded[0]
+                self._state = _FIELD_SEP
+            elif state == _ITEM:
+                if c == "]":
+                    self._close_array()
+                    continue
+                decoded = self._value(final)
+                if decoded is None:
+                    return items
+                items.append(decoded[0])
+                self._state = _ITEM_SEP
+            elif state == _ITEM_SEP:
+                if c == "]":
+                    self._close_array()
+                else:
+                    self._expect(c, ",")
+                    self._state = _ITEM
+            elif state == _FIELD_SEP:
+                if c == "}":
+                    self._pos += 1
+                    self._state = _DONE
+                else:
+                    self._expect(c, ",")
+                    self._state = _KEY
+            else:
+                raise ValueError("Extra data after JSON response")
+
+    def _expect(self, c: str, char: str):
+        if c != char:
+            raise ValueError(f"Expected {char!r} at offset {self._pos}, got {c!r}")
+        self._pos += 1
+
+    def _close_array(self):
+        self._pos += 1
+        self._state = _DONE if self._bare else _FIELD_SEP
+
+
+class RecordStream:
+    """Iterator over the records of one streamed list response.
+
+    ``read(n)`` supplies decoded body bytes (b"" at end of body) and
+    ``close()`` is called once iteration ends or is abandoned. After a
+    complete iteration ``envelope`` holds the non-record fields.
+    """
+
+    def __init__(self, read: Callable[[int], bytes], close: Callable[[], None],
+                 key: str = "data"):
+        self._read = read
+        self._close = close
+        self._parser = ItemParser(key)
+        self._iter = self._records()
+
+    @property
+    def envelope(self) -> dict:
+        return self._parser.envelope
+
+    def _records(self) -> Iterator:
+        parser = self._parser
+        try:
+            while chunk := self._read(READ_CHUNK):
+                yield from parser.feed(chunk)
+            yield from parser.close()
+        finally:
+            self._close()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._iter)
+
+    def close(self):
+        """Stop reading; the connection is dropped if the body is unread."""
+        self._iter.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
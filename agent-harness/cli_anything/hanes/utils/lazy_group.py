@@ -0,0 +1,53 @@
+"""
+@file lazy_group.py
+@description Click group that imports subcommand modules on first dispatch.
+    Lets the root CLI list master/material/production/... without paying
+    for their imports on every invocation; only the group actually run
+    (or all of them, for --help) gets loaded.
+"""
+
+import importlib
+import threading
+
+import click
+
+
+class LazyGroup(click.Group):
+    """click.Group whose subcommands are given as "module:attribute" paths.
+
+    Usage:
+        @click.group(cls=LazyGroup, lazy_subcommands={
+            "master": "cli_anything.hanes.core.master:master_group",
+        })
+        def cli(): ...
+    """
+
+    def __init__(self, *args, lazy_subcommands: dict[str, str] | None = None,
+                 **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = dict(lazy_subcommands or {})
+        # batch runs commands on worker threads; the first lookups of a
+        # group can happen at the same time.
+        self._load_lock = threading.Lock()
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_subcommands))
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        if cmd_name in self.lazy_subcommands:
+            return self._load(cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def _load(self, cmd_name: str) -> click.Command:
+        with self._load_lock:
+            command = self.commands.get(cmd_name)
+            if command is not None:
+                return command  # loaded by another thread meanwhile
+            module_name, attr = self.lazy_subcommands[cmd_name].split(":", 1)
+            command = getattr(importlib.import_module(module_name), attr)
+            if not isinstance(command, click.Command):
+                raise TypeError(f"{module_name}:{attr} is not a click command")
+            # Register for real so later lookups skip the import machinery.
+            self.add_command(command, cmd_name)
+            self.lazy_subcommands.pop(cmd_name, None)
+            return command
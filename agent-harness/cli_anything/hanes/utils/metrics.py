@@ -0,0 +1,238 @@
+"""
+@file metrics.py
+@description Per-request latency instrumentation for the HANES API client.
+    Every request made by HanesBackend is recorded with its timing split
+    into queue / DNS / connect / TTFB / download / JSON-decode, plus status
+    and response size. Per-endpoint histograms give p50/p95/p99; --trace
+    prints a waterfall of one command's requests and --metrics-file
+    appends one NDJSON record per request for offline analysis.
+"""
+
+import contextvars
+import json
+import math
+import threading
+import time
+from pathlib import Path
+
+# Request phases in the order they happen, with their waterfall glyphs.
+PHASES = ("queue", "dns", "connect", "ttfb", "download", "decode")
+_GLYPHS = {"queue": ".", "dns": "d", "connect": "c", "ttfb": "w",
+           "download": "r", "decode": "j"}
+
+# Histogram bucket growth: percentiles are accurate to about 5%.
+_GROWTH = 1.05
+_LOG_GROWTH = math.log(_GROWTH)
+
+WATERFALL_WIDTH = 30
+
+# Records of the command running in this context (see RequestMetrics.begin).
+_trace: contextvars.ContextVar[list | None] = contextvars.ContextVar(
+    "hanes_trace", default=None)
+
+
+def endpoint_of(method: str, path: str) -> str:
+    """Histogram key: method plus path with IDs/codes collapsed.
+
+    Path segments containing a digit (order numbers, item codes, numeric
+    IDs) become ``{id}`` so /production/job-orders/12/start and
+    /production/job-orders/13/start share one histogram.
+    """
+    path = path.split("?", 1)[0]
+    parts = ["{id}" if any(ch.isdigit() for ch in seg) else seg
+             for seg in path.split("/")]
+    return f"{method} {'/'.join(parts)}"
+
+
+class Histogram:
+    """Log-bucketed latency histogram with fixed memory."""
+
+    def __init__(self):
+        self.buckets: dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, ms: float):
+        index = math.ceil(math.log(ms) / _LOG_GROWTH) if ms > 0.001 else -142
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+
+    def merge(self, other: "Histogram"):
+        """Add another histogram's samples to this one."""
+        for index, n in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + n
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th percentile (0-100)."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * q / 100))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(_GROWTH ** index, self.max)
+        return self.max
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count, 3) if self.count else 0.0,
+            "p50_ms": round(self.percentile(50), 3),
+            "p95_ms": round(self.percentile(95), 3),
+            "p99_ms": round(self.percentile(99), 3),
+            "max_ms": round(self.max, 3),
+        }
+
+
+class RequestMetrics:
+    """Collects request timings; thread-safe, shared by a Session.
+
+    Args:
+        path: Append one NDJSON record per request to this file.
+
+    Usage:
+        metrics = RequestMetrics()
+        backend = HanesBackend(metrics=metrics)
+        metrics.begin()
+        backend.list_parts()
+        print(metrics.waterfall(metrics.end()))
+    """
+
+    def __init__(self, path: str | Path | None = None):
+        self.path = Path(path) if path else None
+        self.histograms: dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+        self._file = None
+
+    def begin(self) -> list:
+        """Start tracing the requests of one command in this context."""
+        records: list = []
+        _trace.set(records)
+        return records
+
+    def end(self) -> list:
+        """Stop tracing in this context and return what was traced."""
+        records = _trace.get() or []
+        _trace.set(None)
+        return records
+
+    def set_path(self, path: str | Path | None):
+        """Switch the NDJSON file (None: stop writing one)."""
+        path = Path(path) if path else None
+        with self._lock:
+            if path == self.path:
+                return
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self.path = path
+
+    def record(self, method: str, path: str, status: int | None,
+               nbytes: int, timing: dict | None, decode_ms: float,
+               started: float, source: str = "network"):
+        """Record one finished request.
+
+        ``timing`` holds the phase durations in ms measured by the pool
+        (None for cache hits); ``started`` is the perf_counter() value at
+        which the client call began.
+        """
+        now = time.perf_counter()
+        phases = dict.fromkeys(PHASES, 0.0)
+        if timing:
+            phases.update((k, v) for k, v in timing.items() if k in phases)
+        phases["decode"] = decode_ms
+        endpoint = endpoint_of(method, path)
+        total_ms = (now - started) * 1000
+        record = {
+            "ts": round(time.time(), 3),
+            "endpoint": endpoint,
+            "path": path,
+            "status": status,
+            "bytes": nbytes,
+            "source": source,
+            "attempts": timing.get("attempts", 1) if timing else 0,
+            **{f"{k}_ms": round(v, 3) for k, v in phases.items()},
+            "total_ms": round(total_ms, 3),
+        }
+        trace = _trace.get()
+        with self._lock:
+            if source != "cache":
+                hist = self.histograms.get(endpoint)
+                if hist is None:
+                    hist = self.histograms[endpoint] = Histogram()
+                hist.add(total_ms)
+            if self.path is not None:
+                self._write(record)
+        if trace is not None:
+            trace.append((started, record))
+
+    def _write(self, record: dict):
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def endpoints(self) -> dict[str, dict]:
+        """Latency summary (count, mean, p50/p95/p99, max) per endpoint."""
+        with self._lock:
+            return {name: hist.summary()
+                    for name, hist in sorted(self.histograms.items())}
+
+    def waterfall(self, records: list, width: int = WATERFALL_WIDTH) -> str:
+        """Render traced requests as a timing waterfall ("" if none).
+
+        Each bar spans the command's wall time: ``.`` queue, ``d`` DNS,
+        ``c`` connect, ``w`` waiting for the first byte, ``r`` download,
+        ``j`` JSON decode.
+        """
+        if not records:
+            return ""
+        records = sorted(records, key=lambda item: item[0])
+        origin = min(started for started, _ in records)
+        span = max((started - origin) * 1000 + r["total_ms"]
+                   for started, r in records) or 1.0
+        lines = [f"trace: {len(records)} request(s), {span:.1f} ms",
+                 f"{'start':>8} {'total':>9} {'status':>6} {'bytes':>9}  "
+                 f"{'endpoint':<36} {'dns':>5} {'conn':>5} {'ttfb':>6} "
+                 f"{'down':>6} {'json':>5}  waterfall"]
+        for started, r in records:
+            offset = (started - origin) * 1000
+            endpoint = r["endpoint"] if r["source"] == "network" \
+                else f"{r['endpoint']} ({r['source']})"
+            lines.append(
+                f"{offset:>6.1f}ms {r['total_ms']:>7.1f}ms {r['status'] or '-':>6} "
+                f"{r['bytes']:>9,}  {endpoint[:36]:<36} {r['dns_ms']:>5.1f} "
+                f"{r['connect_ms']:>5.1f} {r['ttfb_ms']:>6.1f} "
+                f"{r['download_ms']:>6.1f} {r['decode_ms']:>5.1f}  "
+                f"|{self._bar(offset, r, span, width)}|")
+        return "\n".join(lines)
+
+    @staticmethod
+    def _bar(offset: float, record: dict, span: float, width: int) -> str:
+        cells = [" "] * width
+        scale = width / span
+        t = offset
+        for phase in PHASES:
+            ms = record[f"{phase}_ms"]
+            if ms <= 0:
+                continue
+            first = min(width - 1, int(t * scale))
+            last = max(first + 1, min(width, round((t + ms) * scale)))
+            for i in range(first, last):
+                cells[i] = _GLYPHS[phase]
+            t += ms
+        return "".join(cells)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
@@ -0,0 +1,196 @@
+"""
+@file output.py
+@description Output renderer shared by the CLI command modules.
+    render() prints a command result as a table, JSON, NDJSON, CSV or TSV
+    (global --format). Record formats are written incrementally, so list
+    commands run with --all stream pages from HanesBackend.iter_*() to
+    stdout at constant memory instead of building the whole document.
+"""
+
+import csv
+import json
+from collections.abc import Iterator
+from typing import Callable, Iterable
+
+import click
+from click.core import ParameterSource
+
+from cli_anything.hanes.utils.codec import dumps_pretty
+from cli_anything.hanes.utils.hanes_backend import DEFAULT_PAGE_SIZE
+
+
+FORMATS = ("table", "json", "ndjson", "csv", "tsv")
+
+# Rows buffered to size table columns before the first line is printed.
+TABLE_SAMPLE_ROWS = 100
+
+# Small writes are coalesced into chunks of about this many characters.
+CHUNK_CHARS = 8192
+
+
+def page_size(ctx: click.Context, limit: int) -> int:
+    """Page size for --all: --limit when given explicitly, else the default."""
+    if ctx.get_parameter_source("limit") in (None, ParameterSource.DEFAULT):
+        return DEFAULT_PAGE_SIZE
+    return limit
+
+
+def stream_json(records: Iterable[dict]) -> int:
+    """Write ``{"data": [...], "total": n}`` one record at a time.
+
+    The layout matches json.dumps(..., indent=2) of the same document.
+    """
+    count = 0
+    for record in records:
+        lines = dumps_pretty(record).replace("\n", "\n    ")
+        click.echo(("{\n  \"data\": [\n    " if count == 0 else ",\n    ") + lines,
+                   nl=False)
+        count += 1
+    if count == 0:
+        click.echo('{\n  "data": [],\n  "total": 0\n}')
+    else:
+        click.echo(f'\n  ],\n  "total": {count}\n}}')
+    return count
+
+
+def stream_table(records: Iterable[dict], headers: list[str],
+                 rows_fn: Callable[[dict], list]) -> int:
+    """Print records as a table, sizing columns from the first rows."""
+    from cli_anything.hanes.utils.repl_skin import ReplSkin
+    skin = ReplSkin("hanes")
+    count = skin.table_stream(headers, (rows_fn(r) for r in records),
+                              sample_rows=TABLE_SAMPLE_ROWS)
+    skin.info(f"Total: {count}")
+    return count
+
+
+class _ChunkedEcho:
+    """File-like sink that batches writes into few click.echo() calls."""
+
+    def __init__(self, limit: int = CHUNK_CHARS):
+        self.limit = limit
+        self._parts: list[str] = []
+        self._size = 0
+
+    def write(self, s: str) -> int:
+        self._parts.append(s)
+        self._size += len(s)
+        if self._size >= self.limit:
+            self.flush()
+        return len(s)
+
+    def flush(self):
+        if self._parts:
+            click.echo("".join(self._parts), nl=False)
+            self._parts, self._size = [], 0
+
+
+def stream_ndjson(records: Iterable) -> int:
+    """Write one compact JSON document per line."""
+    out = _ChunkedEcho()
+    count = 0
+    for record in records:
+        out.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        count += 1
+    out.flush()
+    return count
+
+
+def _cell(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False, default=str)
+    return str(value)
+
+
+def stream_delimited(records: Iterable, delimiter: str = ",") -> int:
+    """Write records as CSV/TSV with a header row.
+
+    Columns are the keys of the first record; keys that only show up in
+    later records are dropped so rows never have to be buffered.
+    Nested values are written as compact JSON.
+    """
+    out = _ChunkedEcho()
+    writer = csv.writer(out, delimiter=delimiter, lineterminator="\n")
+    fields: list[str] | None = None
+    count = 0
+    for record in records:
+        if not isinstance(record, dict):
+            record = {"value": record}
+        if fields is None:
+            fields = list(record)
+            writer.writerow(fields)
+        writer.writerow([_cell(record.get(f)) for f in fields])
+        count += 1
+    out.flush()
+    return count
+
+
+def output_format(ctx: click.Context) -> str:
+    """The --format in effect: explicit, else json with --json, else table."""
+    return ctx.obj.get("format") or ("json" if ctx.obj.get("json_mode") else "table")
+
+
+def _records(data) -> Iterable | None:
+    """Records carried by a result: an iterator, a list, or an envelope."""
+    if isinstance(data, (Iterator, list)):
+        return data
+    if isinstance(data, dict):
+        items = data.get("data", data)
+        if isinstance(items, list):
+            return items
+        return [items]
+    return None
+
+
+def _print_table(data: dict, headers: list[str],
+                 rows_fn: Callable[[dict], list]) -> bool:
+    items = data.get("data", data)
+    if not isinstance(items, list):
+        return False
+    from cli_anything.hanes.utils.repl_skin import ReplSkin
+    skin = ReplSkin("hanes")
+    skin.table(headers, [rows_fn(item) for item in items])
+    skin.info(f"Total: {data.get('total', len(items))}")
+    return True
+
+
+def render(ctx: click.Context, data, headers: list[str] | None = None,
+           rows_fn: Callable[[dict], list] | None = None):
+    """Print a command result in the selected output format.
+
+    ``data`` is an API response (usually a {"data": [...]} envelope) or an
+    iterator of records from --all. headers/rows_fn describe the table
+    view; without them the table format falls back to JSON. A write that
+    was queued offline instead of applied exits with EXIT_QUEUED.
+    """
+    _render(ctx, data, headers, rows_fn)
+    if isinstance(data, dict) and data.get("status") == "queued":
+        from cli_anything.hanes.utils.write_queue import EXIT_QUEUED
+        ctx.exit(EXIT_QUEUED)
+
+
+def _render(ctx: click.Context, data, headers: list[str] | None,
+            rows_fn: Callable[[dict], list] | None):
+    fmt = output_format(ctx)
+    streaming = isinstance(data, Iterator)
+    if fmt == "table" and headers and rows_fn:
+        if streaming:
+            stream_table(data, headers, rows_fn)
+            return
+        if isinstance(data, dict) and _print_table(data, headers, rows_fn):
+            return
+    if fmt in ("table", "json"):
+        if streaming:
+            stream_json(data)
+        else:
+            click.echo(dumps_pretty(data))
+        return
+    records = _records(data)
+    if records is None:
+        records = [data]
+    if fmt == "ndjson":
+        stream_ndjson(records)
+    else:
+        stream_delimited(records, "\t" if fmt == "tsv" else ",")
@@ -0,0 +1,194 @@
+"""
+@file profiling.py
+@description Client-side profiling for --profile and --profile-imports.
+    CommandProfiler runs a command under cProfile and writes pstats, a
+    collapsed-stack (".folded") file for flamegraph tools and a top-N
+    cumulative report. profile_imports() re-runs the CLI under
+    python -X importtime and summarises the import cost per module.
+
+    Usage:
+        cli-anything-hanes --profile out.prof production orders --all
+        flamegraph.pl out.folded > out.svg     # or: speedscope out.folded
+        python -m pstats out.prof
+        cli-anything-hanes --profile-imports master parts
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import subprocess
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+
+DEFAULT_TOP = 20
+# Stack sampling period. The sampler needs the GIL to look at other
+# threads, so busy Python code is sampled about every switch interval
+# (5 ms by default) whatever this is set to.
+SAMPLE_INTERVAL = 0.001
+
+# Only one profiler per process: cProfile refuses to nest.
+_active_lock = threading.Lock()
+_active = False
+
+
+def folded_path(path: str | Path) -> Path:
+    """Collapsed-stack file written next to the pstats file."""
+    return Path(path).with_suffix(".folded")
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler(threading.Thread):
+    """Samples every thread's stack into flamegraph "collapsed" counts.
+
+    cProfile only sees the thread that enabled it; the sampler also covers
+    the --all prefetch thread and batch / daemon workers.
+    """
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        super().__init__(name="hanes-profiler", daemon=True)
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        own = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                stack.append(names.get(ident, f"thread-{ident}"))
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def write(self, path: str | Path):
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f"{stack} {count}\n")
+
+
+class CommandProfiler:
+    """Profiles the code between start() and stop().
+
+    Args:
+        path: pstats output file; the collapsed stacks go to
+            folded_path(path).
+        top: Number of functions in the cumulative-time report.
+        stream: Where the report is printed (default: stderr).
+    """
+
+    def __init__(self, path: str | Path, top: int = DEFAULT_TOP,
+                 stream=None, interval: float = SAMPLE_INTERVAL):
+        self.path = Path(path)
+        self.top = top
+        self.stream = stream
+        self.interval = interval
+        self.profile: cProfile.Profile | None = None
+        self.sampler: StackSampler | None = None
+
+    def start(self) -> bool:
+        """Start profiling; False if another profiler is already running."""
+        global _active
+        with _active_lock:
+            if _active:
+                return False
+            _active = True
+        self.profile = cProfile.Profile()
+        self.sampler = StackSampler(self.interval)
+        self.sampler.start()
+        self.profile.enable()
+        return True
+
+    def stop(self) -> str:
+        """Stop, write both files and return the top-N report."""
+        global _active
+        self.profile.disable()
+        self.sampler.stop()
+        with _active_lock:
+            _active = False
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.profile.dump_stats(self.path)
+        self.sampler.write(folded_path(self.path))
+
+        out = io.StringIO()
+        stats = pstats.Stats(self.profile, stream=out)
+        stats.strip_dirs().sort_stats("cumulative").print_stats(self.top)
+        samples = sum(self.sampler.stacks.values())
+        return (f"profile: wrote {self.path} (pstats) and "
+                f"{folded_path(self.path)} ({samples} stack samples)\n"
+                + out.getvalue().strip("\n"))
+
+
+# ── Import profiling ─────────────────────────────────────────────
+
+IMPORT_FLAG = "--profile-imports"
+
+_CHILD = ("import sys\n"
+          "from cli_anything.hanes.hanes_cli import main\n"
+          "sys.argv[0] = 'cli-anything-hanes'\n"
+          "main()\n")
+
+
+def parse_importtime(lines: list[str]) -> tuple[list[dict], list[str]]:
+    """Split -X importtime stderr into per-module records and other lines."""
+    modules, other = [], []
+    for line in lines:
+        if not line.startswith("import time:"):
+            other.append(line)
+            continue
+        fields = line[len("import time:"):].split("|")
+        try:
+            self_us, cumulative_us = int(fields[0]), int(fields[1])
+        except ValueError:
+            continue  # the column header
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules.append({"module": name.strip(), "depth": depth,
+                        "self_ms": self_us / 1000,
+                        "cumulative_ms": cumulative_us / 1000})
+    return modules, other
+
+
+def import_report(modules: list[dict], top: int = DEFAULT_TOP) -> str:
+    """Total import time and the top-N modules by cumulative time."""
+    total = sum(m["self_ms"] for m in modules)
+    ranked = sorted(modules, key=lambda m: m["cumulative_ms"], reverse=True)
+    lines = [f"imports: {len(modules)} modules, {total:.1f} ms",
+             f"{'cumulative':>12} {'self':>9}  module"]
+    for m in ranked[:top]:
+        lines.append(f"{m['cumulative_ms']:>10.1f}ms {m['self_ms']:>7.1f}ms  "
+                     f"{m['module']}")
+    return "\n".join(lines)
+
+
+def profile_imports(argv: list[str], top: int = DEFAULT_TOP) -> int:
+    """Run the CLI with argv under -X importtime; report to stderr.
+
+    The command's stdout passes through and its own stderr output is
+    kept. Modules loaded by importlib (the lazily imported command
+    groups themselves) are not timed by the interpreter, but everything
+    they import is. Returns the command's exit code.
+    """
+    argv = [a for a in argv if a != IMPORT_FLAG]
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", _CHILD, *argv],
+                          stdout=None, stderr=subprocess.PIPE, text=True)
+    modules, other = parse_importtime(proc.stderr.splitlines())
+    if other:
+        sys.stderr.write("\n".join(other) + "\n")
+    sys.stderr.write(import_report(modules, top) + "\n")
+    return proc.returncode
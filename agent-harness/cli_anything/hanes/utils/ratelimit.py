@@ -0,0 +1,271 @@
+"""
+@file ratelimit.py
+@description Client-side rate limiting for the HANES API client.
+    A token bucket caps requests per second and a slot pool caps requests
+    in flight, either inside one process or across every process that
+    points at the same directory (lock files under ~/.cli-anything-hanes),
+    so a fleet of agent workers cannot swamp one plant's backend. 429
+    Retry-After pauses the bucket for all of them. Time spent queueing is
+    recorded for monitoring.
+"""
+
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+from cli_anything.hanes.utils.filelock import FileLock
+
+
+# Slot polling interval while every in-flight slot is taken.
+_SLOT_POLL = 0.005
+# Queue waits kept for the p95 estimate.
+_WAIT_WINDOW = 1024
+
+
+class RateLimitError(RuntimeError):
+    """The limiter's shared lock stayed busy; the backend was not asked.
+
+    Not an OSError, so callers do not mistake it for a connection
+    failure (and the circuit breaker does not count it).
+    """
+
+
+def _reserve(state: dict, now: float, rate: float, burst: float) -> float:
+    """Take one token from ``state`` and return how long to wait for it.
+
+    Tokens may go negative: each caller reserves the next token and sleeps
+    until it has been refilled, so waiters are served in arrival order
+    without polling.
+    """
+    tokens = min(burst, state["tokens"] + (now - state["ts"]) * rate) - 1
+    state["tokens"], state["ts"] = tokens, now
+    wait = -tokens / rate if tokens < 0 else 0.0
+    return max(wait, state.get("paused_until", 0.0) - now)
+
+
+class TokenBucket:
+    """In-process token bucket: ``rate`` tokens per second, up to ``burst``."""
+
+    def __init__(self, rate: float, burst: float | None = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst or max(1.0, rate)
+        self._state = {"tokens": self.burst, "ts": time.time(), "paused_until": 0.0}
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Reserve a token; returns seconds to sleep before using it."""
+        with self._lock:
+            return _reserve(self._state, time.time(), self.rate, self.burst)
+
+    def pause(self, seconds: float):
+        """Hold back every caller for ``seconds`` (e.g. after a 429)."""
+        with self._lock:
+            until = time.time() + seconds
+            self._state["paused_until"] = max(self._state["paused_until"], until)
+
+
+class SharedTokenBucket(TokenBucket):
+    """Token bucket whose state lives in a file shared by all processes."""
+
+    def __init__(self, directory: str | Path, rate: float,
+                 burst: float | None = None, lock_timeout: float = 10.0):
+        super().__init__(rate, burst)
+        self.directory = Path(directory)
+        self.lock_timeout = lock_timeout
+        self._path = self.directory / "bucket.json"
+        self._file_lock = self.directory / "bucket.lock"
+
+    def _update(self, fn):
+        with self._lock, FileLock(self._file_lock, timeout=self.lock_timeout):
+            try:
+                state = json.loads(self._path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                state = {"tokens": self.burst, "ts": time.time(),
+                         "paused_until": 0.0}
+            result = fn(state)
+            tmp = self._path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(state), encoding="utf-8")
+            os.replace(tmp, self._path)
+            return result
+
+    def reserve(self) -> float:
+        return self._update(
+            lambda state: _reserve(state, time.time(), self.rate, self.burst))
+
+    def pause(self, seconds: float):
+        def apply(state):
+            until = time.time() + seconds
+            state["paused_until"] = max(state.get("paused_until", 0.0), until)
+        self._update(apply)
+
+
+class _LocalSlot:
+    def __init__(self, semaphore: threading.BoundedSemaphore):
+        self._semaphore = semaphore
+
+    def release(self):
+        self._semaphore.release()
+
+
+class InflightSlots:
+    """At most ``size`` requests in flight in this process."""
+
+    def __init__(self, size: int):
+        self.size = max(1, size)
+        self._semaphore = threading.BoundedSemaphore(self.size)
+
+    def acquire(self) -> _LocalSlot:
+        self._semaphore.acquire()
+        return _LocalSlot(self._semaphore)
+
+
+class SharedInflightSlots:
+    """At most ``size`` requests in flight across processes.
+
+    Each slot is a lock file; a request holds one for its duration. Locks
+    die with their process, so a killed worker never leaks a slot.
+    """
+
+    def __init__(self, directory: str | Path, size: int):
+        self.size = max(1, size)
+        self.directory = Path(directory)
+
+    def acquire(self) -> FileLock:
+        while True:
+            for i in range(self.size):
+                lock = FileLock(self.directory / f"slot-{i}.lock")
+                if lock.try_acquire():
+                    return lock
+            time.sleep(_SLOT_POLL)
+
+
+class _Permit:
+    __slots__ = ("_limiter", "_slot")
+
+    def __init__(self, limiter: "RateLimiter"):
+        self._limiter = limiter
+        self._slot = None
+
+    def __enter__(self):
+        self._slot = self._limiter._enter()
+        return self
+
+    def __exit__(self, *exc):
+        self._limiter._exit(self._slot)
+
+
+class RateLimiter:
+    """Token-bucket rate limit plus in-flight cap, with queue-wait metrics.
+
+    Args:
+        rate: Requests per second (None: unlimited).
+        burst: Bucket size (default: one second's worth, at least 1).
+        max_inflight: Concurrent requests (None: unlimited).
+        shared_dir: Coordinate through lock files in this directory so
+            the limits apply to all processes using it, not just this one.
+
+    Usage:
+        limiter = RateLimiter(rate=20, max_inflight=4)
+        with limiter.permit():
+            resp = pool.request("GET", url)
+    """
+
+    def __init__(self, rate: float | None = None, burst: float | None = None,
+                 max_inflight: int | None = None,
+                 shared_dir: str | Path | None = None):
+        self.rate = rate
+        self.max_inflight = max_inflight
+        self.shared_dir = Path(shared_dir) if shared_dir else None
+        self.bucket: TokenBucket | None = None
+        self.slots: InflightSlots | SharedInflightSlots | None = None
+        if rate:
+            self.bucket = (SharedTokenBucket(self.shared_dir, rate, burst)
+                           if self.shared_dir else TokenBucket(rate, burst))
+        if max_inflight:
+            self.slots = (SharedInflightSlots(self.shared_dir, max_inflight)
+                          if self.shared_dir else InflightSlots(max_inflight))
+        self._lock = threading.Lock()
+        self._waits: deque[float] = deque(maxlen=_WAIT_WINDOW)
+        self.counters = {"acquired": 0, "queued": 0, "inflight": 0,
+                         "paused": 0}
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        # Pause deadline when there is no bucket to carry it.
+        self._paused_until = 0.0
+
+    @classmethod
+    def for_backend(cls, base_url: str, root: str | Path, **kwargs) -> "RateLimiter":
+        """Limiter whose shared state is keyed by backend URL under root."""
+        digest = hashlib.sha256(base_url.rstrip("/").encode("utf-8")).hexdigest()
+        return cls(shared_dir=Path(root) / "ratelimit" / digest[:16], **kwargs)
+
+    def permit(self) -> _Permit:
+        """Context manager that waits for a slot and a token."""
+        return _Permit(self)
+
+    def _enter(self):
+        t0 = time.perf_counter()
+        slot = self.slots.acquire() if self.slots else None
+        try:
+            try:
+                delay = (self.bucket.reserve() if self.bucket
+                         else self._paused_until - time.time())
+            except TimeoutError as e:
+                raise RateLimitError(str(e)) from e
+            if delay > 0:
+                time.sleep(delay)
+        except BaseException:
+            # Interrupted or failed before the request: give the slot back.
+            if slot is not None:
+                slot.release()
+            raise
+        waited = time.perf_counter() - t0
+        with self._lock:
+            self.counters["acquired"] += 1
+            self.counters["inflight"] += 1
+            if waited >= 0.001:
+                self.counters["queued"] += 1
+            self._waits.append(waited)
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+        return slot
+
+    def _exit(self, slot):
+        with self._lock:
+            self.counters["inflight"] -= 1
+        if slot is not None:
+            slot.release()
+
+    def pause(self, seconds: float):
+        """Stop issuing requests for ``seconds`` (server asked us to)."""
+        with self._lock:
+            self.counters["paused"] += 1
+            if not self.bucket:
+                self._paused_until = max(self._paused_until,
+                                         time.time() + seconds)
+        if self.bucket:
+            self.bucket.pause(seconds)
+
+    def stats(self) -> dict:
+        with self._lock:
+            waits = sorted(self._waits)
+            acquired = self.counters["acquired"]
+            return {
+                "rate": self.rate,
+                "max_inflight": self.max_inflight,
+                "shared": self.shared_dir is not None,
+                **self.counters,
+                "wait_total_ms": round(self._wait_total * 1000, 1),
+                "wait_mean_ms": (round(self._wait_total * 1000 / acquired, 3)
+                                 if acquired else 0.0),
+                "wait_p95_ms": (round(waits[math.ceil(len(waits) * 0.95) - 1]
+                                      * 1000, 3) if waits else 0.0),
+                "wait_max_ms": round(self._wait_max * 1000, 3),
+            }
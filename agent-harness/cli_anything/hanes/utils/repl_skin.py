@@ -43,12 +43,13 @@ _BR = "\u256f"
 
 
 def _strip_ansi(text: str) -> str:
-    import re
-    return re.sub(r"\033\[[^m]*m", "", text)
+    from cli_anything.hanes.utils.table import strip_ansi
+    return strip_ansi(text)
 
 
 def _visible_len(text: str) -> int:
-    return len(_strip_ansi(text))
+    from cli_anything.hanes.utils.table import display_width
+    return display_width(text)
 
 
 _ANSI_256_TO_HEX = {
@@ -216,40 +217,21 @@ class ReplSkin:
             text += f" {self._c(_LIGHT_GRAY, label)}"
         print(text)
 
+    def table_stream(self, headers: list[str], rows, widths: list[int] | None = None,
+                     max_col_width: int = 40, sample_rows: int = 100) -> int:
+        """Print rows as they come; widths are estimated from the first
+        ``sample_rows`` rows unless given. Returns the row count."""
+        from cli_anything.hanes.utils.table import TableWriter
+        writer = TableWriter(headers, widths=widths, max_col_width=max_col_width,
+                             sample_rows=sample_rows, color=self._color)
+        return writer.write(rows)
+
     def table(self, headers: list[str], rows: list[list[str]],
               max_col_width: int = 40):
         if not headers:
             return
-        col_widths = [min(len(h), max_col_width) for h in headers]
-        for row in rows:
-            for i, cell in enumerate(row):
-                if i < len(col_widths):
-                    col_widths[i] = min(
-                        max(col_widths[i], len(str(cell))), max_col_width
-                    )
-
-        def pad(text: str, width: int) -> str:
-            t = str(text)[:width]
-            return t + " " * (width - len(t))
-
-        header_cells = [
-            self._c(_CYAN + _BOLD, pad(h, col_widths[i]))
-            for i, h in enumerate(headers)
-        ]
-        sep = self._c(_DARK_GRAY, f" {_V_LINE} ")
-        print(f"  {sep.join(header_cells)}")
-        sep_line = self._c(
-            _DARK_GRAY,
-            f"  {'\u2500\u2500\u2500'.join([_H_LINE * w for w in col_widths])}"
-        )
-        print(sep_line)
-        for row in rows:
-            cells = []
-            for i, cell in enumerate(row):
-                if i < len(col_widths):
-                    cells.append(self._c(_LIGHT_GRAY, pad(str(cell), col_widths[i])))
-            row_sep = self._c(_DARK_GRAY, f" {_V_LINE} ")
-            print(f"  {row_sep.join(cells)}")
+        self.table_stream(headers, rows, max_col_width=max_col_width,
+                          sample_rows=len(rows))
 
     def help(self, commands: dict[str, str]):
         self.section("Commands")
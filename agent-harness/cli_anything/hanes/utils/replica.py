@@ -0,0 +1,456 @@
+"""
+@file replica.py
+@description Local SQLite replica of master data for `sync` and --local.
+    One table per resource holds each record's JSON with its key, a
+    content hash, updatedAt and indexed filter columns. sync() pulls only
+    records changed since the updatedAt watermark when the backend honours
+    ``updatedAfter``, and otherwise (or once a day, to catch deletions)
+    diffs the full listing against the stored hashes. Parts and BOM lines
+    are also kept in an n-gram search index (utils/search_index.py).
+
+    Usage:
+        replica = Replica(DEFAULT_SESSION_DIR / "replica.sqlite")
+        replica.sync(backend, "parts")
+        replica.query("parts", search="AVSS", filters={"itemType": "RAW"})
+        replica.search("AVS 0.5sq 흑색")
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterator
+
+from cli_anything.hanes.utils.search_index import FIELDS, INDEX_VERSION, SearchIndex
+
+DEFAULT_REPLICA_FILE = "replica.sqlite"
+# Incremental pulls cannot see deletions; a full diff runs when the last
+# one is older than this.
+FULL_SYNC_EVERY_S = 24 * 3600
+# updatedAfter is sent this far before the watermark, so rows changed in
+# the same second as the last sync are not missed if the backend compares
+# with ">". Re-fetched rows are recognised by their hash.
+WATERMARK_OVERLAP_S = 60
+_BATCH = 500
+
+
+class ReplicaResource:
+    """A mirrored list endpoint.
+
+    Args:
+        path: API list path.
+        key: Fields that identify a record.
+        columns: Fields stored in indexed columns, usable as filters.
+        search: Fields matched by --search (case-insensitive substring).
+    """
+
+    __slots__ = ("name", "path", "key", "columns", "search")
+
+    def __init__(self, name: str, path: str, key: tuple, columns: tuple,
+                 search: tuple):
+        self.name = name
+        self.path = path
+        self.key = key
+        self.columns = columns
+        self.search = search
+
+    @property
+    def table(self) -> str:
+        return self.name.replace("-", "_")
+
+
+RESOURCES = {r.name: r for r in (
+    ReplicaResource("parts", "/master/parts", ("itemCode",),
+                    ("itemType", "useYn"),
+                    ("itemCode", "itemName", "itemNo", "custPartNo", "spec")),
+    ReplicaResource("processes", "/master/processes", ("processCode",),
+                    ("processType", "useYn"), ("processCode", "processName")),
+    ReplicaResource("boms", "/master/boms",
+                    ("parentItemCode", "childItemCode", "revision"),
+                    ("parentItemCode", "childItemCode"),
+                    ("parentItemCode", "childItemCode")),
+    ReplicaResource("routings", "/master/routings", ("itemCode", "seq"),
+                    ("itemCode", "processCode"), ("itemCode", "processCode")),
+    ReplicaResource("com-codes", "/master/com-codes", ("groupCode", "detailCode"),
+                    ("groupCode", "useYn"), ("groupCode", "detailCode", "detailName")),
+    ReplicaResource("warehouses", "/inventory/warehouses", ("warehouseCode",),
+                    ("warehouseType", "useYn"), ("warehouseCode", "warehouseName")),
+)}
+
+
+class ReplicaMissing(LookupError):
+    """The resource has never been synced."""
+
+
+def record_hash(record: dict) -> str:
+    raw = json.dumps(record, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def parse_timestamp(value) -> datetime | None:
+    """Aware datetime of an ISO timestamp ("Z", an offset, or naive UTC);
+    None if unparsable. Instants compare correctly whatever the offset or
+    precision, unlike the strings."""
+    text = str(value)
+    if text.endswith("Z"):
+        text = text[:-1] + "+00:00"
+    try:
+        ts = datetime.fromisoformat(text)
+    except ValueError:
+        return None
+    return ts if ts.tzinfo is not None else ts.replace(tzinfo=timezone.utc)
+
+
+def lookback(watermark: str, seconds: float = WATERMARK_OVERLAP_S) -> str:
+    """ISO timestamp ``seconds`` before watermark (unchanged if unparsable)."""
+    ts = parse_timestamp(watermark)
+    if ts is None:
+        return watermark
+    earlier = (ts - timedelta(seconds=seconds)).astimezone(timezone.utc)
+    return earlier.strftime("%Y-%m-%dT%H:%M:%S.") + f"{earlier.microsecond // 1000:03d}Z"
+
+
+class Replica:
+    """SQLite file holding the mirrored resources and their sync state.
+
+    The database runs in WAL mode, so list commands keep reading while a
+    sync writes; each resource's sync is one transaction. Each thread
+    (batch workers, the daemon) gets its own connection.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._local = threading.local()
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            db = self._local.db = sqlite3.connect(self.path, timeout=30)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute("PRAGMA cache_size=-65536")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS sync_state (resource TEXT PRIMARY KEY, "
+                "mode TEXT, watermark TEXT, synced_at REAL, full_at REAL, "
+                "rows INTEGER, duration_ms REAL, last TEXT)")
+            db.execute("CREATE TABLE IF NOT EXISTS search_state "
+                       "(resource TEXT PRIMARY KEY, version INTEGER)")
+            for res in RESOURCES.values():
+                cols = "".join(f', "c_{c}" TEXT' for c in res.columns)
+                db.execute(
+                    f'CREATE TABLE IF NOT EXISTS "{res.table}" (key TEXT PRIMARY KEY, '
+                    f"hash TEXT NOT NULL, updated_at TEXT, search TEXT, "
+                    f"data TEXT NOT NULL{cols})")
+                for c in res.columns:
+                    db.execute(f'CREATE INDEX IF NOT EXISTS "{res.table}_{c}" '
+                               f'ON "{res.table}" ("c_{c}")')
+                if res.name in FIELDS:
+                    SearchIndex(db, res.name, res.table).create()
+            db.commit()
+        return db
+
+    def close(self):
+        """Close this thread's connection."""
+        db = getattr(self._local, "db", None)
+        if db is not None:
+            db.close()
+            self._local.db = None
+
+    # ── Writing ──────────────────────────────────────────────────────
+
+    @staticmethod
+    def _row(res: ReplicaResource, record: dict) -> tuple:
+        digest = record_hash(record)
+        if all(record.get(k) is None for k in res.key):
+            key = record.get("id", digest)
+        else:
+            key = "\x1f".join(str(record.get(k, "")) for k in res.key)
+        search = " ".join(str(record.get(f, "")) for f in res.search).lower()
+        updated = record.get("updatedAt")
+        return (str(key), digest, None if updated is None else str(updated), search,
+                json.dumps(record, ensure_ascii=False),
+                *(None if record.get(c) is None else str(record[c]) for c in res.columns))
+
+    def _upsert(self, res: ReplicaResource, rows: list[tuple], index: bool = False):
+        """Write rows; with ``index``, move them in the search index too."""
+        if index:
+            search_index = SearchIndex(self.db, res.name, res.table)
+            search_index.remove(self._docs(res, [r[0] for r in rows]))
+        cols = ["key", "hash", "updated_at", "search", "data"] + [f"c_{c}" for c in res.columns]
+        names = ", ".join(f'"{c}"' for c in cols)
+        marks = ", ".join("?" * len(cols))
+        updates = ", ".join(f'"{c}"=excluded."{c}"' for c in cols[1:])
+        self.db.executemany(
+            f'INSERT INTO "{res.table}" ({names}) VALUES ({marks}) '
+            f"ON CONFLICT(key) DO UPDATE SET {updates}", rows)
+        if index:
+            # Updated rows keep their rowid; new ones just got one.
+            rowids = {key: doc for doc, key in self._select(res, "rowid, key",
+                                                            [r[0] for r in rows])}
+            search_index.put([(rowids[r[0]], json.loads(r[4])) for r in rows])
+
+    def _select(self, res: ReplicaResource, columns: str, keys: list[str]) -> list[tuple]:
+        found = []
+        for i in range(0, len(keys), _BATCH):
+            chunk = keys[i:i + _BATCH]
+            found += self.db.execute(
+                f'SELECT {columns} FROM "{res.table}" '
+                f'WHERE key IN ({", ".join("?" * len(chunk))})', chunk)
+        return found
+
+    def _docs(self, res: ReplicaResource, keys: list[str]) -> list[tuple[int, dict]]:
+        """(rowid, record) of the stored rows among ``keys``."""
+        return [(doc, json.loads(data))
+                for doc, data in self._select(res, "rowid, data", keys)]
+
+    def _index_current(self, res: ReplicaResource) -> bool:
+        row = self.db.execute("SELECT version FROM search_state WHERE resource = ?",
+                              (res.name,)).fetchone()
+        return row is not None and row[0] == INDEX_VERSION
+
+    def _reindex(self, res: ReplicaResource):
+        """Rebuild the search index of a resource from its rows."""
+        def records():
+            # Not read until rebuild() has dropped its index.
+            for doc, data in self.db.execute(f'SELECT rowid, data FROM "{res.table}"'):
+                yield doc, json.loads(data)
+
+        SearchIndex(self.db, res.name, res.table).rebuild(records())
+        self.db.execute("INSERT OR REPLACE INTO search_state VALUES (?, ?)",
+                        (res.name, INDEX_VERSION))
+
+    def state(self, name: str) -> dict | None:
+        row = self.db.execute(
+            "SELECT mode, watermark, synced_at, full_at, rows, duration_ms, last "
+            "FROM sync_state WHERE resource = ?", (name,)).fetchone()
+        if row is None:
+            return None
+        return {"resource": name, "mode": row[0], "watermark": row[1],
+                "synced_at": row[2], "full_at": row[3], "rows": row[4],
+                "duration_ms": row[5], "last": json.loads(row[6] or "{}")}
+
+    def sync(self, backend, name: str, full: bool = False,
+             page_size: int = 500) -> dict:
+        """Bring one resource up to date; returns what changed.
+
+        Incremental when a watermark exists (the backend's records carry
+        updatedAt and it honoured updatedAfter last time), otherwise - or
+        with ``full``, or when the last full diff is a day old - a full
+        diff that also removes records gone from the backend.
+        """
+        res = RESOURCES[name]
+        t0 = time.perf_counter()
+        state = self.state(name)
+        incremental = (not full and state is not None and state["watermark"]
+                       and time.time() - (state["full_at"] or 0) < FULL_SYNC_EVERY_S)
+        # A missing or outdated search index is rebuilt once at the end
+        # instead of being patched row by row.
+        index = res.name in FIELDS and self._index_current(res)
+        counts = None
+        try:
+            if incremental:
+                counts = self._pull_changes(backend, res, lookback(state["watermark"]),
+                                            page_size, index)
+            if counts is None:
+                counts = self._full_diff(backend, res, page_size, index)
+                # Stay on full diffs if updatedAfter turned out to be ignored.
+                counts["honoured"] = not incremental
+            if res.name in FIELDS and not index:
+                self._reindex(res)
+        except BaseException:
+            self.db.rollback()  # the replica keeps its previous state
+            raise
+        db = self.db
+        rows = db.execute(f'SELECT COUNT(*) FROM "{res.table}"').fetchone()[0]
+        stamped = db.execute(f'SELECT COUNT(*) FROM "{res.table}" '
+                             "WHERE updated_at IS NOT NULL").fetchone()[0]
+        # A watermark is only trusted if every record has updatedAt and the
+        # backend did not ignore updatedAfter.
+        watermark = (self._latest(res) if rows and stamped == rows and counts["honoured"]
+                     else None)
+        now = time.time()
+        full_at = now if counts["mode"] == "full" else state["full_at"]
+        duration_ms = (time.perf_counter() - t0) * 1000
+        db.execute(
+            "INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (name, "incremental" if watermark else "full", watermark, now, full_at,
+             rows, duration_ms, json.dumps(counts)))
+        db.commit()
+        return {"resource": name, **counts, "rows": rows, "watermark": watermark,
+                "duration_ms": round(duration_ms, 1)}
+
+    def _latest(self, res: ReplicaResource) -> str | None:
+        """The latest updated_at by instant; None if any is unparsable."""
+        latest = None
+        for (value,) in self.db.execute(
+                f'SELECT DISTINCT updated_at FROM "{res.table}"'):
+            ts = parse_timestamp(value)
+            if ts is None:
+                return None
+            if latest is None or ts > latest[0]:
+                latest = (ts, value)
+        return latest and latest[1]
+
+    def _pull_changes(self, backend, res: ReplicaResource, since: str,
+                      page_size: int, index: bool) -> dict | None:
+        """Upsert records changed since ``since``; None if not possible."""
+        db = self.db
+        since_ts = parse_timestamp(since)
+        if since_ts is None:
+            return None
+        counts = {"mode": "incremental", "fetched": 0, "inserted": 0,
+                  "updated": 0, "unchanged": 0, "deleted": 0, "honoured": True}
+        batch = []
+        for record in backend.iter_all(res.path, page_size=page_size,
+                                       stream=True, updatedAfter=since):
+            updated = parse_timestamp(record.get("updatedAt"))
+            if updated is None or updated < since_ts:
+                # updatedAfter was ignored: every record is coming back.
+                db.rollback()
+                return None
+            row = self._row(res, record)
+            old = db.execute(f'SELECT hash FROM "{res.table}" WHERE key = ?',
+                             (row[0],)).fetchone()
+            counts["fetched"] += 1
+            if old is None:
+                counts["inserted"] += 1
+            elif old[0] != row[1]:
+                counts["updated"] += 1
+            else:
+                counts["unchanged"] += 1
+                continue
+            batch.append(row)
+            if len(batch) >= _BATCH:
+                self._upsert(res, batch, index)
+                batch.clear()
+        if batch:
+            self._upsert(res, batch, index)
+        return counts
+
+    def _full_diff(self, backend, res: ReplicaResource, page_size: int,
+                   index: bool) -> dict:
+        """Compare the whole listing with stored hashes by key."""
+        db = self.db
+        known = dict(db.execute(f'SELECT key, hash FROM "{res.table}"'))
+        counts = {"mode": "full", "fetched": 0, "inserted": 0, "updated": 0,
+                  "unchanged": 0, "deleted": 0, "honoured": True}
+        seen = set()
+        batch = []
+        for record in backend.iter_all(res.path, page_size=page_size, stream=True):
+            row = self._row(res, record)
+            counts["fetched"] += 1
+            if row[0] in seen:
+                # Key fields that are not unique after all: number the
+                # repeats in listing order.
+                n = 2
+                while f"{row[0]}\x1f#{n}" in seen:
+                    n += 1
+                row = (f"{row[0]}\x1f#{n}",) + row[1:]
+            seen.add(row[0])
+            old = known.get(row[0])
+            if old is None:
+                counts["inserted"] += 1
+            elif old != row[1]:
+                counts["updated"] += 1
+            else:
+                counts["unchanged"] += 1
+                continue
+            batch.append(row)
+            if len(batch) >= _BATCH:
+                self._upsert(res, batch, index)
+                batch.clear()
+        if batch:
+            self._upsert(res, batch, index)
+        gone = [k for k in known if k not in seen]
+        if index:
+            SearchIndex(db, res.name, res.table).remove(self._docs(res, gone))
+        db.executemany(f'DELETE FROM "{res.table}" WHERE key = ?', [(k,) for k in gone])
+        counts["deleted"] = len(gone)
+        return counts
+
+    # ── Reading ──────────────────────────────────────────────────────
+
+    def _where(self, res: ReplicaResource, search: str | None,
+               filters: dict | None) -> tuple[str, list]:
+        clauses, args = [], []
+        if search:
+            clauses.append("search LIKE ? ESCAPE '\\'")
+            term = search.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            args.append(f"%{term}%")
+        for field, value in (filters or {}).items():
+            if value is None:
+                continue
+            if field not in res.columns:
+                raise ValueError(f"{res.name} cannot be filtered by {field}")
+            clauses.append(f'"c_{field}" = ?')
+            args.append(str(value))
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", args
+
+    def _require(self, name: str) -> ReplicaResource:
+        if not self.path.exists() or self.state(name) is None:
+            raise ReplicaMissing(f"no local replica of {name}; run "
+                                 f"`cli-anything-hanes sync -r {name}` first")
+        return RESOURCES[name]
+
+    def query(self, name: str, search: str | None = None,
+              filters: dict | None = None, page: int = 1, limit: int = 20) -> dict:
+        """One page in the backend's list envelope."""
+        res = self._require(name)
+        where, args = self._where(res, search, filters)
+        total = self.db.execute(f'SELECT COUNT(*) FROM "{res.table}"{where}',
+                                args).fetchone()[0]
+        page, limit = max(page, 1), max(limit, 1)
+        rows = self.db.execute(
+            f'SELECT data FROM "{res.table}"{where} ORDER BY rowid LIMIT ? OFFSET ?',
+            args + [limit, (page - 1) * limit])
+        data = [json.loads(r[0]) for r in rows]
+        pages = (total + limit - 1) // limit
+        return {"success": True, "data": data,
+                "meta": {"page": page, "limit": limit, "total": total,
+                         "totalPages": pages, "hasNext": page < pages}}
+
+    def iter_records(self, name: str, search: str | None = None,
+                     filters: dict | None = None) -> Iterator[dict]:
+        """Every matching record, like backend.iter_all()."""
+        res = self._require(name)
+        where, args = self._where(res, search, filters)
+        for (data,) in self.db.execute(
+                f'SELECT data FROM "{res.table}"{where} ORDER BY rowid', args):
+            yield json.loads(data)
+
+    def search(self, query: str, names: tuple = tuple(FIELDS), limit: int = 20) -> dict:
+        """Ranked records matching ``query`` across the indexed resources.
+
+        Each record comes with "resource" and "score"; records holding
+        every query token rank before those holding only some.
+        """
+        t0 = time.perf_counter()
+        synced = [n for n in names if self.path.exists() and self.state(n) is not None]
+        if not synced:
+            self._require(names[0])
+        hits, total, exhaustive, complete = [], 0, True, False
+        for name in synced:
+            res = RESOURCES[name]
+            if not self._index_current(res):
+                self._reindex(res)
+                self.db.commit()
+            found = SearchIndex(self.db, name, res.table).search(query, limit)
+            total += found["total"]
+            exhaustive &= found["exhaustive"]
+            complete |= bool(found["hits"]) and not found["partial"]
+            scores = dict(found["hits"])
+            for doc, data in self.db.execute(
+                    f'SELECT rowid, data FROM "{res.table}" WHERE rowid IN '
+                    f'({", ".join("?" * len(scores))})', list(scores)):
+                hits.append((found["partial"], -scores[doc],
+                             {"resource": name, "score": scores[doc], **json.loads(data)}))
+        hits.sort(key=lambda h: h[:2])
+        return {"success": True, "data": [h[2] for h in hits[:limit]],
+                "meta": {"query": query, "total": total, "exhaustive": exhaustive,
+                         "partial": not complete, "resources": synced,
+                         "took_ms": round((time.perf_counter() - t0) * 1000, 2)}}
@@ -0,0 +1,211 @@
+"""
+@file resilience.py
+@description Retry and circuit-breaker policy for the HANES API client.
+    Backend restarts (pnpm dev reloads, PM2 restarts) show up as refused
+    connections or 502/503/504 for a few seconds. RetryPolicy retries
+    requests that are safe to repeat with jittered exponential backoff
+    (and waits out 429 Retry-After);
+    CircuitBreaker stops hammering a backend that is down and lets one
+    health probe through at a time to find out when it is back.
+"""
+
+import random
+import threading
+import time
+
+
+# Gateway / unavailable statuses seen while the backend restarts.
+RETRY_STATUSES = frozenset({502, 503, 504})
+# Rate limited: the request was not processed, so any method may retry.
+THROTTLED = 429
+# Methods that may be repeated without an idempotency key.
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+DEFAULT_MAX_ATTEMPTS = 4
+DEFAULT_BASE_DELAY = 0.25
+DEFAULT_MAX_DELAY = 4.0
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT = 5.0
+# Longest Retry-After we sleep through; beyond it the response is returned.
+DEFAULT_MAX_RETRY_AFTER = 30.0
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Seconds to wait from a Retry-After header (delta-seconds or date)."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    from email.utils import parsedate_to_datetime
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised without touching the network while the breaker is open."""
+
+    def __init__(self, base_url: str, retry_in: float):
+        self.retry_in = retry_in
+        super().__init__(
+            f"HANES MES backend at {base_url} is unavailable "
+            f"(circuit open, next probe in {retry_in:.1f}s)"
+        )
+
+
+class RetryPolicy:
+    """Decides whether and when a failed request is sent again.
+
+    GET/HEAD/OPTIONS are always retryable; other methods only when the
+    request carries an Idempotency-Key header, or the server answered 429.
+    Delays use "full jitter": a uniform draw from
+    [0, min(max_delay, base_delay * 2**attempt)], so many clients
+    restarting together do not retry in lockstep. A Retry-After header
+    raises the delay to what the server asked for, up to max_retry_after.
+    """
+
+    def __init__(self, max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+                 base_delay: float = DEFAULT_BASE_DELAY,
+                 max_delay: float = DEFAULT_MAX_DELAY,
+                 statuses: frozenset[int] = RETRY_STATUSES,
+                 max_retry_after: float = DEFAULT_MAX_RETRY_AFTER):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.statuses = statuses
+        self.max_retry_after = max_retry_after
+        self._lock = threading.Lock()
+        self.counters = {"requests": 0, "retries": 0, "recovered": 0,
+                         "exhausted": 0, "throttled": 0}
+
+    def allows(self, method: str, headers: dict[str, str]) -> bool:
+        """True if a request may be repeated without side effects."""
+        return method.upper() in IDEMPOTENT_METHODS or IDEMPOTENCY_HEADER in headers
+
+    def retryable_status(self, status: int) -> bool:
+        return status in self.statuses or status == THROTTLED
+
+    def should_retry(self, attempt: int, method: str, headers: dict[str, str],
+                     exc: BaseException | None = None, status: int | None = None,
+                     retry_after: float | None = None) -> bool:
+        """Decide after failed attempt number ``attempt`` (0-based).
+
+        ``exc`` is the transport error, or None for a retryable ``status``.
+        A refused connection or a 429 means the server did not process the
+        request, so even a plain write may be sent again. Timeouts are not
+        retried: the backend is slow rather than restarting, and each
+        attempt costs a full timeout.
+        """
+        if isinstance(exc, ConnectionRefusedError) or status == THROTTLED:
+            retryable = True
+        else:
+            retryable = (self.allows(method, headers)
+                         and not isinstance(exc, TimeoutError))
+        if retry_after is not None and retry_after > self.max_retry_after:
+            retryable = False
+        if retryable and attempt + 1 < self.max_attempts:
+            return True
+        if attempt:
+            self.count("exhausted")
+        return False
+
+    def succeeded(self, attempt: int):
+        if attempt:
+            self.count("recovered")
+
+    def backoff(self, attempt: int, retry_after: float | None = None) -> float:
+        """Count a retry and return the delay to sleep before it."""
+        self.count("retries")
+        delay = random.uniform(0, min(self.max_delay,
+                                      self.base_delay * (2 ** attempt)))
+        return max(delay, retry_after or 0.0)
+
+    def count(self, name: str):
+        with self._lock:
+            self.counters[name] += 1
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self.counters)
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker shared by all requests to a host.
+
+    closed     requests flow; ``failure_threshold`` failures in a row open it.
+    open       requests fail fast with CircuitOpenError for ``reset_timeout``.
+    half-open  after the timeout one caller runs a health probe (the
+               backends use ping()) and reports it via probed(); success
+               closes the circuit, failure re-opens it for another
+               ``reset_timeout``.
+
+    Usage:
+        if breaker.acquire(base_url):
+            breaker.probed(backend.ping(), base_url)
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                 reset_timeout: float = DEFAULT_RESET_TIMEOUT):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+        self.counters = {"opened": 0, "short_circuited": 0, "probes": 0}
+
+    def acquire(self, base_url: str) -> bool:
+        """Admit a request: False to send it, True if the caller must probe
+        first. Raises CircuitOpenError while open or while another caller
+        is probing."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return False
+            retry_in = self._opened_at + self.reset_timeout - time.monotonic()
+            if self.state == self.HALF_OPEN or retry_in > 0:
+                self.counters["short_circuited"] += 1
+                raise CircuitOpenError(base_url, max(retry_in, 0.0))
+            self.state = self.HALF_OPEN
+            self.counters["probes"] += 1
+            return True
+
+    def probed(self, healthy: bool, base_url: str):
+        """Report the probe result; raises CircuitOpenError if unhealthy."""
+        with self._lock:
+            if healthy:
+                self.state = self.CLOSED
+                self.failures = 0
+                return
+            self._open()
+            self.counters["short_circuited"] += 1
+        raise CircuitOpenError(base_url, self.reset_timeout)
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.state = self.CLOSED
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.CLOSED and self.failures >= self.failure_threshold:
+                self._open()
+
+    def _open(self):
+        self.state = self.OPEN
+        self._opened_at = time.monotonic()
+        self.counters["opened"] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"state": self.state, "failures": self.failures,
+                    **self.counters}
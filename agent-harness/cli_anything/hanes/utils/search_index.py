@@ -0,0 +1,296 @@
+"""
+@file search_index.py
+@description Inverted n-gram index over replicated parts and BOM lines
+    for `master search`. Lives in the replica's SQLite file and is kept
+    up to date by Replica.sync() in the same transaction as the rows, so
+    searching never needs the backend.
+
+    Tokens (after NFKC and case folding):
+        Hangul runs     -> character bigrams ("흑색전선" -> 흑색 색전 전선)
+                           and the first syllable; a document also gets
+                           the bigram across a space, so "흑색전선" finds
+                           "흑색 전선"
+        other words     -> the word, every prefix of it of 2+ characters,
+                           and its parts split at punctuation and
+                           letter/digit changes ("0.5sq" -> 0 5 sq)
+    A query matches records holding all of its tokens, ranked by
+    sum(idf * field weight); if none hold all, by how many they hold.
+
+    Usage:
+        index = SearchIndex(db, "parts", "parts")
+        index.put([(rowid, record), ...])
+        index.search("AVS 0.5sq 흑색", limit=20)
+"""
+
+import math
+import re
+import unicodedata
+from typing import Iterable
+
+# Bumped whenever tokens() changes; older indexes are rebuilt on sync.
+INDEX_VERSION = 1
+
+# Fields indexed per resource, with their weight in the score.
+FIELDS = {
+    "parts": (("itemCode", 4), ("itemNo", 3), ("custPartNo", 3),
+              ("itemName", 2), ("spec", 1)),
+    "boms": (("parentItemCode", 3), ("childItemCode", 3), ("ecoNo", 2),
+             ("bomGrp", 1), ("remark", 1)),
+}
+
+# Weight of a token by how it matched, in tenths (stored as small ints).
+_EXACT, _PIECE, _PREFIX, _BRIDGE = 10, 8, 6, 5
+_MAX_PREFIX = 20
+# Postings read for the rarest query token; beyond this the ranking only
+# sees the best-weighted matches of that token (meta "exhaustive": false).
+CANDIDATES = 1000
+_CHUNK = 500
+# Postings sorted and inserted together by rebuild().
+_REBUILD_ROWS = 200_000
+
+_HANGUL = "가-힣ㄱ-ㆎ"
+_TOKEN = re.compile(rf"[{_HANGUL}]+(?:[ \t]+[{_HANGUL}]+)*|[^\W_{_HANGUL}]+(?:[.\-_/+][^\W_{_HANGUL}]+)*")
+_PIECES = re.compile(r"\d+|[^\W\d_]+")
+
+
+def normalize(text) -> str:
+    text = str(text)
+    if text.isascii():
+        return text.lower()
+    return unicodedata.normalize("NFKC", text).casefold()
+
+
+def _bigrams(run: str) -> list[str]:
+    return [run] if len(run) == 1 else [run[i:i + 2] for i in range(len(run) - 1)]
+
+
+def tokens(text, query: bool = False) -> dict[str, int]:
+    """Index tokens of ``text`` with their match weight.
+
+    With ``query``, the tokens to look up instead: whole words only (the
+    index holds their prefixes) and no bigrams across spaces.
+    """
+    out: dict[str, int] = {}
+    get = out.get
+    for tok in _TOKEN.findall(normalize(text)):
+        if "가" <= tok[0] <= "힣" or "ㄱ" <= tok[0] <= "ㆎ":
+            runs = tok.split()
+            for run in runs:
+                for gram in _bigrams(run):
+                    out[gram] = _EXACT
+                if not query and len(run) > 1 and get(run[0], 0) < _PREFIX:
+                    out[run[0]] = _PREFIX
+            if not query:
+                for left, right in zip(runs, runs[1:]):
+                    gram = left[-1] + right[0]
+                    if get(gram, 0) < _BRIDGE:
+                        out[gram] = _BRIDGE
+            continue
+        out[tok] = _EXACT
+        if query:
+            continue
+        for n in range(2, min(len(tok), _MAX_PREFIX + 1)):
+            prefix = tok[:n]
+            if get(prefix, 0) < _PREFIX:
+                out[prefix] = _PREFIX
+        pieces = _PIECES.findall(tok)
+        if len(pieces) > 1:
+            for piece in pieces:
+                if get(piece, 0) < _PIECE:
+                    out[piece] = _PIECE
+    return out
+
+
+def query_tokens(text) -> list[tuple[str, list[str]]]:
+    """(token, parts) to look up; a word that is not indexed as a whole
+    ("avss-0.5") is looked up by its parts instead."""
+    out = []
+    for tok in tokens(text, query=True):
+        pieces = _PIECES.findall(tok)
+        out.append((tok, pieces if len(pieces) > 1 else []))
+    return out
+
+
+def document(name: str, record: dict) -> dict[str, int]:
+    """Tokens of a record with field weight x match weight."""
+    out: dict[str, int] = {}
+    for field, weight in FIELDS[name]:
+        value = record.get(field)
+        if value is None or value == "":
+            continue
+        for token, w in tokens(value).items():
+            w *= weight
+            if w > out.get(token, 0):
+                out[token] = w
+    return out
+
+
+class SearchIndex:
+    """Postings and document frequencies for one replica table.
+
+    Per resource table T:
+        T_tokens (token, doc, weight)  WITHOUT ROWID, plus (token, weight)
+        T_terms  (token, df)
+    where doc is the record's rowid in T and weight is field weight x
+    match weight. Writes run inside the caller's transaction on ``db``.
+    """
+
+    def __init__(self, db, name: str, table: str):
+        self.db = db
+        self.name = name
+        self.table = table
+
+    def create(self):
+        db, table = self.db, self.table
+        db.execute(f'CREATE TABLE IF NOT EXISTS "{table}_tokens" (token TEXT NOT NULL, '
+                   "doc INTEGER NOT NULL, weight INTEGER NOT NULL, "
+                   "PRIMARY KEY (token, doc)) WITHOUT ROWID")
+        db.execute(f'CREATE INDEX IF NOT EXISTS "{table}_tokens_rank" '
+                   f'ON "{table}_tokens" (token, weight DESC)')
+        db.execute(f'CREATE TABLE IF NOT EXISTS "{table}_terms" (token TEXT PRIMARY KEY, '
+                   "df INTEGER NOT NULL) WITHOUT ROWID")
+
+    def clear(self):
+        self.db.execute(f'DELETE FROM "{self.table}_tokens"')
+        self.db.execute(f'DELETE FROM "{self.table}_terms"')
+
+    def _df(self, delta: dict[str, int]):
+        self.db.executemany(
+            f'INSERT INTO "{self.table}_terms" VALUES (?, ?) '
+            "ON CONFLICT(token) DO UPDATE SET df = df + excluded.df",
+            [(t, d) for t, d in delta.items() if d])
+        if any(d < 0 for d in delta.values()):
+            self.db.execute(f'DELETE FROM "{self.table}_terms" WHERE df <= 0')
+
+    def rebuild(self, docs: Iterable[tuple[int, dict]]):
+        """Index every record (rowid, record) from scratch.
+
+        Postings go in sorted batches and the rank index is built once at
+        the end, which is several times faster than put() for a whole table.
+        """
+        db, table = self.db, self.table
+        db.execute(f'DROP INDEX IF EXISTS "{table}_tokens_rank"')
+        self.clear()
+        df: dict[str, int] = {}
+        rows = []
+
+        def flush():
+            rows.sort()
+            db.executemany(f'INSERT INTO "{table}_tokens" VALUES (?, ?, ?)', rows)
+            rows.clear()
+
+        for doc, record in docs:
+            for token, weight in document(self.name, record).items():
+                rows.append((token, doc, weight))
+                df[token] = df.get(token, 0) + 1
+            if len(rows) >= _REBUILD_ROWS:
+                flush()
+        flush()
+        db.executemany(f'INSERT INTO "{table}_terms" VALUES (?, ?)', sorted(df.items()))
+        self.create()
+
+    def put(self, docs: list[tuple[int, dict]]):
+        """Index new records (rowid, record) not yet in the index."""
+        delta: dict[str, int] = {}
+        rows = []
+        for doc, record in docs:
+            for token, weight in document(self.name, record).items():
+                rows.append((token, doc, weight))
+                delta[token] = delta.get(token, 0) + 1
+        self.db.executemany(
+            f'INSERT OR REPLACE INTO "{self.table}_tokens" VALUES (?, ?, ?)', rows)
+        self._df(delta)
+
+    def remove(self, docs: list[tuple[int, dict]]):
+        """Unindex records (rowid, record as it was indexed)."""
+        delta: dict[str, int] = {}
+        rows = []
+        for doc, record in docs:
+            for token in document(self.name, record):
+                rows.append((token, doc))
+                delta[token] = delta.get(token, 0) - 1
+        self.db.executemany(
+            f'DELETE FROM "{self.table}_tokens" WHERE token = ? AND doc = ?', rows)
+        self._df(delta)
+
+    # ── Searching ────────────────────────────────────────────────────
+
+    def _df_of(self, token: str) -> int:
+        row = self.db.execute(f'SELECT df FROM "{self.table}_terms" WHERE token = ?',
+                              (token,)).fetchone()
+        return row[0] if row else 0
+
+    def _weights(self, token: str, docs: list[int]) -> dict[int, int]:
+        """Weight of ``token`` in each of ``docs`` that holds it."""
+        found = {}
+        for i in range(0, len(docs), _CHUNK):
+            chunk = docs[i:i + _CHUNK]
+            found.update(self.db.execute(
+                f'SELECT doc, weight FROM "{self.table}_tokens" WHERE token = ? '
+                f'AND doc IN ({", ".join("?" * len(chunk))})', [token, *chunk]))
+        return found
+
+    def _top(self, token: str, limit: int) -> list[tuple[int, int]]:
+        """The ``limit`` docs holding ``token`` with the highest weight."""
+        return self.db.execute(
+            f'SELECT doc, weight FROM "{self.table}_tokens" '
+            f'INDEXED BY "{self.table}_tokens_rank" '
+            "WHERE token = ? ORDER BY weight DESC LIMIT ?", (token, limit)).fetchall()
+
+    def search(self, query: str, limit: int = 20,
+               candidates: int = CANDIDATES) -> dict:
+        """Ranked (rowid, score) pairs for ``query``.
+
+        Returns {"hits", "total", "exhaustive", "partial"}: "total" counts
+        the matches among the candidates read, which is every match when
+        "exhaustive"; "partial" means no record held every token.
+        """
+        terms: dict[str, int] = {}
+        missing = False
+        for token, pieces in query_tokens(query):
+            found = {t: self._df_of(t) for t in [token] + pieces}
+            if found[token]:
+                terms[token] = found[token]
+            elif pieces and all(found[p] for p in pieces):
+                terms.update((p, found[p]) for p in pieces)
+            else:
+                missing = True
+                terms.update((t, df) for t, df in found.items() if df)
+        result = {"hits": [], "total": 0, "exhaustive": True, "partial": missing}
+        if not terms:
+            return result
+        n = self.db.execute(f'SELECT COUNT(*) FROM "{self.table}"').fetchone()[0]
+        idf = {t: math.log(1 + n / df) for t, df in terms.items()}
+        order = sorted(terms, key=terms.get)
+
+        scores: dict[int, float] = {}
+        matched: dict[int, int] = {}
+        if not missing:
+            driver = order[0]
+            top = self._top(driver, candidates)
+            result["exhaustive"] = terms[driver] <= candidates
+            scores = {doc: idf[driver] * w for doc, w in top}
+            for token in order[1:]:
+                if not scores:
+                    break
+                found = self._weights(token, list(scores))
+                scores = {doc: s + idf[token] * found[doc]
+                          for doc, s in scores.items() if doc in found}
+        if not scores:
+            # Nobody holds every token: rank by the tokens they do hold.
+            result["partial"] = True
+            per = max(candidates // len(order), limit)
+            docs = set()
+            for token in order:
+                docs.update(doc for doc, _ in self._top(token, per))
+                result["exhaustive"] &= terms[token] <= per
+            docs = list(docs)
+            for token in order:
+                for doc, w in self._weights(token, docs).items():
+                    scores[doc] = scores.get(doc, 0.0) + idf[token] * w
+                    matched[doc] = matched.get(doc, 0) + 1
+        ranked = sorted(scores.items(),
+                        key=lambda kv: (-matched.get(kv[0], 0), -kv[1], kv[0]))
+        result["total"] = len(ranked)
+        result["hits"] = [(doc, round(score / 10, 3)) for doc, score in ranked[:limit]]
+        return result
@@ -0,0 +1,68 @@
+"""
+@file singleflight.py
+@description Coalescing of identical concurrent calls.
+    When several threads ask for the same thing at once, the first one
+    does the work and the rest wait for its outcome, so a burst of
+    identical GETs costs one backend query. The asyncio counterpart lives
+    in hanes_async.py to keep asyncio out of the sync client's imports.
+"""
+
+import threading
+from typing import Any, Callable, Hashable
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Thread-safe call coalescing keyed by any hashable.
+
+    Usage:
+        flight = SingleFlight()
+        resp = flight.do(("GET", url), lambda: pool.request("GET", url))
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self.counters = {"calls": 0, "shared": 0}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Run fn, or wait for the identical call already in flight.
+
+        Every caller gets the leader's return value or exception; callers
+        must not mutate a shared result.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.counters["calls"] += 1
+            else:
+                self.counters["shared"] += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self.counters, inflight=len(self._calls))
@@ -0,0 +1,210 @@
+"""
+@file table.py
+@description Streaming terminal table renderer.
+    Column widths come from a sample of leading rows (or fixed widths), so
+    rows are formatted and written as they arrive instead of being held in
+    memory. Widths are measured in terminal cells: Hangul, CJK and other
+    East-Asian wide characters count as two, ANSI colour codes as zero,
+    and over-long cells are truncated with an ellipsis.
+"""
+
+import itertools
+import re
+import sys
+from typing import Iterable, TextIO
+
+_RESET = "\033[0m"
+_BOLD = "\033[1m"
+_CYAN = "\033[38;5;80m"
+_DARK_GRAY = "\033[38;5;240m"
+_LIGHT_GRAY = "\033[38;5;250m"
+
+_H_LINE = "\u2500"
+_V_LINE = "\u2502"
+_ELLIPSIS = "\u2026"
+
+DEFAULT_MAX_COL_WIDTH = 40
+DEFAULT_SAMPLE_ROWS = 100
+# Formatted lines buffered per write() to the output stream.
+_LINES_PER_WRITE = 256
+# Distinct fitted cells remembered per column; codes such as Y/N, EA or
+# status values repeat on almost every row.
+_FIT_CACHE_SIZE = 1024
+
+_ANSI_RE = re.compile(r"\033\[[^m]*m")
+# Code point ranges with East_Asian_Width W or F (Unicode 15.0, generated
+# from unicodedata): Hangul, CJK, kana, full-width forms, emoji.
+_WIDE_RANGES = (
+    (0x1100, 0x115F), (0x231A, 0x231B), (0x2329, 0x232A), (0x23E9, 0x23EC),
+    (0x23F0, 0x23F0), (0x23F3, 0x23F3), (0x25FD, 0x25FE), (0x2614, 0x2615),
+    (0x2648, 0x2653), (0x267F, 0x267F), (0x2693, 0x2693), (0x26A1, 0x26A1),
+    (0x26AA, 0x26AB), (0x26BD, 0x26BE), (0x26C4, 0x26C5), (0x26CE, 0x26CE),
+    (0x26D4, 0x26D4), (0x26EA, 0x26EA), (0x26F2, 0x26F3), (0x26F5, 0x26F5),
+    (0x26FA, 0x26FA), (0x26FD, 0x26FD), (0x2705, 0x2705), (0x270A, 0x270B),
+    (0x2728, 0x2728), (0x274C, 0x274C), (0x274E, 0x274E), (0x2753, 0x2755),
+    (0x2757, 0x2757), (0x2795, 0x2797), (0x27B0, 0x27B0), (0x27BF, 0x27BF),
+    (0x2B1B, 0x2B1C), (0x2B50, 0x2B50), (0x2B55, 0x2B55), (0x2E80, 0x2E99),
+    (0x2E9B, 0x2EF3), (0x2F00, 0x2FD5), (0x2FF0, 0x2FFB), (0x3000, 0x303E),
+    (0x3041, 0x3096), (0x3099, 0x30FF), (0x3105, 0x312F), (0x3131, 0x318E),
+    (0x3190, 0x31E3), (0x31F0, 0x321E), (0x3220, 0x3247), (0x3250, 0x4DBF),
+    (0x4E00, 0xA48C), (0xA490, 0xA4C6), (0xA960, 0xA97C), (0xAC00, 0xD7A3),
+    (0xF900, 0xFAFF), (0xFE10, 0xFE19), (0xFE30, 0xFE52), (0xFE54, 0xFE66),
+    (0xFE68, 0xFE6B), (0xFF01, 0xFF60), (0xFFE0, 0xFFE6), (0x16FE0, 0x16FE4),
+    (0x16FF0, 0x16FF1), (0x17000, 0x187F7), (0x18800, 0x18CD5),
+    (0x18D00, 0x18D08), (0x1AFF0, 0x1AFF3), (0x1AFF5, 0x1AFFB),
+    (0x1AFFD, 0x1AFFE), (0x1B000, 0x1B122), (0x1B132, 0x1B132),
+    (0x1B150, 0x1B152), (0x1B155, 0x1B155), (0x1B164, 0x1B167),
+    (0x1B170, 0x1B2FB), (0x1F004, 0x1F004), (0x1F0CF, 0x1F0CF),
+    (0x1F18E, 0x1F18E), (0x1F191, 0x1F19A), (0x1F200, 0x1F202),
+    (0x1F210, 0x1F23B), (0x1F240, 0x1F248), (0x1F250, 0x1F251),
+    (0x1F260, 0x1F265), (0x1F300, 0x1F320), (0x1F32D, 0x1F335),
+    (0x1F337, 0x1F37C), (0x1F37E, 0x1F393), (0x1F3A0, 0x1F3CA),
+    (0x1F3CF, 0x1F3D3), (0x1F3E0, 0x1F3F0), (0x1F3F4, 0x1F3F4),
+    (0x1F3F8, 0x1F43E), (0x1F440, 0x1F440), (0x1F442, 0x1F4FC),
+    (0x1F4FF, 0x1F53D), (0x1F54B, 0x1F54E), (0x1F550, 0x1F567),
+    (0x1F57A, 0x1F57A), (0x1F595, 0x1F596), (0x1F5A4, 0x1F5A4),
+    (0x1F5FB, 0x1F64F), (0x1F680, 0x1F6C5), (0x1F6CC, 0x1F6CC),
+    (0x1F6D0, 0x1F6D2), (0x1F6D5, 0x1F6D7), (0x1F6DC, 0x1F6DF),
+    (0x1F6EB, 0x1F6EC), (0x1F6F4, 0x1F6FC), (0x1F7E0, 0x1F7EB),
+    (0x1F7F0, 0x1F7F0), (0x1F90C, 0x1F93A), (0x1F93C, 0x1F945),
+    (0x1F947, 0x1F9FF), (0x1FA70, 0x1FA7C), (0x1FA80, 0x1FA88),
+    (0x1FA90, 0x1FABD), (0x1FABF, 0x1FAC5), (0x1FACE, 0x1FADB),
+    (0x1FAE0, 0x1FAE8), (0x1FAF0, 0x1FAF8), (0x20000, 0x2FFFD),
+    (0x30000, 0x3FFFD),
+)
+_WIDE_RE = re.compile("[%s]" % "".join(
+    f"{chr(lo)}-{chr(hi)}" for lo, hi in _WIDE_RANGES))
+
+
+def strip_ansi(text: str) -> str:
+    return _ANSI_RE.sub("", text) if "\033" in text else text
+
+
+def display_width(text: str) -> int:
+    """Terminal cells occupied by text."""
+    if "\033" in text:
+        text = _ANSI_RE.sub("", text)
+    if text.isascii():
+        return len(text)
+    return 2 * len(text) - len(_WIDE_RE.sub("", text))
+
+
+def truncate(text: str, width: int) -> str:
+    """Cut text to at most ``width`` cells, marking the cut with an ellipsis."""
+    text = strip_ansi(text)
+    if display_width(text) <= width:
+        return text
+    if width <= 0:
+        return ""
+    room = width - 1
+    cut = text[:room]
+    used = display_width(cut)
+    # Every character is one or two cells, so dropping ceil(excess / 2)
+    # characters never overshoots; this converges in a few steps.
+    while used > room:
+        cut = cut[:len(cut) - (used - room + 1) // 2]
+        used = display_width(cut)
+    return cut + _ELLIPSIS + " " * (room - used)
+
+
+def fit(text: str, width: int) -> str:
+    """Pad or truncate text to exactly ``width`` cells."""
+    w = display_width(text)
+    if w <= width:
+        return text + " " * (width - w)
+    return truncate(text, width)
+
+
+def fit_widths(headers: list[str], rows: Iterable[list],
+               max_col_width: int = DEFAULT_MAX_COL_WIDTH) -> list[int]:
+    """Column widths covering headers and rows, capped at max_col_width."""
+    widths = [display_width(str(h)) for h in headers]
+    n = len(widths)
+    for row in rows:
+        for i, cell in enumerate(row[:n]):
+            w = display_width(str(cell))
+            if w > widths[i]:
+                widths[i] = w
+    return [min(w, max_col_width) for w in widths]
+
+
+class TableWriter:
+    """Writes a table row by row with widths fixed up front.
+
+    Args:
+        headers: Column titles.
+        widths: Fixed column widths; if None they are estimated from the
+            first ``sample_rows`` rows passed to write().
+        max_col_width: Cap for estimated widths.
+        color: Emit the ReplSkin colour scheme.
+        out: Text stream to write to (default: sys.stdout at write time).
+
+    Usage:
+        TableWriter(["Code", "Name"]).write(rows_iterator)
+    """
+
+    def __init__(self, headers: list[str], widths: list[int] | None = None,
+                 max_col_width: int = DEFAULT_MAX_COL_WIDTH,
+                 sample_rows: int = DEFAULT_SAMPLE_ROWS, color: bool = False,
+                 out: TextIO | None = None):
+        self.headers = [str(h) for h in headers]
+        self.widths = list(widths) if widths is not None else None
+        self.max_col_width = max_col_width
+        self.sample_rows = sample_rows
+        self.color = color
+        self.out = out
+        self._fit_cache = [{} for _ in self.headers]
+        if color:
+            self._sep = f" {_DARK_GRAY}{_V_LINE}{_RESET} "
+            self._cell_on, self._cell_off = _LIGHT_GRAY, _RESET
+        else:
+            self._sep = f" {_V_LINE} "
+            self._cell_on = self._cell_off = ""
+
+    def _paint(self, code: str, text: str) -> str:
+        return f"{code}{text}{_RESET}" if self.color else text
+
+    def format_header(self) -> str:
+        cells = [self._paint(_CYAN + _BOLD, fit(h, w))
+                 for h, w in zip(self.headers, self.widths)]
+        rule = (_H_LINE * 3).join(_H_LINE * w for w in self.widths)
+        return f"  {self._sep.join(cells)}\n{self._paint(_DARK_GRAY, '  ' + rule)}\n"
+
+    def format_row(self, row: list) -> str:
+        on, off = self._cell_on, self._cell_off
+        cells = []
+        for cell, width, cache in zip(row, self.widths, self._fit_cache):
+            text = str(cell)
+            # Inlined fast path for plain ASCII that already fits.
+            if len(text) <= width and text.isascii() and "\033" not in text:
+                cells.append(on + text.ljust(width) + off)
+                continue
+            fitted = cache.get(text)
+            if fitted is None:
+                fitted = fit(text, width)
+                if len(cache) < _FIT_CACHE_SIZE:
+                    cache[text] = fitted
+            cells.append(on + fitted + off)
+        return f"  {self._sep.join(cells)}\n"
+
+    def write(self, rows: Iterable[list]) -> int:
+        """Write header and rows; returns the number of rows written."""
+        out = self.out or sys.stdout
+        rows = iter(rows)
+        sample: list[list] = []
+        if self.widths is None:
+            sample = list(itertools.islice(rows, self.sample_rows))
+            self.widths = fit_widths(self.headers, sample, self.max_col_width)
+        out.write(self.format_header())
+        count = 0
+        buf: list[str] = []
+        for row in itertools.chain(sample, rows):
+            buf.append(self.format_row(row))
+            count += 1
+            if len(buf) >= _LINES_PER_WRITE:
+                out.write("".join(buf))
+                buf.clear()
+        if buf:
+            out.write("".join(buf))
+        out.flush()
+        return count
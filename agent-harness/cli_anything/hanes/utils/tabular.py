@@ -0,0 +1,199 @@
+"""
+@file tabular.py
+@description Streaming row readers for CSV and XLSX files (stdlib only).
+    Rows come out one at a time as {header: value} dicts, so memory stays
+    flat however large the file is. XLSX sheets are read straight from
+    the zip with iterparse; no spreadsheet library is needed.
+
+    Usage:
+        with TabularReader("parts.xlsx") as reader:
+            for row_no, row in reader:
+                print(row_no, row["itemCode"])
+"""
+
+import csv
+import math
+import re
+import sys
+import zipfile
+from pathlib import Path
+from xml.etree.ElementTree import iterparse
+
+_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+_CELL_REF = re.compile(r"([A-Z]+)")
+# Whole numbers Excel stores as 12.0 / 12.000000000000002 are read as 12:
+# "12.0" by pattern, float noise within a few ulps via _number_text.
+_WHOLE = re.compile(r"-?\d+\.0*$")
+_ULPS = 4 * sys.float_info.epsilon
+
+
+def column_index(ref: str) -> int:
+    """0-based column of a cell reference ("A1" -> 0, "AB7" -> 27)."""
+    index = 0
+    for ch in _CELL_REF.match(ref).group(1):
+        index = index * 26 + ord(ch) - 64
+    return index - 1
+
+
+def _number_text(text: str) -> str:
+    """Numeric cell text, with whole numbers written without a fraction."""
+    if _WHOLE.match(text):
+        return text.split(".", 1)[0]
+    try:
+        number = float(text)
+    except ValueError:
+        return text
+    if not math.isfinite(number):
+        return text
+    whole = round(number)
+    if whole and math.isclose(number, whole, rel_tol=_ULPS):
+        return str(whole)
+    return text
+
+
+class TabularReader:
+    """Iterate a CSV or XLSX file as (row number, {header: value}).
+
+    The first non-empty row is the header. Values are stripped strings;
+    empty cells are left out of the dict and blank rows are skipped. Row
+    numbers are the file's own (CSV line / sheet row), for error reports.
+
+    XLSX date cells arrive as Excel serial numbers, since telling them
+    apart needs the workbook styles; format date columns as text.
+
+    Args:
+        path: .csv, .tsv, .txt or .xlsx file.
+        encoding: Text encoding of CSV files (utf-8-sig also accepts
+            plain UTF-8; Korean Excel exports are often cp949).
+        sheet: XLSX sheet name (default: the first sheet).
+    """
+
+    def __init__(self, path: str | Path, encoding: str = "utf-8-sig",
+                 sheet: str | None = None):
+        self.path = Path(path)
+        self.encoding = encoding
+        self.sheet = sheet
+        self.headers: list[str] = []
+        self._rows = None
+        self._closers: list = []
+
+    @property
+    def is_xlsx(self) -> bool:
+        return self.path.suffix.lower() in (".xlsx", ".xlsm")
+
+    def __enter__(self):
+        rows = self._xlsx_rows() if self.is_xlsx else self._csv_rows()
+        for row_no, values in rows:
+            if any(values):
+                self.headers = [v.strip() for v in values]
+                break
+        self._rows = rows
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        while self._closers:
+            self._closers.pop().close()
+
+    def __iter__(self):
+        if self._rows is None:
+            raise RuntimeError("use TabularReader as a context manager")
+        headers = self.headers
+        for row_no, values in self._rows:
+            row = {}
+            for header, value in zip(headers, values):
+                value = value.strip()
+                if header and value:
+                    row[header] = value
+            if row:
+                yield row_no, row
+
+    # ── CSV ──
+
+    def _csv_rows(self):
+        f = open(self.path, newline="", encoding=self.encoding)
+        self._closers.append(f)
+        suffix = self.path.suffix.lower()
+        delimiter = "\t" if suffix == ".tsv" else ","
+        reader = csv.reader(f, delimiter=delimiter)
+        line = 1
+        for values in reader:
+            yield line, values
+            line = reader.line_num + 1
+
+    # ── XLSX ──
+
+    def _xlsx_rows(self):
+        zf = zipfile.ZipFile(self.path)
+        self._closers.append(zf)
+        strings = self._shared_strings(zf)
+        with zf.open(self._sheet_path(zf)) as f:
+            for _, elem in iterparse(f):
+                if elem.tag != f"{_NS}row":
+                    continue
+                values: list[str] = []
+                for cell in elem.iter(f"{_NS}c"):
+                    ref = cell.get("r")
+                    if ref:
+                        col = column_index(ref)
+                        values.extend([""] * (col - len(values)))
+                    values.append(self._cell_value(cell, strings))
+                row_no = int(elem.get("r") or 0)
+                elem.clear()
+                yield row_no, values
+
+    @staticmethod
+    def _cell_value(cell, strings: list[str]) -> str:
+        kind = cell.get("t")
+        if kind == "inlineStr":
+            return "".join(t.text or "" for t in cell.iter(f"{_NS}t"))
+        v = cell.find(f"{_NS}v")
+        if v is None or v.text is None:
+            return ""
+        if kind == "s":
+            return strings[int(v.text)]
+        if kind in (None, "n"):
+            return _number_text(v.text)
+        return v.text
+
+    @staticmethod
+    def _shared_strings(zf: zipfile.ZipFile) -> list[str]:
+        try:
+            f = zf.open("xl/sharedStrings.xml")
+        except KeyError:
+            return []
+        strings = []
+        with f:
+            for _, elem in iterparse(f):
+                if elem.tag == f"{_NS}si":
+                    # Plain <si><t>, or rich text split into <r><t> runs;
+                    # phonetic hints (<rPh><t>) are not part of the value.
+                    parts = [t.text or "" for t in elem.findall(f"{_NS}t")]
+                    parts += [t.text or "" for t in elem.findall(f"{_NS}r/{_NS}t")]
+                    strings.append("".join(parts))
+                    elem.clear()
+        return strings
+
+    def _sheet_path(self, zf: zipfile.ZipFile) -> str:
+        with zf.open("xl/workbook.xml") as f:
+            sheets = [(e.get("name"), e.get(f"{_REL_NS}id"))
+                      for _, e in iterparse(f) if e.tag == f"{_NS}sheet"]
+        if not sheets:
+            raise ValueError(f"{self.path}: workbook has no sheets")
+        if self.sheet is None:
+            rel_id = sheets[0][1]
+        else:
+            matches = [rid for name, rid in sheets if name == self.sheet]
+            if not matches:
+                raise ValueError(f"{self.path}: no sheet named {self.sheet!r} "
+                                 f"(sheets: {', '.join(n for n, _ in sheets)})")
+            rel_id = matches[0]
+        with zf.open("xl/_rels/workbook.xml.rels") as f:
+            targets = {e.get("Id"): e.get("Target") for _, e in iterparse(f)
+                       if e.tag == f"{_PKG_REL_NS}Relationship"}
+        target = targets[rel_id]
+        return target.lstrip("/") if target.startswith("/") else f"xl/{target}"
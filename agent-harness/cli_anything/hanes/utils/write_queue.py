@@ -0,0 +1,321 @@
+"""
+@file write_queue.py
+@description Durable offline queue for writes the backend could not take.
+    An append-only NDJSON journal under ~/.cli-anything-hanes: a write
+    that fails with a connection error or a 408/429/502/503/504 is
+    appended (fsynced) with its idempotency key instead of being lost,
+    and Replayer sends the queued writes later, once ping() succeeds, in
+    journal order per path (different paths are replayed concurrently).
+    Several processes can share one journal; appends and compaction hold
+    a lock file and only one replayer runs at a time.
+
+    Journal lines:
+        {"op": "put", "id": KEY, "method": "POST", "path": ..., "data": ..., "ts": ...}
+        {"op": "done", "ids": [...]}          sent (2xx, or replayed by key)
+        {"op": "failed", "id": KEY, "error": ...}   refused, or gave up; kept
+        {"op": "attempt", "ids": [...]}       replay hit a transient error
+        {"op": "retry", "ids": [...]}         failed -> pending again
+        {"op": "drop", "ids": [...]}          discarded by hand
+
+    Usage:
+        queue = WriteQueue(DEFAULT_SESSION_DIR / "write-queue.ndjson")
+        backend = HanesBackend(..., write_queue=queue)
+        backend.create_prod_result({...})   # {"status": "queued", ...} if offline
+        Replayer(queue, backend).flush(wait=300)
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from cli_anything.hanes.utils.filelock import FileLock
+
+DEFAULT_QUEUE_FILE = "write-queue.ndjson"
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_WORKERS = 4
+# Transient replay failures after which an entry is marked failed, so one
+# write the backend keeps choking on cannot hold back the rest forever.
+DEFAULT_MAX_ATTEMPTS = 10
+# Exit status of a command whose write was queued rather than applied
+# (EX_TEMPFAIL).
+EXIT_QUEUED = 75
+# Replies that mean "not now" rather than "never": the write stays queued.
+# Other 5xx (a 500 from a handler bug) would fail the same way on replay.
+_TRANSIENT_STATUSES = {408, 429, 502, 503, 504}
+# Replies that would refuse every queued write alike (expired login);
+# replay stops instead of failing them all.
+_STOP_STATUSES = {401, 403}
+
+
+def new_key() -> str:
+    """Idempotency key for a write that may be queued and replayed."""
+    return f"wq-{uuid.uuid4().hex}"
+
+
+def is_transient(exc: BaseException) -> bool:
+    """Whether a failed write should wait in the queue rather than fail."""
+    if isinstance(exc, ConnectionError):
+        return True
+    status = getattr(exc, "status", None)
+    return status in _TRANSIENT_STATUSES
+
+
+class WriteQueue:
+    """Append-only journal of queued writes.
+
+    State is rebuilt by reading the journal from the top, so a crash at
+    any point loses at most a torn last line, which is skipped. Resolved
+    entries are dropped by compact().
+    """
+
+    def __init__(self, path: str | Path, lock_timeout: float = 10.0):
+        self.path = Path(path)
+        self._lock = FileLock(self.path.with_name(self.path.name + ".lock"),
+                              timeout=lock_timeout)
+        self._thread_lock = threading.Lock()
+
+    def _append(self, records: list[dict]):
+        data = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records)
+        with self._thread_lock, self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+            try:
+                os.write(fd, data.encode("utf-8"))
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    def append(self, method: str, path: str, data: dict | None,
+               key: str | None = None) -> dict:
+        """Queue a write; returns the journal entry (its id is the key)."""
+        entry = {"op": "put", "id": key or new_key(), "method": method,
+                 "path": path, "data": data,
+                 "ts": time.strftime("%Y-%m-%dT%H:%M:%S%z")}
+        self._append([entry])
+        return entry
+
+    def mark(self, done: list[str] = (), failed: dict[str, str] | None = None,
+             attempted: list[str] = ()):
+        """Record a replayed batch with one append (and one fsync)."""
+        records = [{"op": "done", "ids": list(done)}] if done else []
+        records += [{"op": "failed", "id": i, "error": e}
+                    for i, e in (failed or {}).items()]
+        if attempted:
+            records.append({"op": "attempt", "ids": list(attempted)})
+        if records:
+            self._append(records)
+
+    def retry(self, ids: list[str]):
+        """Move failed entries back to pending, with no attempts counted."""
+        if ids:
+            self._append([{"op": "retry", "ids": list(ids)}])
+
+    def drop(self, ids: list[str]):
+        """Discard entries without sending them."""
+        if ids:
+            self._append([{"op": "drop", "ids": list(ids)}])
+
+    def _read(self) -> tuple[dict[str, dict], int]:
+        """Unresolved entries by id (journal order) and the line count."""
+        entries: dict[str, dict] = {}
+        lines = 0
+        try:
+            f = open(self.path, encoding="utf-8")
+        except FileNotFoundError:
+            return entries, 0
+        with f:
+            for line in f:
+                lines += 1
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue  # torn write
+                op = rec.get("op")
+                if op == "put":
+                    entries[rec["id"]] = {k: v for k, v in rec.items() if k != "op"}
+                elif op in ("done", "drop"):
+                    for i in rec["ids"]:
+                        entries.pop(i, None)
+                elif op == "failed" and rec["id"] in entries:
+                    entries[rec["id"]]["error"] = rec["error"]
+                elif op == "attempt":
+                    for i in rec["ids"]:
+                        if i in entries:
+                            entries[i]["attempts"] = entries[i].get("attempts", 0) + 1
+                elif op == "retry":
+                    for i in rec["ids"]:
+                        if i in entries:
+                            entries[i].pop("error", None)
+                            entries[i].pop("attempts", None)
+        return entries, lines
+
+    def entries(self) -> tuple[list[dict], list[dict]]:
+        """(pending, failed) entries, oldest first."""
+        entries, _ = self._read()
+        pending = [e for e in entries.values() if "error" not in e]
+        failed = [e for e in entries.values() if "error" in e]
+        return pending, failed
+
+    def compact(self):
+        """Rewrite the journal with only unresolved entries (atomically)."""
+        with self._thread_lock, self._lock:
+            entries, lines = self._read()
+            if lines == 0 or lines == len(entries):
+                return
+            if not entries:
+                self.path.unlink(missing_ok=True)
+                return
+            tmp = self.path.with_name(self.path.name + ".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                for e in entries.values():
+                    put = {k: v for k, v in e.items() if k != "error"}
+                    f.write(json.dumps({"op": "put", **put}, ensure_ascii=False) + "\n")
+                    if "error" in e:
+                        f.write(json.dumps({"op": "failed", "id": e["id"],
+                                            "error": e["error"]},
+                                           ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+
+    def stats(self) -> dict:
+        pending, failed = self.entries()
+        return {"path": str(self.path), "pending": len(pending),
+                "failed": len(failed),
+                "oldest": pending[0]["ts"] if pending else None,
+                "bytes": self.path.stat().st_size if self.path.exists() else 0}
+
+
+class Replayer:
+    """Sends queued writes to the backend, oldest first.
+
+    Writes go out in batches of ``batch_size``. Within a batch the writes
+    to one path are sent one after another in journal order, and up to
+    ``workers`` paths are replayed at once: production results and
+    receiving for the same order or lot depend on their order, writes to
+    different resources do not. The next batch starts when the previous
+    one is settled, and each batch is recorded with one journal append.
+
+    A transient failure (connection error, 408/429/502/503/504) stops
+    that path for the batch and counts an attempt against the entry;
+    after ``max_attempts`` the entry is marked failed. While ping()
+    fails, or a batch hits a transient failure, it backs off (doubling
+    up to ``max_backoff``) until ``wait`` seconds have passed.
+
+    Args:
+        queue: The journal.
+        backend: HanesBackend the writes are sent through (with their
+            original idempotency keys, so a write the backend already
+            got before the connection dropped is not applied twice).
+    """
+
+    def __init__(self, queue: WriteQueue, backend,
+                 batch_size: int = DEFAULT_BATCH_SIZE,
+                 workers: int = DEFAULT_WORKERS,
+                 max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+                 backoff: float = 0.5, max_backoff: float = 30.0):
+        self.queue = queue
+        self.backend = backend
+        self.batch_size = batch_size
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+    def _send(self, entry: dict):
+        send = getattr(self.backend, entry["method"].lower())
+        return send(entry["path"], entry["data"], idempotency_key=entry["id"])
+
+    def _send_path(self, entries: list[dict]) -> list[tuple[dict, Exception | None]]:
+        """Send one path's entries in order, up to the first one that has
+        to be sent again (a later write must not overtake it)."""
+        results = []
+        for entry in entries:
+            try:
+                self._send(entry)
+            except Exception as exc:
+                results.append((entry, exc))
+                if is_transient(exc) or getattr(exc, "status", None) in _STOP_STATUSES:
+                    break
+            else:
+                results.append((entry, None))
+        return results
+
+    def flush(self, wait: float = 0.0, progress=None) -> dict:
+        """Send everything pending; returns counts.
+
+        "busy" is True when another process is already replaying.
+        ``progress`` is called with the counts after every batch.
+        """
+        counts = {"sent": 0, "failed": 0, "batches": 0, "remaining": 0,
+                  "busy": False, "stopped": None}
+        flush_lock = FileLock(self.queue.path.with_name(self.queue.path.name + ".flush"))
+        if not flush_lock.try_acquire():
+            counts["busy"] = True
+            counts["remaining"] = len(self.queue.entries()[0])
+            return counts
+        t0 = time.monotonic()
+        deadline = t0 + wait
+        delay = self.backoff
+        try:
+            pending, _ = self.queue.entries()
+            with ThreadPoolExecutor(max_workers=self.workers,
+                                    thread_name_prefix="hanes-replay") as pool:
+                while pending:
+                    stop, fatal = None, False
+                    if not self.backend.ping():
+                        stop = "backend unreachable"
+                    else:
+                        paths: dict[str, list[dict]] = {}
+                        for entry in pending[:self.batch_size]:
+                            paths.setdefault(entry["path"], []).append(entry)
+                        futures = [pool.submit(self._send_path, entries)
+                                   for entries in paths.values()]
+                        done, failed, attempted = [], {}, []
+                        for future in futures:
+                            for entry, exc in future.result():
+                                if exc is None:
+                                    done.append(entry["id"])
+                                elif is_transient(exc):
+                                    error = str(exc).splitlines()[0]
+                                    stop = stop or error
+                                    entry["attempts"] = entry.get("attempts", 0) + 1
+                                    if entry["attempts"] >= self.max_attempts:
+                                        failed[entry["id"]] = (
+                                            f"gave up after {entry['attempts']} "
+                                            f"attempts: {error}")
+                                    else:
+                                        attempted.append(entry["id"])
+                                elif getattr(exc, "status", None) in _STOP_STATUSES:
+                                    stop, fatal = str(exc), True
+                                else:
+                                    failed[entry["id"]] = str(exc)
+                        self.queue.mark(done, failed, attempted)
+                        settled = set(done) | set(failed)
+                        pending = [e for e in pending if e["id"] not in settled]
+                        counts["sent"] += len(done)
+                        counts["failed"] += len(failed)
+                        counts["batches"] += 1
+                        if progress:
+                            progress({**counts, "remaining": len(pending)})
+                    if stop is None:
+                        delay = self.backoff
+                        if not pending:
+                            # Picks up writes queued while this ran.
+                            pending, _ = self.queue.entries()
+                        continue
+                    if fatal or time.monotonic() + delay > deadline:
+                        counts["stopped"] = stop
+                        break
+                    time.sleep(delay)
+                    delay = min(delay * 2, self.max_backoff)
+            counts["remaining"] = len(pending)
+            self.queue.compact()
+        finally:
+            flush_lock.release()
+        counts["seconds"] = round(time.monotonic() - t0, 3)
+        return counts